@@ -3,23 +3,59 @@ Astrology API - Main Application
 Professional API for generating divisional charts using Swiss Ephemeris
 Supports D1 (Rashi), D9 (Navamsha), and more charts
 """
-from flask import Flask, jsonify
+from flask import Flask, Response, abort, jsonify, request
 import os
 import sys
 
 # Add project root to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Import route blueprints
-from routes import d1_bp, d9_bp
+# Import route blueprints (cheap: engines initialise on first use)
+from routes import d1_bp, d9_bp, synastry_bp, dasha_bp, events_bp, panchang_bp, hora_bp, lagna_table_bp, sky_bp, transit_overlay_bp, transit_periods_bp, match_bp, astrocartography_bp, places_bp
+from services import runtime
+from services.admission import controller as admission_controller
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
+# Larger request bodies are refused with 413, here and in asgi.py
+MAX_BODY_BYTES = int(os.environ.get("MAX_BODY_BYTES", os.environ.get("ASGI_MAX_BODY_BYTES", str(16 * 1024 * 1024))))
+app.config['MAX_CONTENT_LENGTH'] = MAX_BODY_BYTES
 
 # Register blueprints
 app.register_blueprint(d1_bp)
 app.register_blueprint(d9_bp)
+app.register_blueprint(synastry_bp)
+app.register_blueprint(dasha_bp)
+app.register_blueprint(events_bp)
+app.register_blueprint(panchang_bp)
+app.register_blueprint(hora_bp)
+app.register_blueprint(lagna_table_bp)
+app.register_blueprint(sky_bp)
+app.register_blueprint(transit_overlay_bp)
+app.register_blueprint(transit_periods_bp)
+app.register_blueprint(match_bp)
+app.register_blueprint(astrocartography_bp)
+app.register_blueprint(places_bp)
+
+# lazy | background | eager - see services.runtime
+runtime.start()
+
+
+@app.before_request
+def limit_body_size():
+    """Refuse oversized bodies before a view reads them (views turn read errors into 500s)"""
+    if request.content_length is not None and request.content_length > MAX_BODY_BYTES:
+        abort(413)
+
+
+@app.errorhandler(413)
+def body_too_large(error):
+    """Same 413 payload as the ASGI entry point"""
+    return jsonify({
+        "error": "Request body too large",
+        "status": "error"
+    }), 413
 
 
 @app.route('/')
@@ -33,6 +69,10 @@ def home():
             "D1": "Rashi Chart (Birth Chart)",
             "D9": "Navamsha Chart (Marriage & Relationships)"
         },
+        "periods_available": {
+            "Vimshottari": "Maha, Antar, Pratyantar, Sookshma and Prana dashas",
+            "Transit": "Sade Sati, Ashtama Shani and Jupiter returns"
+        },
         "endpoints": {
             "D1": {
                 "full": "/api/v1/d1-chart (POST)",
@@ -42,7 +82,20 @@ def home():
                 "full": "/api/v1/d9-chart (POST)",
                 "refined": "/api/v1/d9-chart-refined (POST)"
             },
+            "Synastry": "/api/v1/synastry (POST)",
+            "Dasha": "/api/v1/dasha (POST)",
+            "Events": "/api/v1/events (POST)",
+            "Panchang": "/api/v1/panchang (POST)",
+            "Hora": "/api/v1/hora (POST)",
+            "Lagna Table": "/api/v1/lagna-table (POST)",
+            "Sky": "/api/v1/sky (POST)",
+            "Transit Overlay": "/api/v1/transit-overlay (POST)",
+            "Transit Periods": "/api/v1/transit-periods (POST)",
+            "Match": "/api/v1/match (POST)",
+            "Astrocartography": "/api/v1/astrocartography (POST)",
+            "Places": "/api/v1/places?q= (GET), /api/v1/places/<id> (GET)",
             "health": "/health (GET)",
+            "metrics": "/metrics (GET)",
             "docs": "/docs (GET)"
         }
     })
@@ -50,15 +103,36 @@ def home():
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+
+    Only reports engines that are already initialised, so a probe never builds
+    one or reads a file; ?deep=1 builds the D1 engine and runs one ephemeris
+    calculation to report the mode actually serving requests.
+    """
     return jsonify({
         "status": "healthy",
         "service": "Vedic Astrology Chart API",
         "ephemeris": "Swiss Ephemeris",
-        "version": "2.0.0"
+        "ephemeris_mode": runtime.ephemeris_status(deep=request.args.get("deep") == "1"),
+        "gazetteer": _gazetteer_status(),
+        "version": "2.0.0",
+        "admission": admission_controller.metrics()
     })
 
 
+def _gazetteer_status():
+    """Index sizes of the gazetteer, or None when it is not loaded (yet) or has no file"""
+    gazetteer = runtime.initialized("gazetteer")
+    return gazetteer.stats() if gazetteer is not None else None
+
+
+@app.route('/metrics')
+def metrics():
+    """Admission-control metrics (queue depth, admissions, shed counts) for Prometheus"""
+    return Response(admission_controller.prometheus_metrics(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/docs')
 def api_documentation():
     """API documentation endpoint"""
@@ -69,11 +143,15 @@ def api_documentation():
         "request_format": {
             "name": "string (required) - Full name",
             "datetime": "string (required) - Birth date and time in ISO format (YYYY-MM-DDTHH:MM:SS)",
-            "latitude": "float (required) - Birth latitude (-90 to 90)",
-            "longitude": "float (required) - Birth longitude (-180 to 180)",
-            "timezone": "float (required) - Timezone offset in hours (e.g., 5.5 for IST, -5 for EST)",
-            "place": "string (required) - Birth place name",
-            "religion": "string (optional) - Religion"
+            "latitude": "float (required unless place_id) - Birth latitude (-90 to 90)",
+            "longitude": "float (required unless place_id) - Birth longitude (-180 to 180)",
+            "timezone": "float or string (required unless place_id) - Offset in hours (e.g., 5.5 for IST) or IANA zone name (e.g., Asia/Kolkata, resolved with its historical DST)",
+            "place": "string (required unless place_id) - Birth place name",
+            "place_id": "int (optional) - Gazetteer (GeoNames) id from /api/v1/places; fills place, latitude, longitude and timezone",
+            "religion": "string (optional) - Religion",
+            "ayanamsa": "string (optional) - lahiri (default), raman, kp, kp_new, true_chitra, ...",
+            "house_system": "string (optional) - whole_sign (default), placidus, sripati, equal, porphyry, koch",
+            "ephemeris": "string (optional) - swiss (.se1 files) or moshier (analytic, no file I/O); default EPHEMERIS_MODE"
         },
         "endpoints": {
             "D1 Chart (Rashi)": {
@@ -99,8 +177,93 @@ def api_documentation():
                 "method": "POST",
                 "description": "Calculate D9 chart with essential graha data only",
                 "response": "Simplified D9 format with same fields as D1 refined"
+            },
+            "Synastry": {
+                "path": "/api/v1/synastry",
+                "method": "POST",
+                "description": "Two birth charts compared: cross-aspects, house overlays and D9 comparison from one batched calculation",
+                "parameters": "first and second: birth details as for the D1 chart",
+                "response": "Both charts in brief, cross-aspects with orbs, house overlays both ways, and D9 lagnas, 7th houses, overlays and conjunctions"
+            },
+            "Vimshottari Dasha": {
+                "path": "/api/v1/dasha",
+                "method": "POST",
+                "description": "Vimshottari dasha periods from the natal Moon at any level (maha, antar, pratyantar, sookshma, prana)",
+                "parameters": "Birth details plus optional level, from, to (local dates), at, limit (1-500) and cursor",
+                "response": "Running periods at 'at' (default now) and one page of periods overlapping the window, with next_cursor"
+            },
+            "Transit Events": {
+                "path": "/api/v1/events",
+                "method": "POST",
+                "description": "Sign/nakshatra ingresses, retrograde/direct stations, new/full moons and tithi changes in a date range",
+                "parameters": "from, to (local dates), optional timezone, planets, types, limit (1-5000) and cursor",
+                "response": "One page of events in time order, served from the precomputed calendar where it covers the range, with next_cursor"
+            },
+            "Panchang": {
+                "path": "/api/v1/panchang",
+                "method": "POST",
+                "description": "Sunrise-anchored daily panchang (vara, tithi, nakshatra, yoga, karana) with exact end times of every limb",
+                "parameters": "latitude, longitude, timezone, from, optional to (inclusive, up to 366 days) and stream (NDJSON, one line per month)",
+                "response": "Columnar arrays per day plus every tithi, nakshatra, yoga and karana span in the range"
+            },
+            "Hora": {
+                "path": "/api/v1/hora",
+                "method": "POST",
+                "description": "The 24 planetary horas and 16 choghadiyas of a sunrise-to-sunrise day, from cached sunrise tables",
+                "parameters": "latitude, longitude, timezone and either date or datetime (default now)",
+                "response": "Sunrise, sunset, next sunrise, every hora and choghadiya, and for an instant the current ones"
+            },
+            "Lagna Table": {
+                "path": "/api/v1/lagna-table",
+                "method": "POST",
+                "description": "Every lagna sign, navamsha and nakshatra pada change of a local date, root-found on the ascendant and cached per location",
+                "parameters": "latitude (up to 60 degrees), longitude, timezone and either date or datetime (default now)",
+                "response": "Sign, nakshatra and navamsha segments with start/end times, and for an instant the running ones"
+            },
+            "Current Sky": {
+                "path": "/api/v1/sky",
+                "method": "POST",
+                "description": "Positions of the nine grahas now from a snapshot refreshed in the background, plus lagna and whole-sign houses for an observer",
+                "parameters": "timezone and optional latitude/longitude",
+                "response": "Snapshot instant, age and staleness bound, ayanamsa, planets and, with a location, lagna, midheaven and houses"
+            },
+            "Transit Overlay": {
+                "path": "/api/v1/transit-overlay",
+                "method": "POST",
+                "description": "Transit houses, aspects and orbs of one sky state over many natal Moons/lagnas in one vectorized pass",
+                "parameters": "Optional datetime/timezone (default now) and equal-length moon_longitude, lagna_longitude, moon_sign, lagna_sign lists",
+                "response": "Transit positions plus (charts x planets) house, aspect and orb arrays per natal point"
+            },
+            "Transit Periods": {
+                "path": "/api/v1/transit-periods",
+                "method": "POST",
+                "description": "Sade Sati, Ashtama Shani and Jupiter returns from exact Saturn/Jupiter sign ingresses, with every retrograde exit and re-entry as a phase",
+                "parameters": "Birth details plus optional kinds, from, to (local dates) and at",
+                "response": "Natal signs, periods running at 'at' (default now) and every period overlapping the window (default birth + 100 years)"
+            },
+            "Ashtakoota Match": {
+                "path": "/api/v1/match",
+                "method": "POST",
+                "description": "Guna Milan (36 points) of one profile against many candidates from precomputed 108 x 108 pada-pair tables",
+                "parameters": "role, datetime/timezone or moon_longitude, candidates (moon_longitude or nakshatra/pada lists, optional id), top_k, min_score, exclude_doshas",
+                "response": "Profile Moon and the top_k candidates with total, per-koota points and nadi/bhakoot/gana dosha flags"
+            },
+            "Astrocartography": {
+                "path": "/api/v1/astrocartography",
+                "method": "POST",
+                "description": "Lagna, midheaven and whole-sign houses of one instant over a location grid or city list in one vectorized pass, plus planet-on-angle lines",
+                "parameters": "Optional datetime/timezone (default now), grid (lat/lon range and step, default world at 1 degree) or locations (latitude/longitude lists, optional id), planets, include, line_step",
+                "response": "Arrays shaped like the grid (or list) of lagna sign/longitude, midheaven and per-graha houses, and ASC/DSC/MC/IC line coordinates"
+            },
+            "Places": {
+                "path": "/api/v1/places",
+                "method": "GET",
+                "description": "Offline place autocomplete (name prefix, then trigram similarity) from the GeoNames gazetteer at GAZETTEER_PATH; /api/v1/places/<id> looks up one id",
+                "parameters": "q, optional limit (1-50) and country (ISO 3166 alpha-2)",
+                "response": "Places with id, label, country, latitude, longitude, IANA timezone and population"
             }
-        }
+        },
+        "overload": "Chart requests beyond the admission queue are rejected with 503 and a Retry-After header"
     })
 
 
@@ -0,0 +1,379 @@
+"""
+Astrology API - ASGI Application
+Serves the same routes and response contract as app.py under an async server
+
+    uvicorn asgi:application --host 0.0.0.0 --port $PORT
+    gunicorn -k uvicorn.workers.UvicornWorker asgi:application
+
+Chart endpoints are handled natively: the request body is read, parsed and
+validated on the event loop, the calculation is offloaded to the bounded
+ephemeris executor (services.ephemeris_executor) and the response is formatted
+and serialized back on the loop. Streamed responses (long panchang ranges) are
+sent as NDJSON, one block per line, each block offloaded and admitted on its own. Chart requests first take an admission-control
+slot (services.admission) and are shed with 503 and Retry-After under overload;
+waiting happens on the loop without holding a thread. Every other request (home, health, docs,
+errors, places, bodies that are not JSON) is passed to the Flask app
+unchanged: requests to a chart path or /health?deep=1 run on the process's
+swisseph thread, everything else (in-memory lookups that never call swisseph) on the
+event loop's default thread pool so it does not queue behind calculations.
+Bodies over MAX_BODY_BYTES get the same 413 as under WSGI.
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+from collections import namedtuple
+from urllib.parse import parse_qs
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app as flask_app, MAX_BODY_BYTES
+from routes.common import overloaded_payload, request_endpoint_class, validate_user_details
+from routes.d1_routes import _format_full_chart_response, _format_refined_chart_response
+from routes.d9_routes import _format_full_d9_response, _format_refined_d9_response
+from routes.synastry_routes import _format_synastry_response, validate_synastry_request
+from routes.dasha_routes import _format_dasha_response, validate_dasha_request
+from routes.events_routes import _format_events_response, validate_events_request
+from routes.hora_routes import _format_hora_response, validate_hora_request
+from routes.lagna_table_routes import _format_lagna_table_response, validate_lagna_table_request
+from routes.sky_routes import _format_sky_response, validate_sky_request
+from routes.transit_overlay_routes import _format_transit_overlay_response, validate_transit_overlay_request
+from routes.match_routes import _format_match_response, validate_match_request
+from routes.astrocartography_routes import _format_astrocartography_response, validate_astrocartography_request
+from routes.transit_period_routes import _format_transit_periods_response, validate_transit_periods_request
+from routes.panchang_routes import (
+    _format_panchang_block, _format_panchang_response, format_stream_line,
+    panchang_block_arguments, validate_panchang_request, STREAM_BLOCK_CLASS
+)
+from services import runtime
+from services.admission import controller, Overloaded, ADMITTED_ENVIRON_KEY
+from services.ephemeris_executor import (
+    EphemerisExecutor, calculate_d1, calculate_d9, calculate_synastry, calculate_dasha, find_events,
+    calculate_panchang, calculate_panchang_block, calculate_hora, calculate_lagna_table, current_sky,
+    calculate_transit_overlay, calculate_transit_periods, calculate_match, calculate_astrocartography
+)
+
+
+ChartRoute = namedtuple(
+    "ChartRoute", ["job", "formatter", "error_message", "validator", "stream"],
+    defaults=[validate_user_details, None]
+)
+
+# How a route streams requests whose query has stream=True: blocks(query) lists
+# the job arguments of each block, formatter(job result) gives one NDJSON line
+StreamRoute = namedtuple("StreamRoute", ["blocks", "job", "formatter", "endpoint_class"])
+
+CHART_ROUTES = {
+    "/api/v1/d1-chart": ChartRoute(
+        calculate_d1, _format_full_chart_response,
+        "Internal server error during chart calculation"
+    ),
+    "/api/v1/d1-chart-refined": ChartRoute(
+        calculate_d1, _format_refined_chart_response,
+        "Internal server error during chart calculation"
+    ),
+    "/api/v1/d9-chart": ChartRoute(
+        calculate_d9, _format_full_d9_response,
+        "Internal server error during D9 chart calculation"
+    ),
+    "/api/v1/d9-chart-refined": ChartRoute(
+        calculate_d9, _format_refined_d9_response,
+        "Internal server error during D9 chart calculation"
+    ),
+    "/api/v1/synastry": ChartRoute(
+        calculate_synastry, lambda result: _format_synastry_response(*result),
+        "Internal server error during synastry calculation", validate_synastry_request
+    ),
+    "/api/v1/dasha": ChartRoute(
+        calculate_dasha, lambda result: _format_dasha_response(*result),
+        "Internal server error during dasha calculation", validate_dasha_request
+    ),
+    "/api/v1/events": ChartRoute(
+        find_events, lambda result: _format_events_response(*result),
+        "Internal server error during event search", validate_events_request
+    ),
+    "/api/v1/panchang": ChartRoute(
+        calculate_panchang, lambda result: _format_panchang_response(*result),
+        "Internal server error during panchang calculation", validate_panchang_request,
+        StreamRoute(
+            panchang_block_arguments,
+            calculate_panchang_block, lambda result: _format_panchang_block(*result), STREAM_BLOCK_CLASS
+        )
+    ),
+    "/api/v1/hora": ChartRoute(
+        calculate_hora, lambda result: _format_hora_response(*result),
+        "Internal server error during hora calculation", validate_hora_request
+    ),
+    "/api/v1/lagna-table": ChartRoute(
+        calculate_lagna_table, lambda result: _format_lagna_table_response(*result),
+        "Internal server error during lagna table calculation", validate_lagna_table_request
+    ),
+    "/api/v1/sky": ChartRoute(
+        current_sky, lambda result: _format_sky_response(*result),
+        "Internal server error during sky calculation", validate_sky_request
+    ),
+    "/api/v1/transit-overlay": ChartRoute(
+        calculate_transit_overlay, lambda result: _format_transit_overlay_response(*result),
+        "Internal server error during transit overlay", validate_transit_overlay_request
+    ),
+    "/api/v1/transit-periods": ChartRoute(
+        calculate_transit_periods, lambda result: _format_transit_periods_response(*result),
+        "Internal server error during transit period calculation", validate_transit_periods_request
+    ),
+    "/api/v1/match": ChartRoute(
+        calculate_match, lambda result: _format_match_response(*result),
+        "Internal server error during matching", validate_match_request
+    ),
+    "/api/v1/astrocartography": ChartRoute(
+        calculate_astrocartography, lambda result: _format_astrocartography_response(*result),
+        "Internal server error during astrocartography", validate_astrocartography_request
+    ),
+}
+
+
+def _view_endpoint_class(path: str) -> str:
+    """Admission class that @admission_controlled recorded on the Flask view of a chart path"""
+    endpoint, _ = flask_app.url_map.bind("localhost").match(path, method="POST")
+    return flask_app.view_functions[endpoint].endpoint_class
+
+
+# Taken from the Flask views so both servers admit a route in the same class
+# (a class, or a function of the request JSON for /events)
+ENDPOINT_CLASSES = {path: _view_endpoint_class(path) for path in CHART_ROUTES}
+
+executor = EphemerisExecutor()
+
+
+class BodyTooLarge(Exception):
+    """Request body exceeded MAX_BODY_BYTES"""
+
+
+async def _read_body(receive) -> bytes:
+    """Read the full request body from the ASGI receive channel"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise BodyTooLarge()
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _send_response(send, status: int, body: bytes, headers):
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, payload, extra_headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("latin-1")),
+    ]
+    for name, value in (extra_headers or {}).items():
+        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    await _send_response(send, status, body, headers)
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _call_wsgi(scope, body: bytes, admitted: bool = False):
+    """Run the Flask app for one request and collect (status, headers, body)"""
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        ADMITTED_ENVIRON_KEY: admitted,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+    for key, value in scope.get("headers", []):
+        name = key.decode("latin-1").upper().replace("-", "_")
+        if name == "CONTENT_TYPE":
+            environ["CONTENT_TYPE"] = value.decode("latin-1")
+        elif name != "CONTENT_LENGTH":
+            environ[f"HTTP_{name}"] = value.decode("latin-1")
+
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+    result = flask_app(environ, start_response)
+    try:
+        response_body = b"".join(result)
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return started["status"], started["headers"], response_body
+
+
+def _uses_swisseph(scope) -> bool:
+    """Whether a request handed to Flask may call swisseph (chart paths and the deep health probe)"""
+    if scope["path"] in CHART_ROUTES:
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return scope["path"] == "/health" and query.get("deep") == ["1"]
+
+
+async def _delegate_to_flask(scope, body: bytes, send, admitted: bool = False):
+    if _uses_swisseph(scope):
+        status, headers, response_body = await executor.run_local(_call_wsgi, scope, body, admitted)
+    else:
+        loop = asyncio.get_running_loop()
+        status, headers, response_body = await loop.run_in_executor(None, _call_wsgi, scope, body, admitted)
+    await _send_response(send, status, response_body, headers)
+
+
+def _chart_endpoint_class(scope, body: bytes) -> str:
+    """Admission class of one chart request (see routes.common.request_endpoint_class)"""
+    endpoint_class = ENDPOINT_CLASSES[scope["path"]]
+    if not callable(endpoint_class):
+        return endpoint_class
+    json_data = None
+    if body and _header(scope, b"content-type").startswith("application/json"):
+        try:
+            json_data = json.loads(body)
+        except ValueError:
+            pass
+    return request_endpoint_class(endpoint_class, json_data)
+
+
+async def _handle_chart(scope, body: bytes, send, route: ChartRoute):
+    try:
+        async with controller.slot_async(_chart_endpoint_class(scope, body)):
+            stream_query = await _handle_admitted_chart(scope, body, send, route)
+    except Overloaded as e:
+        payload, headers = overloaded_payload(e)
+        return await _send_json(send, 503, payload, headers)
+    if stream_query is not None:
+        await _stream_chart(send, route, stream_query)
+
+
+async def _stream_chart(send, route: ChartRoute, query):
+    """Send an NDJSON response block by block; errors after the first block end the stream with an error line"""
+    stream = route.stream
+    started = False
+    last_line = b""
+    try:
+        for block in stream.blocks(query):
+            async with controller.slot_async(stream.endpoint_class):
+                result = await executor.run(stream.job, *block)
+            line = format_stream_line(stream.formatter(result))
+            if not started:
+                await send({
+                    "type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")]
+                })
+                started = True
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+    except Overloaded as e:
+        if not started:
+            payload, headers = overloaded_payload(e)
+            return await _send_json(send, 503, payload, headers)
+        last_line = format_stream_line({"status": "error", "error": "Service overloaded, retry later", "reason": e.reason})
+    except Exception as e:
+        payload = {"error": route.error_message, "message": str(e), "status": "error"}
+        if not started:
+            return await _send_json(send, 500, payload)
+        last_line = format_stream_line(payload)
+    await send({"type": "http.response.body", "body": last_line, "more_body": False})
+
+
+async def _handle_admitted_chart(scope, body: bytes, send, route: ChartRoute):
+    # Anything Flask's request.get_json() would reject keeps Flask's behaviour
+    if not _header(scope, b"content-type").startswith("application/json"):
+        return await _delegate_to_flask(scope, body, send, admitted=True)
+    try:
+        json_data = json.loads(body) if body else None
+    except ValueError:
+        return await _delegate_to_flask(scope, body, send, admitted=True)
+
+    try:
+        request_data, error = route.validator(json_data)
+        if error:
+            payload, status = error
+            return await _send_json(send, status, payload)
+
+        if route.stream is not None and getattr(request_data, "stream", False):
+            # Streamed outside this request's admission slot, see _stream_chart
+            return request_data
+
+        result = await executor.run(route.job, request_data)
+        response = route.formatter(result)
+    except Exception as e:
+        return await _send_json(send, 500, {
+            "error": route.error_message,
+            "message": str(e),
+            "status": "error"
+        })
+
+    await _send_json(send, 200, response)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            executor.start()
+            if executor.kind == "thread":
+                # Snapshot refreshes run on the swisseph thread like every calculation
+                runtime.set_sky_runner(executor.call_local)
+            if "ADMISSION_MAX_CONCURRENCY" not in os.environ:
+                # One calculation per ephemeris thread/process
+                controller.resize(executor.workers)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            runtime.stop_sky_ticker()
+            executor.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI entry point"""
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    try:
+        body = await _read_body(receive)
+    except BodyTooLarge:
+        return await _send_json(send, 413, {
+            "error": "Request body too large",
+            "status": "error"
+        })
+
+    route = CHART_ROUTES.get(scope["path"])
+    if route is not None and scope["method"] == "POST":
+        return await _handle_chart(scope, body, send, route)
+    return await _delegate_to_flask(scope, body, send)
@@ -0,0 +1,264 @@
+"""
+Ashtakoota Calculator
+Guna Milan (36-point) compatibility from precomputed pada-pair tables
+
+Every koota depends only on the two Moons' nakshatra padas (a pada never
+spans two signs, so the pada fixes the Moon sign too). The eight koota scores,
+their total and the dosha flags are therefore tabulated once for all
+108 x 108 (groom pada, bride pada) pairs. Scoring one profile against any
+number of candidates is a single gather from one row (or column) of the
+total table; only the top-k matches are expanded into per-koota breakdowns.
+
+Kootas (maximum points):
+    varna 1, vashya 2, tara 3, yoni 4, graha maitri 5, gana 6, bhakoot 7, nadi 8
+Vashya follows the sign halves of Sagittarius and Capricorn (by the pada's
+start). Dosha flags are raw (no cancellation rules applied):
+    nadi    - both Moons in the same nadi (nadi koota 0)
+    bhakoot - Moon signs 2/12, 5/9 or 6/8 apart (bhakoot koota 0)
+    gana    - gana koota 0 (a Rakshasa gana facing a Deva or Manushya gana)
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from models.astrology_models import Planet, Zodiac
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+PADAS = 108
+PADA_SPAN = 360.0 / PADAS
+MAX_POINTS = 36
+
+KOOTAS = ("varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi")
+KOOTA_MAXIMA = (1, 2, 3, 4, 5, 6, 7, 8)
+
+# Dosha bit flags
+DOSHAS = {"nadi": 1, "bhakoot": 2, "gana": 4}
+
+ROLES = ("groom", "bride")
+
+# Varna rank per sign (Aries first): 4 Brahmin, 3 Kshatriya, 2 Vaishya, 1 Shudra
+SIGN_VARNA = (3, 2, 1, 4, 3, 2, 1, 4, 3, 2, 1, 4)
+
+# Vashya groups: 0 chatushpada, 1 manava, 2 jalachara, 3 vanachara, 4 keeta;
+# (first half, second half) of each sign
+SIGN_VASHYA = (
+    (0, 0), (0, 0), (1, 1), (2, 2), (3, 3), (1, 1),
+    (1, 1), (4, 4), (1, 0), (0, 2), (1, 1), (2, 2)
+)
+# Groom group (row) against bride group (column)
+VASHYA_POINTS = np.array([
+    [2.0, 1.0, 1.0, 0.5, 1.0],
+    [1.0, 2.0, 0.5, 0.0, 1.0],
+    [1.0, 0.5, 2.0, 1.0, 1.0],
+    [0.0, 0.0, 0.0, 2.0, 0.0],
+    [1.0, 1.0, 1.0, 0.0, 2.0],
+])
+
+# Yoni animal per nakshatra (Ashwini first) and the symmetric animal table
+YONI_ANIMALS = (
+    "horse", "elephant", "sheep", "serpent", "dog", "cat", "rat",
+    "cow", "buffalo", "tiger", "deer", "monkey", "mongoose", "lion"
+)
+NAKSHATRA_YONI = (
+    0, 1, 2, 3, 3, 4, 5, 2, 5, 6, 6, 7, 8, 9,
+    8, 9, 10, 10, 4, 11, 12, 11, 13, 0, 13, 7, 1
+)
+YONI_POINTS = np.array([
+    [4, 2, 2, 3, 2, 2, 2, 1, 0, 1, 3, 3, 2, 1],
+    [2, 4, 3, 3, 2, 2, 2, 2, 3, 1, 2, 3, 2, 0],
+    [2, 3, 4, 2, 1, 2, 1, 3, 3, 1, 2, 0, 3, 1],
+    [3, 3, 2, 4, 2, 1, 1, 1, 1, 2, 2, 2, 0, 2],
+    [2, 2, 1, 2, 4, 2, 1, 2, 2, 1, 0, 2, 1, 1],
+    [2, 2, 2, 1, 2, 4, 0, 2, 2, 1, 3, 3, 2, 1],
+    [2, 2, 1, 1, 1, 0, 4, 2, 2, 2, 2, 2, 1, 2],
+    [1, 2, 3, 1, 2, 2, 2, 4, 3, 0, 3, 2, 2, 1],
+    [0, 3, 3, 1, 2, 2, 2, 3, 4, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 1, 1, 2, 0, 1, 4, 1, 1, 2, 1],
+    [3, 2, 2, 2, 0, 3, 2, 3, 2, 1, 4, 2, 2, 1],
+    [3, 3, 0, 2, 2, 3, 2, 2, 2, 1, 2, 4, 3, 2],
+    [2, 2, 3, 0, 1, 2, 1, 2, 2, 2, 2, 3, 4, 2],
+    [1, 0, 1, 2, 1, 1, 2, 1, 1, 1, 1, 2, 2, 4],
+], dtype=float)
+
+# Gana per nakshatra: 0 deva, 1 manushya, 2 rakshasa
+NAKSHATRA_GANA = (
+    0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2,
+    0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0
+)
+# Groom gana (row) against bride gana (column)
+GANA_POINTS = np.array([
+    [6.0, 6.0, 0.0],
+    [5.0, 6.0, 0.0],
+    [1.0, 0.0, 6.0],
+])
+
+# Nadi per nakshatra repeats adi, madhya, antya, antya, madhya, adi
+NADI_CYCLE = (0, 1, 2, 2, 1, 0)
+
+# Bhakoot: sign distances (counted from one Moon to the other) that score 0
+BHAKOOT_DOSHA_DISTANCES = (2, 12, 5, 9, 6, 8)
+
+# Graha maitri points by (relationship of groom lord to bride lord, and back);
+# 0 enemy, 1 neutral, 2 friend (the same lord counts as friends both ways)
+MAITRI_POINTS = np.array([
+    [0.0, 0.5, 1.0],
+    [0.5, 3.0, 4.0],
+    [1.0, 4.0, 5.0],
+])
+
+
+def longitude_to_pada(longitude) -> np.ndarray:
+    """Pada index 0-107 of sidereal Moon longitudes"""
+    return (np.asarray(longitude, dtype=np.float64) % 360 // PADA_SPAN).astype(np.intp)
+
+
+def nakshatra_pada_to_pada(nakshatra, pada) -> np.ndarray:
+    """Pada index 0-107 from nakshatra numbers 1-27 and padas 1-4"""
+    return (np.asarray(nakshatra, dtype=np.intp) - 1) * 4 + np.asarray(pada, dtype=np.intp) - 1
+
+
+def _relationship(planet: Planet, other: Planet) -> int:
+    """Natural relationship of planet towards other: 0 enemy, 1 neutral, 2 friend"""
+    if planet == other or other in VedicAstrologyHelper.NATURAL_FRIENDS[planet]:
+        return 2
+    if other in VedicAstrologyHelper.NATURAL_ENEMIES[planet]:
+        return 0
+    return 1
+
+
+def _koota_tables() -> np.ndarray:
+    """(108, 108, 8) points of every koota for every (groom pada, bride pada)"""
+    padas = np.arange(PADAS)
+    nakshatras = padas // 4
+    signs = padas // 9
+    halves = (padas % 9 * PADA_SPAN >= 15.0).astype(np.intp)
+    groom, bride = np.meshgrid(padas, padas, indexing="ij")
+    g_nak, b_nak = nakshatras[groom], nakshatras[bride]
+    g_sign, b_sign = signs[groom], signs[bride]
+
+    varna = np.array(SIGN_VARNA)
+    vashya = np.array(SIGN_VASHYA)[signs, halves]
+    yoni = np.array(NAKSHATRA_YONI)
+    gana = np.array(NAKSHATRA_GANA)
+    nadi = np.array(NADI_CYCLE)[np.arange(27) % 6]
+    lords = [VedicAstrologyHelper.SIGN_LORDS[Zodiac(sign + 1)] for sign in range(12)]
+    maitri = np.array([
+        [MAITRI_POINTS[_relationship(lords[g], lords[b]), _relationship(lords[b], lords[g])]
+         for b in range(12)]
+        for g in range(12)
+    ])
+
+    # Tara: count 1-27 from one nakshatra to the other; remainders 3, 5, 7 (mod 9) are inauspicious
+    def tara(start, end):
+        return np.where(np.isin((end - start) % 27 % 9 + 1, (3, 5, 7)), 0.0, 1.5)
+
+    points = np.empty((PADAS, PADAS, len(KOOTAS)))
+    points[..., 0] = varna[g_sign] >= varna[b_sign]
+    points[..., 1] = VASHYA_POINTS[vashya[groom], vashya[bride]]
+    points[..., 2] = tara(b_nak, g_nak) + tara(g_nak, b_nak)
+    points[..., 3] = YONI_POINTS[yoni[g_nak], yoni[b_nak]]
+    points[..., 4] = maitri[g_sign, b_sign]
+    points[..., 5] = GANA_POINTS[gana[g_nak], gana[b_nak]]
+    points[..., 6] = np.where(np.isin((g_sign - b_sign) % 12 + 1, BHAKOOT_DOSHA_DISTANCES), 0.0, 7.0)
+    points[..., 7] = np.where(nadi[g_nak] == nadi[b_nak], 0.0, 8.0)
+    return points
+
+
+@dataclass
+class MatchResult:
+    """Best candidates for one profile, best first"""
+    profile_pada: int
+    role: str                            # Role of the profile ("groom" or "bride")
+    indices: np.ndarray                  # Candidate positions in the input columns
+    total: np.ndarray                    # float32 points out of 36
+    doshas: np.ndarray                   # uint8 DOSHAS bit flags
+    considered: int                      # Candidates scored
+    eligible: int                        # Candidates passing min_score and the dosha filter
+
+
+class AshtakootaCalculator:
+    """Vectorized Ashtakoota matching over columnar candidate Moons"""
+
+    def __init__(self):
+        """Initialize Ashtakoota Calculator (builds the 108 x 108 tables; no ephemeris)"""
+        points = _koota_tables()
+        self.points = points.astype(np.float32)
+        # Indexed [groom pada, bride pada]; the transposed copies make the
+        # bride's row contiguous too
+        self.total = np.ascontiguousarray(points.sum(axis=2), dtype=np.float32)
+        doshas = np.zeros((PADAS, PADAS), dtype=np.uint8)
+        doshas[points[..., KOOTAS.index("nadi")] == 0] |= DOSHAS["nadi"]
+        doshas[points[..., KOOTAS.index("bhakoot")] == 0] |= DOSHAS["bhakoot"]
+        doshas[points[..., KOOTAS.index("gana")] == 0] |= DOSHAS["gana"]
+        self.doshas = doshas
+        self._total_by_bride = np.ascontiguousarray(self.total.T)
+        self._doshas_by_bride = np.ascontiguousarray(doshas.T)
+
+    def score(self, pada: int, role: str, candidate_padas: np.ndarray):
+        """
+        Total points and dosha flags of one profile against every candidate
+
+        Args:
+            pada: Profile Moon pada (0-107)
+            role: "groom" or "bride" (candidates take the other role)
+            candidate_padas: Candidate Moon padas (0-107)
+
+        Returns:
+            Tuple of (float32 totals, uint8 dosha flags), one per candidate
+        """
+        if role == "groom":
+            return self.total[pada][candidate_padas], self.doshas[pada][candidate_padas]
+        return self._total_by_bride[pada][candidate_padas], self._doshas_by_bride[pada][candidate_padas]
+
+    def top_k(self, pada: int, role: str, candidate_padas: np.ndarray, k: int,
+              min_score: float = 0.0, exclude_doshas: int = 0) -> MatchResult:
+        """
+        Best k candidates for one profile
+
+        Ties keep input order, so results are deterministic.
+
+        Args:
+            pada: Profile Moon pada (0-107)
+            role: "groom" or "bride"
+            candidate_padas: Candidate Moon padas (0-107)
+            k: Number of candidates to return
+            min_score: Lowest total points accepted
+            exclude_doshas: DOSHAS bits; candidates with any of them are dropped
+
+        Returns:
+            MatchResult
+        """
+        candidate_padas = np.asarray(candidate_padas, dtype=np.intp)
+        total, doshas = self.score(pada, role, candidate_padas)
+        eligible = total >= min_score
+        if exclude_doshas:
+            eligible &= (doshas & exclude_doshas) == 0
+        indices = np.flatnonzero(eligible)
+
+        if len(indices) > k:
+            # Everything scoring at least the kth best, then an exact ordered cut
+            threshold = np.partition(total[indices], len(indices) - k)[len(indices) - k]
+            indices = indices[total[indices] >= threshold]
+        order = np.lexsort((indices, -total[indices]))[:k]
+        indices = indices[order]
+
+        return MatchResult(
+            profile_pada=pada,
+            role=role,
+            indices=indices,
+            total=total[indices],
+            doshas=doshas[indices],
+            considered=len(candidate_padas),
+            eligible=int(eligible.sum())
+        )
+
+    def breakdown(self, groom_pada: int, bride_pada: int) -> Dict[str, float]:
+        """Points of each koota for one couple"""
+        return {koota: float(value) for koota, value in zip(KOOTAS, self.points[groom_pada, bride_pada])}
+
+
+def dosha_names(flags: int) -> List[str]:
+    """Names of the doshas set in a DOSHAS bit mask"""
+    return [name for name, bit in DOSHAS.items() if flags & bit]
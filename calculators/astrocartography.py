@@ -0,0 +1,174 @@
+"""
+Astrocartography Calculator
+Lagna, midheaven and whole-sign houses of one instant over many locations,
+plus the lines where each graha is on an angle
+
+Everything location independent comes from one SkySnapshot (ayanamsa, true
+obliquity, sidereal time and graha positions), so a grid or a city list is a
+single vectorized pass over utils.ascendant.ascendant_midheaven:
+    lagna / MC  - sidereal ascendant and midheaven of every location
+    houses      - whole-sign house of each graha counted from each lagna
+    lines       - in mundo angle lines: MC/IC where the local sidereal time
+                  equals the graha's right ascension (a meridian), ASC/DSC
+                  where it rises or sets, hour angle -/+ acos(-tan lat tan dec),
+                  sampled every line_step degrees of latitude where defined
+"""
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from models.astrology_models import Planet
+from services.sky_snapshot import SkySnapshot, SKY_PLANETS
+from utils.ascendant import ascendant_midheaven
+
+
+# Most locations evaluated in one request (a 1 x 1 degree world grid is 64800)
+MAX_LOCATIONS = int(os.environ.get("ASTROCARTOGRAPHY_MAX_LOCATIONS", "200000"))
+# Angle lines stop short of the poles, where they crowd into the meridians
+LINE_MAX_LATITUDE = float(os.environ.get("ASTROCARTOGRAPHY_LINE_MAX_LATITUDE", "85"))
+
+# Default grid: the whole world at 1 degree, poles excluded (no horizon there)
+WORLD_GRID = {"lat_min": -89.0, "lat_max": 89.0, "lon_min": -180.0, "lon_max": 179.0, "step": 1.0}
+
+
+@dataclass
+class Locations:
+    """Flat latitude/longitude columns and the shape they are reported in"""
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    shape: Tuple[int, ...]               # (latitudes, longitudes) of a grid, (n,) of a list
+    grid_latitudes: Optional[np.ndarray] = None     # Grid axes (None for a list)
+    grid_longitudes: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    @classmethod
+    def grid(cls, lat_min: float, lat_max: float, lon_min: float, lon_max: float, step: float) -> "Locations":
+        """Regular grid, both ranges inclusive, latitude rows by longitude columns"""
+        lat_axis = lat_min + step * np.arange(int(np.floor((lat_max - lat_min) / step + 1e-9)) + 1)
+        lon_axis = lon_min + step * np.arange(int(np.floor((lon_max - lon_min) / step + 1e-9)) + 1)
+        latitudes, longitudes = np.meshgrid(lat_axis, lon_axis, indexing="ij")
+        return cls(latitudes.ravel(), longitudes.ravel(), latitudes.shape, lat_axis, lon_axis)
+
+    @classmethod
+    def points(cls, latitudes: Sequence[float], longitudes: Sequence[float]) -> "Locations":
+        """Arbitrary locations (e.g. a city list)"""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        return cls(latitudes, np.asarray(longitudes, dtype=np.float64), latitudes.shape)
+
+
+@dataclass
+class AngleLine:
+    """Locations where a graha is on one angle"""
+    planet: Planet
+    angle: str                           # asc, dsc, mc or ic
+    latitudes: np.ndarray
+    longitudes: np.ndarray               # East positive, in [-180, 180)
+
+
+@dataclass
+class Astrocartography:
+    """Angles and houses of one instant over a set of locations (arrays in Locations order)"""
+    planets: List[Planet]
+    right_ascension: np.ndarray          # Per graha, degrees
+    declination: np.ndarray
+    ascendant: np.ndarray                # Sidereal lagna per location
+    midheaven: np.ndarray                # Sidereal MC per location
+    lagna_sign: np.ndarray               # 0-11 per location
+    houses: np.ndarray                   # (locations x planets) whole-sign houses 1-12
+    lines: List[AngleLine]
+
+
+def _wrap_longitude(longitude):
+    """Geographic longitude in [-180, 180)"""
+    return (np.asarray(longitude) + 180.0) % 360 - 180.0
+
+
+class AstrocartographyCalculator:
+    """Vectorized location grids and angle lines from one sky state (no ephemeris reads)"""
+
+    def __init__(self, planets: Sequence[Planet] = SKY_PLANETS):
+        """
+        Initialize Astrocartography Calculator
+
+        Args:
+            planets: Grahas evaluated by default
+        """
+        self.planets = list(planets)
+
+    def calculate(self, sky: SkySnapshot, locations: Locations, planets: Sequence[Planet] = None,
+                  line_step: float = 1.0, with_lines: bool = True) -> Astrocartography:
+        """
+        Angles, lagna signs and houses of every location, plus the angle lines
+
+        Args:
+            sky: Sky state of the instant (SkySnapshotService.compute or current)
+            locations: Locations to evaluate
+            planets: Grahas for houses and lines (default all nine)
+            line_step: Latitude step of the ASC/DSC lines in degrees
+            with_lines: False skips the angle lines
+
+        Returns:
+            Astrocartography
+        """
+        planets = list(planets) if planets else self.planets
+        longitudes = np.array([sky.planet(planet).longitude for planet in planets])
+        right_ascension, declination = self.equatorial(sky, planets)
+
+        armc = (sky.sidereal_time * 15.0 + locations.longitudes) % 360
+        ascendant, midheaven = ascendant_midheaven(armc, sky.obliquity, locations.latitudes)
+        ascendant = (ascendant - sky.ayanamsa) % 360
+        midheaven = (midheaven - sky.ayanamsa) % 360
+        lagna_sign = (ascendant // 30).astype(np.int8)
+        planet_signs = (longitudes // 30).astype(np.int8)
+        houses = ((planet_signs[None, :] - lagna_sign[:, None]) % 12 + 1).astype(np.int8)
+
+        return Astrocartography(
+            planets=planets,
+            right_ascension=right_ascension,
+            declination=declination,
+            ascendant=ascendant,
+            midheaven=midheaven,
+            lagna_sign=lagna_sign,
+            houses=houses,
+            lines=self.lines(sky, planets, right_ascension, declination, line_step) if with_lines else []
+        )
+
+    @staticmethod
+    def equatorial(sky: SkySnapshot, planets: Sequence[Planet]) -> Tuple[np.ndarray, np.ndarray]:
+        """Right ascension and declination of grahas from their tropical ecliptic positions"""
+        coordinates = [
+            swe.cotrans(((sky.planet(planet).longitude + sky.ayanamsa) % 360, sky.planet(planet).latitude, 1.0),
+                        -sky.obliquity)
+            for planet in planets
+        ]
+        return (np.array([position[0] for position in coordinates]),
+                np.array([position[1] for position in coordinates]))
+
+    @staticmethod
+    def lines(sky: SkySnapshot, planets: Sequence[Planet], right_ascension: np.ndarray,
+              declination: np.ndarray, line_step: float,
+              max_latitude: float = LINE_MAX_LATITUDE) -> List[AngleLine]:
+        """ASC, DSC, MC and IC lines of each graha"""
+        sidereal_degrees = sky.sidereal_time * 15.0
+        count = int(np.floor(2 * max_latitude / line_step + 1e-9)) + 1
+        latitudes = -max_latitude + line_step * np.arange(count)
+        tan_latitudes = np.tan(np.radians(latitudes))
+        meridian_latitudes = np.array([-max_latitude, max_latitude])
+
+        lines = []
+        for planet, ra, dec in zip(planets, right_ascension.tolist(), declination.tolist()):
+            meridian = float(_wrap_longitude(ra - sidereal_degrees))
+            lines.append(AngleLine(planet, "mc", meridian_latitudes, np.full(2, meridian)))
+            lines.append(AngleLine(planet, "ic", meridian_latitudes, np.full(2, float(_wrap_longitude(meridian + 180.0)))))
+
+            cos_hour_angle = -tan_latitudes * np.tan(np.radians(dec))
+            defined = np.abs(cos_hour_angle) <= 1.0
+            hour_angle = np.degrees(np.arccos(cos_hour_angle[defined]))
+            lines.append(AngleLine(planet, "asc", latitudes[defined], _wrap_longitude(meridian - hour_angle)))
+            lines.append(AngleLine(planet, "dsc", latitudes[defined], _wrap_longitude(meridian + hour_angle)))
+        return lines
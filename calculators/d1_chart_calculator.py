@@ -2,15 +2,18 @@
 D1 Chart Calculator
 Main engine for calculating Rashi (D1) chart with all astronomical data
 """
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import math
 
 from models.astrology_models import (
     UserDetails, D1Chart, PlanetPosition, HouseData, NakshatraDetails,
-    SunMoonShine, Planet, Zodiac, Nakshatra
+    SunMoonShine, Planet, Zodiac, Nakshatra, HouseSystem, EphemerisMode
 )
-from services.swiss_ephemeris_service import SwissEphemerisService
+from services.swiss_ephemeris_service import SwissEphemerisService, NAKSHATRA_BY_NAME
+from services.rise_set_service import RiseSetService
+from utils.time_utils import civil_to_julian_days, julian_day_to_local_datetime
 from utils.vedic_helper import VedicAstrologyHelper
 
 
@@ -25,6 +28,7 @@ class D1ChartCalculator:
             ephe_path: Path to Swiss Ephemeris data files
         """
         self.ephemeris_service = SwissEphemerisService(ephe_path)
+        self.rise_set_service = RiseSetService(ephemeris_service=self.ephemeris_service)
         self.vedic_helper = VedicAstrologyHelper()
         
         # Zodiac sign rulers
@@ -46,8 +50,58 @@ class D1ChartCalculator:
         )
         
         # Calculate Ayanamsa
-        ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day)
+        ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day, user_details.ayanamsa)
         
+        # Calculate all planet positions
+        planets, ephemeris = self._calculate_planet_positions(julian_day, ayanamsa, user_details.ephemeris)
+        
+        return self._assemble_chart(user_details, julian_day, ayanamsa, planets, ephemeris)
+    
+    def calculate_d1_charts(self, user_details_list: List[UserDetails]) -> List[D1Chart]:
+        """
+        Calculate several D1 charts in one pass
+        
+        Birth times are converted in one vectorized pass. The
+        location-independent sky state (ayanamsa and planet positions) is
+        computed once per distinct instant, ayanamsa and ephemeris and shared
+        by every record with all three; each chart still gets its own
+        PlanetPosition objects.
+        
+        Args:
+            user_details_list: Birth details, one per chart
+            
+        Returns:
+            D1Chart objects in input order
+        """
+        if not user_details_list:
+            return []
+        _, julian_days = civil_to_julian_days(
+            [user_details.datetime for user_details in user_details_list],
+            [user_details.timezone for user_details in user_details_list]
+        )
+        sky_states = {}
+        charts = []
+        for user_details, julian_day in zip(user_details_list, julian_days.tolist()):
+            key = (julian_day, user_details.ayanamsa, user_details.ephemeris)
+            if key not in sky_states:
+                ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day, user_details.ayanamsa)
+                sky_states[key] = (ayanamsa, *self._calculate_planet_positions(
+                    julian_day, ayanamsa, user_details.ephemeris
+                ))
+            ayanamsa, positions, ephemeris = sky_states[key]
+            planets = [replace(position) for position in positions]
+            charts.append(self._assemble_chart(user_details, julian_day, ayanamsa, planets, ephemeris))
+        return charts
+    
+    def shares_sky_state(self, first: UserDetails, second: UserDetails) -> bool:
+        """Whether two birth records are the same instant, ayanamsa and ephemeris (and share their sky state)"""
+        convert = self.ephemeris_service.convert_to_julian_day
+        return (first.ayanamsa == second.ayanamsa and first.ephemeris == second.ephemeris
+                and convert(first.datetime, first.timezone) == convert(second.datetime, second.timezone))
+    
+    def _assemble_chart(self, user_details: UserDetails, julian_day: float, ayanamsa: float,
+                        planets: List[PlanetPosition], ephemeris: str) -> D1Chart:
+        """Build the location-dependent parts of a chart around its planet positions"""
         # Calculate Ascendant
         ascendant_longitude = self.ephemeris_service.calculate_ascendant(
             julian_day, user_details.latitude, user_details.longitude
@@ -59,9 +113,6 @@ class D1ChartCalculator:
         # Create Lagna position
         lagna = self._create_lagna_position(sidereal_ascendant)
         
-        # Calculate all planet positions
-        planets = self._calculate_planet_positions(julian_day, ayanamsa)
-        
         # Calculate houses
         houses = self._calculate_houses(julian_day, user_details, ayanamsa, planets)
         
@@ -76,7 +127,8 @@ class D1ChartCalculator:
         
         # Calculate sun/moon shine
         sun_moon_shine = self._calculate_sun_moon_shine(
-            julian_day, user_details.latitude, user_details.longitude, planets
+            julian_day, user_details.latitude, user_details.longitude, user_details.timezone, planets,
+            user_details.ephemeris
         )
         
         return D1Chart(
@@ -87,7 +139,8 @@ class D1ChartCalculator:
             nakshatra_details=nakshatra_details,
             sun_moon_shine=sun_moon_shine,
             ayanamsa=ayanamsa,
-            calculation_time=datetime.now(timezone.utc).isoformat()
+            calculation_time=datetime.now(timezone.utc).isoformat(),
+            ephemeris=ephemeris
         )
     
     def _create_lagna_position(self, longitude: float) -> PlanetPosition:
@@ -110,17 +163,20 @@ class D1ChartCalculator:
             retrograde=False
         )
     
-    def _calculate_planet_positions(self, julian_day: float, ayanamsa: float) -> List[PlanetPosition]:
-        """Calculate positions for all planets"""
+    def _calculate_planet_positions(self, julian_day: float, ayanamsa: float,
+                                    ephemeris: str = None) -> Tuple[List[PlanetPosition], str]:
+        """Calculate positions for all planets, with the ephemeris that served them"""
         planets = []
+        served = set()
         
         for planet in [Planet.SUN, Planet.MOON, Planet.MERCURY, Planet.VENUS,
                       Planet.MARS, Planet.JUPITER, Planet.SATURN, Planet.RAHU, Planet.KETU]:
             
             # Get tropical position
-            longitude, latitude, distance, speed = self.ephemeris_service.get_planet_position(
-                planet, julian_day
+            (longitude, latitude, distance, speed), source = self.ephemeris_service.calculate_planet(
+                planet, julian_day, ephemeris
             )
+            served.add(source)
             
             # Convert to sidereal
             sidereal_longitude = (longitude - ayanamsa) % 360
@@ -146,11 +202,16 @@ class D1ChartCalculator:
             
             planets.append(planet_pos)
         
-        return planets
+        # A single position served by Moshier (e.g. a missing .se1 file) marks the chart
+        if EphemerisMode.MOSHIER.value in served:
+            return planets, EphemerisMode.MOSHIER.value
+        return planets, EphemerisMode.SWISS.value
     
     def _calculate_houses(self, julian_day: float, user_details: UserDetails, 
                          ayanamsa: float, planets: List[PlanetPosition]) -> List[HouseData]:
-        """Calculate house cusps and determine planets in each house using Whole Sign houses"""
+        """Calculate house cusps and determine planets in each house (Whole Sign unless requested otherwise)"""
+        if user_details.house_system != HouseSystem.WHOLE_SIGN.value:
+            return self._calculate_cusp_houses(julian_day, user_details, ayanamsa, planets)
         
         # Get ascendant to determine house 1 sign (Whole Sign system)
         ascendant_longitude = self.ephemeris_service.calculate_ascendant(
@@ -188,6 +249,30 @@ class D1ChartCalculator:
         
         return houses
     
+    def _calculate_cusp_houses(self, julian_day: float, user_details: UserDetails,
+                               ayanamsa: float, planets: List[PlanetPosition]) -> List[HouseData]:
+        """Houses of a cusp-based system (Placidus, Sripati, equal, ...) with sidereal cusps"""
+        
+        house_cusps = self.ephemeris_service.calculate_houses(
+            julian_day, user_details.latitude, user_details.longitude, user_details.house_system
+        )
+        
+        houses = []
+        
+        for i in range(12):
+            cusp_longitude = (house_cusps[i] - ayanamsa) % 360
+            sign = self.ephemeris_service.longitude_to_zodiac_sign(cusp_longitude)
+            
+            houses.append(HouseData(
+                house_number=i + 1,
+                cusp_longitude=cusp_longitude,
+                sign=sign,
+                ruler_planet=self.sign_rulers[sign],
+                planets_in_house=self._find_planets_in_house(i + 1, house_cusps, ayanamsa, planets)
+            ))
+        
+        return houses
+    
     def _find_planets_in_house_whole_sign(self, house_sign_num: int,
                                           planets: List[PlanetPosition]) -> List[Planet]:
         """Find which planets are in a house using Whole Sign system"""
@@ -209,7 +294,7 @@ class D1ChartCalculator:
     
     def _find_planets_in_house(self, house_number: int, house_cusps: List[float],
                               ayanamsa: float, planets: List[PlanetPosition]) -> List[Planet]:
-        """Find which planets are positioned in a specific house (DEPRECATED - kept for compatibility)"""
+        """Find which planets lie between a house's cusp and the next one (tropical cusps)"""
         
         planets_in_house = []
         
@@ -249,14 +334,21 @@ class D1ChartCalculator:
         
         return nakshatra_details
     
-    def _calculate_sun_moon_shine(self, julian_day: float, latitude: float,
-                                 longitude: float, planets: List[PlanetPosition]) -> SunMoonShine:
+    def _calculate_sun_moon_shine(self, julian_day: float, latitude: float, longitude: float,
+                                 timezone_offset: float, planets: List[PlanetPosition],
+                                 ephemeris: str = None) -> SunMoonShine:
         """Calculate sun and moon shine data"""
         
-        # Get sunrise/sunset times
-        sun_times = self.ephemeris_service.calculate_sunrise_sunset(
-            julian_day, latitude, longitude
+        # Rise and set times on the local birth date (shared, cached service)
+        sun_times = self.rise_set_service.times_at(
+            Planet.SUN, julian_day, latitude, longitude, timezone_offset, ephemeris=ephemeris
+        )
+        moon_times = self.rise_set_service.times_at(
+            Planet.MOON, julian_day, latitude, longitude, timezone_offset, ephemeris=ephemeris
         )
+
+        def local_time(event_jd):
+            return julian_day_to_local_datetime(event_jd, timezone_offset) if event_jd is not None else ""
         
         # Find Sun and Moon positions
         sun_pos = next(p for p in planets if p.planet == Planet.SUN)
@@ -291,10 +383,10 @@ class D1ChartCalculator:
         tithi = int((moon_pos.longitude - sun_pos.longitude) % 360 / 12) + 1
         
         return SunMoonShine(
-            sunrise_time=sun_times["sunrise"],
-            sunset_time=sun_times["sunset"],
-            moonrise_time="",  # Would need additional calculation
-            moonset_time="",   # Would need additional calculation
+            sunrise_time=local_time(sun_times.rise_jd),
+            sunset_time=local_time(sun_times.set_jd),
+            moonrise_time=local_time(moon_times.rise_jd),
+            moonset_time=local_time(moon_times.set_jd),
             sun_strength=sun_strength,
             moon_strength=moon_strength,
             moon_phase=moon_phase,
@@ -302,7 +394,9 @@ class D1ChartCalculator:
             sun_sign=sun_sign_name,
             sun_sign_sanskrit=sun_sign_sanskrit,
             moon_sign=moon_sign_name,
-            moon_sign_sanskrit=moon_sign_sanskrit
+            moon_sign_sanskrit=moon_sign_sanskrit,
+            polar_day=sun_times.always_up,
+            polar_night=sun_times.always_down
         )
     
     def _calculate_planet_strength(self, planet_pos: PlanetPosition) -> float:
@@ -341,7 +435,7 @@ class D1ChartCalculator:
                     break
             
             # Get nakshatra lord from ephemeris service
-            nak_data = next((n for n in self.ephemeris_service.nakshatras if n["name"] == planet_pos.nakshatra), None)
+            nak_data = NAKSHATRA_BY_NAME.get(planet_pos.nakshatra)
             nakshatra_lord = nak_data["ruler"] if nak_data else None
             # Compute KP sub-lord based on absolute longitude
             sub_lord = None
@@ -11,7 +11,7 @@ from models.astrology_models import (
     UserDetails, D1Chart, PlanetPosition, HouseData, NakshatraDetails,
     SunMoonShine, Planet, Zodiac, Nakshatra
 )
-from services.swiss_ephemeris_service import SwissEphemerisService
+from services.swiss_ephemeris_service import SwissEphemerisService, NAKSHATRA_BY_NAME
 from utils.vedic_helper import VedicAstrologyHelper
 from calculators.d1_chart_calculator import D1ChartCalculator
 
@@ -19,16 +19,17 @@ from calculators.d1_chart_calculator import D1ChartCalculator
 class D9ChartCalculator:
     """Calculator for D9 Navamsha chart"""
     
-    def __init__(self, ephe_path: str = "./ephe"):
+    def __init__(self, ephe_path: str = "./ephe", d1_calculator: D1ChartCalculator = None):
         """
         Initialize D9 Chart Calculator
         
         Args:
             ephe_path: Path to Swiss Ephemeris data files
+            d1_calculator: Optional D1 calculator to share (and its ephemeris service)
         """
-        self.ephemeris_service = SwissEphemerisService(ephe_path)
+        self.d1_calculator = d1_calculator or D1ChartCalculator(ephe_path)
+        self.ephemeris_service = self.d1_calculator.ephemeris_service
         self.vedic_helper = VedicAstrologyHelper()
-        self.d1_calculator = D1ChartCalculator(ephe_path)
         self.sign_rulers = VedicAstrologyHelper.SIGN_LORDS
     
     def calculate_d9_chart(self, user_details: UserDetails, d1_chart: D1Chart = None) -> Dict:
@@ -199,7 +200,7 @@ class D9ChartCalculator:
         """
         for planet in planets:
             # Set nakshatra lord from nakshatras list
-            nak_entry = next((n for n in self.ephemeris_service.nakshatras if n["name"] == planet.nakshatra), None)
+            nak_entry = NAKSHATRA_BY_NAME.get(planet.nakshatra)
             if nak_entry:
                 planet.nakshatra_lord = nak_entry["ruler"]
             
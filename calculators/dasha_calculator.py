@@ -0,0 +1,194 @@
+"""
+Vimshottari Dasha Calculator
+Maha, Antar, Pratyantar, Sookshma and Prana periods from the natal Moon
+
+The full five-level tree holds 9^5 = 59,049 periods, so it is never built:
+only the nine mahadashas are stored and every deeper level is expanded on
+demand, one parent at a time, while walking a date window.
+"""
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from models.astrology_models import UserDetails, Planet, DashaLevel, DashaPeriod
+from services.swiss_ephemeris_service import SwissEphemerisService, DEFAULT_AYANAMSA
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+# Days per dasha year (Julian year)
+DASHA_YEAR_DAYS = 365.25
+CYCLE_YEARS = sum(VedicAstrologyHelper.VIMSHOTTARI_LENGTHS.values())  # 120
+NAKSHATRA_SPAN = 360.0 / 27
+
+
+class VimshottariDasha:
+    """Lazily expanded Vimshottari dasha tree for one natal Moon"""
+
+    def __init__(self, birth_jd: float, moon_longitude: float, year_days: float = DASHA_YEAR_DAYS):
+        """
+        Args:
+            birth_jd: Julian Day (UT) of birth
+            moon_longitude: Sidereal longitude of the natal Moon
+            year_days: Days per dasha year
+        """
+        order = VedicAstrologyHelper.VIMSHOTTARI_ORDER
+        lengths = VedicAstrologyHelper.VIMSHOTTARI_LENGTHS
+
+        self.birth_jd = birth_jd
+        self.moon_longitude = moon_longitude % 360
+        self.year_days = year_days
+
+        nakshatra_index = int(self.moon_longitude // NAKSHATRA_SPAN) % 27
+        elapsed = (self.moon_longitude % NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+        self.nakshatra_lord = order[nakshatra_index % 9]
+        self.balance_years = lengths[self.nakshatra_lord] * (1 - elapsed)
+        self.cycle_start_jd = birth_jd - lengths[self.nakshatra_lord] * elapsed * year_days
+        self.cycle_end_jd = self.cycle_start_jd + CYCLE_YEARS * year_days
+        self._mahadashas = self._split(None, self.cycle_start_jd, self.cycle_end_jd, self.nakshatra_lord)
+
+    def _split(self, parent: Optional[DashaPeriod], start_jd: float, end_jd: float,
+               first_lord: Planet) -> List[DashaPeriod]:
+        """Divide [start_jd, end_jd) into nine periods starting with first_lord"""
+        order = VedicAstrologyHelper.VIMSHOTTARI_ORDER
+        lengths = VedicAstrologyHelper.VIMSHOTTARI_LENGTHS
+        offset = order.index(first_lord)
+        level = DashaLevel(parent.level.value + 1) if parent else DashaLevel.MAHA
+        lords = parent.lords if parent else []
+        path = parent.path if parent else ()
+
+        periods = []
+        span = end_jd - start_jd
+        cursor = start_jd
+        for i in range(9):
+            lord = order[(offset + i) % 9]
+            # Close the last period on the parent boundary so no rounding drift accumulates
+            period_end = end_jd if i == 8 else cursor + span * lengths[lord] / CYCLE_YEARS
+            periods.append(DashaPeriod(
+                level=level,
+                lords=lords + [lord],
+                path=path + (i,),
+                start_jd=cursor,
+                end_jd=period_end
+            ))
+            cursor = period_end
+        return periods
+
+    def mahadashas(self) -> List[DashaPeriod]:
+        """The nine mahadashas of the 120-year cycle running through birth"""
+        return list(self._mahadashas)
+
+    def sub_periods(self, period: DashaPeriod) -> List[DashaPeriod]:
+        """
+        Expand one period into its nine sub-periods
+
+        Raises:
+            ValueError: If the period is already at the Prana level
+        """
+        if period.level == DashaLevel.PRANA:
+            raise ValueError("Prana is the deepest dasha level")
+        return self._split(period, period.start_jd, period.end_jd, period.lord)
+
+    def period_by_path(self, path: Sequence[int]) -> DashaPeriod:
+        """
+        Locate a period from its index path (e.g. (6, 7) = 7th antar of 6th maha)
+
+        Raises:
+            ValueError: If the path is empty, too deep or out of range
+        """
+        if not 1 <= len(path) <= len(DashaLevel) or any(not 0 <= i <= 8 for i in path):
+            raise ValueError(f"Invalid dasha path: {path}")
+        period = self._mahadashas[path[0]]
+        for index in path[1:]:
+            period = self.sub_periods(period)[index]
+        return period
+
+    def period_at(self, julian_day: float, level: DashaLevel = DashaLevel.PRANA) -> List[DashaPeriod]:
+        """
+        Running periods at one instant, from the mahadasha down to the given level
+
+        Returns:
+            One period per level, or an empty list outside the 120-year cycle
+        """
+        chain = []
+        periods = self._mahadashas
+        for depth in range(level.value):
+            period = next((p for p in periods if p.start_jd <= julian_day < p.end_jd), None)
+            if period is None:
+                return []
+            chain.append(period)
+            if depth + 1 < level.value:
+                periods = self.sub_periods(period)
+        return chain
+
+    def periods(self, level: DashaLevel, start_jd: Optional[float] = None, end_jd: Optional[float] = None,
+                after: Optional[Tuple[int, ...]] = None) -> Iterator[DashaPeriod]:
+        """
+        Periods of one level overlapping a window, in chronological order
+
+        Only parents overlapping the window (and following the cursor) are
+        expanded, so taking the first few items is cheap at any depth.
+
+        Args:
+            level: Level of the periods to yield
+            start_jd: Window start (Julian Day, UT); None for the cycle start
+            end_jd: Window end (Julian Day, UT); None for the cycle end
+            after: Path of the last period already returned (pagination cursor)
+
+        Yields:
+            DashaPeriod objects
+        """
+        yield from self._walk(self._mahadashas, level.value, start_jd, end_jd, after)
+
+    def _walk(self, periods: List[DashaPeriod], depth: int, start_jd: Optional[float],
+              end_jd: Optional[float], after: Optional[Tuple[int, ...]]) -> Iterator[DashaPeriod]:
+        for period in periods:
+            if start_jd is not None and period.end_jd <= start_jd:
+                continue
+            if end_jd is not None and period.start_jd >= end_jd:
+                break
+            if after is not None:
+                # Chronological order is the lexicographic order of paths
+                prefix = after[:len(period.path)]
+                if period.path < prefix or (len(period.path) == depth and period.path == prefix):
+                    continue
+            if len(period.path) == depth:
+                yield period
+            else:
+                yield from self._walk(self.sub_periods(period), depth, start_jd, end_jd, after)
+
+
+class DashaCalculator:
+    """Builds Vimshottari dasha trees from birth details"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None):
+        """
+        Initialize Dasha Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+
+    def natal_moon_longitude(self, julian_day: float, ayanamsa: str = DEFAULT_AYANAMSA,
+                             ephemeris: str = None) -> float:
+        """Sidereal longitude of the Moon (same reduction as the D1 chart)"""
+        ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day, ayanamsa)
+        tropical_longitude = self.ephemeris_service.get_planet_position(Planet.MOON, julian_day, ephemeris)[0]
+        return (tropical_longitude - ayanamsa) % 360
+
+    def calculate_dasha(self, user_details: UserDetails) -> VimshottariDasha:
+        """
+        Calculate the dasha tree for one birth record
+
+        Args:
+            user_details: User birth details
+
+        Returns:
+            VimshottariDasha whose levels are expanded on demand
+        """
+        julian_day = self.ephemeris_service.convert_to_julian_day(
+            user_details.datetime, user_details.timezone
+        )
+        return VimshottariDasha(julian_day, self.natal_moon_longitude(
+            julian_day, user_details.ayanamsa, user_details.ephemeris
+        ))
@@ -0,0 +1,193 @@
+"""
+Hora Calculator
+Planetary horas and choghadiya segments of a sunrise-to-sunrise day
+
+A day runs from sunrise to the next sunrise. Daytime (sunrise to sunset) and
+night (sunset to the next sunrise) are each split into 12 equal horas and 8
+equal choghadiyas. Lords follow the Chaldean order starting from the weekday
+lord: horas advance one step per hora, day choghadiyas one step per segment and
+night choghadiyas two steps back per segment (starting two back from the day
+lord). Only the three rise/set times come from the ephemeris, through the
+shared rise/set cache, so a warm cache answers without calling swisseph.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models.astrology_models import HoraQuery, Planet
+from services.rise_set_service import RiseSetService
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.time_utils import julian_day_to_local_datetime
+
+
+HORAS_PER_HALF = 12
+CHOGHADIYAS_PER_HALF = 8
+
+# Descending orbital period; hora n + 1 is ruled by the next planet
+CHALDEAN_ORDER = [
+    Planet.SATURN, Planet.JUPITER, Planet.MARS, Planet.SUN, Planet.VENUS, Planet.MERCURY, Planet.MOON
+]
+
+# Weekday lords, 0 = Ravivara (Sunday) as in the panchang
+VARA_LORDS = [
+    Planet.SUN, Planet.MOON, Planet.MARS, Planet.MERCURY, Planet.JUPITER, Planet.VENUS, Planet.SATURN
+]
+
+CHOGHADIYA_NAMES = {
+    Planet.SUN: "Udveg",
+    Planet.VENUS: "Chal",
+    Planet.MERCURY: "Labh",
+    Planet.MOON: "Amrit",
+    Planet.SATURN: "Kaal",
+    Planet.JUPITER: "Shubh",
+    Planet.MARS: "Rog",
+}
+
+CHOGHADIYA_QUALITIES = {
+    "Amrit": "good", "Shubh": "good", "Labh": "good",
+    "Chal": "neutral",
+    "Udveg": "bad", "Kaal": "bad", "Rog": "bad",
+}
+
+
+def _chaldean_sequence(vara: int, count: int, step: int, offset: int = 0) -> List[Planet]:
+    """count lords from the weekday lord shifted by offset, advancing step places each"""
+    first = CHALDEAN_ORDER.index(VARA_LORDS[vara]) + offset
+    return [CHALDEAN_ORDER[(first + i * step) % 7] for i in range(count)]
+
+
+@dataclass
+class HoraDay:
+    """Horas and choghadiyas of one local date (boundaries in Julian Days, UT)"""
+    date: str                            # Local date the day starts on (YYYY-MM-DD)
+    vara: int                            # Weekday, 0 = Ravivara (Sunday)
+    sunrise_jd: float                    # NaN on polar dates (then every boundary is NaN)
+    sunset_jd: float
+    next_sunrise_jd: float
+    polar_day: bool
+    polar_night: bool
+    hora_lords: List[Planet]             # 24 lords, 12 by day then 12 by night
+    hora_bounds: np.ndarray              # 25 boundaries
+    choghadiya_lords: List[Planet]       # 16 lords, 8 by day then 8 by night
+    choghadiya_bounds: np.ndarray        # 17 boundaries
+    current_hora: Optional[int] = None   # Index of the segment holding the query instant
+    current_choghadiya: Optional[int] = None
+
+
+class HoraCalculator:
+    """Hora and choghadiya tables from cached sunrise and sunset times"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 rise_set_service: RiseSetService = None):
+        """
+        Initialize Hora Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            rise_set_service: Existing rise/set service (and cache) to share
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self.rise_set_service = rise_set_service or RiseSetService(ephemeris_service=self.ephemeris_service)
+
+    def calculate(self, query: HoraQuery) -> HoraDay:
+        """
+        Hora day of a validated query
+
+        With an instant, the day is the one running at that instant (the previous
+        date's before sunrise) and the current segments are marked.
+        """
+        if query.julian_day is None:
+            return self.calculate_day(query.latitude, query.longitude, query.timezone, query.date)
+
+        local_date = julian_day_to_local_datetime(query.julian_day, query.timezone)[:10]
+        day = self.calculate_day(query.latitude, query.longitude, query.timezone, local_date)
+        if query.julian_day < day.sunrise_jd:
+            previous = (date.fromisoformat(local_date) - timedelta(days=1)).isoformat()
+            day = self.calculate_day(query.latitude, query.longitude, query.timezone, previous)
+
+        day.current_hora = _segment_at(day.hora_bounds, query.julian_day)
+        day.current_choghadiya = _segment_at(day.choghadiya_bounds, query.julian_day)
+        return day
+
+    def calculate_day(self, latitude: float, longitude: float, timezone_offset: float, local_date: str) -> HoraDay:
+        """
+        Horas and choghadiyas of the day starting at sunrise on local_date
+
+        Args:
+            latitude: Geographic latitude
+            longitude: Geographic longitude (east positive)
+            timezone_offset: Offset of local_date in hours
+            local_date: YYYY-MM-DD
+
+        Returns:
+            HoraDay
+        """
+        next_date = (date.fromisoformat(local_date) + timedelta(days=1)).isoformat()
+        today = self.rise_set_service.times(Planet.SUN, local_date, latitude, longitude, timezone_offset)
+        tomorrow = self.rise_set_service.times(Planet.SUN, next_date, latitude, longitude, timezone_offset)
+
+        sunrise, sunset, next_sunrise = (
+            np.nan if value is None else value for value in (today.rise_jd, today.set_jd, tomorrow.rise_jd)
+        )
+        # A set before the rise (or a missing event) leaves no sunrise-to-sunrise day
+        if not sunrise < sunset < next_sunrise:
+            sunrise = sunset = next_sunrise = np.nan
+
+        vara = date.fromisoformat(local_date).isoweekday() % 7
+        return HoraDay(
+            date=local_date,
+            vara=vara,
+            sunrise_jd=float(sunrise),
+            sunset_jd=float(sunset),
+            next_sunrise_jd=float(next_sunrise),
+            polar_day=today.always_up,
+            polar_night=today.always_down,
+            hora_lords=_chaldean_sequence(vara, 2 * HORAS_PER_HALF, 1),
+            hora_bounds=_split(sunrise, sunset, next_sunrise, HORAS_PER_HALF),
+            choghadiya_lords=(_chaldean_sequence(vara, CHOGHADIYAS_PER_HALF, 1)
+                              + _chaldean_sequence(vara, CHOGHADIYAS_PER_HALF, -2, -2)),
+            choghadiya_bounds=_split(sunrise, sunset, next_sunrise, CHOGHADIYAS_PER_HALF)
+        )
+
+    def precompute(self, locations: Sequence[Dict], first_date: str, days: int) -> int:
+        """
+        Fill the rise/set cache for a list of places over a run of dates
+
+        Args:
+            locations: Dicts with latitude, longitude and timezone
+            first_date: First local date (YYYY-MM-DD)
+            days: Number of dates (the sunrise after the last one is included)
+
+        Returns:
+            Number of (place, date) sunrise entries now cached
+        """
+        if not locations:
+            return 0
+        first = date.fromisoformat(first_date)
+        dates = np.array([(first + timedelta(days=i)).isoformat() for i in range(days + 1)], dtype=object)
+        latitudes, longitudes, timezones = (
+            np.array([location[key] for location in locations], dtype=np.float64)[:, None]
+            for key in ("latitude", "longitude", "timezone")
+        )
+        table = self.rise_set_service.batch(Planet.SUN, dates[None, :], latitudes, longitudes, timezones)
+        return int(table.rise_jd.size)
+
+
+def _split(sunrise: float, sunset: float, next_sunrise: float, parts: int) -> np.ndarray:
+    """Boundaries of parts equal segments by day followed by parts by night"""
+    fractions = np.arange(parts, dtype=np.float64) / parts
+    return np.concatenate((
+        sunrise + (sunset - sunrise) * fractions,
+        sunset + (next_sunrise - sunset) * fractions,
+        [next_sunrise]
+    ))
+
+
+def _segment_at(bounds: np.ndarray, julian_day: float) -> Optional[int]:
+    """Index of the segment containing julian_day, None outside (or on polar dates)"""
+    if not bounds[0] <= julian_day < bounds[-1]:
+        return None
+    return int(np.searchsorted(bounds, julian_day, side="right")) - 1
@@ -0,0 +1,206 @@
+"""
+Lagna Table Calculator
+Every lagna sign, navamsha and nakshatra pada change of one local date
+
+The sidereal ascendant is sampled every SAMPLE_MINUTES from local midnight to
+the next midnight, unwrapped (it only moves forward below the polar circles)
+and each 3°20' boundary it crosses is refined with Brent's method to
+ROOT_TOLERANCE days. Navamsha and nakshatra pada boundaries coincide, every
+fourth one is a nakshatra boundary and every ninth a sign boundary, so one root
+search per boundary serves all three divisions. The samples are one vectorized
+utils.ascendant pass and the refinement uses its scalar form. Sidereal time is
+exact at every evaluation; obliquity and ayanamsa move by well under a
+milliarcsecond per hour and are interpolated linearly between their values at
+the two midnights.
+
+Tables are cached by (local date, rounded latitude/longitude, timezone offset)
+and answer point queries by bisection, so a rectification UI scrubbing through
+the day costs a few microseconds per step once the table is built.
+"""
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+import swisseph as swe
+
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.ascendant import ascendant, ascendants
+from utils.root_finding import brent
+from utils.time_utils import local_datetime_to_julian_day
+
+
+# 4 decimals = about 11 m, moving a lagna change by a hundredth of a second
+COORDINATE_DECIMALS = int(os.environ.get("LAGNA_TABLE_COORDINATE_DECIMALS", "4"))
+CACHE_SIZE = int(os.environ.get("LAGNA_TABLE_CACHE_SIZE", "4096"))
+# Near the polar circles whole signs rise in seconds and others never do
+MAX_LATITUDE = float(os.environ.get("LAGNA_TABLE_MAX_LATITUDE", "60"))
+
+SAMPLE_MINUTES = 4
+ROOT_TOLERANCE = 1e-7                   # Days, about 9 ms
+NAVAMSHA_SPAN = 30.0 / 9                # Degrees per navamsha (= nakshatra pada)
+
+# Table divisions with the number of navamshas in one of their segments
+DIVISIONS = {"sign": 9, "nakshatra": 4, "navamsha": 1}
+
+
+class LagnaSegment(NamedTuple):
+    """One stretch of time with an unchanged lagna division"""
+    index: int                           # Sign 0-11, nakshatra 0-26 or navamsha (pada) 0-107
+    start_jd: float
+    end_jd: float
+
+
+@dataclass(frozen=True)
+class LagnaTable:
+    """Lagna division changes of one local date (Julian Days, UT)"""
+    date: str
+    latitude: float
+    longitude: float
+    timezone: float
+    start_jd: float                      # Local midnight
+    end_jd: float                        # Next local midnight
+    starts: Dict[str, List[float]]       # Division -> segment start times, starts[0] = start_jd
+    indices: Dict[str, List[int]]        # Division -> index of each segment
+
+    def segments(self, division: str) -> List[LagnaSegment]:
+        """Every segment of a division in time order"""
+        starts = self.starts[division]
+        ends = starts[1:] + [self.end_jd]
+        return [LagnaSegment(*segment) for segment in zip(self.indices[division], starts, ends)]
+
+    def at(self, julian_day: float) -> Dict[str, LagnaSegment]:
+        """
+        Segment of each division holding julian_day
+
+        Raises:
+            ValueError: If julian_day is outside the table's date
+        """
+        if not self.start_jd <= julian_day < self.end_jd:
+            raise ValueError("Instant is outside the lagna table's date")
+        running = {}
+        for division, starts in self.starts.items():
+            position = bisect_right(starts, julian_day) - 1
+            end_jd = starts[position + 1] if position + 1 < len(starts) else self.end_jd
+            running[division] = LagnaSegment(self.indices[division][position], starts[position], end_jd)
+        return running
+
+
+class LagnaTableCalculator:
+    """Lagna change tables per location and date with an LRU cache"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 cache_size: int = CACHE_SIZE, coordinate_decimals: int = COORDINATE_DECIMALS):
+        """
+        Initialize Lagna Table Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            cache_size: Cached (date, location) tables
+            coordinate_decimals: Decimals latitude and longitude are rounded to
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self.cache_size = cache_size
+        self.coordinate_decimals = coordinate_decimals
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def table(self, local_date: str, latitude: float, longitude: float, timezone_offset: float) -> LagnaTable:
+        """
+        Lagna table of one local date
+
+        Args:
+            local_date: YYYY-MM-DD
+            latitude: Geographic latitude (at most MAX_LATITUDE from the equator)
+            longitude: Geographic longitude (east positive)
+            timezone_offset: Offset of the local date in hours
+
+        Returns:
+            LagnaTable
+        """
+        if abs(latitude) > MAX_LATITUDE:
+            raise ValueError(f"Lagna tables are available up to {MAX_LATITUDE:g} degrees latitude")
+        latitude = round(latitude, self.coordinate_decimals)
+        longitude = round(longitude, self.coordinate_decimals)
+        key = (local_date, latitude, longitude, timezone_offset)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        result = self._calculate(local_date, latitude, longitude, timezone_offset)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self._hits, "misses": self._misses}
+
+    def _calculate(self, local_date: str, latitude: float, longitude: float, timezone_offset: float) -> LagnaTable:
+        """Sample the day, root-find every navamsha boundary and group them per division"""
+        next_date = (date.fromisoformat(local_date) + timedelta(days=1)).isoformat()
+        start_jd = local_datetime_to_julian_day(local_date, timezone_offset)
+        end_jd = local_datetime_to_julian_day(next_date, timezone_offset)
+        ayanamsa_start = self.ephemeris_service.calculate_ayanamsa(start_jd)
+        ayanamsa_rate = (self.ephemeris_service.calculate_ayanamsa(end_jd) - ayanamsa_start) / (end_jd - start_jd)
+        obliquity_start = swe.calc_ut(start_jd, swe.ECL_NUT)[0][0]
+        obliquity_rate = (swe.calc_ut(end_jd, swe.ECL_NUT)[0][0] - obliquity_start) / (end_jd - start_jd)
+
+        def sidereal_ascendant(julian_day):
+            elapsed = julian_day - start_jd
+            tropical = ascendant(julian_day, latitude, longitude, obliquity_start + obliquity_rate * elapsed)[0]
+            return (tropical - ayanamsa_start - ayanamsa_rate * elapsed) % 360
+
+        times = np.linspace(start_jd, end_jd, int(round((end_jd - start_jd) * 1440 / SAMPLE_MINUTES)) + 1)
+        elapsed = times - start_jd
+        tropical = ascendants(times, latitude, longitude, obliquity_start + obliquity_rate * elapsed)[0]
+        samples = (tropical - ayanamsa_start - ayanamsa_rate * elapsed) % 360
+        # Forward steps only: the ascendant never moves back below the polar circles
+        unwrapped = samples[0] + np.concatenate(([0.0], np.cumsum(np.diff(samples) % 360)))
+
+        first = int(unwrapped[0] // NAVAMSHA_SPAN)
+        last = int(unwrapped[-1] // NAVAMSHA_SPAN)
+        boundaries = (np.arange(first + 1, last + 1) * NAVAMSHA_SPAN).tolist()
+        brackets = np.searchsorted(unwrapped, boundaries).tolist()
+
+        navamsha_starts = [start_jd]
+        for target, bracket in zip(boundaries, brackets):
+            def offset(t, target=target):
+                return (sidereal_ascendant(t) - target + 180.0) % 360 - 180.0
+            navamsha_starts.append(brent(offset, float(times[bracket - 1]), float(times[bracket]),
+                                         tolerance=ROOT_TOLERANCE))
+        navamshas = [n % 108 for n in range(first, last + 1)]
+
+        starts = {}
+        indices = {}
+        for division, span in DIVISIONS.items():
+            keep = [i for i, navamsha in enumerate(navamshas) if i == 0 or navamsha % span == 0]
+            starts[division] = [navamsha_starts[i] for i in keep]
+            indices[division] = [navamshas[i] // span for i in keep]
+
+        return LagnaTable(
+            date=local_date,
+            latitude=latitude,
+            longitude=longitude,
+            timezone=timezone_offset,
+            start_jd=start_jd,
+            end_jd=end_jd,
+            starts=starts,
+            indices=indices
+        )
@@ -0,0 +1,284 @@
+"""
+Panchang Calculator
+Sunrise-anchored daily panchang with exact tithi, nakshatra, yoga and karana end times
+
+All four limbs are monotonic functions of the Sun and Moon longitudes:
+    tithi     - Moon-Sun elongation / 12 degrees (30 per lunar month)
+    karana    - Moon-Sun elongation / 6 degrees (60 per lunar month)
+    nakshatra - sidereal Moon / 13 deg 20'
+    yoga      - (sidereal Sun + sidereal Moon) / 13 deg 20'
+Sun and Moon are sampled with their speeds every SAMPLE_STEP_DAYS and each limb
+is a cubic Hermite interpolant between samples (error below 1e-5 degrees, a
+fraction of a second). Every boundary in a range is bracketed by two samples
+and refined at once with a vectorized Newton iteration on the interpolant, so a
+year for one city needs about 1,500 ephemeris calls and a few array operations.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from models.astrology_models import Planet, PanchangElement, PanchangQuery
+from services.rise_set_service import RiseSetService
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.time_utils import local_datetime_to_julian_day
+
+
+SAMPLE_STEP_DAYS = 0.5
+NEWTON_ITERATIONS = 6
+# Longest possible span of one limb (tithi at the slowest elongation) plus slack
+MARGIN_DAYS = 1.5
+DEFAULT_BLOCK_DAYS = 31
+
+# Degrees per division and divisions per circle of each limb
+ELEMENT_SPANS = {
+    PanchangElement.TITHI: (12.0, 30),
+    PanchangElement.NAKSHATRA: (360.0 / 27, 27),
+    PanchangElement.YOGA: (360.0 / 27, 27),
+    PanchangElement.KARANA: (6.0, 60),
+}
+
+TITHI_NAMES = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami",
+    "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi"
+]
+
+YOGA_NAMES = [
+    "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma",
+    "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+    "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha",
+    "Shukla", "Brahma", "Indra", "Vaidhriti"
+]
+
+MOVABLE_KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Garaja", "Vanija", "Vishti"]
+
+VARA_NAMES = ["Ravivara", "Somavara", "Mangalavara", "Budhavara", "Guruvara", "Shukravara", "Shanivara"]
+
+
+def tithi_name(tithi: int) -> str:
+    """Name of tithi 1-30 (Purnima is 15, Amavasya 30)"""
+    if tithi == 15:
+        return "Purnima"
+    if tithi == 30:
+        return "Amavasya"
+    return TITHI_NAMES[(tithi - 1) % 15]
+
+
+def paksha(tithi: int) -> str:
+    """Shukla (waxing) for tithis 1-15, Krishna (waning) for 16-30"""
+    return "Shukla" if tithi <= 15 else "Krishna"
+
+
+def karana_name(karana: int) -> str:
+    """Name of karana 1-60 (half-tithis counted from Shukla Pratipada)"""
+    if karana == 1:
+        return "Kimstughna"
+    if karana >= 58:
+        return ["Shakuni", "Chatushpada", "Naga"][karana - 58]
+    return MOVABLE_KARANAS[(karana - 2) % 7]
+
+
+@dataclass
+class PanchangSpans:
+    """Consecutive spans of one limb: number (1-based), start and end (Julian Day, UT)"""
+    index: np.ndarray
+    start_jd: np.ndarray
+    end_jd: np.ndarray
+
+
+@dataclass
+class PanchangBlock:
+    """Panchang for consecutive local dates as columnar arrays"""
+    dates: List[str]                     # Local dates (YYYY-MM-DD)
+    midnight_jd: np.ndarray              # Local midnight starting each date (Julian Day, UT)
+    sunrise_jd: np.ndarray               # NaN when the Sun does not rise that date
+    sunset_jd: np.ndarray                # NaN when the Sun does not set that date
+    moonrise_jd: np.ndarray              # NaN when the Moon does not rise that date
+    moonset_jd: np.ndarray               # NaN when the Moon does not set that date
+    polar_day: np.ndarray                # Sun up all date
+    polar_night: np.ndarray              # Sun down all date
+    vara: np.ndarray                     # Weekday, 0 = Ravivara (Sunday)
+    at_sunrise: Dict[PanchangElement, np.ndarray]  # Limb prevailing at sunrise (midnight without one)
+    ends_at: Dict[PanchangElement, np.ndarray]     # End of that limb (Julian Day, UT)
+    spans: Dict[PanchangElement, PanchangSpans]    # Every span overlapping the block, reported once per stream
+
+
+class PanchangCalculator:
+    """Daily and range panchang for one location"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 rise_set_service: RiseSetService = None):
+        """
+        Initialize Panchang Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            rise_set_service: Existing rise/set service (and cache) to share
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self.rise_set_service = rise_set_service or RiseSetService(ephemeris_service=self.ephemeris_service)
+
+    @staticmethod
+    def block_ranges(query: PanchangQuery, block_days: int = DEFAULT_BLOCK_DAYS) -> List[Tuple[str, int, bool]]:
+        """
+        Split the query range into blocks
+
+        Returns:
+            List of (first local date, number of dates, include_running)
+            arguments for calculate_block()
+        """
+        first = date.fromisoformat(query.start_date)
+        return [
+            ((first + timedelta(days=offset)).isoformat(), min(block_days, query.days - offset), offset == 0)
+            for offset in range(0, query.days, block_days)
+        ]
+
+    def blocks(self, query: PanchangQuery, block_days: int = DEFAULT_BLOCK_DAYS) -> Iterator[PanchangBlock]:
+        """
+        Panchang of query.days local dates, one block of up to block_days at a time
+
+        Args:
+            query: Location, first local date and number of days
+            block_days: Dates per block
+
+        Yields:
+            PanchangBlock objects in date order; together they report every
+            limb span exactly once
+        """
+        for first, days, include_running in self.block_ranges(query, block_days):
+            yield self.calculate_block(query, first, days, include_running)
+
+    def calculate(self, query: PanchangQuery) -> PanchangBlock:
+        """Panchang of the whole query range as a single block"""
+        return self.calculate_block(query, query.start_date, query.days)
+
+    def calculate_block(self, query: PanchangQuery, first: str, days: int,
+                        include_running: bool = True) -> PanchangBlock:
+        """
+        Panchang for `days` local dates starting at `first`
+
+        Args:
+            query: Location and timezone
+            first: First local date (YYYY-MM-DD)
+            days: Number of dates
+            include_running: Also report the spans already running at the
+                block's first midnight (False for later blocks of a stream)
+        """
+        first = date.fromisoformat(first)
+        dates = [(first + timedelta(days=i)).isoformat() for i in range(days)]
+        first_midnight = local_datetime_to_julian_day(dates[0], query.timezone)
+        midnight_jd = first_midnight + np.arange(days + 1, dtype=np.float64)
+        window_start, window_end = midnight_jd[0], midnight_jd[-1]
+
+        sun = self.rise_set_service.batch(Planet.SUN, dates, query.latitude, query.longitude, query.timezone)
+        moon = self.rise_set_service.batch(Planet.MOON, dates, query.latitude, query.longitude, query.timezone)
+        anchors = np.where(np.isnan(sun.rise_jd), midnight_jd[:-1], sun.rise_jd)
+
+        spans = self.spans(window_start, window_end)
+        at_sunrise, ends_at = {}, {}
+        for element, element_spans in spans.items():
+            position = np.searchsorted(element_spans.end_jd, anchors, side="right")
+            at_sunrise[element] = element_spans.index[position]
+            ends_at[element] = element_spans.end_jd[position]
+            if not include_running:
+                keep = element_spans.start_jd >= window_start
+                spans[element] = PanchangSpans(
+                    element_spans.index[keep], element_spans.start_jd[keep], element_spans.end_jd[keep]
+                )
+
+        weekday = first.isoweekday() % 7
+        return PanchangBlock(
+            dates=dates,
+            midnight_jd=midnight_jd[:-1],
+            sunrise_jd=sun.rise_jd,
+            sunset_jd=sun.set_jd,
+            moonrise_jd=moon.rise_jd,
+            moonset_jd=moon.set_jd,
+            polar_day=sun.always_up,
+            polar_night=sun.always_down,
+            vara=(weekday + np.arange(days)) % 7,
+            at_sunrise=at_sunrise,
+            ends_at=ends_at,
+            spans=spans
+        )
+
+    def spans(self, start_jd: float, end_jd: float) -> Dict[PanchangElement, PanchangSpans]:
+        """
+        Every tithi, nakshatra, yoga and karana span overlapping [start_jd, end_jd)
+
+        Args:
+            start_jd: Range start (Julian Day, UT)
+            end_jd: Range end (Julian Day, UT)
+        """
+        times, quantities = self._sample(start_jd - MARGIN_DAYS, end_jd + MARGIN_DAYS)
+
+        result = {}
+        for element, (span, count) in ELEMENT_SPANS.items():
+            values, rates = quantities[element]
+            boundaries = np.arange(math.ceil(values[0] / span), math.floor(values[-1] / span) + 1)
+            crossings = _hermite_roots(times, values, rates, boundaries * span)
+            # Span k runs from boundary k to boundary k + 1 (number = k mod count + 1)
+            inside = (crossings[1:] > start_jd) & (crossings[:-1] < end_jd)
+            result[element] = PanchangSpans(
+                index=(boundaries[:-1][inside] % count + 1).astype(np.int16),
+                start_jd=crossings[:-1][inside],
+                end_jd=crossings[1:][inside]
+            )
+        return result
+
+    def _sample(self, start_jd: float, end_jd: float) -> Tuple[np.ndarray, Dict]:
+        """Unwrapped limb longitudes and their rates on the sampling grid"""
+        count = max(2, math.ceil((end_jd - start_jd) / SAMPLE_STEP_DAYS) + 1)
+        times = start_jd + np.arange(count) * SAMPLE_STEP_DAYS
+
+        sun = np.empty((count, 2))
+        moon = np.empty((count, 2))
+        ayanamsa = np.empty(count)
+        for i, julian_day in enumerate(times):
+            longitude, _, _, speed = self.ephemeris_service.get_planet_position(Planet.SUN, julian_day)
+            sun[i] = longitude, speed
+            longitude, _, _, speed = self.ephemeris_service.get_planet_position(Planet.MOON, julian_day)
+            moon[i] = longitude, speed
+            ayanamsa[i] = self.ephemeris_service.calculate_ayanamsa(julian_day)
+        ayanamsa_rate = (ayanamsa[-1] - ayanamsa[0]) / (times[-1] - times[0])
+
+        elongation = (np.unwrap(moon[:, 0] - sun[:, 0], period=360), moon[:, 1] - sun[:, 1])
+        return times, {
+            PanchangElement.TITHI: elongation,
+            PanchangElement.KARANA: elongation,
+            PanchangElement.NAKSHATRA: (
+                np.unwrap(moon[:, 0] - ayanamsa, period=360),
+                moon[:, 1] - ayanamsa_rate
+            ),
+            PanchangElement.YOGA: (
+                np.unwrap(sun[:, 0] + moon[:, 0] - 2 * ayanamsa, period=360),
+                sun[:, 1] + moon[:, 1] - 2 * ayanamsa_rate
+            ),
+        }
+
+
+def _hermite_roots(times: np.ndarray, values: np.ndarray, rates: np.ndarray,
+                   targets: np.ndarray) -> np.ndarray:
+    """
+    Times at which a monotonic sampled function reaches each target value
+
+    The function is the cubic Hermite interpolant of (times, values, rates);
+    targets must lie within the sampled values.
+    """
+    interval = np.clip(np.searchsorted(values, targets, side="right") - 1, 0, len(times) - 2)
+    step = times[interval + 1] - times[interval]
+    v0, v1 = values[interval], values[interval + 1]
+    d0, d1 = rates[interval] * step, rates[interval + 1] * step
+
+    # Cubic in s in [0, 1]: v0 + d0 s + c2 s^2 + c3 s^3
+    c2 = 3 * (v1 - v0) - 2 * d0 - d1
+    c3 = 2 * (v0 - v1) + d0 + d1
+    s = (targets - v0) / (v1 - v0)
+    for _ in range(NEWTON_ITERATIONS):
+        residual = v0 + s * (d0 + s * (c2 + s * c3)) - targets
+        slope = d0 + s * (2 * c2 + 3 * s * c3)
+        s = np.clip(s - residual / slope, 0.0, 1.0)
+    return times[interval] + s * step
@@ -0,0 +1,140 @@
+"""
+Synastry Calculator
+Two birth charts compared: cross-aspects, house overlays and D9 comparison
+
+Both D1 charts come from one D1ChartCalculator.calculate_d1_charts pass (the
+sky state is computed once when the two instants coincide) and both D9 charts
+are derived from them without further ephemeris calls. Every comparison is
+read off the charts' PlanetPosition and HouseData objects:
+    cross-aspects  - each graha of one chart against each graha and the lagna
+                     of the other, by sign (conjunction = 1st; every graha the
+                     7th, Mars also 4th/8th, Jupiter 5th/9th, Saturn 3rd/10th)
+                     with the signed orb from the exact aspect angle
+    house overlays - the house of the other chart each graha falls in
+    D9 comparison  - navamsha lagnas and 7th houses, navamsha overlays and
+                     grahas sharing a navamsha sign
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from models.astrology_models import UserDetails, D1Chart, PlanetPosition, HouseData, Planet
+from calculators.d1_chart_calculator import D1ChartCalculator
+from calculators.d9_chart_calculator import D9ChartCalculator
+from calculators.transit_overlay import GRAHA_ASPECTS, DEFAULT_ASPECTS
+
+
+@dataclass
+class CrossAspect:
+    """One graha of a chart conjoining or aspecting a point of the other chart"""
+    source: int                          # Chart of the aspecting graha (0 first, 1 second)
+    planet: Planet
+    target: Optional[Planet]             # Graha of the other chart; None = its lagna
+    house: int                           # Target sign counted from the graha (1 = conjunction)
+    orb: float                           # Signed degrees from the exact aspect angle
+
+
+@dataclass
+class Synastry:
+    """Two charts and their comparisons"""
+    d1_charts: Tuple[D1Chart, D1Chart]
+    d9_charts: Tuple[Dict, Dict]         # D9ChartCalculator.calculate_d9_chart results
+    shared_sky: bool                     # Both records are the same instant
+    cross_aspects: List[CrossAspect]
+    house_overlays: Tuple[Dict[Planet, int], Dict[Planet, int]]     # Grahas of chart i in the other's houses
+    d9_overlays: Tuple[Dict[Planet, int], Dict[Planet, int]]
+    d9_conjunctions: List[Tuple[Planet, Planet]]    # (graha of first, graha of second) in one navamsha sign
+
+
+def house_of(longitude: float, houses: List[HouseData]) -> int:
+    """House of a sidereal longitude in a chart's houses (from one cusp to the next, any system)"""
+    for house, following in zip(houses, houses[1:] + houses[:1]):
+        if (longitude - house.cusp_longitude) % 360 < (following.cusp_longitude - house.cusp_longitude) % 360:
+            return house.house_number
+    raise ValueError("Houses do not cover the zodiac")
+
+
+def _signed_orb(longitude: float, target: float, house: int) -> float:
+    """Degrees from the exact aspect angle (house - 1) * 30, in [-180, 180)"""
+    return (target - longitude - (house - 1) * 30.0 + 180.0) % 360 - 180.0
+
+
+class SynastryCalculator:
+    """Compares two birth charts from shared chart engines"""
+
+    def __init__(self, ephe_path: str = "./ephe", d1_calculator: D1ChartCalculator = None,
+                 d9_calculator: D9ChartCalculator = None):
+        """
+        Initialize Synastry Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            d1_calculator: Existing D1 calculator to share
+            d9_calculator: Existing D9 calculator to share
+        """
+        self.d1_calculator = d1_calculator or D1ChartCalculator(ephe_path)
+        self.d9_calculator = d9_calculator or D9ChartCalculator(ephe_path, self.d1_calculator)
+
+    def calculate(self, first: UserDetails, second: UserDetails) -> Synastry:
+        """
+        Compare two birth records
+
+        Args:
+            first: Birth details of the first person
+            second: Birth details of the second person
+
+        Returns:
+            Synastry with both D1 and D9 charts and their comparisons
+        """
+        d1_charts = tuple(self.d1_calculator.calculate_d1_charts([first, second]))
+        d9_charts = tuple(
+            self.d9_calculator.calculate_d9_chart(details, chart)
+            for details, chart in zip((first, second), d1_charts)
+        )
+        d9_points = [(chart["d9_planets"], chart["d9_houses"]) for chart in d9_charts]
+
+        return Synastry(
+            d1_charts=d1_charts,
+            d9_charts=d9_charts,
+            shared_sky=self.d1_calculator.shares_sky_state(first, second),
+            cross_aspects=self.cross_aspects(*d1_charts),
+            house_overlays=(
+                self.overlay(d1_charts[0].planets, d1_charts[1].houses),
+                self.overlay(d1_charts[1].planets, d1_charts[0].houses)
+            ),
+            d9_overlays=(
+                self.overlay(d9_points[0][0], d9_points[1][1]),
+                self.overlay(d9_points[1][0], d9_points[0][1])
+            ),
+            d9_conjunctions=[
+                (planet.planet, other.planet)
+                for planet in d9_points[0][0] for other in d9_points[1][0]
+                if planet.sign == other.sign
+            ]
+        )
+
+    @staticmethod
+    def cross_aspects(first: D1Chart, second: D1Chart) -> List[CrossAspect]:
+        """Conjunctions and aspects of each chart's grahas on the other's grahas and lagna"""
+        aspects = []
+        charts = (first, second)
+        for source in (0, 1):
+            other = charts[1 - source]
+            targets = [(position.planet, position) for position in other.planets] + [(None, other.lagna)]
+            for position in charts[source].planets:
+                casts = GRAHA_ASPECTS.get(position.planet, DEFAULT_ASPECTS)
+                for target, target_position in targets:
+                    house = (target_position.sign.value - position.sign.value) % 12 + 1
+                    if house in casts:
+                        aspects.append(CrossAspect(
+                            source=source,
+                            planet=position.planet,
+                            target=target,
+                            house=house,
+                            orb=_signed_orb(position.longitude, target_position.longitude, house)
+                        ))
+        return aspects
+
+    @staticmethod
+    def overlay(planets: List[PlanetPosition], houses: List[HouseData]) -> Dict[Planet, int]:
+        """House of another chart that each graha falls in"""
+        return {position.planet: house_of(position.longitude, houses) for position in planets}
@@ -0,0 +1,307 @@
+"""
+Transit Event Search
+Exact sign/nakshatra ingresses and retrograde/direct stations by root-finding
+
+Each graha is sampled on a grid fine enough that between two samples it can
+cross at most one nakshatra boundary and change direction at most once (the
+step comes from its maximum speed and its shortest retrograde or direct
+phase). Stations are refined first with Brent's method on sidereal speed;
+between stations the longitude is monotonic, so every boundary crossing is
+bracketed by two samples and refined with Brent's method on sidereal
+longitude. Rahu and Ketu (mean nodes) never station, so only their ingresses
+are reported.
+
+Lunar events (tithi changes, new and full moons) are reported as Moon events:
+the Moon-Sun elongation always increases, so each 12 degree tithi boundary is
+bracketed the same way.
+"""
+import math
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from models.astrology_models import Planet, Zodiac, Nakshatra, TransitEvent, TransitEventType
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.root_finding import brent, wrap_degrees
+
+
+NAKSHATRA_SPAN = 360.0 / 27
+SIGN_SPAN = 30.0
+TITHI_SPAN = 12.0
+
+# Upper bounds of |sidereal speed| in degrees per day
+MAX_SPEEDS = {
+    Planet.SUN: 1.02,
+    Planet.MOON: 15.4,
+    Planet.MERCURY: 2.23,
+    Planet.VENUS: 1.27,
+    Planet.MARS: 0.8,
+    Planet.JUPITER: 0.25,
+    Planet.SATURN: 0.14,
+    Planet.RAHU: 0.06,
+    Planet.KETU: 0.06
+}
+
+# Upper bound of the Moon-Sun elongation speed in degrees per day
+MAX_ELONGATION_SPEED = 14.6
+
+# Order of events at the same instant (the event calendar's type codes)
+EVENT_TYPE_ORDER = {event_type: rank for rank, event_type in enumerate(TransitEventType)}
+
+LUNAR_EVENT_TYPES = frozenset([
+    TransitEventType.NEW_MOON, TransitEventType.FULL_MOON, TransitEventType.TITHI_CHANGE
+])
+
+# Sampling steps (days) shorter than half the shortest retrograde or direct phase
+STATION_STEPS = {
+    Planet.MERCURY: 4.0,
+    Planet.VENUS: 7.0,
+    Planet.MARS: 10.0,
+    Planet.JUPITER: 15.0,
+    Planet.SATURN: 15.0
+}
+
+# Fraction of a nakshatra a graha may travel between two samples
+STEP_SAFETY = 0.8
+
+DEFAULT_PLANETS = [
+    Planet.SUN, Planet.MOON, Planet.MARS, Planet.MERCURY, Planet.JUPITER,
+    Planet.VENUS, Planet.SATURN, Planet.RAHU, Planet.KETU
+]
+DEFAULT_CHUNK_DAYS = 366.0
+
+# Root tolerances in days (ingress ~0.1 s; stations are flat, ~1 s)
+INGRESS_TOLERANCE = 1e-6
+STATION_TOLERANCE = 1e-5
+
+
+class TransitEventSearch:
+    """Finds ingresses and stations of the grahas over any date range"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None):
+        """
+        Initialize Transit Event Search
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self._ayanamsa_rate = None
+
+    def _sidereal_state(self, planet: Planet, julian_day: float) -> Tuple[float, float]:
+        """Sidereal longitude and speed (same reduction as the D1 chart)"""
+        if self._ayanamsa_rate is None:
+            # Precession rate; varies by < 0.1% per century
+            self._ayanamsa_rate = (
+                self.ephemeris_service.calculate_ayanamsa(2451545.5)
+                - self.ephemeris_service.calculate_ayanamsa(2451544.5)
+            )
+        longitude, _, _, speed = self.ephemeris_service.get_planet_position(planet, julian_day)
+        ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day)
+        return (longitude - ayanamsa) % 360, speed - self._ayanamsa_rate
+
+    def events(self, start_jd: float, end_jd: float, planets: Optional[Iterable[Planet]] = None,
+               event_types: Optional[Iterable[TransitEventType]] = None,
+               chunk_days: float = DEFAULT_CHUNK_DAYS) -> Iterator[TransitEvent]:
+        """
+        Ordered stream of events in [start_jd, end_jd)
+
+        The range is searched one chunk at a time, so consumers of long ranges
+        receive the first events without waiting for the whole search.
+
+        Args:
+            start_jd: Range start (Julian Day, UT)
+            end_jd: Range end (Julian Day, UT)
+            planets: Grahas to search (default: all nine)
+            event_types: Event types to report (default: all)
+            chunk_days: Days searched per chunk
+
+        Yields:
+            TransitEvent objects in (time, graha, event type) order, the
+            record order of the event calendar
+
+        Raises:
+            ValueError: For grahas without a known maximum speed
+        """
+        planets = list(planets) if planets is not None else DEFAULT_PLANETS
+        unsupported = [planet.name for planet in planets if planet not in MAX_SPEEDS]
+        if unsupported:
+            raise ValueError(f"Event search does not support: {', '.join(unsupported)}")
+        event_types = frozenset(event_types) if event_types is not None else frozenset(TransitEventType)
+        planet_set = set(planets)
+
+        chunk_start = start_jd
+        while chunk_start < end_jd:
+            chunk_end = min(chunk_start + chunk_days, end_jd)
+            batch = []
+            for planet in planets:
+                batch.extend(
+                    event for event in self._planet_events(planet, chunk_start, chunk_end, event_types)
+                    if chunk_start <= event.julian_day < chunk_end
+                )
+            if Planet.MOON in planet_set and event_types & LUNAR_EVENT_TYPES:
+                batch.extend(
+                    event for event in self._lunar_events(chunk_start, chunk_end, event_types)
+                    if chunk_start <= event.julian_day < chunk_end
+                )
+            batch.sort(key=lambda event: (event.julian_day, event.planet.value, EVENT_TYPE_ORDER[event.event_type]))
+            yield from batch
+            chunk_start = chunk_end
+
+    def search(self, start_jd: float, end_jd: float, planets: Optional[Iterable[Planet]] = None,
+               event_types: Optional[Iterable[TransitEventType]] = None) -> List[TransitEvent]:
+        """All events in [start_jd, end_jd) as a list (see events())"""
+        return list(self.events(start_jd, end_jd, planets, event_types))
+
+    def _planet_events(self, planet: Planet, start_jd: float, end_jd: float,
+                       event_types: frozenset) -> List[TransitEvent]:
+        step = STEP_SAFETY * NAKSHATRA_SPAN / MAX_SPEEDS[planet]
+        can_station = planet in STATION_STEPS
+        if can_station:
+            step = min(step, STATION_STEPS[planet])
+        count = max(1, math.ceil((end_jd - start_jd) / step))
+        step = (end_jd - start_jd) / count
+
+        divisions = []
+        if TransitEventType.SIGN_INGRESS in event_types:
+            divisions.append((SIGN_SPAN, TransitEventType.SIGN_INGRESS))
+        if TransitEventType.NAKSHATRA_INGRESS in event_types:
+            divisions.append((NAKSHATRA_SPAN, TransitEventType.NAKSHATRA_INGRESS))
+
+        events = []
+        previous_jd = start_jd
+        previous_longitude, previous_speed = self._sidereal_state(planet, start_jd)
+        for i in range(1, count + 1):
+            julian_day = end_jd if i == count else start_jd + i * step
+            longitude, speed = self._sidereal_state(planet, julian_day)
+
+            segments = [(previous_jd, previous_longitude, julian_day, longitude)]
+            if can_station and (previous_speed > 0) != (speed > 0):
+                station_jd = brent(
+                    lambda t: self._sidereal_state(planet, t)[1],
+                    previous_jd, julian_day, previous_speed, speed, STATION_TOLERANCE
+                )
+                station_longitude = self._sidereal_state(planet, station_jd)[0]
+                turning_retrograde = previous_speed > 0
+                station_type = (TransitEventType.RETROGRADE_STATION if turning_retrograde
+                                else TransitEventType.DIRECT_STATION)
+                if station_type in event_types:
+                    events.append(self._make_event(
+                        planet, station_type, station_jd, station_longitude, turning_retrograde
+                    ))
+                segments = [
+                    (previous_jd, previous_longitude, station_jd, station_longitude),
+                    (station_jd, station_longitude, julian_day, longitude)
+                ]
+
+            for segment in segments:
+                events.extend(self._crossings(planet, segment, divisions))
+
+            previous_jd, previous_longitude, previous_speed = julian_day, longitude, speed
+
+        events.sort(key=lambda event: event.julian_day)
+        return events
+
+    def _elongation(self, julian_day: float) -> float:
+        """Moon-Sun elongation (the ayanamsa cancels, so tropical longitudes are used)"""
+        moon_longitude = self.ephemeris_service.get_planet_position(Planet.MOON, julian_day)[0]
+        sun_longitude = self.ephemeris_service.get_planet_position(Planet.SUN, julian_day)[0]
+        return (moon_longitude - sun_longitude) % 360
+
+    def _lunar_events(self, start_jd: float, end_jd: float, event_types: frozenset) -> List[TransitEvent]:
+        """Tithi changes plus new and full moons in [start_jd, end_jd]"""
+        count = max(1, math.ceil((end_jd - start_jd) / (STEP_SAFETY * TITHI_SPAN / MAX_ELONGATION_SPEED)))
+        step = (end_jd - start_jd) / count
+
+        events = []
+        previous_jd = start_jd
+        previous_elongation = self._elongation(start_jd)
+        for i in range(1, count + 1):
+            julian_day = end_jd if i == count else start_jd + i * step
+            elongation = self._elongation(julian_day)
+            unwrapped_end = previous_elongation + (elongation - previous_elongation) % 360
+
+            start_index = math.floor(previous_elongation / TITHI_SPAN)
+            end_index = math.floor(unwrapped_end / TITHI_SPAN)
+            if start_index != end_index:
+                boundary = end_index * TITHI_SPAN
+                crossing_jd = brent(
+                    lambda t: wrap_degrees(self._elongation(t) - boundary),
+                    previous_jd, julian_day,
+                    wrap_degrees(previous_elongation - boundary), wrap_degrees(elongation - boundary),
+                    INGRESS_TOLERANCE
+                )
+                tithi = end_index % 30 + 1
+                moon_longitude = self._sidereal_state(Planet.MOON, crossing_jd)[0]
+                types = [TransitEventType.TITHI_CHANGE]
+                if tithi == 1:
+                    types.append(TransitEventType.NEW_MOON)
+                elif tithi == 16:
+                    types.append(TransitEventType.FULL_MOON)
+                for event_type in types:
+                    if event_type in event_types:
+                        event = self._make_event(Planet.MOON, event_type, crossing_jd, moon_longitude, False)
+                        event.tithi = tithi
+                        events.append(event)
+
+            previous_jd, previous_elongation = julian_day, elongation
+
+        return events
+
+    def _crossings(self, planet: Planet, segment: Tuple[float, float, float, float],
+                   divisions: List[Tuple[float, TransitEventType]]) -> List[TransitEvent]:
+        """Boundary crossings inside one monotonic segment (at most one per division)"""
+        start_jd, start_longitude, end_jd, end_longitude = segment
+        travel = wrap_degrees(end_longitude - start_longitude)
+        unwrapped_end = start_longitude + travel
+
+        crossings = []
+        for span, event_type in divisions:
+            start_index = math.floor(start_longitude / span)
+            end_index = math.floor(unwrapped_end / span)
+            if start_index == end_index:
+                continue
+            boundary = max(start_index, end_index) * span
+            crossing_jd = brent(
+                lambda t: wrap_degrees(self._sidereal_state(planet, t)[0] - boundary),
+                start_jd, end_jd,
+                wrap_degrees(start_longitude - boundary), wrap_degrees(end_longitude - boundary),
+                INGRESS_TOLERANCE
+            )
+            divisions_count = round(360 / span)
+            crossings.append(self._make_event(
+                planet, event_type, crossing_jd, boundary % 360, travel < 0,
+                entered_index=end_index % divisions_count,
+                previous_index=start_index % divisions_count
+            ))
+        return crossings
+
+    def _make_event(self, planet: Planet, event_type: TransitEventType, julian_day: float,
+                    longitude: float, retrograde: bool, entered_index: Optional[int] = None,
+                    previous_index: Optional[int] = None) -> TransitEvent:
+        # An ingress longitude sits on a boundary; locate the other division
+        # just inside the side being entered
+        probe = longitude
+        if entered_index is not None:
+            probe = (longitude + (-1e-7 if retrograde else 1e-7)) % 360
+        sign_index = int(probe // SIGN_SPAN) % 12
+        nakshatra_index = int(probe // NAKSHATRA_SPAN) % 27
+
+        if event_type == TransitEventType.SIGN_INGRESS:
+            sign_index = entered_index
+        elif event_type == TransitEventType.NAKSHATRA_INGRESS:
+            nakshatra_index = entered_index
+
+        event = TransitEvent(
+            julian_day=julian_day,
+            planet=planet,
+            event_type=event_type,
+            longitude=longitude,
+            retrograde=retrograde,
+            sign=Zodiac(sign_index + 1),
+            nakshatra=Nakshatra(nakshatra_index + 1)
+        )
+        if event_type == TransitEventType.SIGN_INGRESS:
+            event.previous_sign = Zodiac(previous_index + 1)
+        elif event_type == TransitEventType.NAKSHATRA_INGRESS:
+            event.previous_nakshatra = Nakshatra(previous_index + 1)
+        return event
@@ -0,0 +1,163 @@
+"""
+Transit Overlay Calculator
+Transits of one sky state over many natal charts in a single vectorized pass
+
+For every natal reference point (Moon and/or lagna) and every transiting graha:
+    house  - sign of the transit counted from the natal point (1-12), e.g.
+             Saturn in 12, 1 or 2 from the Moon during Sade Sati
+    aspect - whether the graha conjoins or casts drishti on the natal point:
+             every graha the 7th, Mars also 4th/8th, Jupiter 5th/9th, Saturn
+             3rd/10th (as VedicAstrologyHelper.calculate_aspects)
+    orb    - signed degrees from the exact aspect angle (30 degrees per sign
+             counted), NaN when only the natal sign is known
+Natal data is columnar (one numpy array per field), so a user base of millions
+is a handful of array operations per graha; overlay_chunks() bounds memory.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.astrology_models import Planet
+
+
+OVERLAY_TARGETS = ("moon", "lagna")
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+TRANSIT_PLANETS = (
+    Planet.SUN, Planet.MOON, Planet.MERCURY, Planet.VENUS,
+    Planet.MARS, Planet.JUPITER, Planet.SATURN, Planet.RAHU, Planet.KETU
+)
+
+# Signs counted from the graha (1 = its own sign) that it aspects or occupies
+GRAHA_ASPECTS = {
+    Planet.MARS: (1, 4, 7, 8),
+    Planet.JUPITER: (1, 5, 7, 9),
+    Planet.SATURN: (1, 3, 7, 10),
+}
+DEFAULT_ASPECTS = (1, 7)
+
+
+def _aspect_table(planets: Sequence[Planet]) -> np.ndarray:
+    """(len(planets), 13) lookup: row p, column n is True when planet p aspects the nth sign"""
+    table = np.zeros((len(planets), 13), dtype=bool)
+    for row, planet in enumerate(planets):
+        table[row, list(GRAHA_ASPECTS.get(planet, DEFAULT_ASPECTS))] = True
+    return table
+
+
+@dataclass
+class NatalColumns:
+    """Natal reference points of many charts (one entry per chart; None = not supplied)"""
+    moon_longitude: Optional[np.ndarray] = None   # Sidereal degrees, NaN where unknown
+    lagna_longitude: Optional[np.ndarray] = None
+    moon_sign: Optional[np.ndarray] = None        # 1-12, used where the longitude is unknown
+    lagna_sign: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        for column in (self.moon_longitude, self.lagna_longitude, self.moon_sign, self.lagna_sign):
+            if column is not None:
+                return len(column)
+        return 0
+
+    def targets(self) -> List[str]:
+        """Reference points present in the columns"""
+        return [target for target in OVERLAY_TARGETS
+                if getattr(self, f"{target}_longitude") is not None or getattr(self, f"{target}_sign") is not None]
+
+    def slice(self, start: int, stop: int) -> "NatalColumns":
+        """Rows start:stop of every column (views, no copy)"""
+        return NatalColumns(**{
+            name: None if column is None else column[start:stop]
+            for name, column in vars(self).items()
+        })
+
+
+@dataclass
+class OverlayTarget:
+    """Transits against one natal reference point, shape (charts, planets)"""
+    house: np.ndarray                    # int8, 1-12
+    aspect: np.ndarray                   # bool
+    orb: np.ndarray                      # float32 degrees, NaN without a natal longitude
+
+
+@dataclass
+class TransitOverlay:
+    """Transit positions and their overlay on a block of natal charts"""
+    planets: Tuple[Planet, ...]
+    transit_longitudes: np.ndarray       # Sidereal degrees, one per planet
+    targets: Dict[str, OverlayTarget]
+
+
+class TransitOverlayCalculator:
+    """Vectorized transit houses, aspects and orbs over columnar natal data"""
+
+    def __init__(self, planets: Sequence[Planet] = TRANSIT_PLANETS):
+        """
+        Initialize Transit Overlay Calculator
+
+        Args:
+            planets: Transiting grahas (columns of every result)
+        """
+        self.planets = tuple(planets)
+        self._aspects = _aspect_table(self.planets)
+
+    def overlay(self, transit_longitudes: np.ndarray, natal: NatalColumns) -> TransitOverlay:
+        """
+        Overlay one sky state on every chart in natal
+
+        Args:
+            transit_longitudes: Sidereal longitudes of self.planets
+            natal: Columnar natal reference points
+
+        Returns:
+            TransitOverlay with one OverlayTarget per reference point supplied
+        """
+        transit_longitudes = np.asarray(transit_longitudes, dtype=np.float64)
+        transit_signs = (transit_longitudes // 30).astype(np.int16)
+        targets = {}
+        for target in natal.targets():
+            longitude = getattr(natal, f"{target}_longitude")
+            sign = getattr(natal, f"{target}_sign")
+            targets[target] = self._overlay_point(transit_longitudes, transit_signs, longitude, sign, len(natal))
+        return TransitOverlay(self.planets, transit_longitudes, targets)
+
+    def overlay_chunks(self, transit_longitudes: np.ndarray, natal: NatalColumns,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[int, TransitOverlay]]:
+        """Overlay chunk_rows charts at a time, yielding (first row, TransitOverlay)"""
+        for start in range(0, len(natal), chunk_rows):
+            yield start, self.overlay(transit_longitudes, natal.slice(start, start + chunk_rows))
+
+    def _overlay_point(self, transit_longitudes: np.ndarray, transit_signs: np.ndarray,
+                       natal_longitude: Optional[np.ndarray], natal_sign: Optional[np.ndarray],
+                       rows: int) -> OverlayTarget:
+        if natal_longitude is not None:
+            natal_longitude = np.asarray(natal_longitude, dtype=np.float64)
+            known = ~np.isnan(natal_longitude)
+            signs = np.where(known, np.nan_to_num(natal_longitude) // 30, 0).astype(np.intp)
+            if natal_sign is not None:
+                signs = np.where(known, signs, np.asarray(natal_sign, dtype=np.intp) - 1)
+        else:
+            signs = np.asarray(natal_sign, dtype=np.intp) - 1
+
+        # Everything but the orb depends only on the natal sign: build (12, planets)
+        # tables once and gather one row per chart
+        natal_signs = np.arange(12)[:, None]
+        house = ((transit_signs[None, :] - natal_signs) % 12 + 1).astype(np.int8)
+        counted = (natal_signs - transit_signs[None, :]) % 12 + 1
+        aspect = self._aspects[np.arange(len(self.planets))[None, :], counted]
+        exact = (transit_longitudes[None, :] + (counted - 1) * 30.0 - 180.0).astype(np.float32)
+
+        if natal_longitude is None:
+            orb = np.full((rows, len(self.planets)), np.nan, dtype=np.float32)
+        else:
+            orb = natal_longitude.astype(np.float32)[:, None] - exact[signs]
+            orb %= 360.0
+            orb -= 180.0
+
+        return OverlayTarget(house=house[signs], aspect=aspect[signs], orb=orb)
+
+
+def transit_longitudes_from_snapshot(snapshot, planets: Sequence[Planet] = TRANSIT_PLANETS) -> np.ndarray:
+    """Sidereal longitudes of planets from a services.sky_snapshot.SkySnapshot"""
+    return np.array([snapshot.planet(planet).longitude for planet in planets], dtype=np.float64)
@@ -0,0 +1,226 @@
+"""
+Transit Period Calculator
+Sade Sati, Ashtama Shani and Jupiter returns from exact sign ingresses
+
+Saturn's and Jupiter's sign ingresses over a fixed span (from the event
+calendar where it covers the span, searched live elsewhere) are turned once
+into a per-graha table of sign occupancies: consecutive [start, end)
+intervals, each with its sign and whether it was entered retrograde. A
+transit period is a run of occupancies inside the period's signs counted from
+a natal sign (12th, 1st and 2nd from the Moon for Sade Sati, 8th for Ashtama
+Shani, the natal Jupiter sign for a Jupiter return). A single occupancy
+outside those signs between two inside them can only be a retrograde dip, so
+it stays part of the period as an "outside" phase; every retrograde exit and
+re-entry is therefore a phase boundary at the exact ingress time.
+
+Periods depend on nothing but the natal sign, so they are built once per
+(kind, sign) and shared by every chart with that sign.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from models.astrology_models import (
+    Planet, Zodiac, TransitEventType, TransitPeriodKind, TransitPhase, TransitPeriod, UserDetails
+)
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.time_utils import local_datetime_to_julian_day
+
+
+# Span whose ingresses are searched (UTC dates); periods are clipped to it
+SPAN_FROM = os.environ.get("TRANSIT_PERIOD_FROM", "1900-01-01")
+SPAN_TO = os.environ.get("TRANSIT_PERIOD_TO", "2100-01-01")
+DEFAULT_WINDOW_YEARS = 100
+
+# Transiting graha, natal point and phase name per house counted from it
+PERIOD_DEFINITIONS = {
+    TransitPeriodKind.SADE_SATI: (Planet.SATURN, Planet.MOON, {12: "rising", 1: "peak", 2: "setting"}),
+    TransitPeriodKind.ASHTAMA_SHANI: (Planet.SATURN, Planet.MOON, {8: "ashtama"}),
+    TransitPeriodKind.JUPITER_RETURN: (Planet.JUPITER, Planet.JUPITER, {1: "return"}),
+}
+TRANSITING_PLANETS = (Planet.SATURN, Planet.JUPITER)
+
+
+class SignOccupancy(NamedTuple):
+    """One stay of a graha in a sign"""
+    sign: Zodiac
+    start_jd: float                      # Ingress (or the span start)
+    end_jd: float                        # Next ingress (or the span end)
+    retrograde: bool                     # Entered while retrograde
+
+
+@dataclass
+class NatalTransitPeriods:
+    """Transit periods of one chart (lists are shared with every chart of the same sign)"""
+    birth_jd: float
+    natal_longitudes: Dict[Planet, float]             # Sidereal natal Moon and Jupiter
+    periods: Dict[TransitPeriodKind, List[TransitPeriod]]
+
+    def natal_sign(self, kind: TransitPeriodKind) -> Zodiac:
+        """Sign the houses of a period kind are counted from"""
+        return Zodiac(int(self.natal_longitudes[PERIOD_DEFINITIONS[kind][1]] // 30) + 1)
+
+    def between(self, kind: TransitPeriodKind, start_jd: float, end_jd: float) -> List[TransitPeriod]:
+        """Periods of one kind overlapping [start_jd, end_jd), in time order"""
+        return [period for period in self.periods[kind]
+                if period.end_jd > start_jd and period.start_jd < end_jd]
+
+    def running(self, julian_day: float) -> List[TransitPeriod]:
+        """Periods of every kind in progress at one instant"""
+        return [period for periods in self.periods.values() for period in periods
+                if period.start_jd <= julian_day < period.end_jd]
+
+
+class TransitPeriodCalculator:
+    """Transit periods per natal sign from cached Saturn and Jupiter sign occupancies"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 event_search=None, event_calendar=None,
+                 start_jd: Optional[float] = None, end_jd: Optional[float] = None):
+        """
+        Initialize Transit Period Calculator
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            event_search: TransitEventSearch for the parts of the span the calendar misses
+            event_calendar: Precomputed services.event_calendar.EventCalendar, if any
+            start_jd: Span start (Julian Day, UT); default SPAN_FROM
+            end_jd: Span end (Julian Day, UT); default SPAN_TO
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        if event_search is None:
+            from calculators.transit_event_search import TransitEventSearch
+            event_search = TransitEventSearch(ephemeris_service=self.ephemeris_service)
+        self.event_search = event_search
+        self.event_calendar = event_calendar
+        self.start_jd = start_jd if start_jd is not None else local_datetime_to_julian_day(SPAN_FROM, 0)
+        self.end_jd = end_jd if end_jd is not None else local_datetime_to_julian_day(SPAN_TO, 0)
+        self._occupancies: Optional[Dict[Planet, List[SignOccupancy]]] = None
+        self._periods: Dict[Tuple[TransitPeriodKind, Zodiac], List[TransitPeriod]] = {}
+        self._lock = threading.Lock()
+
+    def occupancies(self, planet: Planet) -> List[SignOccupancy]:
+        """
+        Sign occupancies of Saturn or Jupiter over the span (built on first use)
+
+        Raises:
+            ValueError: For other grahas
+        """
+        if planet not in TRANSITING_PLANETS:
+            raise ValueError(f"No sign occupancies for {planet.name}")
+        if self._occupancies is None:
+            with self._lock:
+                if self._occupancies is None:
+                    self._occupancies = self._build_occupancies()
+        return self._occupancies[planet]
+
+    def periods(self, kind: TransitPeriodKind, natal_sign: Zodiac) -> List[TransitPeriod]:
+        """
+        Every period of one kind for a natal sign over the span (cached per sign)
+
+        Args:
+            kind: Period kind
+            natal_sign: Natal Moon sign (natal Jupiter sign for Jupiter returns)
+
+        Returns:
+            TransitPeriod objects in time order (shared; do not modify)
+        """
+        key = (kind, natal_sign)
+        periods = self._periods.get(key)
+        if periods is None:
+            planet = PERIOD_DEFINITIONS[kind][0]
+            periods = self._build_periods(kind, natal_sign, self.occupancies(planet))
+            with self._lock:
+                periods = self._periods.setdefault(key, periods)
+        return periods
+
+    def natal_longitude(self, planet: Planet, julian_day: float) -> float:
+        """Sidereal longitude of a natal graha (same reduction as the D1 chart)"""
+        ayanamsa = self.ephemeris_service.calculate_ayanamsa(julian_day)
+        tropical_longitude = self.ephemeris_service.get_planet_position(planet, julian_day)[0]
+        return (tropical_longitude - ayanamsa) % 360
+
+    def calculate(self, user_details: UserDetails,
+                  kinds: Optional[List[TransitPeriodKind]] = None) -> NatalTransitPeriods:
+        """
+        Transit periods for one birth record
+
+        Args:
+            user_details: User birth details
+            kinds: Period kinds to include (default: all)
+
+        Returns:
+            NatalTransitPeriods over the whole span
+        """
+        kinds = list(kinds) if kinds is not None else list(TransitPeriodKind)
+        julian_day = self.ephemeris_service.convert_to_julian_day(
+            user_details.datetime, user_details.timezone
+        )
+        natal_points = {PERIOD_DEFINITIONS[kind][1] for kind in kinds}
+        result = NatalTransitPeriods(
+            birth_jd=julian_day,
+            natal_longitudes={point: self.natal_longitude(point, julian_day) for point in natal_points},
+            periods={}
+        )
+        for kind in kinds:
+            result.periods[kind] = self.periods(kind, result.natal_sign(kind))
+        return result
+
+    def _build_occupancies(self) -> Dict[Planet, List[SignOccupancy]]:
+        from services.event_calendar import find_events
+
+        ingresses = {planet: [] for planet in TRANSITING_PLANETS}
+        for event, _ in find_events(self.start_jd, self.end_jd, TRANSITING_PLANETS,
+                                    [TransitEventType.SIGN_INGRESS], self.event_calendar, self.event_search):
+            ingresses[event.planet].append(event)
+
+        occupancies = {}
+        for planet, events in ingresses.items():
+            if not events:
+                raise ValueError(f"No {planet.name} sign ingress between {SPAN_FROM} and {SPAN_TO}")
+            # Before the first ingress the graha is in the sign it leaves (entry unknown)
+            table = [SignOccupancy(events[0].previous_sign, self.start_jd, events[0].julian_day, False)]
+            for event, following in zip(events, events[1:] + [None]):
+                table.append(SignOccupancy(
+                    event.sign, event.julian_day,
+                    following.julian_day if following else self.end_jd, event.retrograde
+                ))
+            occupancies[planet] = table
+        return occupancies
+
+    def _build_periods(self, kind: TransitPeriodKind, natal_sign: Zodiac,
+                       occupancies: List[SignOccupancy]) -> List[TransitPeriod]:
+        planet, _, names = PERIOD_DEFINITIONS[kind]
+        periods = []
+        phases: List[TransitPhase] = []
+        dip: Optional[TransitPhase] = None
+
+        def close():
+            periods.append(TransitPeriod(
+                kind=kind, planet=planet, natal_sign=natal_sign, phases=phases,
+                truncated=phases[0].start_jd <= self.start_jd or phases[-1].end_jd >= self.end_jd
+            ))
+
+        for occupancy in occupancies:
+            house = (occupancy.sign.value - natal_sign.value) % 12 + 1
+            phase = TransitPhase(
+                name=names.get(house, "outside"), sign=occupancy.sign, house=house,
+                start_jd=occupancy.start_jd, end_jd=occupancy.end_jd, retrograde=occupancy.retrograde
+            )
+            if house in names:
+                if dip is not None:
+                    phases.append(dip)
+                    dip = None
+                phases.append(phase)
+            elif phases and dip is None:
+                # Outside once: a retrograde dip if the next occupancy is back inside
+                dip = phase
+            elif phases:
+                close()
+                phases, dip = [], None
+
+        if phases:
+            close()
+        return periods
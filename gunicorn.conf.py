@@ -0,0 +1,47 @@
+"""
+Gunicorn configuration
+
+The app is preloaded in the master so every immutable table (nakshatras, KP
+sub-lord boundaries, dignity/relationship matrices, labels) and the shared
+chart engines are built once and inherited copy-on-write by the workers.
+swisseph file handles are reopened in each worker after fork, and a warm-up
+chart is computed before the worker accepts traffic.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+# More than one thread selects the gthread worker; chart requests then wait in
+# the admission queue (services.admission) rather than in the socket backlog
+threads = int(os.environ.get("GUNICORN_THREADS", "1"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "600"))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+
+# With preload the hooks below build and warm the engines; without it each
+# worker imports the app itself and warms up in a background thread.
+os.environ.setdefault("STARTUP_MODE", "lazy" if preload_app else "background")
+
+
+def when_ready(server):
+    """Master: build the shared engines once the preloaded app is imported"""
+    from services import runtime
+    runtime.initialize()
+
+
+def pre_fork(server, worker):
+    """Master: keep the shared objects out of the GC so workers don't dirty their pages"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker: never share swisseph file handles (and read offsets) with the master"""
+    from services import runtime
+    runtime.reopen_ephemeris()
+
+
+def post_worker_init(worker):
+    """Worker: warm up before entering the accept loop"""
+    from services import runtime
+    elapsed = runtime.warm_up()
+    worker.log.info("Worker %s warmed up in %.1f ms", worker.pid, elapsed * 1000)
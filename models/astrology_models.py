@@ -3,7 +3,7 @@ Astrology Models Module
 Contains data models for astrology calculations
 """
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from enum import Enum
 
 
@@ -70,6 +70,72 @@ class Nakshatra(Enum):
     REVATI = 27
 
 
+class TransitEventType(Enum):
+    """Kinds of transit events found by the event search"""
+    SIGN_INGRESS = "sign_ingress"
+    NAKSHATRA_INGRESS = "nakshatra_ingress"
+    RETROGRADE_STATION = "retrograde_station"
+    DIRECT_STATION = "direct_station"
+    NEW_MOON = "new_moon"
+    FULL_MOON = "full_moon"
+    TITHI_CHANGE = "tithi_change"
+
+
+class DashaLevel(Enum):
+    """Vimshottari dasha levels, outermost first"""
+    MAHA = 1
+    ANTAR = 2
+    PRATYANTAR = 3
+    SOOKSHMA = 4
+    PRANA = 5
+
+
+class TransitPeriodKind(Enum):
+    """Slow-graha transit periods counted from a natal sign"""
+    SADE_SATI = "sade_sati"              # Saturn in the 12th, 1st and 2nd from the Moon
+    ASHTAMA_SHANI = "ashtama_shani"      # Saturn in the 8th from the Moon
+    JUPITER_RETURN = "jupiter_return"    # Jupiter back in its natal sign
+
+
+class Ayanamsa(Enum):
+    """Selectable ayanamsas (sidereal zodiac origins)"""
+    LAHIRI = "lahiri"                    # Chitrapaksha, Indian government standard
+    LAHIRI_ICRC = "lahiri_icrc"
+    RAMAN = "raman"
+    KP = "kp"                            # Krishnamurti
+    KP_NEW = "kp_new"                    # Krishnamurti (VP291)
+    TRUE_CHITRA = "true_chitra"          # Spica at 180 degrees at every date
+    TRUE_PUSHYA = "true_pushya"
+    TRUE_REVATI = "true_revati"
+    YUKTESHWAR = "yukteshwar"
+    SURYASIDDHANTA = "suryasiddhanta"
+    FAGAN_BRADLEY = "fagan_bradley"
+
+
+class HouseSystem(Enum):
+    """Selectable house systems"""
+    WHOLE_SIGN = "whole_sign"            # Lagna sign is the 1st house
+    PLACIDUS = "placidus"
+    SRIPATI = "sripati"                  # Bhava madhya at the Porphyry cusps, sandhis between
+    EQUAL = "equal"                      # 30 degree houses from the lagna
+    PORPHYRY = "porphyry"
+    KOCH = "koch"
+
+
+class EphemerisMode(Enum):
+    """Sources of planetary positions"""
+    SWISS = "swiss"                      # Swiss Ephemeris .se1 files (JPL DE431 compressed)
+    MOSHIER = "moshier"                  # Analytic Moshier ephemeris, no file I/O
+
+
+class PanchangElement(Enum):
+    """Limbs of the panchang found by root-finding (vara follows the date)"""
+    TITHI = "tithi"
+    NAKSHATRA = "nakshatra"
+    YOGA = "yoga"
+    KARANA = "karana"
+
+
 @dataclass
 class UserDetails:
     """User birth details for chart calculation"""
@@ -80,6 +146,16 @@ class UserDetails:
     timezone: float  # Timezone offset in hours (e.g., 5.5 for IST, -5 for EST)
     place: str
     religion: Optional[str] = None
+    ayanamsa: str = Ayanamsa.LAHIRI.value
+    house_system: str = HouseSystem.WHOLE_SIGN.value
+    ephemeris: Optional[str] = None      # EphemerisMode value (None: the deployment's EPHEMERIS_MODE)
+    place_id: Optional[int] = None       # Gazetteer (GeoNames) id the location came from
+    timezone_name: Optional[str] = None  # IANA zone timezone was resolved from (None: a fixed offset)
+
+    @property
+    def zone(self) -> Union[float, str]:
+        """Timezone of other local instants (query dates): the IANA zone when given, else the offset"""
+        return self.timezone_name or self.timezone
 
 
 @dataclass
@@ -131,10 +207,20 @@ class NakshatraDetails:
     quality: str  # Rajas, Tamas, Sattva
 
 
+@dataclass
+class RiseSetTimes:
+    """Rising, setting and upper meridian transit of one body within one local date"""
+    rise_jd: Optional[float]         # Julian Day (UT); None when it does not rise that date
+    set_jd: Optional[float]          # None when it does not set that date
+    transit_jd: Optional[float]      # None when it does not culminate that date
+    always_up: bool = False          # Above the horizon all date (polar day for the Sun)
+    always_down: bool = False        # Below the horizon all date (polar night for the Sun)
+
+
 @dataclass
 class SunMoonShine:
     """Sun and Moon shine calculations"""
-    sunrise_time: str
+    sunrise_time: str                # Local ISO datetime on the birth date; "" when there is none
     sunset_time: str
     moonrise_time: str
     moonset_time: str
@@ -146,6 +232,8 @@ class SunMoonShine:
     sun_sign_sanskrit: Optional[str] = None  # Sanskrit name (Kanya)
     moon_sign: Optional[str] = None  # Sign name (Pisces)
     moon_sign_sanskrit: Optional[str] = None  # Sanskrit name (Meena)
+    polar_day: bool = False          # Sun above the horizon all birth date
+    polar_night: bool = False        # Sun below the horizon all birth date
 
 
 @dataclass
@@ -158,4 +246,192 @@ class D1Chart:
     nakshatra_details: List[NakshatraDetails]
     sun_moon_shine: SunMoonShine
     ayanamsa: float  # Ayanamsa value used
-    calculation_time: str  # UTC timestamp of calculation
\ No newline at end of file
+    calculation_time: str  # UTC timestamp of calculation
+    ephemeris: str = EphemerisMode.SWISS.value  # Ephemeris that served the positions
+
+@dataclass
+class DashaPeriod:
+    """One Vimshottari dasha period at any level"""
+    level: DashaLevel
+    lords: List[Planet]      # Mahadasha lord first, this period's lord last
+    path: Tuple[int, ...]    # Position of each period within its parent (0-8)
+    start_jd: float          # Julian Day (UT) the period starts
+    end_jd: float            # Julian Day (UT) the period ends
+
+    @property
+    def lord(self) -> Planet:
+        """Lord of this period"""
+        return self.lords[-1]
+
+
+@dataclass
+class DashaQuery:
+    """Validated dasha request: birth details plus window and pagination"""
+    user_details: UserDetails
+    level: DashaLevel
+    at_jd: float                          # Instant for the running-period chain
+    limit: int
+    start_jd: Optional[float] = None      # Window start (Julian Day, UT)
+    end_jd: Optional[float] = None        # Window end (Julian Day, UT)
+    after: Optional[Tuple[int, ...]] = None  # Pagination cursor (path of the last period returned)
+
+
+@dataclass
+class TransitEvent:
+    """One ingress or station of a graha, or a lunar event (reported for the Moon)"""
+    julian_day: float                # Julian Day (UT) of the event
+    planet: Planet
+    event_type: TransitEventType
+    longitude: float                 # Sidereal longitude at the event
+    retrograde: bool                 # Direction of motion after the event
+    sign: Zodiac                     # Sign entered (ingress) or occupied (station)
+    nakshatra: Nakshatra             # Nakshatra entered (ingress) or occupied (station)
+    previous_sign: Optional[Zodiac] = None          # Sign left (sign ingress only)
+    previous_nakshatra: Optional[Nakshatra] = None  # Nakshatra left (nakshatra ingress only)
+    tithi: Optional[int] = None                     # Tithi entered (lunar events only, 1-30)
+
+
+@dataclass
+class TransitPhase:
+    """One sign occupancy of the transiting graha within a transit period"""
+    name: str                        # e.g. "rising", "peak", "setting"; "outside" for a retrograde dip
+    sign: Zodiac
+    house: int                       # Sign counted from the natal sign (1-12)
+    start_jd: float                  # Ingress into the sign (Julian Day, UT)
+    end_jd: float                    # Ingress into the next sign
+    retrograde: bool                 # Sign entered while retrograde
+
+
+@dataclass
+class TransitPeriod:
+    """A transit period: from the first entry into its signs to the final exit"""
+    kind: TransitPeriodKind
+    planet: Planet
+    natal_sign: Zodiac               # Sign the houses are counted from
+    phases: List[TransitPhase]       # Consecutive, including retrograde dips outside the signs
+    truncated: bool = False          # Clipped by the edge of the precomputed span
+
+    @property
+    def start_jd(self) -> float:
+        """Julian Day (UT) of the first entry"""
+        return self.phases[0].start_jd
+
+    @property
+    def end_jd(self) -> float:
+        """Julian Day (UT) of the final exit"""
+        return self.phases[-1].end_jd
+
+    @property
+    def interrupted(self) -> bool:
+        """Whether a retrograde dip took the graha out of the period's signs"""
+        return any(phase.name == "outside" for phase in self.phases)
+
+
+@dataclass
+class TransitPeriodQuery:
+    """Validated transit period request: birth details plus window"""
+    user_details: UserDetails
+    kinds: List[TransitPeriodKind]
+    at_jd: float                          # Instant for the running periods
+    start_jd: Optional[float] = None      # Window start (Julian Day, UT); None = birth
+    end_jd: Optional[float] = None        # Window end (Julian Day, UT); None = DEFAULT_WINDOW_YEARS after start
+
+
+@dataclass
+class SynastryQuery:
+    """Validated synastry request: two birth records"""
+    first: UserDetails
+    second: UserDetails
+
+
+@dataclass
+class MatchQuery:
+    """Validated Ashtakoota matching request: one profile against columnar candidates"""
+    role: str                             # Role of the profile ("groom" or "bride")
+    timezone: float                       # Offset of the profile's birth datetime
+    candidate_padas: object               # numpy int array of candidate Moon padas (0-107)
+    top_k: int
+    min_score: float = 0.0
+    exclude_doshas: int = 0               # calculators.ashtakoota_calculator.DOSHAS bits
+    candidate_ids: Optional[list] = None  # Echoed back for the returned candidates
+    moon_longitude: Optional[float] = None  # Profile Moon (sidereal); None = from julian_day
+    julian_day: Optional[float] = None    # Profile birth instant (UT)
+
+
+@dataclass
+class EventQuery:
+    """Validated event calendar request"""
+    start_jd: float                                    # Range start (Julian Day, UT)
+    end_jd: float                                      # Range end (Julian Day, UT)
+    timezone: float                                    # Offset used for dates in the response
+    limit: int
+    planets: Optional[List[Planet]] = None             # None = all nine grahas
+    event_types: Optional[List[TransitEventType]] = None  # None = every event type
+    after: Optional[float] = None                      # Pagination cursor (Julian Day of the last event returned)
+
+
+@dataclass
+class PanchangQuery:
+    """Validated panchang request: a location and a run of local dates"""
+    latitude: float
+    longitude: float
+    timezone: float                  # Offset of the local dates and of the response
+    start_date: str                  # First local date (YYYY-MM-DD)
+    days: int                        # Number of dates
+    stream: bool = False             # Stream blocks as NDJSON instead of one document
+
+
+@dataclass
+class HoraQuery:
+    """Validated hora/choghadiya request: a location and a local date or instant"""
+    latitude: float
+    longitude: float
+    timezone: float                  # Offset of the local date and of the response
+    date: str                        # Local date (YYYY-MM-DD) the day starts on
+    julian_day: Optional[float] = None  # Instant whose running day and segments are wanted
+
+
+@dataclass
+class LagnaTableQuery:
+    """Validated lagna table request: a location and a local date or instant"""
+    latitude: float
+    longitude: float
+    timezone: float                  # Offset of the local date and of the response
+    date: str                        # Local date (YYYY-MM-DD) of the table
+    julian_day: Optional[float] = None  # Instant whose running lagna divisions are wanted
+
+
+@dataclass
+class SkyQuery:
+    """Validated current-sky request: an optional observer"""
+    timezone: float                  # Offset of the response
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+@dataclass
+class TransitOverlayQuery:
+    """Validated transit overlay request: a transit instant and columnar natal points"""
+    timezone: float                  # Offset of the response
+    natal: object                    # calculators.transit_overlay.NatalColumns
+    julian_day: Optional[float] = None  # None = now, from the sky snapshot
+
+
+@dataclass
+class AstrocartographyQuery:
+    """Validated astrocartography request: one instant over a location grid or list"""
+    timezone: float                  # Offset of datetime and of the response
+    locations: object                # calculators.astrocartography.Locations
+    include: List[str]               # Any of angles, houses, lines
+    line_step: float                 # Latitude step of the ASC/DSC lines
+    planets: Optional[List[Planet]] = None      # None = all nine
+    location_ids: Optional[list] = None
+    julian_day: Optional[float] = None  # None = now, from the sky snapshot
+
+
+@dataclass
+class PlaceQuery:
+    """Validated place autocomplete request"""
+    query: str
+    limit: int
+    country: Optional[str] = None    # ISO 3166 alpha-2
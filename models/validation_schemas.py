@@ -1,9 +1,43 @@
 """
 Input validation schemas using Marshmallow
 """
-from marshmallow import Schema, fields, validate, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, pre_load, post_load, ValidationError
 import re
 
+from models.astrology_models import DashaLevel, TransitEventType, TransitPeriodKind, Ayanamsa, HouseSystem, EphemerisMode
+
+LOCAL_DATE_OR_DATETIME = r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}:\d{2})?$'
+
+# Placidus and Koch cusps do not exist inside the polar circles
+POLAR_HOUSE_SYSTEMS = (HouseSystem.PLACIDUS.value, HouseSystem.KOCH.value)
+POLAR_HOUSE_MAX_LATITUDE = 66.0
+
+
+class TimezoneField(fields.Field):
+    """A UTC offset in hours (-12 to 14) or an IANA zone name such as Asia/Kolkata"""
+
+    default_error_messages = {
+        "invalid": "Timezone must be an offset in hours or an IANA zone name (e.g., Asia/Kolkata)",
+        "range": "Timezone offset must be between -12 and 14 hours"
+    }
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        from utils.time_utils import timezone_table
+
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                try:
+                    return timezone_table(value).name
+                except ValueError:
+                    raise self.make_error("invalid")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise self.make_error("invalid")
+        if not -12 <= value <= 14:
+            raise self.make_error("range")
+        return float(value)
+
 
 class UserDetailsSchema(Schema):
     """Schema for validating user birth details"""
@@ -26,29 +60,460 @@ class UserDetailsSchema(Schema):
     latitude = fields.Float(
         required=True,
         validate=validate.Range(min=-90, max=90),
-        error_messages={"required": "Latitude is required"}
+        error_messages={"required": "Latitude is required (or give place_id)"}
     )
     
     longitude = fields.Float(
         required=True,
         validate=validate.Range(min=-180, max=180),
-        error_messages={"required": "Longitude is required"}
+        error_messages={"required": "Longitude is required (or give place_id)"}
     )
     
-    timezone = fields.Float(
+    timezone = TimezoneField(
         required=True,
-        validate=validate.Range(min=-12, max=14),
-        error_messages={"required": "Timezone offset is required (e.g., 5.5 for IST)"}
+        error_messages={"required": "Timezone offset or zone name is required (e.g., 5.5 or Asia/Kolkata, or give place_id)"}
     )
     
     place = fields.Str(
         required=True,
         validate=validate.Length(min=1, max=200),
-        error_messages={"required": "Place is required"}
+        error_messages={"required": "Place is required (or give place_id)"}
     )
+
+    place_id = fields.Int(strict=True, validate=validate.Range(min=1))
     
     religion = fields.Str(
         required=False,
         validate=validate.Length(max=50),
         allow_none=True
-    )
\ No newline at end of file
+    )
+
+    ayanamsa = fields.Str(
+        validate=validate.OneOf([ayanamsa.value for ayanamsa in Ayanamsa])
+    )
+
+    house_system = fields.Str(
+        validate=validate.OneOf([system.value for system in HouseSystem])
+    )
+
+    ephemeris = fields.Str(
+        validate=validate.OneOf([mode.value for mode in EphemerisMode])
+    )
+
+    @pre_load
+    def fill_place(self, data, **kwargs):
+        """Fill place, latitude, longitude and timezone from the gazetteer for a place_id"""
+        place_id = data.get("place_id") if isinstance(data, dict) else None
+        if not isinstance(place_id, int) or isinstance(place_id, bool):
+            return data
+        from services.runtime import get_gazetteer
+
+        gazetteer = get_gazetteer()
+        if gazetteer is None:
+            raise ValidationError("Place ids are not available on this deployment (no gazetteer)", "place_id")
+        place = gazetteer.get(place_id)
+        if place is None:
+            raise ValidationError(f"Unknown place id: {place_id}", "place_id")
+        # Fields given explicitly take precedence over the gazetteer's
+        return {
+            "place": place.label, "latitude": place.latitude, "longitude": place.longitude,
+            "timezone": place.timezone, **data
+        }
+
+    @validates_schema
+    def validate_house_system_latitude(self, data, **kwargs):
+        """Reject house systems that are undefined at the birth latitude"""
+        house_system = data.get("house_system")
+        if house_system in POLAR_HOUSE_SYSTEMS and abs(data.get("latitude", 0)) > POLAR_HOUSE_MAX_LATITUDE:
+            raise ValidationError(
+                f"{house_system} houses are available up to {POLAR_HOUSE_MAX_LATITUDE:g} degrees latitude",
+                "house_system"
+            )
+
+    @post_load
+    def resolve_timezone(self, data, **kwargs):
+        """
+        Replace an IANA zone name by the offset in effect at the birth datetime,
+        keeping the name (timezone_name) for other local instants of the request
+        """
+        from utils.time_utils import timezone_offset_hours
+
+        if isinstance(data.get("timezone"), str):
+            try:
+                data["timezone_name"] = data["timezone"]
+                data["timezone"] = timezone_offset_hours(data["datetime"], data["timezone"])
+            except ValueError as err:
+                raise ValidationError(str(err), "datetime")
+        return data
+
+
+class DashaRequestSchema(UserDetailsSchema):
+    """Schema for dasha requests: birth details plus window and pagination"""
+
+    level = fields.Str(
+        load_default="antar",
+        validate=validate.OneOf([level.name.lower() for level in DashaLevel])
+    )
+
+    start = fields.Str(
+        data_key="from",
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    end = fields.Str(
+        data_key="to",
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    at = fields.Str(
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    limit = fields.Int(
+        load_default=50,
+        validate=validate.Range(min=1, max=500)
+    )
+
+    cursor = fields.Str(
+        allow_none=True,
+        validate=validate.Regexp(
+            r'^[0-8](\.[0-8]){0,4}$',
+            error="Invalid cursor"
+        )
+    )
+
+
+class TransitPeriodRequestSchema(UserDetailsSchema):
+    """Schema for transit period requests: birth details plus window and kinds"""
+
+    kinds = fields.List(
+        fields.Str(validate=validate.OneOf([kind.value for kind in TransitPeriodKind])),
+        validate=validate.Length(min=1)
+    )
+
+    start = fields.Str(
+        data_key="from",
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    end = fields.Str(
+        data_key="to",
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    at = fields.Str(
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+
+class SynastryRequestSchema(Schema):
+    """Schema for synastry requests: two sets of birth details"""
+
+    first = fields.Nested(
+        UserDetailsSchema,
+        required=True,
+        error_messages={"required": "Birth details of the first person are required"}
+    )
+
+    second = fields.Nested(
+        UserDetailsSchema,
+        required=True,
+        error_messages={"required": "Birth details of the second person are required"}
+    )
+
+
+class MatchRequestSchema(Schema):
+    """Schema for Ashtakoota matching: one profile Moon against candidate columns"""
+
+    role = fields.Str(
+        required=True,
+        validate=validate.OneOf(["groom", "bride"]),
+        error_messages={"required": "Role of the profile (groom or bride) is required"}
+    )
+
+    datetime = fields.Str(
+        validate=validate.Regexp(
+            r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$',
+            error="Invalid datetime format. Use YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    timezone = fields.Float(
+        load_default=0.0,
+        validate=validate.Range(min=-12, max=14)
+    )
+
+    moon_longitude = fields.Float(validate=validate.Range(min=0, max=360, max_inclusive=False))
+
+    # Candidate columns are JSON lists checked as whole arrays by the route
+    candidates = fields.Dict(
+        required=True,
+        error_messages={"required": "Candidate columns are required"}
+    )
+
+    top_k = fields.Int(
+        load_default=10,
+        validate=validate.Range(min=1, max=500)
+    )
+
+    min_score = fields.Float(
+        load_default=0.0,
+        validate=validate.Range(min=0, max=36)
+    )
+
+    exclude_doshas = fields.List(
+        fields.Str(validate=validate.OneOf(["nadi", "bhakoot", "gana"]))
+    )
+
+
+class EventRequestSchema(Schema):
+    """Schema for event calendar requests: a local date range and optional filters"""
+
+    start = fields.Str(
+        data_key="from",
+        required=True,
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        ),
+        error_messages={"required": "Range start ('from') is required"}
+    )
+
+    end = fields.Str(
+        data_key="to",
+        required=True,
+        validate=validate.Regexp(
+            LOCAL_DATE_OR_DATETIME,
+            error="Invalid date format. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS"
+        ),
+        error_messages={"required": "Range end ('to') is required"}
+    )
+
+    timezone = fields.Float(
+        load_default=0.0,
+        validate=validate.Range(min=-12, max=14)
+    )
+
+    planets = fields.List(
+        fields.Str(validate=validate.OneOf([
+            "sun", "moon", "mars", "mercury", "jupiter", "venus", "saturn", "rahu", "ketu"
+        ])),
+        validate=validate.Length(min=1)
+    )
+
+    types = fields.List(
+        fields.Str(validate=validate.OneOf([event_type.value for event_type in TransitEventType])),
+        validate=validate.Length(min=1)
+    )
+
+    limit = fields.Int(
+        load_default=500,
+        validate=validate.Range(min=1, max=5000)
+    )
+
+    cursor = fields.Str(
+        allow_none=True,
+        validate=validate.Regexp(
+            r'^\d+(\.\d+)?$',
+            error="Invalid cursor"
+        )
+    )
+
+
+class PanchangRequestSchema(Schema):
+    """Schema for panchang requests: a location and an inclusive range of local dates"""
+
+    latitude = fields.Float(
+        required=True,
+        validate=validate.Range(min=-90, max=90),
+        error_messages={"required": "Latitude is required"}
+    )
+
+    longitude = fields.Float(
+        required=True,
+        validate=validate.Range(min=-180, max=180),
+        error_messages={"required": "Longitude is required"}
+    )
+
+    timezone = fields.Float(
+        required=True,
+        validate=validate.Range(min=-12, max=14),
+        error_messages={"required": "Timezone offset is required (e.g., 5.5 for IST)"}
+    )
+
+    start = fields.Str(
+        data_key="from",
+        required=True,
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}$', error="Invalid date format. Use YYYY-MM-DD"),
+        error_messages={"required": "First date ('from') is required"}
+    )
+
+    end = fields.Str(
+        data_key="to",
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}$', error="Invalid date format. Use YYYY-MM-DD")
+    )
+
+    stream = fields.Bool(load_default=False)
+
+
+class HoraRequestSchema(Schema):
+    """Schema for hora/choghadiya requests: a location and a local date or instant"""
+
+    latitude = fields.Float(
+        required=True,
+        validate=validate.Range(min=-90, max=90),
+        error_messages={"required": "Latitude is required"}
+    )
+
+    longitude = fields.Float(
+        required=True,
+        validate=validate.Range(min=-180, max=180),
+        error_messages={"required": "Longitude is required"}
+    )
+
+    timezone = fields.Float(
+        required=True,
+        validate=validate.Range(min=-12, max=14),
+        error_messages={"required": "Timezone offset is required (e.g., 5.5 for IST)"}
+    )
+
+    date = fields.Str(
+        validate=validate.Regexp(r'^\d{4}-\d{2}-\d{2}$', error="Invalid date format. Use YYYY-MM-DD")
+    )
+
+    datetime = fields.Str(
+        validate=validate.Regexp(
+            r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$',
+            error="Invalid datetime format. Use YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+
+class LagnaTableRequestSchema(HoraRequestSchema):
+    """Schema for lagna table requests: a location and a local date or instant"""
+
+
+class SkyRequestSchema(Schema):
+    """Schema for current-sky requests: a timezone and an optional observer"""
+
+    timezone = fields.Float(
+        required=True,
+        validate=validate.Range(min=-12, max=14),
+        error_messages={"required": "Timezone offset is required (e.g., 5.5 for IST)"}
+    )
+
+    latitude = fields.Float(validate=validate.Range(min=-90, max=90))
+
+    longitude = fields.Float(validate=validate.Range(min=-180, max=180))
+
+
+class TransitOverlayRequestSchema(Schema):
+    """Schema for bulk transit overlays: a transit instant and columnar natal points"""
+
+    datetime = fields.Str(
+        validate=validate.Regexp(
+            r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$',
+            error="Invalid datetime format. Use YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    timezone = fields.Float(
+        load_default=0.0,
+        validate=validate.Range(min=-12, max=14)
+    )
+
+    # Natal columns are JSON lists checked as whole arrays by the route
+    # (per-item marshmallow validation would dominate a large request)
+    moon_longitude = fields.Raw()
+
+    lagna_longitude = fields.Raw()
+
+    moon_sign = fields.Raw()
+
+    lagna_sign = fields.Raw()
+
+
+class LocationGridSchema(Schema):
+    """Schema for a regular latitude/longitude grid (ranges inclusive)"""
+
+    lat_min = fields.Float(load_default=-89.0, validate=validate.Range(min=-89.9, max=89.9))
+
+    lat_max = fields.Float(load_default=89.0, validate=validate.Range(min=-89.9, max=89.9))
+
+    lon_min = fields.Float(load_default=-180.0, validate=validate.Range(min=-180, max=180))
+
+    lon_max = fields.Float(load_default=179.0, validate=validate.Range(min=-180, max=180))
+
+    step = fields.Float(load_default=1.0, validate=validate.Range(min=0.1, max=30))
+
+
+class AstrocartographyRequestSchema(Schema):
+    """Schema for astrocartography: one instant over a location grid or list"""
+
+    datetime = fields.Str(
+        validate=validate.Regexp(
+            r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}$',
+            error="Invalid datetime format. Use YYYY-MM-DDTHH:MM:SS"
+        )
+    )
+
+    timezone = fields.Float(
+        load_default=0.0,
+        validate=validate.Range(min=-12, max=14)
+    )
+
+    grid = fields.Nested(LocationGridSchema)
+
+    # Location columns are JSON lists checked as whole arrays by the route
+    locations = fields.Dict()
+
+    planets = fields.List(
+        fields.Str(validate=validate.OneOf([
+            "sun", "moon", "mars", "mercury", "jupiter", "venus", "saturn", "rahu", "ketu"
+        ])),
+        validate=validate.Length(min=1)
+    )
+
+    include = fields.List(
+        fields.Str(validate=validate.OneOf(["angles", "houses", "lines"])),
+        validate=validate.Length(min=1)
+    )
+
+    line_step = fields.Float(load_default=1.0, validate=validate.Range(min=0.1, max=10))
+
+
+class PlaceSearchSchema(Schema):
+    """Schema for place autocomplete query strings"""
+
+    q = fields.Str(
+        required=True,
+        validate=validate.Length(min=1, max=100),
+        error_messages={"required": "Query ('q') is required"}
+    )
+
+    limit = fields.Int(
+        load_default=10,
+        validate=validate.Range(min=1, max=50)
+    )
+
+    country = fields.Str(
+        validate=validate.Regexp(r'^[A-Za-z]{2}$', error="Country must be an ISO 3166 alpha-2 code")
+    )
@@ -4,5 +4,18 @@ Contains all API route blueprints for different chart types
 """
 from .d1_routes import d1_bp
 from .d9_routes import d9_bp
+from .synastry_routes import synastry_bp
+from .dasha_routes import dasha_bp
+from .events_routes import events_bp
+from .panchang_routes import panchang_bp
+from .hora_routes import hora_bp
+from .lagna_table_routes import lagna_table_bp
+from .sky_routes import sky_bp
+from .transit_overlay_routes import transit_overlay_bp
+from .transit_period_routes import transit_periods_bp
+from .match_routes import match_bp
+from .astrocartography_routes import astrocartography_bp
+from .places_routes import places_bp
 
-__all__ = ['d1_bp', 'd9_bp']
+__all__ = ['d1_bp', 'd9_bp', 'synastry_bp', 'dasha_bp', 'events_bp', 'panchang_bp', 'hora_bp', 'lagna_table_bp', 'sky_bp', 'transit_overlay_bp',
+           'transit_periods_bp', 'match_bp', 'astrocartography_bp', 'places_bp']
@@ -0,0 +1,239 @@
+"""
+Astrocartography Routes
+Lagna, midheaven and houses of one instant over a location grid or city list,
+plus planet-on-angle lines
+"""
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the calculator and the sky snapshot are shared
+# process-wide, see services.runtime)
+astrocartography_bp = Blueprint('astrocartography', __name__, url_prefix='/api/v1')
+
+LOCATION_COLUMNS = ("latitude", "longitude", "id")
+INCLUDE = ("angles", "houses", "lines")
+
+
+@astrocartography_bp.route('/astrocartography', methods=['POST'])
+@admission_controlled("batch")
+def calculate_astrocartography():
+    """
+    Evaluate one instant over many locations
+
+    Request body:
+    {
+        "datetime": "string (optional) local instant YYYY-MM-DDTHH:MM:SS (default now)",
+        "timezone": "float (optional) offset of datetime and of the response (default 0)",
+        "grid": {
+            "lat_min": "float (default -89)", "lat_max": "float (default 89)",
+            "lon_min": "float (default -180)", "lon_max": "float (default 179)",
+            "step": "float (default 1) degrees"
+        },
+        "locations": {
+            "latitude": "list latitudes (instead of grid)",
+            "longitude": "list longitudes",
+            "id": "list (optional) identifiers echoed back"
+        },
+        "planets": "list (optional) grahas for houses and lines (default all nine)",
+        "include": "list (optional) any of angles, houses, lines (default all)",
+        "line_step": "float (optional) latitude step of the ASC/DSC lines (default 1)"
+    }
+    Without grid or locations the whole world is evaluated at 1 degree.
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_astrocartography_request)
+        if error:
+            return error
+
+        snapshot = runtime.get_sky_snapshot_service()
+        sky = snapshot.current() if query.julian_day is None else snapshot.compute(query.julian_day)
+        result = _astrocartography(sky, query)
+        response = _format_astrocartography_response((result, sky), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during astrocartography",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_astrocartography_request(json_data):
+    """
+    Validate an astrocartography request body (framework independent)
+
+    Returns:
+        Tuple of (AstrocartographyQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from calculators.astrocartography import Locations, MAX_LOCATIONS, WORLD_GRID
+    from models.astrology_models import AstrocartographyQuery, Planet
+    from utils.time_utils import local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("AstrocartographyRequestSchema"))
+    if error:
+        return None, error
+    if "grid" in validated_data and "locations" in validated_data:
+        return None, validation_error({"grid": ["Give either 'grid' or 'locations', not both"]})
+
+    location_ids = None
+    if "locations" in validated_data:
+        columns = validated_data["locations"]
+        unknown = sorted(set(columns) - set(LOCATION_COLUMNS))
+        if unknown:
+            return None, validation_error({"locations": [f"Unknown columns: {', '.join(unknown)}"]})
+        if "latitude" not in columns or "longitude" not in columns:
+            return None, validation_error({"locations": ["Give latitude and longitude lists"]})
+        coordinates = {}
+        for name, limit in (("latitude", 89.9), ("longitude", 180.0)):
+            column, message = _coordinate_column(columns[name], limit)
+            if message:
+                return None, validation_error({f"locations.{name}": [message]})
+            coordinates[name] = column
+        location_ids = columns.get("id")
+        if location_ids is not None and (not isinstance(location_ids, list) or any(
+                not isinstance(value, (str, int)) or isinstance(value, bool) for value in location_ids)):
+            return None, validation_error({"locations.id": ["Must be a list of strings or integers"]})
+        lengths = {len(coordinates["latitude"]), len(coordinates["longitude"])}
+        if location_ids is not None:
+            lengths.add(len(location_ids))
+        if len(lengths) > 1:
+            return None, validation_error({"locations": ["All location columns must have the same length"]})
+        locations = Locations.points(coordinates["latitude"], coordinates["longitude"])
+    else:
+        grid = validated_data.get("grid", WORLD_GRID)
+        if grid["lat_max"] < grid["lat_min"] or grid["lon_max"] < grid["lon_min"]:
+            return None, validation_error({"grid": ["Maximum must not be below minimum"]})
+        rows = (grid["lat_max"] - grid["lat_min"]) / grid["step"] + 1
+        columns = (grid["lon_max"] - grid["lon_min"]) / grid["step"] + 1
+        if rows * columns > MAX_LOCATIONS:
+            return None, validation_error({"grid": [f"At most {MAX_LOCATIONS} grid points per request"]})
+        locations = Locations.grid(**grid)
+    if not 1 <= len(locations) <= MAX_LOCATIONS:
+        return None, validation_error({"locations": [f"Between 1 and {MAX_LOCATIONS} locations per request"]})
+
+    timezone_offset = validated_data["timezone"]
+    julian_day = None
+    if "datetime" in validated_data:
+        try:
+            julian_day = local_datetime_to_julian_day(validated_data["datetime"], timezone_offset)
+        except ValueError as err:
+            return None, validation_error({"datetime": [str(err)]})
+
+    planets = validated_data.get("planets")
+    return AstrocartographyQuery(
+        timezone=timezone_offset,
+        locations=locations,
+        include=list(dict.fromkeys(validated_data.get("include", INCLUDE))),
+        line_step=validated_data["line_step"],
+        planets=[Planet[name.upper()] for name in dict.fromkeys(planets)] if planets else None,
+        location_ids=location_ids,
+        julian_day=julian_day
+    ), None
+
+
+def _coordinate_column(values, limit):
+    """(numpy column, None) or (None, error message) for one coordinate list"""
+    import numpy as np
+
+    if not isinstance(values, list):
+        return None, "Must be a list"
+    try:
+        column = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None, "Must hold numbers"
+    if column.ndim != 1 or not (np.abs(column) <= limit).all():
+        return None, f"Must be within -{limit:g} and {limit:g}"
+    return column, None
+
+
+def _astrocartography(sky, query):
+    """Astrocartography of the query's locations at a sky state"""
+    return runtime.get_astrocartography_calculator().calculate(
+        sky, query.locations, query.planets, query.line_step, with_lines="lines" in query.include
+    )
+
+
+def _format_astrocartography_response(result, query):
+    """Format an Astrocartography as arrays shaped like the grid (or the location list)"""
+    import numpy as np
+
+    from models.astrology_models import Zodiac
+    from utils.time_utils import julian_day_to_local_datetime
+
+    chart, sky = result
+    locations = query.locations
+
+    def shaped(values):
+        return values.reshape(locations.shape + values.shape[1:]).tolist()
+
+    instant = {
+        "datetime": julian_day_to_local_datetime(sky.julian_day, query.timezone),
+        "julian_day": round(sky.julian_day, 8),
+        "source": "snapshot" if query.julian_day is None else "ephemeris",
+        "ayanamsa": round(sky.ayanamsa, 6),
+        "sidereal_time": round(sky.sidereal_time, 8)
+    }
+    planets = [
+        {
+            "planet": planet.name.title(),
+            "longitude": round(sky.planet(planet).longitude, 6),
+            "sign": sky.planet(planet).sign.name,
+            "right_ascension": round(float(right_ascension), 6),
+            "declination": round(float(declination), 6)
+        }
+        for planet, right_ascension, declination in zip(chart.planets, chart.right_ascension, chart.declination)
+    ]
+
+    if locations.grid_latitudes is not None:
+        location_data = {
+            "type": "grid",
+            "latitudes": np.round(locations.grid_latitudes, 6).tolist(),
+            "longitudes": np.round(locations.grid_longitudes, 6).tolist()
+        }
+    else:
+        location_data = {
+            "type": "list",
+            "latitude": locations.latitudes.tolist(),
+            "longitude": locations.longitudes.tolist()
+        }
+        if query.location_ids is not None:
+            location_data["id"] = query.location_ids
+
+    data = {
+        "instant": instant,
+        "planets": planets,
+        "locations": location_data,
+        "signs": [sign.name for sign in Zodiac]
+    }
+    if "angles" in query.include:
+        data["lagna_sign"] = shaped(chart.lagna_sign + 1)
+        data["lagna_longitude"] = shaped(np.round(chart.ascendant, 3))
+        # The MC depends on longitude only: one value per grid column
+        midheaven = chart.midheaven.reshape(locations.shape)[0] if locations.grid_latitudes is not None else chart.midheaven
+        data["midheaven_longitude"] = np.round(midheaven, 3).tolist()
+    if "houses" in query.include:
+        data["houses"] = {
+            planet.name.title(): shaped(chart.houses[:, index])
+            for index, planet in enumerate(chart.planets)
+        }
+    if "lines" in query.include:
+        data["lines"] = [
+            {
+                "planet": line.planet.name.title(),
+                "angle": line.angle,
+                "points": np.round(np.column_stack((line.latitudes, line.longitudes)), 4).tolist()
+            }
+            for line in chart.lines
+        ]
+
+    return {
+        "status": "success",
+        "data": data
+    }
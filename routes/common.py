@@ -0,0 +1,161 @@
+"""
+Common Route Helpers
+Request validation and JSON responses shared by the chart blueprints and the
+ASGI entry point
+
+Validation (marshmallow) is imported on first use to keep app import cheap.
+"""
+from flask import jsonify, request, Response
+from functools import wraps
+import json
+
+from services.admission import controller, Overloaded, ADMITTED_ENVIRON_KEY
+
+_schemas = {}
+
+
+def get_schema(schema_name: str):
+    """Return the shared instance of a schema from models.validation_schemas"""
+    schema = _schemas.get(schema_name)
+    if schema is None:
+        from models import validation_schemas
+        schema = getattr(validation_schemas, schema_name)()
+        _schemas[schema_name] = schema
+    return schema
+
+
+def get_user_schema():
+    """Return the shared UserDetailsSchema instance"""
+    return get_schema("UserDetailsSchema")
+
+
+def validation_error(details):
+    """Error payload and status for invalid request fields"""
+    return {
+        "error": "Validation failed",
+        "details": details,
+        "status": "error"
+    }, 400
+
+
+def validate_payload(json_data, schema):
+    """
+    Validate a request body against a marshmallow schema (framework independent)
+
+    Args:
+        json_data: Parsed request JSON
+        schema: Schema instance
+
+    Returns:
+        Tuple of (validated dict, None) on success or (None, (error payload, status)) on failure
+    """
+    from marshmallow import ValidationError
+
+    if not json_data:
+        return None, ({
+            "error": "No JSON data provided",
+            "status": "error"
+        }, 400)
+
+    try:
+        return schema.load(json_data), None
+    except ValidationError as err:
+        return None, validation_error(err.messages)
+
+
+def validate_user_details(json_data):
+    """
+    Validate a birth-details request body (framework independent)
+
+    Args:
+        json_data: Parsed request JSON
+
+    Returns:
+        Tuple of (UserDetails, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import UserDetails
+
+    validated_data, error = validate_payload(json_data, get_user_schema())
+    if error:
+        return None, error
+    return UserDetails(**validated_data), None
+
+
+def load_request(json_data, validator):
+    """
+    Run a framework-independent validator for a Flask view
+
+    Args:
+        json_data: Parsed request JSON
+        validator: Function returning (result, None) or (None, (error payload, status))
+
+    Returns:
+        Tuple of (result, None) on success or (None, error response) on failure
+    """
+    result, error = validator(json_data)
+    if error:
+        payload, status = error
+        return None, (jsonify(payload), status)
+    return result, None
+
+
+def load_user_details(json_data):
+    """
+    Validate a birth-details request body for a Flask view
+
+    Returns:
+        Tuple of (UserDetails, None) on success or (None, error response) on failure
+    """
+    return load_request(json_data, validate_user_details)
+
+
+def json_response(payload) -> Response:
+    """Serialize a response payload keeping non-ASCII symbols readable"""
+    return Response(
+        json.dumps(payload, ensure_ascii=False),
+        mimetype='application/json'
+    )
+
+
+def overloaded_payload(error: Overloaded):
+    """Response body and headers for a request shed by admission control"""
+    return {
+        "error": "Service overloaded, retry later",
+        "reason": error.reason,
+        "retry_after": error.retry_after,
+        "status": "error"
+    }, {"Retry-After": str(error.retry_after)}
+
+
+def request_endpoint_class(endpoint_class, json_data) -> str:
+    """Admission class of one request: a fixed class, or the class a function picks from the request JSON"""
+    return endpoint_class(json_data) if callable(endpoint_class) else endpoint_class
+
+
+def admission_controlled(endpoint_class):
+    """
+    Run a view inside an admission-control slot (see services.admission)
+
+    Requests already admitted by the ASGI entry point are not queued twice. The
+    class is recorded on the view as ``endpoint_class``, where the ASGI entry
+    point reads it.
+
+    Args:
+        endpoint_class: Priority class of the endpoint ("cached", "refined", "full", "batch"),
+            or a function of the request JSON returning one for endpoints whose
+            cost depends on the request
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.environ.get(ADMITTED_ENVIRON_KEY):
+                return view(*args, **kwargs)
+            try:
+                with controller.slot(request_endpoint_class(endpoint_class, request.get_json(silent=True))):
+                    return view(*args, **kwargs)
+            except Overloaded as e:
+                payload, headers = overloaded_payload(e)
+                return jsonify(payload), 503, headers
+        wrapper.endpoint_class = endpoint_class
+        return wrapper
+    return decorator
@@ -2,25 +2,18 @@
 D1 Chart Routes
 All D1 (Rashi/Birth chart) related endpoints
 """
-from flask import Blueprint, request, jsonify, Response
-from marshmallow import ValidationError
-import traceback
-import json
+from flask import Blueprint, request, jsonify
 
-from models.astrology_models import UserDetails, Planet
-from models.validation_schemas import UserDetailsSchema
-from calculators.d1_chart_calculator import D1ChartCalculator
-from utils.vedic_helper import VedicAstrologyHelper
+from routes.common import admission_controlled, load_user_details, json_response
+from services import runtime
 
-# Create blueprint
+# Create blueprint (chart engines are shared process-wide and initialised on
+# first use, see services.runtime)
 d1_bp = Blueprint('d1', __name__, url_prefix='/api/v1')
 
-# Initialize
-user_schema = UserDetailsSchema()
-calculator = D1ChartCalculator(ephe_path="./ephe")
-
 
 @d1_bp.route('/d1-chart', methods=['POST'])
+@admission_controlled("full")
 def calculate_d1_chart():
     """
     Calculate complete D1 chart with all details
@@ -31,36 +24,20 @@ def calculate_d1_chart():
         "datetime": "string (required) ISO format YYYY-MM-DDTHH:MM:SS",
         "latitude": "float (required) -90 to 90",
         "longitude": "float (required) -180 to 180",
-        "timezone": "float (required) hours offset",
+        "timezone": "float or string (required) hours offset or IANA zone name",
         "place": "string (required)",
         "religion": "string (optional)"
     }
     """
     try:
-        json_data = request.get_json()
-        if not json_data:
-            return jsonify({
-                "error": "No JSON data provided",
-                "status": "error"
-            }), 400
-        
-        try:
-            validated_data = user_schema.load(json_data)
-        except ValidationError as err:
-            return jsonify({
-                "error": "Validation failed",
-                "details": err.messages,
-                "status": "error"
-            }), 400
+        user_details, error = load_user_details(request.get_json())
+        if error:
+            return error
         
-        user_details = UserDetails(**validated_data)
-        d1_chart = calculator.calculate_d1_chart(user_details)
+        d1_chart = runtime.get_d1_calculator().calculate_d1_chart(user_details)
         response = _format_full_chart_response(d1_chart)
         
-        return Response(
-            json.dumps(response, ensure_ascii=False),
-            mimetype='application/json'
-        )
+        return json_response(response)
         
     except Exception as e:
         return jsonify({
@@ -71,6 +48,7 @@ def calculate_d1_chart():
 
 
 @d1_bp.route('/d1-chart-refined', methods=['POST'])
+@admission_controlled("refined")
 def calculate_d1_chart_refined():
     """
     Calculate D1 chart - simplified response with grahas only
@@ -79,30 +57,14 @@ def calculate_d1_chart_refined():
     Ruler of, Is In, B. Owner, Relationship, Dignities
     """
     try:
-        json_data = request.get_json()
-        if not json_data:
-            return jsonify({
-                "error": "No JSON data provided",
-                "status": "error"
-            }), 400
-        
-        try:
-            validated_data = user_schema.load(json_data)
-        except ValidationError as err:
-            return jsonify({
-                "error": "Validation failed",
-                "details": err.messages,
-                "status": "error"
-            }), 400
+        user_details, error = load_user_details(request.get_json())
+        if error:
+            return error
         
-        user_details = UserDetails(**validated_data)
-        d1_chart = calculator.calculate_d1_chart(user_details)
+        d1_chart = runtime.get_d1_calculator().calculate_d1_chart(user_details)
         response = _format_refined_chart_response(d1_chart)
         
-        return Response(
-            json.dumps(response, ensure_ascii=False),
-            mimetype='application/json'
-        )
+        return json_response(response)
         
     except Exception as e:
         return jsonify({
@@ -114,9 +76,10 @@ def calculate_d1_chart_refined():
 
 def _format_refined_chart_response(d1_chart):
     """Format D1 chart for refined endpoint"""
-    from services.swiss_ephemeris_service import SwissEphemerisService
+    from models.astrology_models import Planet
+    from services.swiss_ephemeris_service import NAKSHATRA_BY_NAME
+    from utils.vedic_helper import VedicAstrologyHelper
     helper = VedicAstrologyHelper()
-    ephe_service = SwissEphemerisService(ephe_path="./ephe")
     
     def format_longitude_dms(longitude, sign):
         degree_in_sign = longitude % 30
@@ -129,7 +92,7 @@ def _format_refined_chart_response(d1_chart):
     graha_table = []
 
     # Add Lagna first
-    lagna_nak_entry = next((n for n in ephe_service.nakshatras if n["name"] == d1_chart.lagna.nakshatra), None)
+    lagna_nak_entry = NAKSHATRA_BY_NAME.get(d1_chart.lagna.nakshatra)
     lagna_nak_lord = lagna_nak_entry["ruler"] if lagna_nak_entry else d1_chart.houses[0].ruler_planet
     lagna_sub_lord = helper.get_sub_lord(d1_chart.lagna.longitude, lagna_nak_lord)
     lagna_lord_field = f"{helper.get_sanskrit_planet_name(lagna_nak_lord)}, {helper.get_sanskrit_planet_name(lagna_sub_lord)}"
@@ -137,7 +100,7 @@ def _format_refined_chart_response(d1_chart):
     graha_dict = {}
     graha_dict["Graha"] = "Lagna"
     graha_dict["Longitude"] = format_longitude_dms(d1_chart.lagna.longitude, d1_chart.lagna.sign)
-    graha_dict["Nakshatra"] = f"{d1_chart.lagna.nakshatra.name.replace('_', ' ').title()} {d1_chart.lagna.nakshatra_pada}"
+    graha_dict["Nakshatra"] = f"{helper.get_nakshatra_label(d1_chart.lagna.nakshatra)} {d1_chart.lagna.nakshatra_pada}"
     graha_dict["Lord/Sub Lord"] = lagna_lord_field
     graha_dict["Ruler of"] = "-"
     graha_dict["Is In"] = 1
@@ -179,7 +142,7 @@ def _format_refined_chart_response(d1_chart):
         graha_dict = {}
         graha_dict["Graha"] = f"{symbol}{planet_pos.planet.name.title()}{retrograde_symbol}"
         graha_dict["Longitude"] = format_longitude_dms(planet_pos.longitude, planet_pos.sign)
-        graha_dict["Nakshatra"] = f"{planet_pos.nakshatra.name.replace('_', ' ').title()} {planet_pos.nakshatra_pada}"
+        graha_dict["Nakshatra"] = f"{helper.get_nakshatra_label(planet_pos.nakshatra)} {planet_pos.nakshatra_pada}"
         graha_dict["Lord/Sub Lord"] = lord_sub_lord
         graha_dict["Ruler of"] = ruler_of
         graha_dict["Is In"] = planet_pos.is_in_house if planet_pos.is_in_house else "-"
@@ -203,16 +166,23 @@ def _format_refined_chart_response(d1_chart):
             "Ketu": graha_table[9] if len(graha_table) > 9 else {},
             "Sunshine and Moonshine": {
                 "Sun Sign": f"{d1_chart.sun_moon_shine.sun_sign} ({d1_chart.sun_moon_shine.sun_sign_sanskrit} Rashi)",
-                "Moon Sign": f"{d1_chart.sun_moon_shine.moon_sign} ({d1_chart.sun_moon_shine.moon_sign_sanskrit} Rashi)"
+                "Moon Sign": f"{d1_chart.sun_moon_shine.moon_sign} ({d1_chart.sun_moon_shine.moon_sign_sanskrit} Rashi)",
+                "Sunrise": d1_chart.sun_moon_shine.sunrise_time or None,
+                "Sunset": d1_chart.sun_moon_shine.sunset_time or None,
+                "Moonrise": d1_chart.sun_moon_shine.moonrise_time or None,
+                "Moonset": d1_chart.sun_moon_shine.moonset_time or None
             },
-            "ayanamsa": round(d1_chart.ayanamsa, 6)
+            "ayanamsa": round(d1_chart.ayanamsa, 6),
+            "ayanamsa_system": d1_chart.user_details.ayanamsa,
+            "house_system": d1_chart.user_details.house_system,
+            "ephemeris": d1_chart.ephemeris
         }
     }
 
 
 def _format_full_chart_response(d1_chart):
     """Format D1 chart for full endpoint"""
-    from services.swiss_ephemeris_service import SwissEphemerisService
+    from utils.vedic_helper import VedicAstrologyHelper
     helper = VedicAstrologyHelper()
     
     def format_longitude_dms(longitude, sign):
@@ -234,7 +204,7 @@ def _format_full_chart_response(d1_chart):
             "graha": f"{symbol}{planet_pos.planet.name.title()}{retrograde_symbol}",
             "long": format_longitude_dms(planet_pos.longitude, planet_pos.sign),
             "long_dec": round(planet_pos.longitude, 6),
-            "nak": planet_pos.nakshatra.name.replace("_", " ").title(),
+            "nak": helper.get_nakshatra_label(planet_pos.nakshatra),
             "nak_pada": planet_pos.nakshatra_pada,
             "nak_lord": nak_lord_name,
             "sub_lord": sub_lord_name,
@@ -276,7 +246,7 @@ def _format_full_chart_response(d1_chart):
         "graha": "Lagna",
         "long": format_longitude_dms(d1_chart.lagna.longitude, d1_chart.lagna.sign),
         "long_dec": round(d1_chart.lagna.longitude, 6),
-        "nak": d1_chart.lagna.nakshatra.name.replace("_", " ").title(),
+        "nak": helper.get_nakshatra_label(d1_chart.lagna.nakshatra),
         "nak_pada": d1_chart.lagna.nakshatra_pada,
         "sign": d1_chart.lagna.sign.name,
         "deg": round(d1_chart.lagna.degree, 6)
@@ -288,6 +258,9 @@ def _format_full_chart_response(d1_chart):
             "lagna": lagna_data,
             "grahas": [format_planet(p) for p in d1_chart.planets],
             "bhavas": [format_house(h) for h in d1_chart.houses],
-            "ayanamsa": round(d1_chart.ayanamsa, 6)
+            "ayanamsa": round(d1_chart.ayanamsa, 6),
+            "ayanamsa_system": d1_chart.user_details.ayanamsa,
+            "house_system": d1_chart.user_details.house_system,
+            "ephemeris": d1_chart.ephemeris
         }
     }
@@ -3,27 +3,18 @@ D9 Chart (Navamsha) Routes
 All D9 divisional chart related endpoints
 Used for marriage, relationships, and partnerships analysis
 """
-from flask import Blueprint, request, jsonify, Response
-from marshmallow import ValidationError
-import traceback
-import json
+from flask import Blueprint, request, jsonify
 
-from models.astrology_models import UserDetails, Planet
-from models.validation_schemas import UserDetailsSchema
-from calculators.d1_chart_calculator import D1ChartCalculator
-from calculators.d9_chart_calculator import D9ChartCalculator
-from utils.vedic_helper import VedicAstrologyHelper
+from routes.common import admission_controlled, load_user_details, json_response
+from services import runtime
 
-# Create blueprint
+# Create blueprint (chart engines are shared process-wide and initialised on
+# first use, see services.runtime)
 d9_bp = Blueprint('d9', __name__, url_prefix='/api/v1')
 
-# Initialize
-user_schema = UserDetailsSchema()
-d1_calculator = D1ChartCalculator(ephe_path="./ephe")
-d9_calculator = D9ChartCalculator(ephe_path="./ephe")
-
 
 @d9_bp.route('/d9-chart', methods=['POST'])
+@admission_controlled("full")
 def calculate_d9_chart():
     """
     Calculate complete D9 (Navamsha) chart with all details
@@ -35,42 +26,26 @@ def calculate_d9_chart():
         "datetime": "string (required) ISO format YYYY-MM-DDTHH:MM:SS",
         "latitude": "float (required) -90 to 90",
         "longitude": "float (required) -180 to 180",
-        "timezone": "float (required) hours offset",
+        "timezone": "float or string (required) hours offset or IANA zone name",
         "place": "string (required)",
         "religion": "string (optional)"
     }
     """
     try:
-        json_data = request.get_json()
-        if not json_data:
-            return jsonify({
-                "error": "No JSON data provided",
-                "status": "error"
-            }), 400
-        
-        try:
-            validated_data = user_schema.load(json_data)
-        except ValidationError as err:
-            return jsonify({
-                "error": "Validation failed",
-                "details": err.messages,
-                "status": "error"
-            }), 400
+        user_details, error = load_user_details(request.get_json())
+        if error:
+            return error
         
-        user_details = UserDetails(**validated_data)
         
         # Calculate D1 first
-        d1_chart = d1_calculator.calculate_d1_chart(user_details)
+        d1_chart = runtime.get_d1_calculator().calculate_d1_chart(user_details)
         
         # Calculate D9 using D1
-        d9_data = d9_calculator.calculate_d9_chart(user_details, d1_chart)
+        d9_data = runtime.get_d9_calculator().calculate_d9_chart(user_details, d1_chart)
         
         response = _format_full_d9_response(d9_data)
         
-        return Response(
-            json.dumps(response, ensure_ascii=False),
-            mimetype='application/json'
-        )
+        return json_response(response)
         
     except Exception as e:
         return jsonify({
@@ -81,6 +56,7 @@ def calculate_d9_chart():
 
 
 @d9_bp.route('/d9-chart-refined', methods=['POST'])
+@admission_controlled("refined")
 def calculate_d9_chart_refined():
     """
     Calculate D9 chart - simplified response with grahas only
@@ -89,36 +65,20 @@ def calculate_d9_chart_refined():
     Ruler of, Is In, B. Owner, Relationship, Dignities
     """
     try:
-        json_data = request.get_json()
-        if not json_data:
-            return jsonify({
-                "error": "No JSON data provided",
-                "status": "error"
-            }), 400
-        
-        try:
-            validated_data = user_schema.load(json_data)
-        except ValidationError as err:
-            return jsonify({
-                "error": "Validation failed",
-                "details": err.messages,
-                "status": "error"
-            }), 400
+        user_details, error = load_user_details(request.get_json())
+        if error:
+            return error
         
-        user_details = UserDetails(**validated_data)
         
         # Calculate D1 first
-        d1_chart = d1_calculator.calculate_d1_chart(user_details)
+        d1_chart = runtime.get_d1_calculator().calculate_d1_chart(user_details)
         
         # Calculate D9 using D1
-        d9_data = d9_calculator.calculate_d9_chart(user_details, d1_chart)
+        d9_data = runtime.get_d9_calculator().calculate_d9_chart(user_details, d1_chart)
         
         response = _format_refined_d9_response(d9_data)
         
-        return Response(
-            json.dumps(response, ensure_ascii=False),
-            mimetype='application/json'
-        )
+        return json_response(response)
         
     except Exception as e:
         return jsonify({
@@ -130,9 +90,10 @@ def calculate_d9_chart_refined():
 
 def _format_refined_d9_response(d9_data):
     """Format D9 chart for refined endpoint"""
-    from services.swiss_ephemeris_service import SwissEphemerisService
+    from models.astrology_models import Planet
+    from services.swiss_ephemeris_service import NAKSHATRA_BY_NAME
+    from utils.vedic_helper import VedicAstrologyHelper
     helper = VedicAstrologyHelper()
-    ephe_service = SwissEphemerisService(ephe_path="./ephe")
     
     def format_longitude_dms(longitude, sign):
         degree_in_sign = longitude % 30
@@ -146,7 +107,7 @@ def _format_refined_d9_response(d9_data):
 
     # Add D9 Lagna first
     d9_lagna = d9_data["d9_lagna"]
-    lagna_nak_entry = next((n for n in ephe_service.nakshatras if n["name"] == d9_lagna.nakshatra), None)
+    lagna_nak_entry = NAKSHATRA_BY_NAME.get(d9_lagna.nakshatra)
     lagna_nak_lord = lagna_nak_entry["ruler"] if lagna_nak_entry else d9_data["d9_houses"][0].ruler_planet
     lagna_sub_lord = helper.get_sub_lord(d9_lagna.longitude, lagna_nak_lord)
     lagna_lord_field = f"{helper.get_sanskrit_planet_name(lagna_nak_lord)}, {helper.get_sanskrit_planet_name(lagna_sub_lord)}"
@@ -154,7 +115,7 @@ def _format_refined_d9_response(d9_data):
     graha_dict = {}
     graha_dict["Graha"] = "Lagna (D9)"
     graha_dict["Longitude"] = format_longitude_dms(d9_lagna.longitude, d9_lagna.sign)
-    graha_dict["Nakshatra"] = f"{d9_lagna.nakshatra.name.replace('_', ' ').title()}"
+    graha_dict["Nakshatra"] = f"{helper.get_nakshatra_label(d9_lagna.nakshatra)}"
     graha_dict["Nakshatra Pada"] = d9_lagna.nakshatra_pada
     graha_dict["Lord/Sub Lord"] = lagna_lord_field
     graha_dict["Ruler of"] = "-"
@@ -197,7 +158,7 @@ def _format_refined_d9_response(d9_data):
         graha_dict = {}
         graha_dict["Graha"] = f"{symbol}{planet_pos.planet.name.title()}{retrograde_symbol}"
         graha_dict["Longitude"] = format_longitude_dms(planet_pos.longitude, planet_pos.sign)
-        graha_dict["Nakshatra"] = f"{planet_pos.nakshatra.name.replace('_', ' ').title()}"
+        graha_dict["Nakshatra"] = f"{helper.get_nakshatra_label(planet_pos.nakshatra)}"
         graha_dict["Nakshatra Pada"] = planet_pos.nakshatra_pada
         graha_dict["Lord/Sub Lord"] = lord_sub_lord
         graha_dict["Ruler of"] = ruler_of
@@ -227,6 +188,7 @@ def _format_refined_d9_response(d9_data):
 
 def _format_full_d9_response(d9_data):
     """Format D9 chart for full endpoint"""
+    from utils.vedic_helper import VedicAstrologyHelper
     helper = VedicAstrologyHelper()
     
     def format_longitude_dms(longitude, sign):
@@ -248,7 +210,7 @@ def _format_full_d9_response(d9_data):
             "graha": f"{symbol}{planet_pos.planet.name.title()}{retrograde_symbol}",
             "long": format_longitude_dms(planet_pos.longitude, planet_pos.sign),
             "long_dec": round(planet_pos.longitude, 6),
-            "nak": planet_pos.nakshatra.name.replace("_", " ").title(),
+            "nak": helper.get_nakshatra_label(planet_pos.nakshatra),
             "nak_pada": planet_pos.nakshatra_pada,
             "nak_lord": nak_lord_name,
             "sub_lord": sub_lord_name,
@@ -280,7 +242,7 @@ def _format_full_d9_response(d9_data):
         "graha": "Lagna (D9)",
         "long": format_longitude_dms(d9_lagna.longitude, d9_lagna.sign),
         "long_dec": round(d9_lagna.longitude, 6),
-        "nak": d9_lagna.nakshatra.name.replace("_", " ").title(),
+        "nak": helper.get_nakshatra_label(d9_lagna.nakshatra),
         "nak_pada": d9_lagna.nakshatra_pada,
         "sign": d9_lagna.sign.name,
         "deg": round(d9_lagna.degree, 6)
@@ -293,6 +255,8 @@ def _format_full_d9_response(d9_data):
             "lagna": lagna_data,
             "grahas": [format_planet(p) for p in d9_data["d9_planets"]],
             "bhavas": [format_house(h) for h in d9_data["d9_houses"]],
-            "ayanamsa": round(d9_data["ayanamsa"], 6)
+            "ayanamsa": round(d9_data["ayanamsa"], 6),
+            "ayanamsa_system": d9_data["d1_chart"].user_details.ayanamsa,
+            "ephemeris": d9_data["d1_chart"].ephemeris
         }
     }
@@ -0,0 +1,155 @@
+"""
+Dasha Routes
+Vimshottari dasha periods with date windows and cursor pagination
+"""
+from itertools import islice
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (chart engines are shared process-wide and initialised on
+# first use, see services.runtime)
+dasha_bp = Blueprint('dasha', __name__, url_prefix='/api/v1')
+
+DASHA_QUERY_FIELDS = ("level", "start", "end", "at", "limit", "cursor")
+
+
+@dasha_bp.route('/dasha', methods=['POST'])
+@admission_controlled("refined")
+def calculate_dasha():
+    """
+    Calculate Vimshottari dasha periods
+
+    Request body (birth details as for /d1-chart, plus):
+    {
+        "level": "string (optional) maha | antar | pratyantar | sookshma | prana (default antar)",
+        "from": "string (optional) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS",
+        "to": "string (optional) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS",
+        "at": "string (optional) instant for the running periods (default now)",
+        "limit": "int (optional) 1-500 periods per page (default 50)",
+        "cursor": "string (optional) next_cursor of the previous page"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_dasha_request)
+        if error:
+            return error
+
+        dasha = runtime.get_dasha_calculator().calculate_dasha(query.user_details)
+        response = _format_dasha_response(dasha, query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during dasha calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_dasha_request(json_data):
+    """
+    Validate a dasha request body (framework independent)
+
+    Returns:
+        Tuple of (DashaQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import UserDetails, DashaLevel, DashaQuery
+    from utils.time_utils import current_julian_day, local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("DashaRequestSchema"))
+    if error:
+        return None, error
+
+    options = {name: validated_data.pop(name, None) for name in DASHA_QUERY_FIELDS}
+    user_details = UserDetails(**validated_data)
+    level = DashaLevel[options["level"].upper()]
+
+    try:
+        start_jd, end_jd, at_jd = (
+            local_datetime_to_julian_day(options[name], user_details.zone) if options[name] else None
+            for name in ("start", "end", "at")
+        )
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+    if start_jd is not None and end_jd is not None and end_jd <= start_jd:
+        return None, validation_error({"to": ["Must be later than 'from'"]})
+
+    after = None
+    if options["cursor"]:
+        after = tuple(int(index) for index in options["cursor"].split("."))
+        if len(after) != level.value:
+            return None, validation_error({"cursor": ["Cursor does not match the requested level"]})
+
+    return DashaQuery(
+        user_details=user_details,
+        level=level,
+        at_jd=at_jd if at_jd is not None else current_julian_day(),
+        limit=options["limit"],
+        start_jd=start_jd,
+        end_jd=end_jd,
+        after=after
+    ), None
+
+
+def _format_dasha_response(dasha, query):
+    """Format one page of dasha periods plus the running periods at query.at_jd"""
+    from utils.time_utils import julian_day_to_local_datetime
+
+    # Per-instant offsets when the birth timezone was an IANA zone
+    timezone = query.user_details.zone
+
+    def format_date(julian_day):
+        return julian_day_to_local_datetime(julian_day, timezone) if julian_day is not None else None
+
+    def format_period(period):
+        return {
+            "level": period.level.name.lower(),
+            "lord": period.lord.name.title(),
+            "lords": [lord.name.title() for lord in period.lords],
+            "start": format_date(period.start_jd),
+            "end": format_date(period.end_jd),
+            "duration_days": round(period.end_jd - period.start_jd, 4),
+            "cursor": ".".join(str(index) for index in period.path)
+        }
+
+    # One extra period tells whether another page exists
+    page = list(islice(
+        dasha.periods(query.level, query.start_jd, query.end_jd, query.after),
+        query.limit + 1
+    ))
+    has_more = len(page) > query.limit
+    page = page[:query.limit]
+
+    return {
+        "status": "success",
+        "data": {
+            "system": "Vimshottari",
+            "moon_longitude": round(dasha.moon_longitude, 6),
+            "balance_at_birth": {
+                "lord": dasha.nakshatra_lord.name.title(),
+                "years": round(dasha.balance_years, 6)
+            },
+            "cycle": {
+                "start": format_date(dasha.cycle_start_jd),
+                "end": format_date(dasha.cycle_end_jd)
+            },
+            "current": {
+                "at": format_date(query.at_jd),
+                "periods": [format_period(period) for period in dasha.period_at(query.at_jd)]
+            },
+            "level": query.level.name.lower(),
+            "window": {
+                "from": format_date(query.start_jd),
+                "to": format_date(query.end_jd)
+            },
+            "periods": [format_period(period) for period in page],
+            "next_cursor": format_period(page[-1])["cursor"] if has_more else None
+        }
+    }
@@ -0,0 +1,170 @@
+"""
+Event Routes
+Transit and lunar events over a date range from the precomputed event calendar
+"""
+import os
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the calendar and the live search are shared process-wide,
+# see services.runtime)
+events_bp = Blueprint('events', __name__, url_prefix='/api/v1')
+
+# Longest part of a range (outside the precomputed calendar) searched live
+MAX_LIVE_SEARCH_DAYS = float(os.environ.get("EVENTS_MAX_LIVE_DAYS", str(10 * 366)))
+
+
+def events_endpoint_class(json_data) -> str:
+    """
+    Admission class of an events request
+
+    "cached" when the precomputed calendar covers the whole range (or the body
+    is invalid and is rejected without a search), "batch" when any part of it
+    is searched live.
+    """
+    query, error = validate_events_request(json_data)
+    if error:
+        return "cached"
+    start_jd = query.start_jd if query.after is None else max(query.start_jd, query.after)
+    return "batch" if _live_days(start_jd, query.end_jd) > 0 else "cached"
+
+
+@events_bp.route('/events', methods=['POST'])
+@admission_controlled(events_endpoint_class)
+def find_events():
+    """
+    List ingresses, stations and lunar events in a date range
+
+    Request body:
+    {
+        "from": "string (required) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS",
+        "to": "string (required) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS (exclusive)",
+        "timezone": "float (optional) offset of from/to and of the response (default 0)",
+        "planets": "list (optional) e.g. [\"saturn\", \"jupiter\"] (default all nine)",
+        "types": "list (optional) e.g. [\"sign_ingress\", \"new_moon\"] (default all)",
+        "limit": "int (optional) 1-5000 events per page (default 500)",
+        "cursor": "string (optional) next_cursor of the previous page"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_events_request)
+        if error:
+            return error
+
+        from services.event_calendar import find_events as stream_events, page_events
+
+        stream = stream_events(
+            query.start_jd, query.end_jd, query.planets, query.event_types,
+            runtime.get_event_calendar(), runtime.get_event_search(), query.after
+        )
+        response = _format_events_response(page_events(stream, query.limit), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during event search",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_events_request(json_data):
+    """
+    Validate an events request body (framework independent)
+
+    Returns:
+        Tuple of (EventQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import EventQuery, Planet, TransitEventType
+    from utils.time_utils import local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("EventRequestSchema"))
+    if error:
+        return None, error
+
+    timezone_offset = validated_data["timezone"]
+    try:
+        start_jd = local_datetime_to_julian_day(validated_data["start"], timezone_offset)
+        end_jd = local_datetime_to_julian_day(validated_data["end"], timezone_offset)
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+    if end_jd <= start_jd:
+        return None, validation_error({"to": ["Must be later than 'from'"]})
+
+    if _live_days(start_jd, end_jd) > MAX_LIVE_SEARCH_DAYS:
+        return None, validation_error({"to": [
+            f"At most {MAX_LIVE_SEARCH_DAYS:g} days outside the precomputed calendar can be searched"
+        ]})
+
+    planets = validated_data.get("planets")
+    event_types = validated_data.get("types")
+    return EventQuery(
+        start_jd=start_jd,
+        end_jd=end_jd,
+        timezone=timezone_offset,
+        limit=validated_data["limit"],
+        planets=[Planet[name.upper()] for name in dict.fromkeys(planets)] if planets else None,
+        event_types=[TransitEventType(name) for name in dict.fromkeys(event_types)] if event_types else None,
+        after=float(validated_data["cursor"]) if validated_data.get("cursor") else None
+    ), None
+
+
+def _live_days(start_jd: float, end_jd: float) -> float:
+    """Days of [start_jd, end_jd) outside the precomputed calendar (searched live)"""
+    calendar = runtime.get_event_calendar()
+    live_days = end_jd - start_jd
+    if calendar is not None:
+        live_days -= max(0.0, min(end_jd, calendar.end_jd) - max(start_jd, calendar.start_jd))
+    return live_days
+
+
+def _format_events_response(page_result, query):
+    """Format one page of events (see services.event_calendar.page_events)"""
+    from utils.time_utils import julian_day_to_local_datetime
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    page, cursor = page_result
+
+    def format_event(event, source):
+        formatted = {
+            "datetime": julian_day_to_local_datetime(event.julian_day, query.timezone),
+            "julian_day": round(event.julian_day, 6),
+            "planet": event.planet.name.title(),
+            "type": event.event_type.value,
+            "longitude": round(event.longitude, 6),
+            "retrograde": event.retrograde,
+            "sign": event.sign.name,
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(event.nakshatra),
+            "source": source
+        }
+        if event.previous_sign is not None:
+            formatted["previous_sign"] = event.previous_sign.name
+        if event.previous_nakshatra is not None:
+            formatted["previous_nakshatra"] = VedicAstrologyHelper.get_nakshatra_label(event.previous_nakshatra)
+        if event.tithi is not None:
+            formatted["tithi"] = event.tithi
+        return formatted
+
+    calendar = runtime.get_event_calendar()
+    return {
+        "status": "success",
+        "data": {
+            "from": julian_day_to_local_datetime(query.start_jd, query.timezone),
+            "to": julian_day_to_local_datetime(query.end_jd, query.timezone),
+            "timezone": query.timezone,
+            "calendar": {
+                "from": julian_day_to_local_datetime(calendar.start_jd, 0),
+                "to": julian_day_to_local_datetime(calendar.end_jd, 0)
+            } if calendar is not None else None,
+            "count": len(page),
+            "events": [format_event(event, source) for event, source in page],
+            "next_cursor": repr(cursor) if cursor is not None else None
+        }
+    }
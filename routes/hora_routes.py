@@ -0,0 +1,151 @@
+"""
+Hora Routes
+Planetary horas and choghadiya segments for a location and date or instant
+"""
+from datetime import date
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the hora calculator and its sunrise cache are shared
+# process-wide, see services.runtime)
+hora_bp = Blueprint('hora', __name__, url_prefix='/api/v1')
+
+
+@hora_bp.route('/hora', methods=['POST'])
+@admission_controlled("cached")
+def calculate_hora():
+    """
+    Calculate the 24 horas and 16 choghadiyas of a day
+
+    Request body:
+    {
+        "latitude": "float (required)",
+        "longitude": "float (required)",
+        "timezone": "float (required) offset of date/datetime and of the response",
+        "date": "string (optional) local date YYYY-MM-DD the day starts on",
+        "datetime": "string (optional) local YYYY-MM-DDTHH:MM:SS; the day running then, with current segments"
+    }
+    Without date or datetime the current instant is used.
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_hora_request)
+        if error:
+            return error
+
+        response = _format_hora_response(runtime.get_hora_calculator().calculate(query), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during hora calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_hora_request(json_data):
+    """
+    Validate a hora request body (framework independent)
+
+    Returns:
+        Tuple of (HoraQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import HoraQuery
+    from utils.time_utils import current_julian_day, julian_day_to_local_datetime, local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("HoraRequestSchema"))
+    if error:
+        return None, error
+    if "date" in validated_data and "datetime" in validated_data:
+        return None, validation_error({"date": ["Give either 'date' or 'datetime', not both"]})
+
+    timezone_offset = validated_data["timezone"]
+    try:
+        if "date" in validated_data:
+            local_date = date.fromisoformat(validated_data["date"]).isoformat()
+            julian_day = None
+        else:
+            julian_day = (local_datetime_to_julian_day(validated_data["datetime"], timezone_offset)
+                          if "datetime" in validated_data else current_julian_day())
+            local_date = julian_day_to_local_datetime(julian_day, timezone_offset)[:10]
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+
+    return HoraQuery(
+        latitude=validated_data["latitude"],
+        longitude=validated_data["longitude"],
+        timezone=timezone_offset,
+        date=local_date,
+        julian_day=julian_day
+    ), None
+
+
+def _format_hora_response(day, query):
+    """Format a HoraDay with its segments and, for an instant, the current ones"""
+    from calculators.hora_calculator import (
+        CHOGHADIYA_NAMES, CHOGHADIYA_QUALITIES, CHOGHADIYAS_PER_HALF, HORAS_PER_HALF, VARA_LORDS
+    )
+    from calculators.panchang_calculator import VARA_NAMES
+    from utils.time_utils import julian_day_to_local_datetime, julian_days_to_local_datetimes
+
+    hora_times = julian_days_to_local_datetimes(day.hora_bounds, query.timezone)
+    choghadiya_times = julian_days_to_local_datetimes(day.choghadiya_bounds, query.timezone)
+
+    horas = [
+        {
+            "number": i + 1,
+            "lord": lord.name.title(),
+            "part": "day" if i < HORAS_PER_HALF else "night",
+            "start": hora_times[i],
+            "end": hora_times[i + 1]
+        }
+        for i, lord in enumerate(day.hora_lords)
+    ]
+    choghadiyas = [
+        {
+            "number": i + 1,
+            "name": CHOGHADIYA_NAMES[lord],
+            "quality": CHOGHADIYA_QUALITIES[CHOGHADIYA_NAMES[lord]],
+            "lord": lord.name.title(),
+            "part": "day" if i < CHOGHADIYAS_PER_HALF else "night",
+            "start": choghadiya_times[i],
+            "end": choghadiya_times[i + 1]
+        }
+        for i, lord in enumerate(day.choghadiya_lords)
+    ]
+
+    data = {
+        "location": {
+            "latitude": query.latitude,
+            "longitude": query.longitude,
+            "timezone": query.timezone
+        },
+        "date": day.date,
+        "vara": VARA_NAMES[day.vara],
+        "vara_lord": VARA_LORDS[day.vara].name.title(),
+        "sunrise": hora_times[0],
+        "sunset": hora_times[HORAS_PER_HALF],
+        "next_sunrise": hora_times[-1],
+        "polar_day": day.polar_day,
+        "polar_night": day.polar_night,
+        "horas": horas,
+        "choghadiya": choghadiyas
+    }
+    if query.julian_day is not None:
+        data["current"] = {
+            "datetime": julian_day_to_local_datetime(query.julian_day, query.timezone),
+            "hora": horas[day.current_hora] if day.current_hora is not None else None,
+            "choghadiya": choghadiyas[day.current_choghadiya] if day.current_choghadiya is not None else None
+        }
+
+    return {
+        "status": "success",
+        "data": data
+    }
@@ -0,0 +1,160 @@
+"""
+Lagna Table Routes
+Every lagna sign, navamsha and nakshatra pada change of a local date
+"""
+from datetime import date
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the lagna table calculator and its cache are shared
+# process-wide, see services.runtime)
+lagna_table_bp = Blueprint('lagna_table', __name__, url_prefix='/api/v1')
+
+
+@lagna_table_bp.route('/lagna-table', methods=['POST'])
+@admission_controlled("cached")
+def calculate_lagna_table():
+    """
+    Calculate the lagna sign, navamsha and nakshatra pada changes of a day
+
+    Request body:
+    {
+        "latitude": "float (required) up to LAGNA_TABLE_MAX_LATITUDE (default 60) from the equator",
+        "longitude": "float (required)",
+        "timezone": "float (required) offset of date/datetime and of the response",
+        "date": "string (optional) local date YYYY-MM-DD",
+        "datetime": "string (optional) local YYYY-MM-DDTHH:MM:SS; its date, with the running divisions"
+    }
+    Without date or datetime the current instant is used.
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_lagna_table_request)
+        if error:
+            return error
+
+        table = runtime.get_lagna_table_calculator().table(query.date, query.latitude, query.longitude, query.timezone)
+        response = _format_lagna_table_response(table, query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during lagna table calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_lagna_table_request(json_data):
+    """
+    Validate a lagna table request body (framework independent)
+
+    Returns:
+        Tuple of (LagnaTableQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from calculators.lagna_table_calculator import MAX_LATITUDE
+    from models.astrology_models import LagnaTableQuery
+    from utils.time_utils import current_julian_day, julian_day_to_local_datetime, local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("LagnaTableRequestSchema"))
+    if error:
+        return None, error
+    if "date" in validated_data and "datetime" in validated_data:
+        return None, validation_error({"date": ["Give either 'date' or 'datetime', not both"]})
+    if abs(validated_data["latitude"]) > MAX_LATITUDE:
+        return None, validation_error({"latitude": [f"Lagna tables are available up to {MAX_LATITUDE:g} degrees latitude"]})
+
+    timezone_offset = validated_data["timezone"]
+    try:
+        if "date" in validated_data:
+            local_date = date.fromisoformat(validated_data["date"]).isoformat()
+            julian_day = None
+        else:
+            julian_day = (local_datetime_to_julian_day(validated_data["datetime"], timezone_offset)
+                          if "datetime" in validated_data else current_julian_day())
+            local_date = julian_day_to_local_datetime(julian_day, timezone_offset)[:10]
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+
+    return LagnaTableQuery(
+        latitude=validated_data["latitude"],
+        longitude=validated_data["longitude"],
+        timezone=timezone_offset,
+        date=local_date,
+        julian_day=julian_day
+    ), None
+
+
+def _format_lagna_table_response(table, query):
+    """Format every division segment of a LagnaTable and, for an instant, the running ones"""
+    from models.astrology_models import Nakshatra, Zodiac
+    from utils.time_utils import julian_day_to_local_datetime, julian_days_to_local_datetimes
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    def describe(division, index):
+        if division == "sign":
+            return {"sign": Zodiac(index + 1).name}
+        if division == "nakshatra":
+            return {"nakshatra": VedicAstrologyHelper.get_nakshatra_label(Nakshatra(index + 1))}
+        return {
+            "navamsha_sign": Zodiac(index % 12 + 1).name,
+            "sign": Zodiac(index // 9 + 1).name,
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(Nakshatra(index // 4 + 1)),
+            "nakshatra_pada": index % 4 + 1
+        }
+
+    def format_segment(division, segment, start, end):
+        return {
+            **describe(division, segment.index),
+            "start": start,
+            "end": end,
+            "start_jd": round(segment.start_jd, 8),
+            "minutes": round((segment.end_jd - segment.start_jd) * 1440, 3)
+        }
+
+    def format_division(division):
+        segments = table.segments(division)
+        times = julian_days_to_local_datetimes([s.start_jd for s in segments] + [table.end_jd], query.timezone)
+        return [
+            format_segment(division, segment, times[i], times[i + 1])
+            for i, segment in enumerate(segments)
+        ]
+
+    data = {
+        "location": {
+            "latitude": query.latitude,
+            "longitude": query.longitude,
+            "timezone": query.timezone
+        },
+        "date": table.date,
+        "start": julian_day_to_local_datetime(table.start_jd, query.timezone),
+        "end": julian_day_to_local_datetime(table.end_jd, query.timezone),
+        "end_jd": round(table.end_jd, 8),
+        "signs": format_division("sign"),
+        "nakshatras": format_division("nakshatra"),
+        "navamshas": format_division("navamsha")
+    }
+    if query.julian_day is not None:
+        running = table.at(query.julian_day)
+        data["current"] = {
+            "datetime": julian_day_to_local_datetime(query.julian_day, query.timezone),
+            **{
+                division: format_segment(
+                    division, segment,
+                    julian_day_to_local_datetime(segment.start_jd, query.timezone),
+                    julian_day_to_local_datetime(segment.end_jd, query.timezone)
+                )
+                for division, segment in running.items()
+            }
+        }
+
+    return {
+        "status": "success",
+        "data": data
+    }
@@ -0,0 +1,214 @@
+"""
+Match Routes
+Ashtakoota (Guna Milan) matching of one profile against many candidates
+"""
+import os
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the koota tables are built once per process, see
+# services.runtime)
+match_bp = Blueprint('match', __name__, url_prefix='/api/v1')
+
+# Most candidates scored in one request
+MAX_CANDIDATES = int(os.environ.get("MATCH_MAX_CANDIDATES", "100000"))
+CANDIDATE_COLUMNS = ("moon_longitude", "nakshatra", "pada", "id")
+
+
+@match_bp.route('/match', methods=['POST'])
+@admission_controlled("batch")
+def calculate_match():
+    """
+    Score one profile against many candidates and return the best matches
+
+    Request body:
+    {
+        "role": "string (required) groom | bride - role of the profile",
+        "datetime": "string (profile birth YYYY-MM-DDTHH:MM:SS, or give moon_longitude)",
+        "timezone": "float (optional) offset of datetime (default 0)",
+        "moon_longitude": "float (profile sidereal Moon, instead of datetime)",
+        "candidates": {
+            "moon_longitude": "list sidereal Moon longitudes, or",
+            "nakshatra": "list nakshatras 1-27 with",
+            "pada": "list padas 1-4",
+            "id": "list (optional) identifiers echoed back"
+        },
+        "top_k": "int (optional) 1-500 matches returned (default 10)",
+        "min_score": "float (optional) lowest total points (default 0)",
+        "exclude_doshas": "list (optional) any of nadi, bhakoot, gana"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_match_request)
+        if error:
+            return error
+
+        moon_longitude = query.moon_longitude
+        if moon_longitude is None:
+            moon_longitude = runtime.get_dasha_calculator().natal_moon_longitude(query.julian_day)
+        result = _match(moon_longitude, query)
+        response = _format_match_response((result, moon_longitude), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during matching",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_match_request(json_data):
+    """
+    Validate a matching request body (framework independent)
+
+    Returns:
+        Tuple of (MatchQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from calculators.ashtakoota_calculator import DOSHAS, longitude_to_pada, nakshatra_pada_to_pada
+    from models.astrology_models import MatchQuery
+    from utils.time_utils import local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("MatchRequestSchema"))
+    if error:
+        return None, error
+
+    if ("datetime" in validated_data) == ("moon_longitude" in validated_data):
+        return None, validation_error({"datetime": ["Give either datetime or moon_longitude"]})
+    julian_day = None
+    if "datetime" in validated_data:
+        try:
+            julian_day = local_datetime_to_julian_day(validated_data["datetime"], validated_data["timezone"])
+        except ValueError as err:
+            return None, validation_error({"datetime": [str(err)]})
+
+    candidates = validated_data["candidates"]
+    unknown = sorted(set(candidates) - set(CANDIDATE_COLUMNS))
+    if unknown:
+        return None, validation_error({"candidates": [f"Unknown columns: {', '.join(unknown)}"]})
+    columns = {}
+    for name in CANDIDATE_COLUMNS:
+        if name not in candidates:
+            continue
+        column, message = _candidate_column(name, candidates[name])
+        if message:
+            return None, validation_error({f"candidates.{name}": [message]})
+        columns[name] = column
+
+    if "moon_longitude" in columns:
+        if "nakshatra" in columns or "pada" in columns:
+            return None, validation_error({"candidates": ["Give moon_longitude or nakshatra and pada, not both"]})
+        padas = longitude_to_pada(columns["moon_longitude"])
+    elif "nakshatra" in columns and "pada" in columns:
+        padas = nakshatra_pada_to_pada(columns["nakshatra"], columns["pada"])
+    else:
+        return None, validation_error({"candidates": ["Give moon_longitude, or nakshatra and pada"]})
+
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        return None, validation_error({"candidates": ["All candidate columns must have the same length"]})
+    if not 1 <= len(padas) <= MAX_CANDIDATES:
+        return None, validation_error({"candidates": [f"Between 1 and {MAX_CANDIDATES} candidates per request"]})
+
+    return MatchQuery(
+        role=validated_data["role"],
+        timezone=validated_data["timezone"],
+        candidate_padas=padas,
+        top_k=validated_data["top_k"],
+        min_score=validated_data["min_score"],
+        exclude_doshas=sum(DOSHAS[name] for name in set(validated_data.get("exclude_doshas", []))),
+        candidate_ids=columns.get("id"),
+        moon_longitude=validated_data.get("moon_longitude"),
+        julian_day=julian_day
+    ), None
+
+
+def _candidate_column(name, values):
+    """(column, None) or (None, error message) for one candidate list"""
+    import numpy as np
+
+    if not isinstance(values, list):
+        return None, "Must be a list"
+    if name == "id":
+        if any(not isinstance(value, (str, int)) or isinstance(value, bool) for value in values):
+            return None, "Must hold strings or integers"
+        return values, None
+    if name == "moon_longitude":
+        try:
+            column = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            return None, "Must hold numbers"
+        if column.ndim != 1 or not ((column >= 0) & (column < 360)).all():
+            return None, "Longitudes must be in [0, 360)"
+        return column, None
+
+    highest = 27 if name == "nakshatra" else 4
+    if any(type(value) is not int or not 1 <= value <= highest for value in values):
+        return None, f"Must hold integers 1-{highest}"
+    return np.array(values, dtype=np.intp), None
+
+
+def _match(moon_longitude, query):
+    """Top-k MatchResult of the profile Moon against the query's candidates"""
+    from calculators.ashtakoota_calculator import longitude_to_pada
+
+    return runtime.get_ashtakoota_calculator().top_k(
+        int(longitude_to_pada(moon_longitude)), query.role, query.candidate_padas,
+        query.top_k, query.min_score, query.exclude_doshas
+    )
+
+
+def _format_match_response(result, query):
+    """Format the best matches with their koota breakdowns"""
+    from calculators.ashtakoota_calculator import MAX_POINTS, dosha_names
+    from models.astrology_models import Nakshatra, Zodiac
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    match, moon_longitude = result
+    calculator = runtime.get_ashtakoota_calculator()
+
+    def describe(pada):
+        return {
+            "sign": Zodiac(pada // 9 + 1).name,
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(Nakshatra(pada // 4 + 1)),
+            "nakshatra_pada": pada % 4 + 1
+        }
+
+    matches = []
+    for rank, (index, total, doshas) in enumerate(zip(
+            match.indices.tolist(), match.total.tolist(), match.doshas.tolist()), start=1):
+        pada = int(query.candidate_padas[index])
+        groom, bride = (match.profile_pada, pada) if match.role == "groom" else (pada, match.profile_pada)
+        entry = {
+            "rank": rank,
+            "index": index,
+            "total": total,
+            "kootas": calculator.breakdown(groom, bride),
+            "doshas": dosha_names(doshas),
+            **describe(pada)
+        }
+        if query.candidate_ids is not None:
+            entry["id"] = query.candidate_ids[index]
+        matches.append(entry)
+
+    return {
+        "status": "success",
+        "data": {
+            "profile": {
+                "role": match.role,
+                "moon_longitude": round(moon_longitude, 6),
+                **describe(match.profile_pada)
+            },
+            "max_points": MAX_POINTS,
+            "considered": match.considered,
+            "eligible": match.eligible,
+            "matches": matches
+        }
+    }
@@ -0,0 +1,202 @@
+"""
+Panchang Routes
+Daily panchang and exact limb transitions for a location over a range of dates
+"""
+import json
+import os
+from datetime import date
+
+from flask import Blueprint, Response, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+from services.admission import controller
+
+# Create blueprint (chart engines are shared process-wide and initialised on
+# first use, see services.runtime)
+panchang_bp = Blueprint('panchang', __name__, url_prefix='/api/v1')
+
+# Longest range answered as one JSON document / as a stream
+MAX_DOCUMENT_DAYS = int(os.environ.get("PANCHANG_MAX_DAYS", "366"))
+MAX_STREAM_DAYS = int(os.environ.get("PANCHANG_MAX_STREAM_DAYS", str(10 * 366)))
+# Each streamed block takes its own admission slot in this class
+STREAM_BLOCK_CLASS = "batch"
+
+
+@panchang_bp.route('/panchang', methods=['POST'])
+@admission_controlled("refined")
+def calculate_panchang():
+    """
+    Calculate the panchang for a location over a range of local dates
+
+    Request body:
+    {
+        "latitude": "float (required)",
+        "longitude": "float (required)",
+        "timezone": "float (required) offset of the dates and of the response",
+        "from": "string (required) first local date YYYY-MM-DD",
+        "to": "string (optional) last local date YYYY-MM-DD, inclusive (default from)",
+        "stream": "bool (optional) stream one NDJSON line per month (default false)"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_panchang_request)
+        if error:
+            return error
+
+        calculator = runtime.get_panchang_calculator()
+        if query.stream:
+            return Response(_stream_blocks(calculator, query), mimetype='application/x-ndjson')
+
+        response = _format_panchang_response(calculator.calculate(query), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during panchang calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def _stream_blocks(calculator, query):
+    """NDJSON lines of a streamed panchang, each block under its own admission slot"""
+    from services.admission import Overloaded
+
+    try:
+        for arguments in panchang_block_arguments(query):
+            with controller.slot(STREAM_BLOCK_CLASS):
+                block = calculator.calculate_block(*arguments)
+            yield format_stream_line(_format_panchang_block(block, query))
+    except Overloaded as e:
+        yield format_stream_line({"status": "error", "error": "Service overloaded, retry later", "reason": e.reason})
+    except Exception as e:
+        yield format_stream_line({
+            "status": "error",
+            "error": "Internal server error during panchang calculation",
+            "message": str(e)
+        })
+
+
+def panchang_block_arguments(query):
+    """calculate_block() arguments of every block of a streamed panchang"""
+    from calculators.panchang_calculator import PanchangCalculator
+
+    return [(query, *block) for block in PanchangCalculator.block_ranges(query)]
+
+
+def format_stream_line(payload) -> bytes:
+    """One NDJSON line"""
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def validate_panchang_request(json_data):
+    """
+    Validate a panchang request body (framework independent)
+
+    Returns:
+        Tuple of (PanchangQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import PanchangQuery
+
+    validated_data, error = validate_payload(json_data, get_schema("PanchangRequestSchema"))
+    if error:
+        return None, error
+
+    try:
+        first = date.fromisoformat(validated_data["start"])
+        last = date.fromisoformat(validated_data.get("end") or validated_data["start"])
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+
+    days = (last - first).days + 1
+    if days < 1:
+        return None, validation_error({"to": ["Must not be earlier than 'from'"]})
+    limit = MAX_STREAM_DAYS if validated_data["stream"] else MAX_DOCUMENT_DAYS
+    if days > limit:
+        return None, validation_error({"to": [
+            f"At most {limit} days per request" + ("" if validated_data["stream"] else "; use \"stream\": true")
+        ]})
+
+    return PanchangQuery(
+        latitude=validated_data["latitude"],
+        longitude=validated_data["longitude"],
+        timezone=validated_data["timezone"],
+        start_date=first.isoformat(),
+        days=days,
+        stream=validated_data["stream"]
+    ), None
+
+
+def _format_panchang_block(block, query):
+    """Columnar day and transition arrays of one PanchangBlock"""
+    from calculators.panchang_calculator import VARA_NAMES, YOGA_NAMES, tithi_name, paksha, karana_name
+    from models.astrology_models import Nakshatra, PanchangElement
+    from utils.time_utils import julian_days_to_local_datetimes
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    def local(julian_days):
+        return julian_days_to_local_datetimes(julian_days, query.timezone)
+
+    def names(element, numbers):
+        if element == PanchangElement.TITHI:
+            return [tithi_name(number) for number in numbers]
+        if element == PanchangElement.NAKSHATRA:
+            return [VedicAstrologyHelper.get_nakshatra_label(Nakshatra(number)) for number in numbers]
+        if element == PanchangElement.YOGA:
+            return [YOGA_NAMES[number - 1] for number in numbers]
+        return [karana_name(number) for number in numbers]
+
+    days = {
+        "date": block.dates,
+        "vara": [VARA_NAMES[weekday] for weekday in block.vara.tolist()],
+        "sunrise": local(block.sunrise_jd),
+        "sunset": local(block.sunset_jd),
+        "moonrise": local(block.moonrise_jd),
+        "moonset": local(block.moonset_jd),
+        "polar_day": block.polar_day.tolist(),
+        "polar_night": block.polar_night.tolist(),
+    }
+    transitions = {}
+    for element in PanchangElement:
+        numbers = block.at_sunrise[element].tolist()
+        days[element.value] = numbers
+        days[f"{element.value}_name"] = names(element, numbers)
+        days[f"{element.value}_end"] = local(block.ends_at[element])
+        if element == PanchangElement.TITHI:
+            days["paksha"] = [paksha(number) for number in numbers]
+
+        spans = block.spans[element]
+        numbers = spans.index.tolist()
+        transitions[element.value] = {
+            "number": numbers,
+            "name": names(element, numbers),
+            "start": local(spans.start_jd),
+            "end": local(spans.end_jd)
+        }
+
+    return {
+        "from": block.dates[0],
+        "to": block.dates[-1],
+        "days": days,
+        "transitions": transitions
+    }
+
+
+def _format_panchang_response(block, query):
+    """Format a whole-range panchang as one document"""
+    return {
+        "status": "success",
+        "data": {
+            "location": {
+                "latitude": query.latitude,
+                "longitude": query.longitude,
+                "timezone": query.timezone
+            },
+            **_format_panchang_block(block, query)
+        }
+    }
@@ -0,0 +1,125 @@
+"""
+Places Routes
+Offline place autocomplete and lookup from the gazetteer (GeoNames ids,
+coordinates and IANA timezones), so chart requests can send a place_id
+"""
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the gazetteer is loaded once per process, see services.runtime)
+places_bp = Blueprint('places', __name__, url_prefix='/api/v1')
+
+
+@places_bp.route('/places', methods=['GET'])
+@admission_controlled("cached")
+def search_places():
+    """
+    Autocomplete a place name
+
+    Query string:
+        q: "string (required) start of the name, any case or accents; misspellings match by trigrams"
+        limit: "int (optional) 1-50 places (default 10)"
+        country: "string (optional) ISO 3166 alpha-2 code"
+    """
+    try:
+        query, error = load_request(request.args.to_dict(), validate_places_request)
+        if error:
+            return error
+
+        gazetteer = runtime.get_gazetteer()
+        if gazetteer is None:
+            return _unavailable_response()
+        places = gazetteer.search(query.query, query.limit, query.country)
+
+        return json_response({
+            "status": "success",
+            "data": {
+                "query": query.query,
+                "places": [_format_place(place) for place in places]
+            }
+        })
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during place search",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+@places_bp.route('/places/<int:place_id>', methods=['GET'])
+@admission_controlled("cached")
+def get_place(place_id):
+    """Coordinates and IANA timezone of one place id"""
+    try:
+        gazetteer = runtime.get_gazetteer()
+        if gazetteer is None:
+            return _unavailable_response()
+        place = gazetteer.get(place_id)
+        if place is None:
+            return jsonify({
+                "error": "Place not found",
+                "message": f"Unknown place id: {place_id}",
+                "status": "error"
+            }), 404
+
+        return json_response({
+            "status": "success",
+            "data": _format_place(place)
+        })
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during place lookup",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_places_request(query_args):
+    """
+    Validate place autocomplete query arguments (framework independent)
+
+    Returns:
+        Tuple of (PlaceQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import PlaceQuery
+
+    if not query_args:
+        return None, validation_error({"q": ["Query ('q') is required"]})
+    validated_data, error = validate_payload(query_args, get_schema("PlaceSearchSchema"))
+    if error:
+        return None, error
+    return PlaceQuery(
+        query=validated_data["q"],
+        limit=validated_data["limit"],
+        country=validated_data.get("country")
+    ), None
+
+
+def _unavailable_response():
+    """503 for deployments without a gazetteer file"""
+    return jsonify({
+        "error": "Place lookup unavailable",
+        "message": "No gazetteer is loaded on this deployment (see GAZETTEER_PATH)",
+        "status": "error"
+    }), 503
+
+
+def _format_place(place):
+    """Format a Place for the API"""
+    return {
+        "id": place.id,
+        "name": place.name,
+        "label": place.label,
+        "country": place.country,
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "timezone": place.timezone,
+        "population": place.population
+    }
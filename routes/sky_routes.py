@@ -0,0 +1,154 @@
+"""
+Sky Routes
+Current positions of the grahas from the shared sky snapshot, with optional
+observer-dependent lagna and whole-sign houses
+"""
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the snapshot and its ticker are shared process-wide, see
+# services.runtime)
+sky_bp = Blueprint('sky', __name__, url_prefix='/api/v1')
+
+
+@sky_bp.route('/sky', methods=['POST'])
+@admission_controlled("cached")
+def current_sky():
+    """
+    Positions of the grahas now, plus lagna and houses for an observer
+
+    Request body:
+    {
+        "timezone": "float (required) offset of the response",
+        "latitude": "float (optional, with longitude) observer latitude",
+        "longitude": "float (optional, with latitude) observer longitude"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_sky_request)
+        if error:
+            return error
+
+        response = _format_sky_response(observe_sky(query), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during sky calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_sky_request(json_data):
+    """
+    Validate a current-sky request body (framework independent)
+
+    Returns:
+        Tuple of (SkyQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import SkyQuery
+
+    validated_data, error = validate_payload(json_data, get_schema("SkyRequestSchema"))
+    if error:
+        return None, error
+    if ("latitude" in validated_data) != ("longitude" in validated_data):
+        return None, validation_error({"latitude": ["Give both latitude and longitude, or neither"]})
+
+    return SkyQuery(
+        timezone=validated_data["timezone"],
+        latitude=validated_data.get("latitude"),
+        longitude=validated_data.get("longitude")
+    ), None
+
+
+def observe_sky(query):
+    """
+    The latest SkySnapshot, the observer's angles (None without a location)
+    and the snapshot cadence {"max_staleness_seconds", "refresh_seconds"}
+
+    Calls swisseph (swe.houses_armc), so under ASGI it runs as an executor job;
+    _format_sky_response only formats what it returns.
+    """
+    service = runtime.get_sky_snapshot_service()
+    snapshot = service.current()
+    angles = snapshot.angles(query.latitude, query.longitude) if query.latitude is not None else None
+    cadence = {
+        "max_staleness_seconds": service.max_staleness_seconds,
+        "refresh_seconds": service.refresh_seconds
+    }
+    return snapshot, angles, cadence
+
+
+def _format_sky_response(sky, query):
+    """Format observe_sky(), adding the observer's lagna and houses when a location is given"""
+    from services.swiss_ephemeris_service import longitude_to_nakshatra, longitude_to_zodiac_sign
+    from utils.time_utils import julian_day_to_local_datetime
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    snapshot, angles, cadence = sky
+
+    def format_point(longitude):
+        nakshatra, pada = longitude_to_nakshatra(longitude)
+        return {
+            "longitude": round(longitude, 6),
+            "sign": longitude_to_zodiac_sign(longitude).name,
+            "degree": round(longitude % 30, 6),
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(nakshatra),
+            "nakshatra_pada": pada
+        }
+
+    planets = [
+        {
+            "planet": position.planet.name.title(),
+            "longitude": round(position.longitude, 6),
+            "sign": position.sign.name,
+            "degree": round(position.degree, 6),
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(position.nakshatra),
+            "nakshatra_pada": position.nakshatra_pada,
+            "speed": round(position.speed, 6),
+            "retrograde": position.retrograde
+        }
+        for position in snapshot.planets
+    ]
+
+    data = {
+        "snapshot": {
+            "datetime": julian_day_to_local_datetime(snapshot.julian_day, query.timezone),
+            "julian_day": round(snapshot.julian_day, 8),
+            "age_seconds": round(max(0.0, snapshot.age()), 3),
+            **cadence
+        },
+        "ayanamsa": round(snapshot.ayanamsa, 6),
+        "planets": planets
+    }
+
+    if angles is not None:
+        lagna_sign = int(angles.ascendant // 30)
+        for formatted, position in zip(planets, snapshot.planets):
+            formatted["house"] = (int(position.longitude // 30) - lagna_sign) % 12 + 1
+        data["location"] = {
+            "latitude": query.latitude,
+            "longitude": query.longitude
+        }
+        data["lagna"] = format_point(angles.ascendant)
+        data["midheaven"] = format_point(angles.midheaven)
+        data["houses"] = [
+            {
+                "house": house,
+                "sign": longitude_to_zodiac_sign(((lagna_sign + house - 1) % 12) * 30.0).name,
+                "planets": [formatted["planet"] for formatted in planets if formatted["house"] == house]
+            }
+            for house in range(1, 13)
+        ]
+
+    return {
+        "status": "success",
+        "data": data
+    }
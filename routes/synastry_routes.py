@@ -0,0 +1,149 @@
+"""
+Synastry Routes
+Two birth charts compared in one request: cross-aspects, house overlays and D9
+"""
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response, validate_payload
+)
+from services import runtime
+
+# Create blueprint (chart engines are shared process-wide and initialised on
+# first use, see services.runtime)
+synastry_bp = Blueprint('synastry', __name__, url_prefix='/api/v1')
+
+PEOPLE = ("first", "second")
+
+
+@synastry_bp.route('/synastry', methods=['POST'])
+@admission_controlled("full")
+def calculate_synastry():
+    """
+    Compare two birth charts
+
+    Request body:
+    {
+        "first": "object (required) birth details as for /d1-chart",
+        "second": "object (required) birth details as for /d1-chart"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_synastry_request)
+        if error:
+            return error
+
+        synastry = runtime.get_synastry_calculator().calculate(query.first, query.second)
+        response = _format_synastry_response(synastry, query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during synastry calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_synastry_request(json_data):
+    """
+    Validate a synastry request body (framework independent)
+
+    Returns:
+        Tuple of (SynastryQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from models.astrology_models import UserDetails, SynastryQuery
+
+    validated_data, error = validate_payload(json_data, get_schema("SynastryRequestSchema"))
+    if error:
+        return None, error
+
+    return SynastryQuery(
+        first=UserDetails(**validated_data["first"]),
+        second=UserDetails(**validated_data["second"])
+    ), None
+
+
+def _format_synastry_response(synastry, query):
+    """Format both charts in brief and every comparison between them"""
+    from utils.vedic_helper import VedicAstrologyHelper
+
+    def point_name(planet):
+        return planet.name.title() if planet is not None else "Lagna"
+
+    def format_position(position, house=None):
+        formatted = {
+            "sign": position.sign.name,
+            "degree": round(position.degree, 4),
+            "longitude": round(position.longitude, 6),
+            "nakshatra": VedicAstrologyHelper.get_nakshatra_label(position.nakshatra),
+            "nakshatra_pada": position.nakshatra_pada
+        }
+        if house is not None:
+            formatted["house"] = house
+        return formatted
+
+    def format_chart(d1_chart, d9_chart):
+        return {
+            "name": d1_chart.user_details.name,
+            "lagna": format_position(d1_chart.lagna),
+            "planets": [
+                {"planet": point_name(position.planet), "retrograde": position.retrograde,
+                 **format_position(position, position.is_in_house)}
+                for position in d1_chart.planets
+            ],
+            "d9_lagna": d9_chart["d9_lagna"].sign.name,
+            "d9_planets": {point_name(position.planet): position.sign.name for position in d9_chart["d9_planets"]}
+        }
+
+    def format_overlays(overlays):
+        return [
+            {
+                "planets_of": PEOPLE[index],
+                "houses_of": PEOPLE[1 - index],
+                "houses": {point_name(planet): house for planet, house in overlay.items()}
+            }
+            for index, overlay in enumerate(overlays)
+        ]
+
+    def seventh_house(d9_chart):
+        house = d9_chart["d9_houses"][6]
+        return {
+            "sign": house.sign.name,
+            "ruler": point_name(house.ruler_planet),
+            "planets": [point_name(planet) for planet in house.planets_in_house]
+        }
+
+    return {
+        "status": "success",
+        "data": {
+            "charts": {
+                person: format_chart(d1_chart, d9_chart)
+                for person, d1_chart, d9_chart in zip(PEOPLE, synastry.d1_charts, synastry.d9_charts)
+            },
+            "shared_sky": synastry.shared_sky,
+            "cross_aspects": [
+                {
+                    "from": PEOPLE[aspect.source],
+                    "planet": point_name(aspect.planet),
+                    "to": PEOPLE[1 - aspect.source],
+                    "target": point_name(aspect.target),
+                    "house": aspect.house,
+                    "type": "conjunction" if aspect.house == 1 else "aspect",
+                    "orb": round(aspect.orb, 4)
+                }
+                for aspect in synastry.cross_aspects
+            ],
+            "house_overlays": format_overlays(synastry.house_overlays),
+            "d9": {
+                "lagnas": {person: chart["d9_lagna"].sign.name for person, chart in zip(PEOPLE, synastry.d9_charts)},
+                "seventh_houses": {person: seventh_house(chart) for person, chart in zip(PEOPLE, synastry.d9_charts)},
+                "house_overlays": format_overlays(synastry.d9_overlays),
+                "conjunctions": [
+                    {"first": point_name(first), "second": point_name(second)}
+                    for first, second in synastry.d9_conjunctions
+                ]
+            }
+        }
+    }
@@ -0,0 +1,181 @@
+"""
+Transit Overlay Routes
+Transit houses, aspects and orbs of one sky state over many natal charts
+"""
+import os
+
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the overlay calculator and the sky snapshot are shared
+# process-wide, see services.runtime)
+transit_overlay_bp = Blueprint('transit_overlay', __name__, url_prefix='/api/v1')
+
+# Most natal charts in one request (larger bases: tools.transit_overlay)
+MAX_ROWS = int(os.environ.get("TRANSIT_OVERLAY_MAX_ROWS", "10000"))
+NATAL_COLUMNS = ("moon_longitude", "lagna_longitude", "moon_sign", "lagna_sign")
+
+
+@transit_overlay_bp.route('/transit-overlay', methods=['POST'])
+@admission_controlled("batch")
+def calculate_transit_overlay():
+    """
+    Overlay one transit sky state on many natal charts
+
+    Request body:
+    {
+        "datetime": "string (optional) local transit instant YYYY-MM-DDTHH:MM:SS (default now)",
+        "timezone": "float (optional) offset of datetime and of the response (default 0)",
+        "moon_longitude": "list (optional) sidereal natal Moon longitudes, null where unknown",
+        "lagna_longitude": "list (optional) sidereal natal lagna longitudes, null where unknown",
+        "moon_sign": "list (optional) natal Moon signs 1-12 (used where the longitude is unknown)",
+        "lagna_sign": "list (optional) natal lagna signs 1-12"
+    }
+    All supplied lists must have the same length (one entry per chart).
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_transit_overlay_request)
+        if error:
+            return error
+
+        snapshot = runtime.get_sky_snapshot_service()
+        sky = snapshot.current() if query.julian_day is None else snapshot.compute(query.julian_day)
+        overlay = runtime.get_transit_overlay().overlay(_sky_longitudes(sky), query.natal)
+        response = _format_transit_overlay_response((overlay, sky), query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during transit overlay",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_transit_overlay_request(json_data):
+    """
+    Validate a transit overlay request body (framework independent)
+
+    Returns:
+        Tuple of (TransitOverlayQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    import numpy as np
+
+    from calculators.transit_overlay import NatalColumns
+    from models.astrology_models import TransitOverlayQuery
+    from utils.time_utils import local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("TransitOverlayRequestSchema"))
+    if error:
+        return None, error
+
+    columns = {}
+    for name in NATAL_COLUMNS:
+        if name not in validated_data:
+            continue
+        column, message = _natal_column(name, validated_data[name])
+        if message:
+            return None, validation_error({name: [message]})
+        columns[name] = column
+
+    if not columns:
+        return None, validation_error({"moon_longitude": [f"Give at least one of: {', '.join(NATAL_COLUMNS)}"]})
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        return None, validation_error({"moon_longitude": ["All natal columns must have the same length"]})
+    rows = lengths.pop()
+    if not 1 <= rows <= MAX_ROWS:
+        return None, validation_error({"moon_longitude": [f"Between 1 and {MAX_ROWS} charts per request"]})
+    for target in ("moon", "lagna"):
+        longitude, sign = columns.get(f"{target}_longitude"), columns.get(f"{target}_sign")
+        if longitude is not None and sign is None and np.isnan(longitude).any():
+            return None, validation_error({f"{target}_sign": [
+                f"Required where {target}_longitude is null"
+            ]})
+
+    timezone_offset = validated_data["timezone"]
+    julian_day = None
+    if "datetime" in validated_data:
+        try:
+            julian_day = local_datetime_to_julian_day(validated_data["datetime"], timezone_offset)
+        except ValueError as err:
+            return None, validation_error({"datetime": [str(err)]})
+
+    return TransitOverlayQuery(
+        timezone=timezone_offset,
+        natal=NatalColumns(**columns),
+        julian_day=julian_day
+    ), None
+
+
+def _natal_column(name, values):
+    """(numpy column, None) or (None, error message) for one natal list"""
+    import numpy as np
+
+    if not isinstance(values, list):
+        return None, "Must be a list"
+    if name.endswith("_longitude"):
+        try:
+            column = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+        except (TypeError, ValueError):
+            return None, "Must hold numbers or null"
+        known = column[~np.isnan(column)]
+        if ((known < 0) | (known >= 360)).any():
+            return None, "Longitudes must be in [0, 360)"
+        return column, None
+
+    if any(type(value) is not int or not 1 <= value <= 12 for value in values):
+        return None, "Must hold integers 1-12"
+    return np.array(values, dtype=np.int64), None
+
+
+def _sky_longitudes(sky):
+    """Transit longitudes of the overlay planets from a SkySnapshot"""
+    from calculators.transit_overlay import transit_longitudes_from_snapshot
+
+    return transit_longitudes_from_snapshot(sky, runtime.get_transit_overlay().planets)
+
+
+def _format_transit_overlay_response(result, query):
+    """Format a TransitOverlay as (charts x planets) arrays per natal point"""
+    import numpy as np
+
+    from utils.time_utils import julian_day_to_local_datetime
+
+    overlay, sky = result
+
+    def orbs(values):
+        rounded = np.round(values.astype(np.float64), 4)
+        return np.where(np.isnan(rounded), None, rounded).tolist()
+
+    transit = {
+        "datetime": julian_day_to_local_datetime(sky.julian_day, query.timezone),
+        "julian_day": round(sky.julian_day, 8),
+        "source": "snapshot" if query.julian_day is None else "ephemeris",
+        "planets": [planet.name.title() for planet in overlay.planets],
+        "longitudes": [round(float(longitude), 6) for longitude in overlay.transit_longitudes]
+    }
+    if query.julian_day is None:
+        transit["age_seconds"] = round(max(0.0, sky.age()), 3)
+
+    data = {
+        "transit": transit,
+        "count": len(query.natal)
+    }
+    for target, values in overlay.targets.items():
+        data[target] = {
+            "house": values.house.tolist(),
+            "aspect": values.aspect.tolist(),
+            "orb": orbs(values.orb)
+        }
+
+    return {
+        "status": "success",
+        "data": data
+    }
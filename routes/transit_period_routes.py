@@ -0,0 +1,155 @@
+"""
+Transit Period Routes
+Sade Sati, Ashtama Shani and Jupiter returns with every retrograde phase
+"""
+from flask import Blueprint, request, jsonify
+
+from routes.common import (
+    admission_controlled, get_schema, load_request, json_response,
+    validate_payload, validation_error
+)
+from services import runtime
+
+# Create blueprint (the period tables are shared process-wide and built on
+# first use, see services.runtime)
+transit_periods_bp = Blueprint('transit_periods', __name__, url_prefix='/api/v1')
+
+TRANSIT_PERIOD_QUERY_FIELDS = ("kinds", "start", "end", "at")
+
+
+@transit_periods_bp.route('/transit-periods', methods=['POST'])
+@admission_controlled("cached")
+def calculate_transit_periods():
+    """
+    Calculate Sade Sati, Ashtama Shani and Jupiter return periods
+
+    Request body (birth details as for /d1-chart, plus):
+    {
+        "kinds": "list (optional) sade_sati | ashtama_shani | jupiter_return (default all)",
+        "from": "string (optional) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS (default birth)",
+        "to": "string (optional) local YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS (default 100 years after from)",
+        "at": "string (optional) instant for the running periods (default now)"
+    }
+    """
+    try:
+        query, error = load_request(request.get_json(), validate_transit_periods_request)
+        if error:
+            return error
+
+        periods = runtime.get_transit_period_calculator().calculate(query.user_details, query.kinds)
+        response = _format_transit_periods_response(periods, query)
+
+        return json_response(response)
+
+    except Exception as e:
+        return jsonify({
+            "error": "Internal server error during transit period calculation",
+            "message": str(e),
+            "status": "error"
+        }), 500
+
+
+def validate_transit_periods_request(json_data):
+    """
+    Validate a transit period request body (framework independent)
+
+    Returns:
+        Tuple of (TransitPeriodQuery, None) on success or (None, (error payload, status)) on failure
+    """
+    from calculators.transit_period_calculator import SPAN_FROM, SPAN_TO
+    from models.astrology_models import Ayanamsa, UserDetails, TransitPeriodKind, TransitPeriodQuery
+    from utils.time_utils import current_julian_day, local_datetime_to_julian_day
+
+    validated_data, error = validate_payload(json_data, get_schema("TransitPeriodRequestSchema"))
+    if error:
+        return None, error
+
+    options = {name: validated_data.pop(name, None) for name in TRANSIT_PERIOD_QUERY_FIELDS}
+    user_details = UserDetails(**validated_data)
+    if user_details.ayanamsa != Ayanamsa.LAHIRI.value:
+        # The transit occupancy tables are sidereal signs under Lahiri
+        return None, validation_error({"ayanamsa": ["Transit periods are available with the lahiri ayanamsa only"]})
+
+    try:
+        start_jd, end_jd, at_jd = (
+            local_datetime_to_julian_day(options[name], user_details.zone) if options[name] else None
+            for name in ("start", "end", "at")
+        )
+    except ValueError as err:
+        return None, validation_error({"date": [str(err)]})
+    if start_jd is not None and end_jd is not None and end_jd <= start_jd:
+        return None, validation_error({"to": ["Must be later than 'from'"]})
+    span_start, span_end = (local_datetime_to_julian_day(value, 0) for value in (SPAN_FROM, SPAN_TO))
+    if (start_jd is not None and start_jd >= span_end) or (end_jd is not None and end_jd <= span_start):
+        return None, validation_error({"from": [f"Transit periods are available from {SPAN_FROM} to {SPAN_TO}"]})
+
+    kinds = options["kinds"]
+    return TransitPeriodQuery(
+        user_details=user_details,
+        kinds=[TransitPeriodKind(kind) for kind in dict.fromkeys(kinds)] if kinds else list(TransitPeriodKind),
+        at_jd=at_jd if at_jd is not None else current_julian_day(),
+        start_jd=start_jd,
+        end_jd=end_jd
+    ), None
+
+
+def _format_transit_periods_response(periods, query):
+    """Format the periods overlapping the query window plus those running at query.at_jd"""
+    from calculators.transit_period_calculator import DEFAULT_WINDOW_YEARS, PERIOD_DEFINITIONS
+    from utils.time_utils import julian_day_to_local_datetime
+
+    # Per-instant offsets when the birth timezone was an IANA zone
+    timezone = query.user_details.zone
+    start_jd = query.start_jd if query.start_jd is not None else periods.birth_jd
+    end_jd = query.end_jd if query.end_jd is not None else start_jd + DEFAULT_WINDOW_YEARS * 365.25
+
+    def format_date(julian_day):
+        return julian_day_to_local_datetime(julian_day, timezone)
+
+    def format_period(period):
+        return {
+            "kind": period.kind.value,
+            "planet": period.planet.name.title(),
+            "natal_sign": period.natal_sign.name,
+            "start": format_date(period.start_jd),
+            "end": format_date(period.end_jd),
+            "duration_days": round(period.end_jd - period.start_jd, 4),
+            "interrupted": period.interrupted,
+            "truncated": period.truncated,
+            "phases": [
+                {
+                    "phase": phase.name,
+                    "sign": phase.sign.name,
+                    "house": phase.house,
+                    "start": format_date(phase.start_jd),
+                    "end": format_date(phase.end_jd),
+                    "entered_retrograde": phase.retrograde
+                }
+                for phase in period.phases
+            ]
+        }
+
+    return {
+        "status": "success",
+        "data": {
+            "natal": {
+                kind.value: {
+                    "point": PERIOD_DEFINITIONS[kind][1].name.title(),
+                    "sign": periods.natal_sign(kind).name
+                }
+                for kind in query.kinds
+            },
+            "current": {
+                "at": format_date(query.at_jd),
+                "periods": [format_period(period) for period in periods.running(query.at_jd)]
+            },
+            "window": {
+                "from": format_date(start_jd),
+                "to": format_date(end_jd)
+            },
+            "periods": {
+                kind.value: [format_period(period) for period in periods.between(kind, start_jd, end_jd)]
+                for kind in query.kinds
+            }
+        }
+    }
@@ -0,0 +1,356 @@
+"""
+Admission Control Service
+Concurrency limiter with a bounded priority queue in front of the calculators
+
+Every chart request belongs to an endpoint class with a priority (lower runs
+first). At most ``max_concurrency`` requests calculate at once per process; the
+rest wait in a priority queue of at most ``max_queue`` entries for at most
+``queue_timeout`` seconds. A request is shed immediately (HTTP 503 with
+Retry-After) when the queue is full or when the estimated wait - the work
+queued ahead of it plus what is left of the requests already calculating, from
+a moving average of service times - would exceed the deadline. When the queue is full a higher-priority arrival evicts the
+lowest-priority waiter instead of being shed itself.
+
+The default concurrency of 1 also serialises swisseph use per process, which
+is required when gunicorn runs threaded workers.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, Optional, Tuple, Union
+
+
+def _parse_priorities(value: str) -> Dict[str, int]:
+    """Parse "cached=0,refined=1" into a priority map"""
+    priorities = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, priority = item.split("=", 1)
+            priorities[name.strip()] = int(priority)
+    return priorities
+
+
+MAX_CONCURRENCY = int(os.environ.get("ADMISSION_MAX_CONCURRENCY", "1"))
+MAX_QUEUE = int(os.environ.get("ADMISSION_MAX_QUEUE", "32"))
+QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "10"))
+PRIORITIES = _parse_priorities(
+    os.environ.get("ADMISSION_PRIORITIES", "cached=0,refined=1,full=2,batch=3")
+)
+
+# Service-time estimate before any request of a class has completed (seconds)
+INITIAL_SERVICE_TIME = 0.05
+# Weight of the newest sample in the service-time moving average
+SERVICE_TIME_ALPHA = 0.2
+
+SHED_REASONS = ("queue_full", "deadline", "timeout", "evicted")
+
+# WSGI environ flag set by a server that already admitted the request (asgi.py)
+ADMITTED_ENVIRON_KEY = "astrology.admitted"
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Request shed ({reason}); retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """A queued request; woken by a thread event or an asyncio future"""
+
+    def __init__(self, endpoint_class: str, priority: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.endpoint_class = endpoint_class
+        self.priority = priority
+        self.granted = False
+        self.token = None
+        self.evicted = False
+        self.cancelled = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """Priority admission queue with load shedding"""
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY, max_queue: int = MAX_QUEUE,
+                 queue_timeout: float = QUEUE_TIMEOUT, priorities: Dict[str, int] = None):
+        """
+        Args:
+            max_concurrency: Requests allowed to calculate at once
+            max_queue: Requests allowed to wait for a slot
+            queue_timeout: Longest a request may wait for a slot (seconds)
+            priorities: Endpoint class -> priority (lower runs first)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.priorities = dict(priorities or PRIORITIES)
+        self.lowest_priority = max(self.priorities.values(), default=0)
+
+        self._lock = threading.Lock()
+        self._queue = []  # heap of (priority, sequence, waiter)
+        self._sequence = itertools.count()
+        self._active = 0
+        self._queued = 0
+        self._running = {}  # token -> (endpoint class, start time) of each held slot
+        self._service_time = {name: INITIAL_SERVICE_TIME for name in self.priorities}
+        self._admitted = {name: 0 for name in self.priorities}
+        self._shed = {(name, reason): 0 for name in self.priorities for reason in SHED_REASONS}
+
+    # ------------------------------------------------------------------
+    # Queue bookkeeping (call with self._lock held)
+    # ------------------------------------------------------------------
+
+    def _priority(self, endpoint_class: str) -> int:
+        return self.priorities.get(endpoint_class, self.lowest_priority)
+
+    def _estimated_wait(self, priority: int) -> float:
+        """Seconds of running and queued work that would finish before a new request of this priority starts"""
+        now = time.perf_counter()
+        remaining = sum(
+            max(0.0, self._service_time.get(endpoint_class, INITIAL_SERVICE_TIME) - (now - started))
+            for endpoint_class, started in self._running.values()
+        )
+        ahead = sum(
+            self._service_time.get(w.endpoint_class, INITIAL_SERVICE_TIME)
+            for p, _, w in self._queue if not w.cancelled and p <= priority
+        )
+        return (remaining + ahead) / self.max_concurrency
+
+    def _record_shed(self, endpoint_class: str, reason: str):
+        key = (endpoint_class, reason)
+        self._shed[key] = self._shed.get(key, 0) + 1
+
+    def _retry_after(self, priority: int) -> int:
+        return max(1, math.ceil(self._estimated_wait(priority)))
+
+    def _evict_lowest(self, priority: int) -> bool:
+        """Shed the worst waiter if it has a lower priority than the arrival"""
+        live = [(p, seq, w) for p, seq, w in self._queue if not w.cancelled]
+        if not live:
+            return False
+        worst = max(live, key=lambda item: (item[0], item[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].cancelled = True
+        worst[2].evicted = True
+        self._queued -= 1
+        self._record_shed(worst[2].endpoint_class, "evicted")
+        worst[2].wake()
+        return True
+
+    def _start(self, endpoint_class: str) -> int:
+        """Take a slot; returns the token that releases it"""
+        token = next(self._sequence)
+        self._active += 1
+        self._running[token] = (endpoint_class, time.perf_counter())
+        self._admitted[endpoint_class] = self._admitted.get(endpoint_class, 0) + 1
+        return token
+
+    def _enqueue(self, endpoint_class: str, loop=None) -> Union[int, _Waiter]:
+        """
+        Admit immediately (returns the slot token), queue (returns the waiter) or shed
+
+        Raises:
+            Overloaded: When the request is shed on arrival
+        """
+        priority = self._priority(endpoint_class)
+        if self._active < self.max_concurrency and self._queued == 0:
+            return self._start(endpoint_class)
+
+        # Deadline first: a waiter is never evicted for an arrival that is shed anyway
+        estimated_wait = self._estimated_wait(priority)
+        if estimated_wait > self.queue_timeout:
+            self._record_shed(endpoint_class, "deadline")
+            raise Overloaded("deadline", max(1, math.ceil(estimated_wait)))
+
+        if self._queued >= self.max_queue and not self._evict_lowest(priority):
+            self._record_shed(endpoint_class, "queue_full")
+            raise Overloaded("queue_full", self._retry_after(priority))
+
+        waiter = _Waiter(endpoint_class, priority, loop)
+        heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+        self._queued += 1
+        return waiter
+
+    def _grant_next(self):
+        """Hand a freed slot to the best live waiter"""
+        while self._queue and self._active < self.max_concurrency:
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._queued -= 1
+            waiter.token = self._start(waiter.endpoint_class)
+            waiter.granted = True
+            waiter.wake()
+
+    def _give_up(self, waiter: _Waiter) -> int:
+        """
+        Resolve a waiter whose wait ended
+
+        Returns:
+            The slot token if the waiter was granted a slot after all
+        """
+        if waiter.granted:
+            return waiter.token
+        if waiter.evicted:
+            raise Overloaded("evicted", self._retry_after(waiter.priority))
+        waiter.cancelled = True
+        self._queued -= 1
+        self._record_shed(waiter.endpoint_class, "timeout")
+        raise Overloaded("timeout", self._retry_after(waiter.priority))
+
+    def _abandon(self, waiter: _Waiter):
+        """Drop a waiter whose caller went away (e.g. a cancelled task), freeing its slot if it was granted one"""
+        if waiter.granted:
+            self._finish(waiter.token)
+            self._grant_next()
+        elif not waiter.cancelled:
+            waiter.cancelled = True
+            self._queued -= 1
+
+    def _finish(self, token: int) -> Tuple[str, float]:
+        """Free a slot; returns its endpoint class and how long it was held"""
+        self._active -= 1
+        endpoint_class, started = self._running.pop(token)
+        return endpoint_class, time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self, endpoint_class: str) -> int:
+        """
+        Block until a calculation slot is free
+
+        Returns:
+            Token to pass to release()
+
+        Raises:
+            Overloaded: When the request is shed
+        """
+        with self._lock:
+            waiter = self._enqueue(endpoint_class)
+        if not isinstance(waiter, _Waiter):
+            return waiter
+
+        waiter.event.wait(self.queue_timeout)
+        with self._lock:
+            return self._give_up(waiter)
+
+    async def acquire_async(self, endpoint_class: str) -> int:
+        """Event-loop version of acquire(); waits without holding a thread"""
+        with self._lock:
+            waiter = self._enqueue(endpoint_class, asyncio.get_running_loop())
+        if not isinstance(waiter, _Waiter):
+            return waiter
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            # Cancelled (client disconnect) or interrupted: leave the queue, or
+            # hand back a slot granted meanwhile, so it is not held forever
+            with self._lock:
+                self._abandon(waiter)
+            raise
+        with self._lock:
+            return self._give_up(waiter)
+
+    def resize(self, max_concurrency: int):
+        """Change the concurrency limit (e.g. to match an executor's worker count)"""
+        with self._lock:
+            self.max_concurrency = max(1, max_concurrency)
+            self._grant_next()
+
+    def release(self, token: int):
+        """Free a slot and fold the request's service time into the estimate"""
+        with self._lock:
+            endpoint_class, service_time = self._finish(token)
+            previous = self._service_time.get(endpoint_class, INITIAL_SERVICE_TIME)
+            self._service_time[endpoint_class] = (
+                (1 - SERVICE_TIME_ALPHA) * previous + SERVICE_TIME_ALPHA * service_time
+            )
+            self._grant_next()
+
+    @contextmanager
+    def slot(self, endpoint_class: str):
+        """Hold a calculation slot for the duration of the block"""
+        token = self.acquire(endpoint_class)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+    @asynccontextmanager
+    async def slot_async(self, endpoint_class: str):
+        """Async version of slot()"""
+        token = await self.acquire_async(endpoint_class)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+    def metrics(self) -> Dict:
+        """Snapshot of queue depth, admissions, shed counts and service times"""
+        with self._lock:
+            queued_by_class = {name: 0 for name in self.priorities}
+            for _, _, waiter in self._queue:
+                if not waiter.cancelled:
+                    queued_by_class[waiter.endpoint_class] = queued_by_class.get(waiter.endpoint_class, 0) + 1
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "queue_timeout_seconds": self.queue_timeout,
+                "active": self._active,
+                "queued": self._queued,
+                "queued_by_class": queued_by_class,
+                "admitted": dict(self._admitted),
+                "shed": {f"{name}:{reason}": count for (name, reason), count in self._shed.items()},
+                "service_time_seconds": {name: round(value, 6) for name, value in self._service_time.items()}
+            }
+
+    def prometheus_metrics(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        snapshot = self.metrics()
+        lines = [
+            "# TYPE admission_active gauge",
+            f"admission_active {snapshot['active']}",
+            "# TYPE admission_queue_depth gauge",
+        ]
+        lines += [f'admission_queue_depth{{class="{name}"}} {count}'
+                  for name, count in snapshot["queued_by_class"].items()]
+        lines.append("# TYPE admission_admitted_total counter")
+        lines += [f'admission_admitted_total{{class="{name}"}} {count}'
+                  for name, count in snapshot["admitted"].items()]
+        lines.append("# TYPE admission_shed_total counter")
+        for key, count in snapshot["shed"].items():
+            name, reason = key.split(":", 1)
+            lines.append(f'admission_shed_total{{class="{name}",reason="{reason}"}} {count}')
+        lines.append("# TYPE admission_service_time_seconds gauge")
+        lines += [f'admission_service_time_seconds{{class="{name}"}} {value}'
+                  for name, value in snapshot["service_time_seconds"].items()]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide controller used by the Flask views and the ASGI entry point
+controller = AdmissionController()
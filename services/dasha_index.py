@@ -0,0 +1,422 @@
+"""
+Dasha Boundary Index
+Interval index of Vimshottari period boundaries across a stored user base
+
+Answers "which users start Saturn mahadasha in the next 30 days" (range) and
+"which users are running Rahu antardasha on a date" (stabbing) without
+recomputing any chart. Per level, every user's periods are stored as columnar
+numpy arrays sorted by (lord, start), so a query for one lord is a binary
+search inside that lord's segment. Periods of one lord at one level have a
+known maximum length, so stabbing queries only scan starts within that length
+before the instant.
+
+The base segment is persisted as .npy files and memory-mapped on load.
+Changed or deleted users are masked out of the base and their new periods kept
+in a small delta segment until the next compact().
+"""
+import json
+import os
+import shutil
+from collections import namedtuple
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.astrology_models import DashaLevel
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+INDEX_FORMAT = 1
+DEFAULT_LEVELS = (DashaLevel.MAHA, DashaLevel.ANTAR)
+DEFAULT_YEAR_DAYS = 365.25
+NAKSHATRA_SPAN = 360.0 / 27
+# Slack on the maximum period length for floating-point rounding of boundaries
+STABBING_MARGIN_DAYS = 1e-6
+
+_ORDER = VedicAstrologyHelper.VIMSHOTTARI_ORDER
+_ORDER_VALUES = np.array([planet.value for planet in _ORDER], dtype=np.uint8)
+_ORDER_YEARS = np.array([VedicAstrologyHelper.VIMSHOTTARI_LENGTHS[planet] for planet in _ORDER], dtype=np.float64)
+_CYCLE_YEARS = int(_ORDER_YEARS.sum())
+# Planet.value -> position in the Vimshottari order
+_ORDER_POSITION = {planet.value: position for position, planet in enumerate(_ORDER)}
+
+DashaMatches = namedtuple("DashaMatches", ["user_ids", "start_jd", "end_jd", "lords"])
+
+_COLUMNS = ("start", "end", "user", "lords")
+
+
+def expand_periods(birth_jd: np.ndarray, moon_longitude: np.ndarray, levels: Sequence[DashaLevel],
+                   year_days: float = DEFAULT_YEAR_DAYS) -> Dict[DashaLevel, Dict[str, np.ndarray]]:
+    """
+    Vectorized Vimshottari periods for many natal Moons
+
+    Uses the same floating-point operations, in the same order, as
+    calculators.dasha_calculator.VimshottariDasha, so boundaries are identical.
+
+    Args:
+        birth_jd: Julian Days (UT) of birth, shape (n,)
+        moon_longitude: Sidereal natal Moon longitudes, shape (n,)
+        levels: Levels to return
+        year_days: Days per dasha year
+
+    Returns:
+        Level -> columns: start, end (float64), user (row in the inputs, int64)
+        and lords (Planet values, maha first, shape (rows, depth))
+    """
+    moon = np.mod(np.asarray(moon_longitude, dtype=np.float64), 360.0)
+    birth_jd = np.asarray(birth_jd, dtype=np.float64)
+    count = len(moon)
+
+    first = (np.floor_divide(moon, NAKSHATRA_SPAN).astype(np.int64) % 27) % 9
+    elapsed = np.mod(moon, NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+    cycle_start = birth_jd - _ORDER_YEARS[first] * elapsed * year_days
+
+    # The cycle acts as the parent of the mahadashas, starting with the Moon's lord
+    start = cycle_start
+    end = cycle_start + _CYCLE_YEARS * year_days
+    lord = first
+    user = np.arange(count, dtype=np.int64)
+    chain = np.zeros((count, 0), dtype=np.uint8)
+
+    result = {}
+    for depth in range(1, max(level.value for level in levels) + 1):
+        span = end - start
+        cursor = start
+        starts, ends, lords = [], [], []
+        for i in range(9):
+            child_lord = (lord + i) % 9
+            child_end = end if i == 8 else cursor + span * _ORDER_YEARS[child_lord] / _CYCLE_YEARS
+            starts.append(cursor)
+            ends.append(child_end)
+            lords.append(child_lord)
+            cursor = child_end
+
+        # Children of one parent stay adjacent and in chronological order
+        start = np.stack(starts, axis=1).ravel()
+        end = np.stack(ends, axis=1).ravel()
+        lord = np.stack(lords, axis=1).ravel()
+        user = np.repeat(user, 9)
+        chain = np.hstack([np.repeat(chain, 9, axis=0), _ORDER_VALUES[lord][:, None]])
+
+        level = DashaLevel(depth)
+        if level in levels:
+            result[level] = {"start": start, "end": end, "user": user, "lords": chain}
+    return result
+
+
+def _max_length_days(level: DashaLevel, year_days: float) -> np.ndarray:
+    """Longest possible period of each lord (by order position) at a level, in days"""
+    longest_parent = _ORDER_YEARS.max() / _CYCLE_YEARS
+    return _ORDER_YEARS * year_days * longest_parent ** (level.value - 1)
+
+
+def _sort_by_lord(columns: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Sort rows by (period lord, start) and return the lord segment offsets"""
+    lord = columns["lords"][:, -1]
+    # Partition by lord (radix sort on uint8), then sort each segment by start:
+    # much faster than one lexsort over tens of millions of rows
+    order = np.argsort(lord, kind="stable")
+    offsets = np.searchsorted(lord[order], np.arange(max(_ORDER_VALUES) + 2), side="left")
+    starts = columns["start"]
+    for low, high in zip(offsets[:-1], offsets[1:]):
+        if high - low > 1:
+            segment = order[low:high]
+            order[low:high] = segment[np.argsort(starts[segment])]
+    columns = {name: values[order] for name, values in columns.items()}
+    return columns, offsets
+
+
+class DashaIndex:
+    """Interval index of dasha boundaries for many users"""
+
+    def __init__(self, levels: Sequence[DashaLevel], year_days: float, horizon: Optional[Tuple[float, float]],
+                 user_ids: np.ndarray, segments: Dict[DashaLevel, Dict[str, np.ndarray]],
+                 offsets: Dict[DashaLevel, np.ndarray], removed: np.ndarray = None, delta: Dict = None):
+        self.levels = tuple(levels)
+        self.year_days = year_days
+        self.horizon = horizon
+        self.user_ids = user_ids      # sorted int64 ids of the base segment
+        self.segments = segments      # level -> columns sorted by (lord, start)
+        self.offsets = offsets        # level -> row offset of each Planet value's segment
+        self.removed = removed if removed is not None else np.zeros(len(user_ids), dtype=bool)
+        self.delta = delta or self._empty_delta()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, user_ids: Sequence[int], birth_jd: Sequence[float], moon_longitude: Sequence[float],
+              levels: Sequence[DashaLevel] = DEFAULT_LEVELS, year_days: float = DEFAULT_YEAR_DAYS,
+              horizon: Optional[Tuple[float, float]] = None) -> "DashaIndex":
+        """
+        Build an index from per-user natal data
+
+        Args:
+            user_ids: Unique integer user ids
+            birth_jd: Julian Days (UT) of birth
+            moon_longitude: Sidereal natal Moon longitudes
+            levels: Levels to index (each level down multiplies the rows by 9)
+            year_days: Days per dasha year
+            horizon: Optional (start_jd, end_jd); only periods overlapping it are kept
+
+        Raises:
+            ValueError: On duplicate user ids
+        """
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        if len(np.unique(user_ids)) != len(user_ids):
+            raise ValueError("User ids must be unique")
+        order = np.argsort(user_ids, kind="stable")
+        user_ids = user_ids[order]
+
+        periods = expand_periods(
+            np.asarray(birth_jd, dtype=np.float64)[order],
+            np.asarray(moon_longitude, dtype=np.float64)[order],
+            levels, year_days
+        )
+
+        segments, offsets = {}, {}
+        for level, columns in periods.items():
+            columns = cls._clip(columns, horizon)
+            columns["user"] = columns["user"].astype(np.int32)
+            segments[level], offsets[level] = _sort_by_lord(columns)
+        return cls(levels, year_days, horizon, user_ids, segments, offsets)
+
+    @staticmethod
+    def _clip(columns: Dict[str, np.ndarray], horizon: Optional[Tuple[float, float]]) -> Dict[str, np.ndarray]:
+        if horizon is None:
+            return columns
+        keep = (columns["end"] > horizon[0]) & (columns["start"] < horizon[1])
+        return {name: values[keep] for name, values in columns.items()}
+
+    def _empty_delta(self) -> Dict[DashaLevel, Dict[str, np.ndarray]]:
+        return {
+            level: {
+                "start": np.empty(0, dtype=np.float64),
+                "end": np.empty(0, dtype=np.float64),
+                "user": np.empty(0, dtype=np.int64),  # user ids, not base rows
+                "lords": np.empty((0, level.value), dtype=np.uint8)
+            }
+            for level in self.levels
+        }
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _base_rows(self, user_ids: np.ndarray) -> np.ndarray:
+        """Base user rows of the given ids (ids not in the base are skipped)"""
+        rows = np.searchsorted(self.user_ids, user_ids)
+        rows = rows[rows < len(self.user_ids)]
+        return rows[np.isin(self.user_ids[rows], user_ids)]
+
+    def remove(self, user_ids: Sequence[int]):
+        """Drop users from the index (e.g. deleted accounts)"""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        if not self.removed.flags.writeable:
+            self.removed = self.removed.copy()
+        self.removed[self._base_rows(user_ids)] = True
+        for level, columns in self.delta.items():
+            keep = ~np.isin(columns["user"], user_ids)
+            self.delta[level] = {name: values[keep] for name, values in columns.items()}
+
+    def update(self, user_ids: Sequence[int], birth_jd: Sequence[float], moon_longitude: Sequence[float]):
+        """Replace the periods of users whose birth data changed (or add new users)"""
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.remove(user_ids)
+        periods = expand_periods(birth_jd, moon_longitude, self.levels, self.year_days)
+        for level, columns in periods.items():
+            columns = self._clip(columns, self.horizon)
+            columns["user"] = user_ids[columns["user"]]
+            current = self.delta[level]
+            merged = {name: np.concatenate([current[name], columns[name]]) for name in _COLUMNS}
+            order = np.argsort(merged["start"], kind="stable")
+            self.delta[level] = {name: values[order] for name, values in merged.items()}
+
+    def compact(self) -> "DashaIndex":
+        """Fold the delta segment and removals into a new base segment"""
+        live = ~self.removed
+        user_ids = np.union1d(self.user_ids[live], self.delta[self.levels[0]]["user"])
+
+        segments, offsets = {}, {}
+        for level in self.levels:
+            base = self.segments[level]
+            keep = live[base["user"]]
+            delta = self.delta[level]
+            columns = {
+                "start": np.concatenate([base["start"][keep], delta["start"]]),
+                "end": np.concatenate([base["end"][keep], delta["end"]]),
+                "user": np.searchsorted(
+                    user_ids, np.concatenate([self.user_ids[base["user"][keep]], delta["user"]])
+                ).astype(np.int32),
+                "lords": np.concatenate([base["lords"][keep], delta["lords"]])
+            }
+            segments[level], offsets[level] = _sort_by_lord(columns)
+        return DashaIndex(self.levels, self.year_days, self.horizon, user_ids, segments, offsets)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _lord_values(self, lord) -> Iterable[int]:
+        return _ORDER_VALUES.tolist() if lord is None else [lord.value]
+
+    def _collect(self, level: DashaLevel, base_parts, delta_mask) -> DashaMatches:
+        base = self.segments[level]
+        rows = np.concatenate(base_parts) if base_parts else np.empty(0, dtype=np.int64)
+        rows = rows[~self.removed[base["user"][rows]]]
+        delta = self.delta[level]
+
+        user_ids = np.concatenate([self.user_ids[base["user"][rows]], delta["user"][delta_mask]])
+        start = np.concatenate([base["start"][rows], delta["start"][delta_mask]])
+        end = np.concatenate([base["end"][rows], delta["end"][delta_mask]])
+        lords = np.concatenate([base["lords"][rows], delta["lords"][delta_mask]])
+        order = np.argsort(start, kind="stable")
+        return DashaMatches(user_ids[order], start[order], end[order], lords[order])
+
+    def _segment(self, level: DashaLevel, lord_value: int) -> Tuple[int, int]:
+        offsets = self.offsets[level]
+        return int(offsets[lord_value]), int(offsets[lord_value + 1])
+
+    def starting_between(self, level: DashaLevel, start_jd: float, end_jd: float, lord=None) -> DashaMatches:
+        """
+        Periods that start in [start_jd, end_jd)
+
+        Args:
+            level: Indexed dasha level
+            start_jd: Range start (Julian Day, UT)
+            end_jd: Range end (Julian Day, UT)
+            lord: Optional Planet; only periods of this lord
+
+        Returns:
+            DashaMatches sorted by start
+        """
+        starts = self.segments[level]["start"]
+        parts = []
+        for value in self._lord_values(lord):
+            low, high = self._segment(level, value)
+            first = low + np.searchsorted(starts[low:high], start_jd, side="left")
+            last = low + np.searchsorted(starts[low:high], end_jd, side="left")
+            parts.append(np.arange(first, last))
+
+        delta = self.delta[level]
+        mask = (delta["start"] >= start_jd) & (delta["start"] < end_jd)
+        if lord is not None:
+            mask &= delta["lords"][:, -1] == lord.value
+        return self._collect(level, parts, mask)
+
+    def running_at(self, level: DashaLevel, julian_day: float, lord=None) -> DashaMatches:
+        """
+        Periods running at an instant (start <= julian_day < end)
+
+        Args:
+            level: Indexed dasha level
+            julian_day: Instant (Julian Day, UT)
+            lord: Optional Planet; only periods of this lord
+
+        Returns:
+            DashaMatches sorted by start
+        """
+        base = self.segments[level]
+        max_days = _max_length_days(level, self.year_days)
+        parts = []
+        for value in self._lord_values(lord):
+            low, high = self._segment(level, value)
+            # A running period started at most one maximum period length ago
+            window_start = julian_day - max_days[_ORDER_POSITION[value]] - STABBING_MARGIN_DAYS
+            first = low + np.searchsorted(base["start"][low:high], window_start, side="right")
+            last = low + np.searchsorted(base["start"][low:high], julian_day, side="right")
+            candidates = np.arange(first, last)
+            parts.append(candidates[base["end"][candidates] > julian_day])
+
+        delta = self.delta[level]
+        mask = (delta["start"] <= julian_day) & (delta["end"] > julian_day)
+        if lord is not None:
+            mask &= delta["lords"][:, -1] == lord.value
+        return self._collect(level, parts, mask)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """
+        Write the index to a directory
+
+        The base segment is written to a sibling directory and swapped in, so
+        a crashed save never leaves a half-written index behind.
+        """
+        path = os.path.abspath(path)
+        staging, previous = path + ".new", path + ".old"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        np.save(os.path.join(staging, "user_ids.npy"), self.user_ids)
+        np.save(os.path.join(staging, "removed.npy"), self.removed)
+        for level in self.levels:
+            name = level.name.lower()
+            for column in _COLUMNS:
+                np.save(os.path.join(staging, f"{name}.{column}.npy"), self.segments[level][column])
+            np.save(os.path.join(staging, f"{name}.offsets.npy"), self.offsets[level])
+        np.savez(os.path.join(staging, "delta.npz"), **{
+            f"{level.name.lower()}.{column}": self.delta[level][column]
+            for level in self.levels for column in _COLUMNS
+        })
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump({
+                "format": INDEX_FORMAT,
+                "levels": [level.name.lower() for level in self.levels],
+                "year_days": self.year_days,
+                "horizon": list(self.horizon) if self.horizon else None,
+                "users": int(len(self.user_ids)),
+                "rows": {level.name.lower(): int(len(self.segments[level]["start"])) for level in self.levels}
+            }, f, indent=2)
+
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, previous)
+        os.rename(staging, path)
+        shutil.rmtree(previous, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "DashaIndex":
+        """
+        Open an index directory
+
+        Args:
+            path: Directory written by save()
+            mmap: Memory-map the base segment instead of reading it
+
+        Raises:
+            ValueError: If the directory holds an unsupported index format
+        """
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported dasha index format: {manifest.get('format')}")
+
+        mmap_mode = "r" if mmap else None
+        levels = [DashaLevel[name.upper()] for name in manifest["levels"]]
+        segments, offsets = {}, {}
+        for level in levels:
+            name = level.name.lower()
+            segments[level] = {
+                column: np.load(os.path.join(path, f"{name}.{column}.npy"), mmap_mode=mmap_mode)
+                for column in _COLUMNS
+            }
+            offsets[level] = np.load(os.path.join(path, f"{name}.offsets.npy"))
+
+        with np.load(os.path.join(path, "delta.npz")) as stored:
+            delta = {
+                level: {column: stored[f"{level.name.lower()}.{column}"] for column in _COLUMNS}
+                for level in levels
+            }
+
+        horizon = tuple(manifest["horizon"]) if manifest["horizon"] else None
+        return cls(
+            levels, manifest["year_days"], horizon,
+            np.load(os.path.join(path, "user_ids.npy"), mmap_mode=mmap_mode),
+            segments, offsets,
+            removed=np.load(os.path.join(path, "removed.npy")),
+            delta=delta
+        )
@@ -0,0 +1,223 @@
+"""
+Ephemeris Executor
+Bounded offload of chart calculations for the ASGI entry point
+
+swisseph keeps global state (ephemeris path, sidereal mode, open files and
+internal caches) and is not thread-safe, so calculations never run on the
+event loop and never run concurrently within one process:
+    thread  - a single dedicated thread serialises all swisseph work (default)
+    process - a pool of spawned processes, each with its own swisseph state
+In both modes at most EPHEMERIS_MAX_PENDING jobs are queued or running; further
+callers wait on the event loop without holding a thread.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Dict, Optional
+
+from services import runtime
+
+
+EXECUTOR_KINDS = ("thread", "process")
+EXECUTOR_KIND = os.environ.get("EPHEMERIS_EXECUTOR", "thread")
+EXECUTOR_WORKERS = int(os.environ.get("EPHEMERIS_WORKERS", str(os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get("EPHEMERIS_MAX_PENDING", "64"))
+
+
+def calculate_d1(user_details):
+    """Job: D1 chart for one birth record"""
+    return runtime.get_d1_calculator().calculate_d1_chart(user_details)
+
+
+def calculate_d9(user_details) -> Dict:
+    """Job: D9 chart data (including its D1 chart) for one birth record"""
+    d1_chart = runtime.get_d1_calculator().calculate_d1_chart(user_details)
+    return runtime.get_d9_calculator().calculate_d9_chart(user_details, d1_chart)
+
+
+def calculate_synastry(query):
+    """Job: synastry of a validated SynastryQuery (returned with the query for formatting)"""
+    return runtime.get_synastry_calculator().calculate(query.first, query.second), query
+
+
+def calculate_dasha(query):
+    """Job: dasha tree for one validated DashaQuery (returned with the query for formatting)"""
+    return runtime.get_dasha_calculator().calculate_dasha(query.user_details), query
+
+
+def find_events(query):
+    """Job: one page of calendar/live events for a validated EventQuery (returned with the query)"""
+    from services.event_calendar import find_events as _find_events, page_events
+
+    stream = _find_events(
+        query.start_jd, query.end_jd, query.planets, query.event_types,
+        runtime.get_event_calendar(), runtime.get_event_search(), query.after
+    )
+    return page_events(stream, query.limit), query
+
+
+def calculate_panchang(query):
+    """Job: panchang of a whole validated PanchangQuery (returned with the query)"""
+    return runtime.get_panchang_calculator().calculate(query), query
+
+
+def calculate_panchang_block(query, first: str, days: int, include_running: bool):
+    """Job: one block of a streamed panchang (see PanchangCalculator.block_ranges)"""
+    return runtime.get_panchang_calculator().calculate_block(query, first, days, include_running), query
+
+
+def calculate_hora(query):
+    """Job: horas and choghadiyas of a validated HoraQuery (returned with the query)"""
+    return runtime.get_hora_calculator().calculate(query), query
+
+
+def calculate_lagna_table(query):
+    """Job: lagna table of a validated LagnaTableQuery (returned with the query)"""
+    return runtime.get_lagna_table_calculator().table(
+        query.date, query.latitude, query.longitude, query.timezone
+    ), query
+
+
+def current_sky(query):
+    """Job: the latest sky snapshot and observer angles for a validated SkyQuery (returned with the query)"""
+    from routes.sky_routes import observe_sky
+
+    return observe_sky(query), query
+
+
+def calculate_transit_overlay(query):
+    """Job: transit overlay of a validated TransitOverlayQuery (with its sky state, and the query)"""
+    from calculators.transit_overlay import transit_longitudes_from_snapshot
+
+    snapshot = runtime.get_sky_snapshot_service()
+    sky = snapshot.current() if query.julian_day is None else snapshot.compute(query.julian_day)
+    overlay = runtime.get_transit_overlay()
+    return (overlay.overlay(transit_longitudes_from_snapshot(sky, overlay.planets), query.natal), sky), query
+
+
+def calculate_astrocartography(query):
+    """Job: astrocartography of a validated AstrocartographyQuery (with its sky state, and the query)"""
+    from routes.astrocartography_routes import _astrocartography
+
+    snapshot = runtime.get_sky_snapshot_service()
+    sky = snapshot.current() if query.julian_day is None else snapshot.compute(query.julian_day)
+    return (_astrocartography(sky, query), sky), query
+
+
+def calculate_transit_periods(query):
+    """Job: transit periods for a validated TransitPeriodQuery (returned with the query)"""
+    return runtime.get_transit_period_calculator().calculate(query.user_details, query.kinds), query
+
+
+def calculate_match(query):
+    """Job: top-k Ashtakoota matches for a validated MatchQuery (with the profile Moon, and the query)"""
+    from routes.match_routes import _match
+
+    moon_longitude = query.moon_longitude
+    if moon_longitude is None:
+        moon_longitude = runtime.get_dasha_calculator().natal_moon_longitude(query.julian_day)
+    return (_match(moon_longitude, query), moon_longitude), query
+
+
+def _initialize_process():
+    """Process pool initializer: build and warm the engines once per process"""
+    # Jobs refresh a stale sky snapshot inline; a ticker thread would call
+    # swisseph concurrently with them
+    runtime.set_sky_ticker(False)
+    runtime.initialize()
+    runtime.warm_up()
+
+
+class EphemerisExecutor:
+    """Bounded executor that keeps swisseph work off the event loop"""
+
+    def __init__(self, kind: str = EXECUTOR_KIND, workers: int = EXECUTOR_WORKERS,
+                 max_pending: int = MAX_PENDING):
+        """
+        Args:
+            kind: "thread" or "process"
+            workers: Process count for the process pool (threads always use one)
+            max_pending: Maximum number of queued plus running jobs
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown EPHEMERIS_EXECUTOR: {kind} (expected one of {', '.join(EXECUTOR_KINDS)})")
+        self.kind = kind
+        self.workers = 1 if kind == "thread" else max(1, workers)
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._local_executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+
+    def start(self):
+        """Create the underlying pool (idempotent)"""
+        if self._executor is not None:
+            return
+        self._local_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ephemeris")
+        if self.kind == "thread":
+            self._executor = self._local_executor
+        else:
+            # Spawned (not forked) so children never inherit the event loop or
+            # the parent's swisseph file handles
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_process
+            )
+
+    async def run(self, func: Callable, *args):
+        """
+        Run a calculation job off the event loop
+
+        Args:
+            func: Module-level job function (must be picklable for processes)
+            *args: Job arguments
+
+        Returns:
+            The job result
+        """
+        if self._executor is None:
+            self.start()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        self._in_flight += 1
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def run_local(self, func: Callable, *args):
+        """
+        Run work that must stay in this process (e.g. a WSGI call) on the
+        process's single swisseph thread, so it never races a calculation
+
+        Not bounded by max_pending; callers apply their own limits.
+        """
+        if self._executor is None:
+            self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._local_executor, func, *args)
+
+    def call_local(self, func: Callable, *args):
+        """Run func on the process's swisseph thread from another thread and wait for it"""
+        if self._executor is None:
+            self.start()
+        return self._local_executor.submit(func, *args).result()
+
+    @property
+    def in_flight(self) -> int:
+        """Callers waiting for a slot plus jobs queued or running in the pool"""
+        return self._in_flight
+
+    def shutdown(self):
+        """Stop the pool, waiting for running jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            if self._local_executor is not self._executor:
+                self._local_executor.shutdown(wait=True)
+            self._executor = None
+            self._local_executor = None
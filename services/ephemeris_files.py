@@ -0,0 +1,194 @@
+"""
+Ephemeris Files
+Which Swiss Ephemeris files cover a date window, page-cache preloading, and a
+log of the files swisseph actually opens
+
+Planet (sepl) and Moon (semo) files each cover 600 years, named after their
+first century: sepl_18.se1 holds 1800-2399, seplm06.se1 600 BC-1 BC
+(astronomical years -600 to -1). Planet files start exactly on their first
+day, and a planet at that instant is seen by light that left it hours earlier,
+so a window starting in the first year of a block also needs the previous
+planet file; otherwise the files of floor(year / 600) cover it. The chart
+engines never read the asteroid (seas) files; sefstars.txt is only read for
+the star-based ayanamsas (true_chitra, true_pushya, true_revati) and kept
+whenever it exists.
+
+Preloading reads (or maps and touches) those files once so that the first
+requests of a new instance find them in the page cache. Touched files are
+detected without per-call overhead: swisseph is only asked for its current
+file when a Julian Day falls outside the files already seen.
+"""
+import logging
+import math
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+import swisseph as swe
+
+
+# Preload at warm-up: "" (off), "read" or "mmap"
+EPHEMERIS_PRELOAD = os.environ.get("EPHEMERIS_PRELOAD", "")
+# Years (inclusive) whose files are preloaded, "start:end"
+EPHEMERIS_WINDOW = os.environ.get("EPHEMERIS_WINDOW", "1800:2100")
+
+FILE_YEARS = 600
+FILE_KINDS = ("sepl", "semo")              # Planets (with the Sun), Moon
+# Years before a window's start each kind must cover (light time; Moon files start early)
+LEAD_YEARS = {"sepl": 1, "semo": 0}
+FIXED_STARS_FILE = "sefstars.txt"
+PRELOAD_METHODS = ("read", "mmap")
+READ_CHUNK = 1 << 20
+
+# swe.get_current_file_data slots: 0 planets, 1 Moon
+PLANET_SLOT = 0
+MOON_SLOT = 1
+
+logger = logging.getLogger(__name__)
+
+
+def parse_window(window: str) -> Tuple[int, int]:
+    """
+    Parse a "start:end" year window (astronomical years, negative for BC)
+
+    Raises:
+        ValueError: If the window is malformed or end precedes start
+    """
+    try:
+        start, end = (int(part) for part in window.split(":"))
+    except ValueError:
+        raise ValueError(f"Ephemeris window must look like 1800:2100, got {window!r}")
+    if end < start:
+        raise ValueError(f"Ephemeris window ends before it starts: {window}")
+    return start, end
+
+
+def file_name(kind: str, year: int) -> str:
+    """Name of the kind's file holding a year (e.g. sepl_18.se1, semom06.se1)"""
+    block = math.floor(year / FILE_YEARS) * FILE_YEARS // 100
+    if block < 0:
+        return f"{kind}m{-block:02d}.se1"
+    return f"{kind}_{block:02d}.se1"
+
+
+def window_file_names(start_year: int, end_year: int, kinds: Iterable[str] = FILE_KINDS) -> List[str]:
+    """Every file name needed for the years start_year..end_year, in time order per kind"""
+    return [
+        file_name(kind, block * FILE_YEARS)
+        for kind in kinds
+        for block in range(math.floor((start_year - LEAD_YEARS[kind]) / FILE_YEARS),
+                           math.floor(end_year / FILE_YEARS) + 1)
+    ]
+
+
+def window_files(ephe_path: str, start_year: int, end_year: int) -> List[str]:
+    """
+    Paths of the files covering a window, fixed-star catalogue included when present
+
+    Raises:
+        FileNotFoundError: If a needed .se1 file is missing from ephe_path
+    """
+    paths = [os.path.join(ephe_path, name) for name in window_file_names(start_year, end_year)]
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        raise FileNotFoundError(f"Missing ephemeris files: {', '.join(missing)}")
+    stars = os.path.join(ephe_path, FIXED_STARS_FILE)
+    if os.path.isfile(stars):
+        paths.append(stars)
+    return paths
+
+
+def preload(paths: Iterable[str], method: str = "read") -> int:
+    """
+    Bring files into the page cache
+
+    Args:
+        paths: Files to load
+        method: "read" (sequential reads) or "mmap" (map and touch every page)
+
+    Returns:
+        Bytes loaded
+    """
+    if method not in PRELOAD_METHODS:
+        raise ValueError(f"Unknown preload method: {method} (expected one of {', '.join(PRELOAD_METHODS)})")
+    total = 0
+    for path in paths:
+        size = os.path.getsize(path)
+        if size == 0:
+            continue
+        with open(path, "rb") as f:
+            if method == "read":
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while f.read(READ_CHUNK):
+                    pass
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for offset in range(0, size, mmap.PAGESIZE):
+                        mapped[offset]
+        total += size
+    return total
+
+
+def preload_window(ephe_path: str, window: str = EPHEMERIS_WINDOW, method: str = "read") -> Dict:
+    """
+    Preload the files covering a "start:end" year window
+
+    Returns:
+        Dictionary with the files, bytes and elapsed milliseconds
+    """
+    started = time.perf_counter()
+    paths = window_files(ephe_path, *parse_window(window))
+    loaded = preload(paths, method)
+    return {
+        "window": window,
+        "method": method,
+        "files": [os.path.basename(path) for path in paths],
+        "bytes": loaded,
+        "ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+class TouchedFiles:
+    """Ephemeris files swisseph has opened in this process"""
+
+    def __init__(self):
+        self._ranges: Dict[int, Tuple[float, float]] = {}   # Slot -> JD range of its last seen file
+        self._files: Dict[str, Tuple[float, float]] = {}    # Path -> JD range
+        self._lock = threading.Lock()
+
+    def observe(self, julian_day: float, moon: bool = False):
+        """
+        Note the files behind a calculation that swisseph just served from files
+
+        Only a Julian Day outside the files already seen costs a swisseph
+        call, so this is a pair of comparisons on almost every chart.
+        """
+        for slot in (PLANET_SLOT, MOON_SLOT) if moon else (PLANET_SLOT,):
+            start, end = self._ranges.get(slot, (math.inf, -math.inf))
+            if start <= julian_day <= end:
+                continue
+            path, start, end, _ = swe.get_current_file_data(slot)
+            if not path:
+                continue
+            with self._lock:
+                self._ranges[slot] = (start, end)
+                if path not in self._files:
+                    self._files[path] = (start, end)
+                    logger.info("Ephemeris file opened: %s (JD %.1f-%.1f)", path, start, end)
+
+    def files(self) -> List[str]:
+        """Paths touched so far, in the order they were first opened"""
+        with self._lock:
+            return list(self._files)
+
+    def reset(self):
+        """Forget the ranges of the open files (after swe.close); the log is kept"""
+        with self._lock:
+            self._ranges.clear()
+
+
+# Process-wide log fed by SwissEphemerisService
+touched_files = TouchedFiles()
@@ -0,0 +1,259 @@
+"""
+Event Calendar
+Precomputed transit and lunar events over a fixed span, queried by binary search
+
+The calendar is built once (tools/event_calendar.py) by running the transit
+event search over a span such as 1900-2100 and stored as one sorted numpy
+record array (24 bytes per event) plus a manifest. On load the records are
+memory-mapped, so every worker shares the same page cache and a range query is
+two binary searches on the time column - swisseph is never touched. Ranges that
+extend beyond the precomputed span fall back to the live search for the
+uncovered part only.
+"""
+import json
+import os
+import shutil
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.astrology_models import TransitEvent, TransitEventType, Planet, Zodiac, Nakshatra
+
+
+CALENDAR_FORMAT = 1
+
+# Record layout; "previous" holds the sign or nakshatra left (ingresses only)
+# and tithi the tithi entered (lunar events only), 0 when not applicable
+EVENT_DTYPE = np.dtype([
+    ("jd", "<f8"),
+    ("longitude", "<f8"),
+    ("planet", "u1"),
+    ("type", "u1"),
+    ("sign", "u1"),
+    ("nakshatra", "u1"),
+    ("previous", "u1"),
+    ("tithi", "u1"),
+    ("retrograde", "u1"),
+    ("reserved", "u1"),
+])
+
+# Stable on-disk codes of the event types (position in this tuple)
+EVENT_TYPE_CODES = tuple(TransitEventType)
+_TYPE_CODE = {event_type: code for code, event_type in enumerate(EVENT_TYPE_CODES)}
+
+# Two live searches started at different times refine the same event to
+# within about 1e-5 days (stations; ingresses 5e-7). Events closer than this
+# to a paging cursor count as already returned.
+RESUME_TOLERANCE = 2e-5
+
+
+def encode_events(events: Iterable[TransitEvent]) -> np.ndarray:
+    """Pack events into a record array sorted by (time, planet, type)"""
+    rows = []
+    for event in events:
+        previous = event.previous_sign or event.previous_nakshatra
+        rows.append((
+            event.julian_day, event.longitude, event.planet.value, _TYPE_CODE[event.event_type],
+            event.sign.value, event.nakshatra.value, previous.value if previous else 0,
+            event.tithi or 0, int(event.retrograde), 0
+        ))
+    records = np.array(rows, dtype=EVENT_DTYPE)
+    return records[np.lexsort((records["type"], records["planet"], records["jd"]))]
+
+
+def decode_event(record) -> TransitEvent:
+    """Rebuild a TransitEvent from one calendar record"""
+    event_type = EVENT_TYPE_CODES[record["type"]]
+    previous = int(record["previous"])
+    return TransitEvent(
+        julian_day=float(record["jd"]),
+        planet=Planet(int(record["planet"])),
+        event_type=event_type,
+        longitude=float(record["longitude"]),
+        retrograde=bool(record["retrograde"]),
+        sign=Zodiac(int(record["sign"])),
+        nakshatra=Nakshatra(int(record["nakshatra"])),
+        previous_sign=Zodiac(previous) if previous and event_type == TransitEventType.SIGN_INGRESS else None,
+        previous_nakshatra=(Nakshatra(previous)
+                            if previous and event_type == TransitEventType.NAKSHATRA_INGRESS else None),
+        tithi=int(record["tithi"]) or None
+    )
+
+
+class EventCalendar:
+    """Sorted, memory-mappable index of the events in [start_jd, end_jd)"""
+
+    def __init__(self, records: np.ndarray, start_jd: float, end_jd: float):
+        self.records = records
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self._times = records["jd"]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def build(cls, search, start_jd: float, end_jd: float) -> "EventCalendar":
+        """
+        Precompute every event type for all nine grahas
+
+        Args:
+            search: TransitEventSearch used to find the events
+            start_jd: Span start (Julian Day, UT)
+            end_jd: Span end (Julian Day, UT)
+        """
+        return cls(encode_events(search.events(start_jd, end_jd)), start_jd, end_jd)
+
+    def covers(self, julian_day: float) -> bool:
+        """Whether an instant lies inside the precomputed span"""
+        return self.start_jd <= julian_day < self.end_jd
+
+    def select(self, start_jd: float, end_jd: float, planets: Optional[Iterable[Planet]] = None,
+               event_types: Optional[Iterable[TransitEventType]] = None) -> np.ndarray:
+        """
+        Records in [start_jd, end_jd) clipped to the span, optionally filtered
+
+        Args:
+            start_jd: Range start (Julian Day, UT)
+            end_jd: Range end (Julian Day, UT)
+            planets: Only these grahas (default: all)
+            event_types: Only these event types (default: all)
+
+        Returns:
+            Record array in time order (a view of the index when unfiltered)
+        """
+        first, last = np.searchsorted(self._times, [max(start_jd, self.start_jd), min(end_jd, self.end_jd)])
+        records = self.records[first:max(first, last)]
+        if planets is not None:
+            records = records[np.isin(records["planet"], [planet.value for planet in planets])]
+        if event_types is not None:
+            records = records[np.isin(records["type"], [_TYPE_CODE[event_type] for event_type in event_types])]
+        return records
+
+    def events(self, start_jd: float, end_jd: float, planets: Optional[Iterable[Planet]] = None,
+               event_types: Optional[Iterable[TransitEventType]] = None) -> Iterator[TransitEvent]:
+        """Ordered stream of the precomputed events in [start_jd, end_jd) (see select())"""
+        for record in self.select(start_jd, end_jd, planets, event_types):
+            yield decode_event(record)
+
+    def save(self, path: str):
+        """
+        Write the calendar to a directory
+
+        Written to a sibling directory and swapped in, so readers never see a
+        half-written calendar.
+        """
+        path = os.path.abspath(path)
+        staging, previous = path + ".new", path + ".old"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        np.save(os.path.join(staging, "events.npy"), self.records)
+        with open(os.path.join(staging, "manifest.json"), "w") as f:
+            json.dump({
+                "format": CALENDAR_FORMAT,
+                "start_jd": self.start_jd,
+                "end_jd": self.end_jd,
+                "events": int(len(self.records)),
+                "event_types": [event_type.value for event_type in EVENT_TYPE_CODES]
+            }, f, indent=2)
+
+        shutil.rmtree(previous, ignore_errors=True)
+        if os.path.exists(path):
+            os.rename(path, previous)
+        os.rename(staging, path)
+        shutil.rmtree(previous, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "EventCalendar":
+        """
+        Open a calendar directory
+
+        Args:
+            path: Directory written by save()
+            mmap: Memory-map the records instead of reading them
+
+        Raises:
+            ValueError: If the directory holds an unsupported calendar format
+        """
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != CALENDAR_FORMAT:
+            raise ValueError(f"Unsupported event calendar format: {manifest.get('format')}")
+        if manifest.get("event_types") != [event_type.value for event_type in EVENT_TYPE_CODES]:
+            raise ValueError("Event calendar was built with different event types; rebuild it")
+
+        records = np.load(os.path.join(path, "events.npy"), mmap_mode="r" if mmap else None)
+        return cls(records, manifest["start_jd"], manifest["end_jd"])
+
+
+def find_events(start_jd: float, end_jd: float, planets: Optional[Iterable[Planet]] = None,
+                event_types: Optional[Iterable[TransitEventType]] = None,
+                calendar: Optional[EventCalendar] = None,
+                search=None, after: Optional[float] = None) -> Iterator[Tuple[TransitEvent, str]]:
+    """
+    Ordered events in [start_jd, end_jd) from the calendar where it covers the range
+
+    The parts of the range before and after the calendar span (or the whole
+    range without a calendar) are searched live. With a paging cursor (see
+    page_events) the stream resumes strictly after it: the range starts just
+    before the cursor so a live search finds the same events again, and events
+    within RESUME_TOLERANCE of it or earlier are skipped.
+
+    Args:
+        start_jd: Range start (Julian Day, UT)
+        end_jd: Range end (Julian Day, UT)
+        planets: Only these grahas (default: all nine)
+        event_types: Only these event types (default: all)
+        calendar: Precomputed calendar, if any
+        search: TransitEventSearch for the uncovered parts
+        after: Cursor returned with the previous page (Julian Day of its last event)
+
+    Yields:
+        (TransitEvent, source) pairs, source being "calendar" or "live"
+    """
+    planets = list(planets) if planets is not None else None
+    event_types = list(event_types) if event_types is not None else None
+    if after is not None:
+        start_jd = max(start_jd, after - RESUME_TOLERANCE)
+
+    if calendar is None:
+        segments = [(start_jd, end_jd, "live")]
+    else:
+        segments = [
+            (start_jd, min(end_jd, calendar.start_jd), "live"),
+            (max(start_jd, calendar.start_jd), min(end_jd, calendar.end_jd), "calendar"),
+            (max(start_jd, calendar.end_jd), end_jd, "live"),
+        ]
+
+    for segment_start, segment_end, source in segments:
+        if segment_start >= segment_end:
+            continue
+        if source == "calendar":
+            stream = calendar.events(segment_start, segment_end, planets, event_types)
+        else:
+            stream = search.events(segment_start, segment_end, planets, event_types)
+        for event in stream:
+            if after is not None and event.julian_day <= after + RESUME_TOLERANCE:
+                continue
+            yield event, source
+
+
+def page_events(stream: Iterator[Tuple[TransitEvent, str]],
+                limit: int) -> Tuple[List[Tuple[TransitEvent, str]], Optional[float]]:
+    """
+    First `limit` pairs of a find_events() stream plus the cursor of the next page
+
+    A page never ends inside a run of events less than 2 * RESUME_TOLERANCE
+    apart (Rahu and Ketu ingresses, a new moon and its tithi change), so
+    find_events(after=cursor) can skip the whole run even when a live search
+    places it slightly differently, without skipping the event after it. The
+    page may therefore hold slightly more than `limit` events. The cursor is
+    the exact Julian Day of the page's last event, or None on the last page.
+    """
+    page = []
+    for event, source in stream:
+        if len(page) >= limit and event.julian_day - page[-1][0].julian_day > 2 * RESUME_TOLERANCE:
+            return page, page[-1][0].julian_day
+        page.append((event, source))
+    return page, None
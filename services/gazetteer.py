@@ -0,0 +1,284 @@
+"""
+Gazetteer
+Offline place lookup: GeoNames ids to coordinates and IANA timezone, plus
+prefix/trigram autocomplete
+
+The file is a GeoNames "cities" export (cities15000.txt, cities500.txt or the
+.zip they are published in), tab-separated: geonameid, name, asciiname,
+alternatenames, latitude, longitude, feature class and code, country code,
+cc2, admin1-4 codes, population, elevation, dem, timezone, modification date.
+It is read once into columns sorted by id, so a lookup is one searchsorted;
+countries and timezones are stored as small integer codes.
+
+Autocomplete keys are the name, ASCII name and alternate names folded to
+lower-case ASCII words. A prefix is a bisect range over the sorted keys,
+ranked by population; when it matches fewer places than asked for, trigram
+similarity (Dice coefficient over the name's trigrams) fills up the rest,
+which catches typos and words inside a name ("york", "bangalor").
+"""
+import io
+import os
+import re
+import unicodedata
+import zipfile
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+GAZETTEER_PATH = os.environ.get("GAZETTEER_PATH", "./data/cities15000.txt")
+# Places below this population are skipped when loading
+GAZETTEER_MIN_POPULATION = int(os.environ.get("GAZETTEER_MIN_POPULATION", "0"))
+# Index GeoNames alternate names (other languages, former names) for autocomplete
+GAZETTEER_ALTERNATE_NAMES = os.environ.get("GAZETTEER_ALTERNATE_NAMES", "1") == "1"
+
+AUTOCOMPLETE_LIMIT = 10
+MAX_AUTOCOMPLETE_LIMIT = 50
+# Prefixes up to this length match too many keys to rank per query; their
+# top MAX_AUTOCOMPLETE_LIMIT places are ranked once at load
+SHORT_PREFIX_LENGTH = 2
+TRIGRAM_MIN_SIMILARITY = 0.4
+MAX_ALTERNATE_NAME_LENGTH = 60
+
+# GeoNames column positions
+ID, NAME, ASCII_NAME, ALTERNATE_NAMES, LATITUDE, LONGITUDE = 0, 1, 2, 3, 4, 5
+COUNTRY, POPULATION, TIMEZONE = 8, 14, 17
+GEONAMES_COLUMNS = 19
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+
+class Place(NamedTuple):
+    """One gazetteer entry"""
+    id: int
+    name: str
+    country: str                         # ISO 3166 alpha-2
+    latitude: float
+    longitude: float
+    timezone: str                        # IANA zone name
+    population: int
+
+    @property
+    def label(self) -> str:
+        """Display name with country (e.g. "Delhi, IN")"""
+        return f"{self.name}, {self.country}" if self.country else self.name
+
+
+class PlaceRecord(NamedTuple):
+    """A place as read from the file, with every name to index"""
+    id: int
+    name: str
+    ascii_name: str
+    alternate_names: List[str]
+    latitude: float
+    longitude: float
+    country: str
+    population: int
+    timezone: str
+
+
+def normalize(text: str) -> str:
+    """Lower-case ASCII words of a name: accents folded, punctuation to single spaces"""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def name_keys(key: str) -> List[str]:
+    """A normalized name and its tails from each later word ("new york" -> "new york", "york")"""
+    keys = [key]
+    start = key.find(" ")
+    while start != -1:
+        keys.append(key[start + 1:])
+        start = key.find(" ", start + 1)
+    return keys
+
+
+def trigrams(key: str) -> set:
+    """Trigrams of a normalized name, padded with a space at either end"""
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def read_geonames(path: str, min_population: int = 0,
+                  alternate_names: bool = True) -> Iterable[PlaceRecord]:
+    """
+    Rows of a GeoNames cities file (.txt, or a .zip holding one)
+
+    Rows without a timezone or below min_population are skipped.
+    """
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            member = next(name for name in archive.namelist() if name.endswith(".txt"))
+            with archive.open(member) as raw:
+                yield from _parse_rows(io.TextIOWrapper(raw, encoding="utf-8"), min_population, alternate_names)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from _parse_rows(f, min_population, alternate_names)
+
+
+def _parse_rows(lines, min_population: int, alternate_names: bool) -> Iterable[PlaceRecord]:
+    for line in lines:
+        columns = line.rstrip("\n").split("\t")
+        if len(columns) < GEONAMES_COLUMNS or not columns[TIMEZONE]:
+            continue
+        population = int(columns[POPULATION] or 0)
+        if population < min_population:
+            continue
+        alternates = ([name for name in columns[ALTERNATE_NAMES].split(",")
+                       if name and len(name) <= MAX_ALTERNATE_NAME_LENGTH]
+                      if alternate_names and columns[ALTERNATE_NAMES] else [])
+        yield PlaceRecord(
+            id=int(columns[ID]),
+            name=columns[NAME],
+            ascii_name=columns[ASCII_NAME],
+            alternate_names=alternates,
+            latitude=float(columns[LATITUDE]),
+            longitude=float(columns[LONGITUDE]),
+            country=columns[COUNTRY],
+            population=population,
+            timezone=columns[TIMEZONE]
+        )
+
+
+class Gazetteer:
+    """In-memory place columns with an id index and a prefix/trigram name index"""
+
+    def __init__(self, records: Iterable[PlaceRecord]):
+        """
+        Initialize Gazetteer
+
+        Args:
+            records: Places to index (e.g. read_geonames)
+        """
+        records = sorted(records, key=lambda record: record.id)
+        self.ids = np.array([record.id for record in records], dtype=np.int64)
+        self.latitudes = np.array([record.latitude for record in records], dtype=np.float64)
+        self.longitudes = np.array([record.longitude for record in records], dtype=np.float64)
+        self.populations = np.array([record.population for record in records], dtype=np.int64)
+        self.names = [record.name for record in records]
+        self.countries, self.country_codes = self._encode([record.country for record in records])
+        self.timezones, self.timezone_codes = self._encode([record.timezone for record in records])
+        self._country_index = {country: code for code, country in enumerate(self.countries)}
+
+        # Prefix index: sorted keys (every name from each of its words on) and
+        # the row of each key. Trigram index over the primary names: trigram
+        # -> rows holding it
+        entries = set()
+        postings: Dict[str, List[int]] = {}
+        self._trigram_counts = np.zeros(len(records), dtype=np.int16)
+        for row, record in enumerate(records):
+            primary = {normalize(record.name), normalize(record.ascii_name)}
+            alternates = {normalize(name) for name in record.alternate_names}
+            grams = set()
+            for key in primary:
+                grams |= trigrams(key)
+            for key in (primary | alternates) - {""}:
+                entries.update((tail, row) for tail in name_keys(key))
+            self._trigram_counts[row] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+        entries = sorted(entries)
+        self._keys = [key for key, _ in entries]
+        self._key_rows = np.array([row for _, row in entries], dtype=np.int32)
+        self._postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()}
+        self._short_prefixes = {
+            prefix: self._ranked_rows(prefix, MAX_AUTOCOMPLETE_LIMIT)
+            for prefix in {key[:length] for key in self._keys for length in range(1, SHORT_PREFIX_LENGTH + 1)}
+        }
+
+    @staticmethod
+    def _encode(values: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Distinct values and the uint16 code of each entry"""
+        distinct = sorted(set(values))
+        index = {value: code for code, value in enumerate(distinct)}
+        return distinct, np.array([index[value] for value in values], dtype=np.uint16)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH, min_population: int = GAZETTEER_MIN_POPULATION,
+             alternate_names: bool = GAZETTEER_ALTERNATE_NAMES) -> "Gazetteer":
+        """Read and index a GeoNames cities file"""
+        return cls(read_geonames(path, min_population, alternate_names))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def place(self, row: int) -> Place:
+        """Place at a column row"""
+        return Place(
+            id=int(self.ids[row]),
+            name=self.names[row],
+            country=self.countries[self.country_codes[row]],
+            latitude=float(self.latitudes[row]),
+            longitude=float(self.longitudes[row]),
+            timezone=self.timezones[self.timezone_codes[row]],
+            population=int(self.populations[row])
+        )
+
+    def get(self, place_id: int) -> Optional[Place]:
+        """Place with a GeoNames id, or None"""
+        row = int(np.searchsorted(self.ids, place_id))
+        if row == len(self.ids) or self.ids[row] != place_id:
+            return None
+        return self.place(row)
+
+    def search(self, query: str, limit: int = AUTOCOMPLETE_LIMIT, country: Optional[str] = None) -> List[Place]:
+        """
+        Autocomplete a place name
+
+        Args:
+            query: Start of the name (any case and accents), or a misspelt name
+            limit: Most places returned
+            country: Only places in this ISO 3166 alpha-2 country
+
+        Returns:
+            Places with a name starting with the query by descending population,
+            then trigram matches by descending similarity
+        """
+        key = normalize(query)
+        if not key:
+            return []
+        country_code = None
+        if country is not None:
+            country_code = self._country_index.get(country.upper())
+            if country_code is None:
+                return []
+
+        if country_code is None and len(key) <= SHORT_PREFIX_LENGTH:
+            rows = self._short_prefixes.get(key, np.empty(0, dtype=np.int32))[:limit]
+        else:
+            rows = self._ranked_rows(key, limit, country_code)
+        found = rows.tolist()
+
+        if len(found) < limit and len(key) >= 3:
+            found.extend(self._similar(key, limit - len(found), country_code, exclude=rows))
+        return [self.place(row) for row in found]
+
+    def _ranked_rows(self, prefix: str, limit: int, country_code: Optional[int] = None) -> np.ndarray:
+        """Rows with a key starting with prefix, by descending population"""
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\x7f", lo)
+        rows = np.unique(self._key_rows[lo:hi])
+        if country_code is not None:
+            rows = rows[self.country_codes[rows] == country_code]
+        return rows[np.argsort(-self.populations[rows], kind="stable")[:limit]]
+
+    def _similar(self, key: str, limit: int, country_code: Optional[int], exclude: np.ndarray) -> List[int]:
+        """Rows whose primary names share enough trigrams with key, most similar first"""
+        grams = trigrams(key)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return []
+        rows, shared = np.unique(np.concatenate(hits), return_counts=True)
+        similarity = 2.0 * shared / (len(grams) + self._trigram_counts[rows])
+        keep = (similarity >= TRIGRAM_MIN_SIMILARITY) & ~np.isin(rows, exclude)
+        if country_code is not None:
+            keep &= self.country_codes[rows] == country_code
+        rows, similarity = rows[keep], similarity[keep]
+        order = np.lexsort((-self.populations[rows], -similarity))[:limit]
+        return rows[order].tolist()
+
+    def stats(self) -> Dict[str, int]:
+        """Index sizes"""
+        return {"places": len(self.ids), "keys": len(self._keys), "trigrams": len(self._postings)}
@@ -0,0 +1,186 @@
+"""
+Rise/Set Service
+Cached Sun and Moon rising, setting and meridian transit times per local date
+
+Times come from swe.rise_trans (upper limb on the apparent horizon, standard
+atmosphere) searched from local midnight, so an event belongs to the local date
+it happens on. A date without a rise and a set is flagged always up or always
+down (polar day or night for the Sun). Results are cached by (body, local date,
+rounded latitude/longitude, timezone offset, altitude, ephemeris); the rounded coordinates
+are also the ones used for the calculation, so a cached answer never depends on
+which request computed it. Panchang, chart and any later per-day engines share
+one instance (services.runtime.get_rise_set_service).
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Sequence, Union
+
+import numpy as np
+import swisseph as swe
+
+from models.astrology_models import Planet, RiseSetTimes
+from services.swiss_ephemeris_service import SwissEphemerisService, EPHEMERIS_FLAGS
+from utils.time_utils import local_datetime_to_julian_day, julian_day_to_local_datetime
+
+
+# 2 decimals = about 1 km, moving a sunrise by at most a couple of seconds
+COORDINATE_DECIMALS = int(os.environ.get("RISE_SET_COORDINATE_DECIMALS", "2"))
+CACHE_SIZE = int(os.environ.get("RISE_SET_CACHE_SIZE", "65536"))
+
+ATMOSPHERIC_PRESSURE = 1013.25  # mbar
+ATMOSPHERIC_TEMPERATURE = 15.0  # Celsius
+
+RISE_SET_BODIES = (Planet.SUN, Planet.MOON)
+
+
+@dataclass
+class RiseSetTable:
+    """Batch rise/set results as columnar arrays (NaN where an event does not happen)"""
+    rise_jd: np.ndarray
+    set_jd: np.ndarray
+    transit_jd: np.ndarray
+    always_up: np.ndarray
+    always_down: np.ndarray
+
+
+class RiseSetService:
+    """Rise, set and transit times of the Sun and Moon with an LRU cache"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 cache_size: int = CACHE_SIZE, coordinate_decimals: int = COORDINATE_DECIMALS):
+        """
+        Initialize Rise/Set Service
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            cache_size: Cached (body, date, location) entries
+            coordinate_decimals: Decimals latitude and longitude are rounded to
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self.cache_size = cache_size
+        self.coordinate_decimals = coordinate_decimals
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def times(self, body: Planet, local_date: str, latitude: float, longitude: float,
+              timezone_offset: float, altitude: float = 0.0, ephemeris: str = None) -> RiseSetTimes:
+        """
+        Rise, set and transit of a body within one local date
+
+        Args:
+            body: Planet.SUN or Planet.MOON
+            local_date: YYYY-MM-DD
+            latitude: Geographic latitude
+            longitude: Geographic longitude (east positive)
+            timezone_offset: Offset of the local date in hours
+            altitude: Height above sea level in metres
+            ephemeris: Ephemeris mode (default: the ephemeris service's)
+
+        Returns:
+            RiseSetTimes (Julian Days, UT)
+        """
+        if body not in RISE_SET_BODIES:
+            raise ValueError(f"Rise/set times are only available for: {', '.join(b.name for b in RISE_SET_BODIES)}")
+        latitude = round(latitude, self.coordinate_decimals)
+        longitude = round(longitude, self.coordinate_decimals)
+        ephemeris = ephemeris or self.ephemeris_service.ephemeris
+        key = (body, local_date, latitude, longitude, timezone_offset, altitude, ephemeris)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        midnight_jd = local_datetime_to_julian_day(local_date, timezone_offset)
+        result = self._calculate(body, midnight_jd, latitude, longitude, altitude, ephemeris)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def times_at(self, body: Planet, julian_day: float, latitude: float, longitude: float,
+                 timezone_offset: float, altitude: float = 0.0, ephemeris: str = None) -> RiseSetTimes:
+        """Rise, set and transit within the local date containing julian_day"""
+        local_date = julian_day_to_local_datetime(julian_day, timezone_offset)[:10]
+        return self.times(body, local_date, latitude, longitude, timezone_offset, altitude, ephemeris)
+
+    def batch(self, body: Planet, local_dates: Union[str, Sequence[str]],
+              latitudes: Union[float, Iterable[float]], longitudes: Union[float, Iterable[float]],
+              timezone_offsets: Union[float, Iterable[float]], altitude: float = 0.0) -> RiseSetTable:
+        """
+        Rise, set and transit for many dates and/or locations at once
+
+        Arguments are broadcast against each other, so one location with many
+        dates, many locations on one date or matching lists all work. Every
+        entry goes through the cache.
+
+        Returns:
+            RiseSetTable with one entry per broadcast element
+        """
+        dates, latitudes, longitudes, timezone_offsets = np.broadcast_arrays(
+            np.asarray(local_dates, dtype=object), np.asarray(latitudes, dtype=np.float64),
+            np.asarray(longitudes, dtype=np.float64), np.asarray(timezone_offsets, dtype=np.float64)
+        )
+        count = dates.size
+        table = RiseSetTable(
+            rise_jd=np.full(count, np.nan), set_jd=np.full(count, np.nan), transit_jd=np.full(count, np.nan),
+            always_up=np.zeros(count, dtype=bool), always_down=np.zeros(count, dtype=bool)
+        )
+        for i, (local_date, latitude, longitude, timezone_offset) in enumerate(zip(
+                dates.ravel().tolist(), latitudes.ravel().tolist(),
+                longitudes.ravel().tolist(), timezone_offsets.ravel().tolist())):
+            times = self.times(body, local_date, latitude, longitude, timezone_offset, altitude)
+            for column, value in (("rise_jd", times.rise_jd), ("set_jd", times.set_jd),
+                                  ("transit_jd", times.transit_jd)):
+                if value is not None:
+                    getattr(table, column)[i] = value
+            table.always_up[i] = times.always_up
+            table.always_down[i] = times.always_down
+        return table
+
+    def cache_info(self) -> Dict:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            return {"entries": len(self._cache), "capacity": self.cache_size,
+                    "hits": self._hits, "misses": self._misses}
+
+    def _calculate(self, body: Planet, midnight_jd: float, latitude: float, longitude: float,
+                   altitude: float, ephemeris: str) -> RiseSetTimes:
+        """Search each event from local midnight, keeping those before the next midnight"""
+        swe_body = self.ephemeris_service.planet_map[body]
+        geopos = (longitude, latitude, altitude)
+        flags = EPHEMERIS_FLAGS[ephemeris]
+
+        events = []
+        for flag in (swe.CALC_RISE, swe.CALC_SET, swe.CALC_MTRANSIT):
+            status, times = swe.rise_trans(
+                midnight_jd, swe_body, flag, geopos, ATMOSPHERIC_PRESSURE, ATMOSPHERIC_TEMPERATURE, flags
+            )
+            events.append(times[0] if status == 0 and times[0] < midnight_jd + 1 else None)
+        rise_jd, set_jd, transit_jd = events
+
+        always_up = always_down = False
+        if rise_jd is None and set_jd is None:
+            # Up or down for the whole date: any instant tells which
+            instant = transit_jd if transit_jd is not None else midnight_jd + 0.5
+            always_up = self._apparent_altitude(swe_body, instant, geopos, flags) > 0
+            always_down = not always_up
+
+        return RiseSetTimes(rise_jd, set_jd, transit_jd, always_up, always_down)
+
+    def _apparent_altitude(self, swe_body: int, julian_day: float, geopos, flags: int) -> float:
+        """Apparent altitude of a body's centre in degrees"""
+        position = swe.calc_ut(julian_day, swe_body, flags)[0][:3]
+        return swe.azalt(julian_day, swe.ECL2HOR, geopos, ATMOSPHERIC_PRESSURE,
+                         ATMOSPHERIC_TEMPERATURE, position)[2]
+
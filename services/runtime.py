@@ -0,0 +1,411 @@
+"""
+Runtime Service
+Process-wide chart engines shared by every blueprint, plus the hooks that keep
+them fork-safe under a preloaded gunicorn master
+
+Calculators (and with them swisseph) are imported on first use so that
+importing the app stays cheap; STARTUP_MODE decides when that first use is:
+    lazy       - on the first request that needs an engine
+    background - in a warm-up thread started when the app is created
+    eager      - synchronously while the app is created
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+EPHE_PATH = os.environ.get("EPHE_PATH", "./ephe")
+EVENT_CALENDAR_PATH = os.environ.get("EVENT_CALENDAR_PATH", "./data/event_calendar")
+# JSON list of {"name", "latitude", "longitude", "timezone"} whose sunrise
+# tables are precomputed at warm-up for HORA_PRECOMPUTE_DAYS dates
+HORA_CITIES_PATH = os.environ.get("HORA_CITIES_PATH", "")
+HORA_PRECOMPUTE_DAYS = int(os.environ.get("HORA_PRECOMPUTE_DAYS", "31"))
+STARTUP_MODE = os.environ.get("STARTUP_MODE", "lazy")
+STARTUP_MODES = ("lazy", "background", "eager")
+
+logger = logging.getLogger(__name__)
+
+# Birth details used to exercise every code path before serving traffic
+WARM_UP_DETAILS = {
+    "name": "warm-up",
+    "datetime": "1987-05-04T19:43:00",
+    "latitude": 26.1433,
+    "longitude": 91.7898,
+    "timezone": 5.5,
+    "place": "Dispur"
+}
+
+_engines: Dict[str, object] = {}
+# Re-entrant so that an engine factory can fetch the engines it is built on
+_engines_lock = threading.RLock()
+# How the sky ticker calls swisseph (see set_sky_runner); None = in an
+# admission slot (see _refresh_in_slot)
+_sky_runner: Optional[Callable] = None
+# Whether get_sky_snapshot_service starts a ticker (see set_sky_ticker)
+_sky_ticker = True
+
+
+def _engine(name: str, factory: Callable[[], object]):
+    """
+    Return the shared engine called name, building it with factory() on first use
+
+    None is a valid engine (e.g. no event calendar built) and is remembered
+    like any other, so a missing file is only looked for once.
+    """
+    try:
+        return _engines[name]
+    except KeyError:
+        pass
+    with _engines_lock:
+        if name not in _engines:
+            _engines[name] = factory()
+        return _engines[name]
+
+
+def get_d1_calculator():
+    """Return the shared D1 calculator, creating it on first use"""
+    def build():
+        from calculators.d1_chart_calculator import D1ChartCalculator
+        return D1ChartCalculator(ephe_path=EPHE_PATH)
+    return _engine("d1", build)
+
+
+def get_d9_calculator():
+    """Return the shared D9 calculator (reusing the shared D1 calculator)"""
+    def build():
+        from calculators.d9_chart_calculator import D9ChartCalculator
+        return D9ChartCalculator(ephe_path=EPHE_PATH, d1_calculator=get_d1_calculator())
+    return _engine("d9", build)
+
+
+def get_synastry_calculator():
+    """Return the shared synastry calculator (reusing the shared D1 and D9 calculators)"""
+    def build():
+        from calculators.synastry_calculator import SynastryCalculator
+        return SynastryCalculator(
+            ephe_path=EPHE_PATH, d1_calculator=get_d1_calculator(), d9_calculator=get_d9_calculator()
+        )
+    return _engine("synastry", build)
+
+
+def get_dasha_calculator():
+    """Return the shared dasha calculator (sharing the D1 calculator's ephemeris service)"""
+    def build():
+        from calculators.dasha_calculator import DashaCalculator
+        return DashaCalculator(ephemeris_service=get_d1_calculator().ephemeris_service)
+    return _engine("dasha", build)
+
+
+def get_event_search():
+    """Return the shared transit event search (sharing the D1 calculator's ephemeris service)"""
+    def build():
+        from calculators.transit_event_search import TransitEventSearch
+        return TransitEventSearch(ephemeris_service=get_d1_calculator().ephemeris_service)
+    return _engine("events", build)
+
+
+def get_rise_set_service():
+    """Return the shared rise/set service (owned by the D1 calculator, so its cache is shared too)"""
+    return get_d1_calculator().rise_set_service
+
+
+def get_panchang_calculator():
+    """Return the shared panchang calculator (sharing the D1 calculator's ephemeris and rise/set services)"""
+    def build():
+        from calculators.panchang_calculator import PanchangCalculator
+        d1_calculator = get_d1_calculator()
+        return PanchangCalculator(
+            ephemeris_service=d1_calculator.ephemeris_service,
+            rise_set_service=d1_calculator.rise_set_service
+        )
+    return _engine("panchang", build)
+
+
+def get_hora_calculator():
+    """Return the shared hora calculator (sharing the D1 calculator's ephemeris and rise/set services)"""
+    def build():
+        from calculators.hora_calculator import HoraCalculator
+        d1_calculator = get_d1_calculator()
+        return HoraCalculator(
+            ephemeris_service=d1_calculator.ephemeris_service,
+            rise_set_service=d1_calculator.rise_set_service
+        )
+    return _engine("hora", build)
+
+
+def get_lagna_table_calculator():
+    """Return the shared lagna table calculator (sharing the D1 calculator's ephemeris service)"""
+    def build():
+        from calculators.lagna_table_calculator import LagnaTableCalculator
+        return LagnaTableCalculator(ephemeris_service=get_d1_calculator().ephemeris_service)
+    return _engine("lagna_table", build)
+
+
+def get_sky_snapshot_service():
+    """
+    Return the shared sky snapshot service, starting its ticker on first use
+
+    The ticker thread is started lazily in the process that serves requests
+    (threads do not survive a fork, so a preloaded master never starts one).
+    """
+    def build():
+        from services.sky_snapshot import SkySnapshotService
+        return SkySnapshotService(ephemeris_service=get_d1_calculator().ephemeris_service)
+    service = _engine("sky", build)
+    if _sky_ticker and not service.running:
+        service.start(runner=_sky_runner or _refresh_in_slot)
+    return service
+
+
+def _refresh_in_slot(refresh: Callable):
+    """
+    Default sky ticker runner: refresh inside an admission slot
+
+    Under WSGI the admission slot is what keeps request threads from calling
+    swisseph at once (see services.admission), so the ticker queues for one
+    like a "cached" request. A refresh shed under overload is skipped; requests
+    refresh a stale snapshot inline meanwhile.
+    """
+    from services.admission import controller, Overloaded
+
+    try:
+        with controller.slot("cached"):
+            refresh()
+    except Overloaded as e:
+        logger.debug("Sky snapshot refresh skipped (%s)", e.reason)
+
+
+def get_transit_overlay():
+    """Return the shared transit overlay calculator (pure numpy, no ephemeris)"""
+    def build():
+        from calculators.transit_overlay import TransitOverlayCalculator
+        return TransitOverlayCalculator()
+    return _engine("transit_overlay", build)
+
+
+def get_astrocartography_calculator():
+    """Return the shared astrocartography calculator (pure numpy over a sky snapshot, no ephemeris)"""
+    def build():
+        from calculators.astrocartography import AstrocartographyCalculator
+        return AstrocartographyCalculator()
+    return _engine("astrocartography", build)
+
+
+def get_transit_period_calculator():
+    """Return the shared transit period calculator (sharing the event search and calendar)"""
+    def build():
+        from calculators.transit_period_calculator import TransitPeriodCalculator
+        event_search = get_event_search()
+        return TransitPeriodCalculator(
+            ephemeris_service=event_search.ephemeris_service,
+            event_search=event_search,
+            event_calendar=get_event_calendar()
+        )
+    return _engine("transit_periods", build)
+
+
+def get_ashtakoota_calculator():
+    """Return the shared Ashtakoota calculator (pure numpy koota tables, no ephemeris)"""
+    def build():
+        from calculators.ashtakoota_calculator import AshtakootaCalculator
+        return AshtakootaCalculator()
+    return _engine("ashtakoota", build)
+
+
+def set_sky_runner(runner: Optional[Callable]):
+    """Route sky ticker refreshes through runner(refresh), e.g. onto the ASGI swisseph thread"""
+    global _sky_runner
+    _sky_runner = runner
+
+
+def set_sky_ticker(enabled: bool):
+    """Start (default) or never start the sky ticker; without it current() refreshes stale snapshots inline"""
+    global _sky_ticker
+    _sky_ticker = enabled
+
+
+def stop_sky_ticker():
+    """Stop the sky ticker if this process started one"""
+    service = _engines.get("sky")
+    if service is not None:
+        service.stop()
+
+
+def get_event_calendar():
+    """
+    Return the precomputed event calendar, or None when none has been built
+
+    The calendar is memory-mapped once per process from EVENT_CALENDAR_PATH;
+    a missing calendar is remembered so every request falls back to live search
+    without touching the disk again.
+    """
+    def build():
+        from services.event_calendar import EventCalendar
+        if not os.path.exists(os.path.join(EVENT_CALENDAR_PATH, "manifest.json")):
+            return None
+        calendar = EventCalendar.load(EVENT_CALENDAR_PATH)
+        logger.info("Loaded event calendar %s (%d events)", EVENT_CALENDAR_PATH, len(calendar))
+        return calendar
+    return _engine("event_calendar", build)
+
+
+def get_gazetteer():
+    """
+    Return the offline place index, or None when GAZETTEER_PATH has no file
+
+    Loaded once per process (in the gunicorn master when preloaded, so the
+    columns are shared copy-on-write); a missing file is remembered.
+    """
+    def build():
+        from services.gazetteer import Gazetteer, GAZETTEER_PATH
+        if not os.path.exists(GAZETTEER_PATH):
+            return None
+        started = time.perf_counter()
+        gazetteer = Gazetteer.load(GAZETTEER_PATH)
+        logger.info("Loaded gazetteer %s (%d places) in %.1f ms", GAZETTEER_PATH, len(gazetteer),
+                    (time.perf_counter() - started) * 1000)
+        return gazetteer
+    return _engine("gazetteer", build)
+
+
+def initialize():
+    """
+    Build every shared engine
+
+    Called in the gunicorn master when the app is preloaded, so the engines and
+    their read-only tables are shared copy-on-write with the workers. No
+    ephemeris file is read here.
+    """
+    get_d1_calculator()
+    get_d9_calculator()
+    get_synastry_calculator()
+    get_dasha_calculator()
+    get_event_search()
+    get_panchang_calculator()
+    get_hora_calculator()
+    get_lagna_table_calculator()
+    get_transit_overlay()
+    get_astrocartography_calculator()
+    get_event_calendar()
+    get_transit_period_calculator()
+    get_ashtakoota_calculator()
+    get_gazetteer()
+
+
+def initialized(name: str):
+    """The shared engine called name if it has been built, else None (never builds it)"""
+    return _engines.get(name)
+
+
+def ephemeris_status(deep: bool = False) -> Optional[Dict[str, object]]:
+    """
+    Configured ephemeris mode (EPHEMERIS_MODE), its path and the files opened so far
+
+    Without deep this only reads state: None until the D1 engine exists. With
+    deep the engine is built if needed and one Moon position probes the mode
+    actually serving it ("served").
+    """
+    calculator = get_d1_calculator() if deep else initialized("d1")
+    if calculator is None:
+        return None
+    from services.ephemeris_files import touched_files
+
+    service = calculator.ephemeris_service
+    status = service.check_ephemeris() if deep else {"configured": service.ephemeris, "path": service.ephe_path}
+    status["files_touched"] = [os.path.basename(path) for path in touched_files.files()]
+    return status
+
+
+def preload_ephemeris() -> Optional[Dict]:
+    """Pull the files of EPHEMERIS_WINDOW into the page cache when EPHEMERIS_PRELOAD is set"""
+    from services.ephemeris_files import EPHEMERIS_PRELOAD, EPHEMERIS_WINDOW, preload_window
+
+    if not EPHEMERIS_PRELOAD:
+        return None
+    report = preload_window(EPHE_PATH, EPHEMERIS_WINDOW, EPHEMERIS_PRELOAD)
+    logger.info("Preloaded %d ephemeris files (%.1f MB) for %s by %s in %.1f ms",
+                len(report["files"]), report["bytes"] / 1e6, report["window"], report["method"], report["ms"])
+    return report
+
+
+def reopen_ephemeris():
+    """Reopen swisseph file handles; call in each worker right after fork"""
+    get_d1_calculator().ephemeris_service.reopen()
+
+
+def warm_up() -> float:
+    """
+    Preload the ephemeris window (EPHEMERIS_PRELOAD), run one full D1 + D9
+    calculation to load ephemeris pages and code paths, build the
+    Saturn/Jupiter sign occupancy tables of the transit periods and load the
+    gazetteer (so place ids never load it on the ASGI event loop)
+
+    Returns:
+        Elapsed time in seconds
+    """
+    from models.astrology_models import UserDetails
+
+    started = time.perf_counter()
+    preload_ephemeris()
+    user_details = UserDetails(**WARM_UP_DETAILS)
+    d1_chart = get_d1_calculator().calculate_d1_chart(user_details)
+    get_d9_calculator().calculate_d9_chart(user_details, d1_chart)
+    get_transit_period_calculator().calculate(user_details)
+    get_gazetteer()
+    status = ephemeris_status(deep=True)
+    if status["served"] != status["configured"]:
+        logger.warning("Ephemeris mode %s is served by %s (are the .se1 files in %s?)",
+                       status["configured"], status["served"], status["path"])
+    if HORA_CITIES_PATH:
+        precompute_hora_cities()
+    return time.perf_counter() - started
+
+
+def precompute_hora_cities(path: str = HORA_CITIES_PATH, days: int = HORA_PRECOMPUTE_DAYS) -> int:
+    """
+    Fill the sunrise cache for every city in a JSON city list
+
+    The run starts the day before today (UTC) so that the early hours of
+    today in any timezone are covered as well.
+
+    Returns:
+        Number of (city, date) sunrise entries cached
+    """
+    import json
+    from datetime import datetime, timedelta, timezone
+
+    with open(path) as f:
+        cities = json.load(f)
+    first = (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
+    started = time.perf_counter()
+    entries = get_hora_calculator().precompute(cities, first, days + 1)
+    logger.info("Precomputed sunrise tables for %d cities (%d entries) in %.1f ms",
+                len(cities), entries, (time.perf_counter() - started) * 1000)
+    return entries
+
+
+def _background_warm_up():
+    try:
+        elapsed = warm_up()
+        logger.info("Engines warmed up in background in %.1f ms", elapsed * 1000)
+    except Exception:
+        logger.exception("Background warm-up failed; engines will initialise on first use")
+
+
+def start(mode: str = STARTUP_MODE):
+    """
+    Apply the startup mode once the app and its blueprints are registered
+
+    Args:
+        mode: One of STARTUP_MODES
+    """
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"Unknown STARTUP_MODE: {mode} (expected one of {', '.join(STARTUP_MODES)})")
+
+    if mode == "eager":
+        initialize()
+        warm_up()
+    elif mode == "background":
+        threading.Thread(target=_background_warm_up, name="engine-warm-up", daemon=True).start()
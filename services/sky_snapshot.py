@@ -0,0 +1,212 @@
+"""
+Sky Snapshot Service
+Location-independent state of the sky "now", refreshed by a background ticker
+
+Every SKY_REFRESH_SECONDS a ticker thread computes the ayanamsa, the sidereal
+positions of the nine grahas, the true obliquity and Greenwich sidereal time
+for the current instant and publishes them as one immutable SkySnapshot (a
+single reference swap, so readers never see a half-built state). Requests for
+"now" read the snapshot and only add what depends on the observer: the ARMC,
+ascendant and midheaven (swe.houses_armc, pure trigonometry without ephemeris
+reads). current() never hands out a snapshot older than the staleness bound:
+if the ticker has fallen behind (or is not running) the caller refreshes it
+inline.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import swisseph as swe
+
+from models.astrology_models import Planet, Zodiac, Nakshatra
+from services.swiss_ephemeris_service import SwissEphemerisService
+from utils.time_utils import JD_UNIX_EPOCH
+
+
+REFRESH_SECONDS = float(os.environ.get("SKY_REFRESH_SECONDS", "10"))
+# Oldest snapshot current() returns; older ones are refreshed by the caller
+MAX_STALENESS_SECONDS = float(os.environ.get("SKY_MAX_STALENESS_SECONDS", str(2 * REFRESH_SECONDS)))
+
+SKY_PLANETS = (
+    Planet.SUN, Planet.MOON, Planet.MERCURY, Planet.VENUS,
+    Planet.MARS, Planet.JUPITER, Planet.SATURN, Planet.RAHU, Planet.KETU
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SkyPlanet(NamedTuple):
+    """Sidereal position of one graha in a snapshot"""
+    planet: Planet
+    longitude: float
+    latitude: float
+    distance: float
+    speed: float
+    sign: Zodiac
+    degree: float
+    nakshatra: Nakshatra
+    nakshatra_pada: int
+    retrograde: bool
+
+
+class SkyAngles(NamedTuple):
+    """Observer-dependent angles of a snapshot (sidereal degrees)"""
+    armc: float
+    ascendant: float
+    midheaven: float
+
+
+@dataclass(frozen=True)
+class SkySnapshot:
+    """Immutable location-independent sky state at one instant"""
+    julian_day: float                    # Instant of the snapshot (UT)
+    computed_at: float                   # Unix time the snapshot was published
+    ayanamsa: float
+    obliquity: float                     # True obliquity of the ecliptic
+    sidereal_time: float                 # Greenwich apparent sidereal time in hours
+    planets: Tuple[SkyPlanet, ...]       # In SKY_PLANETS order
+
+    def age(self, now: float = None) -> float:
+        """Seconds since the snapshot instant"""
+        return (time.time() if now is None else now) - (self.julian_day - JD_UNIX_EPOCH) * 86400.0
+
+    def planet(self, planet: Planet) -> SkyPlanet:
+        """Position of one graha"""
+        return self.planets[SKY_PLANETS.index(planet)]
+
+    def angles(self, latitude: float, longitude: float) -> SkyAngles:
+        """
+        ARMC, ascendant and midheaven for an observer at this instant
+
+        Args:
+            latitude: Geographic latitude
+            longitude: Geographic longitude (east positive)
+        """
+        armc = (self.sidereal_time * 15.0 + longitude) % 360
+        ascmc = swe.houses_armc(armc, latitude, self.obliquity, b'W')[1]
+        return SkyAngles(
+            armc=armc,
+            ascendant=(ascmc[0] - self.ayanamsa) % 360,
+            midheaven=(ascmc[1] - self.ayanamsa) % 360
+        )
+
+
+class SkySnapshotService:
+    """Publishes SkySnapshots from a ticker thread and serves the latest one"""
+
+    def __init__(self, ephe_path: str = "./ephe", ephemeris_service: SwissEphemerisService = None,
+                 refresh_seconds: float = REFRESH_SECONDS, max_staleness_seconds: float = MAX_STALENESS_SECONDS):
+        """
+        Initialize Sky Snapshot Service
+
+        Args:
+            ephe_path: Path to Swiss Ephemeris data files
+            ephemeris_service: Existing service to share (e.g. the D1 calculator's)
+            refresh_seconds: Ticker cadence
+            max_staleness_seconds: Oldest snapshot current() returns
+        """
+        self.ephemeris_service = ephemeris_service or SwissEphemerisService(ephe_path)
+        self.refresh_seconds = refresh_seconds
+        self.max_staleness_seconds = max(max_staleness_seconds, refresh_seconds)
+        self._snapshot: Optional[SkySnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._ticker_lock = threading.Lock()
+        self._ticker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def current(self) -> SkySnapshot:
+        """Latest snapshot, refreshed inline when older than the staleness bound"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.age() > self.max_staleness_seconds:
+            with self._refresh_lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.age() > self.max_staleness_seconds:
+                    snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self) -> SkySnapshot:
+        """Compute and publish the snapshot for the current instant"""
+        snapshot = self.compute(JD_UNIX_EPOCH + time.time() / 86400.0)
+        self._snapshot = snapshot
+        return snapshot
+
+    def compute(self, julian_day: float) -> SkySnapshot:
+        """
+        Location-independent sky state at an instant
+
+        Args:
+            julian_day: Julian Day (UT)
+
+        Returns:
+            SkySnapshot
+        """
+        service = self.ephemeris_service
+        ayanamsa = service.calculate_ayanamsa(julian_day)
+        planets = []
+        for planet in SKY_PLANETS:
+            longitude, latitude, distance, speed = service.get_planet_position(planet, julian_day)
+            sidereal_longitude = (longitude - ayanamsa) % 360
+            nakshatra, pada = service.longitude_to_nakshatra(sidereal_longitude)
+            planets.append(SkyPlanet(
+                planet=planet,
+                longitude=sidereal_longitude,
+                latitude=latitude,
+                distance=distance,
+                speed=speed,
+                sign=service.longitude_to_zodiac_sign(sidereal_longitude),
+                degree=sidereal_longitude % 30,
+                nakshatra=nakshatra,
+                nakshatra_pada=pada,
+                retrograde=service.is_planet_retrograde(speed)
+            ))
+
+        return SkySnapshot(
+            julian_day=julian_day,
+            computed_at=time.time(),
+            ayanamsa=ayanamsa,
+            obliquity=swe.calc_ut(julian_day, swe.ECL_NUT)[0][0],
+            sidereal_time=swe.sidtime(julian_day),
+            planets=tuple(planets)
+        )
+
+    def start(self, runner: Callable = None):
+        """
+        Start the ticker thread (idempotent)
+
+        Args:
+            runner: Calls the refresh function on the thread that owns swisseph
+                (e.g. the ASGI ephemeris thread); default calls it directly
+        """
+        with self._ticker_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._ticker = threading.Thread(
+                target=self._tick, args=(runner or (lambda refresh: refresh()),),
+                name="sky-ticker", daemon=True
+            )
+            self._ticker.start()
+
+    def stop(self):
+        """Stop the ticker thread"""
+        with self._ticker_lock:
+            self._stop.set()
+            if self._ticker is not None:
+                self._ticker.join()
+                self._ticker = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the ticker thread is alive"""
+        return self._ticker is not None and self._ticker.is_alive()
+
+    def _tick(self, runner: Callable):
+        while not self._stop.is_set():
+            try:
+                runner(self.refresh)
+            except Exception:
+                logger.exception("Sky snapshot refresh failed; callers refresh inline until it recovers")
+            self._stop.wait(self.refresh_seconds)
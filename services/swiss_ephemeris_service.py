@@ -2,25 +2,145 @@
 Swiss Ephemeris Service
 Handles all interactions with the Swiss Ephemeris library
 """
+import os
+import threading
+from collections import OrderedDict
+
 import swisseph as swe
-import math
-from datetime import datetime, timezone
 from typing import Tuple, List, Dict
-import pytz
-from models.astrology_models import Planet, Zodiac, Nakshatra, PlanetPosition
+
+import numpy as np
+
+from models.astrology_models import Planet, Zodiac, Nakshatra, PlanetPosition, Ayanamsa, HouseSystem, EphemerisMode
+from services.ephemeris_files import touched_files
+from utils.ascendant import ascendant, ascendants
+from utils.time_utils import Timezone, civil_to_julian_day
+
+
+# Nakshatra data with degrees and rulers. Built once at import and shared by
+# every service instance (and, under a preloaded gunicorn master, by every
+# worker) - treat as read-only.
+NAKSHATRAS = [
+    {"name": Nakshatra.ASHWINI, "start": 0, "end": 13.333333, "ruler": Planet.KETU, "symbol": "Horse Head", "deity": "Ashwin Kumaras"},
+    {"name": Nakshatra.BHARANI, "start": 13.333333, "end": 26.666667, "ruler": Planet.VENUS, "symbol": "Yoni", "deity": "Yama"},
+    {"name": Nakshatra.KRITTIKA, "start": 26.666667, "end": 40, "ruler": Planet.SUN, "symbol": "Knife", "deity": "Agni"},
+    {"name": Nakshatra.ROHINI, "start": 40, "end": 53.333333, "ruler": Planet.MOON, "symbol": "Cart", "deity": "Brahma"},
+    {"name": Nakshatra.MRIGASHIRA, "start": 53.333333, "end": 66.666667, "ruler": Planet.MARS, "symbol": "Deer Head", "deity": "Soma"},
+    {"name": Nakshatra.ARDRA, "start": 66.666667, "end": 80, "ruler": Planet.RAHU, "symbol": "Teardrop", "deity": "Rudra"},
+    {"name": Nakshatra.PUNARVASU, "start": 80, "end": 93.333333, "ruler": Planet.JUPITER, "symbol": "Bow and Quiver", "deity": "Aditi"},
+    {"name": Nakshatra.PUSHYA, "start": 93.333333, "end": 106.666667, "ruler": Planet.SATURN, "symbol": "Cow's Udder", "deity": "Brihaspati"},
+    {"name": Nakshatra.ASHLESHA, "start": 106.666667, "end": 120, "ruler": Planet.MERCURY, "symbol": "Serpent", "deity": "Sarpa"},
+    {"name": Nakshatra.MAGHA, "start": 120, "end": 133.333333, "ruler": Planet.KETU, "symbol": "Throne", "deity": "Pitru"},
+    {"name": Nakshatra.PURVA_PHALGUNI, "start": 133.333333, "end": 146.666667, "ruler": Planet.VENUS, "symbol": "Hammock", "deity": "Bhaga"},
+    {"name": Nakshatra.UTTARA_PHALGUNI, "start": 146.666667, "end": 160, "ruler": Planet.SUN, "symbol": "Bed", "deity": "Aryaman"},
+    {"name": Nakshatra.HASTA, "start": 160, "end": 173.333333, "ruler": Planet.MOON, "symbol": "Hand", "deity": "Savitar"},
+    {"name": Nakshatra.CHITRA, "start": 173.333333, "end": 186.666667, "ruler": Planet.MARS, "symbol": "Pearl", "deity": "Vishvakarma"},
+    {"name": Nakshatra.SWATI, "start": 186.666667, "end": 200, "ruler": Planet.RAHU, "symbol": "Blade of Grass", "deity": "Vayu"},
+    {"name": Nakshatra.VISHAKHA, "start": 200, "end": 213.333333, "ruler": Planet.JUPITER, "symbol": "Archway", "deity": "Indra-Agni"},
+    {"name": Nakshatra.ANURADHA, "start": 213.333333, "end": 226.666667, "ruler": Planet.SATURN, "symbol": "Lotus", "deity": "Mitra"},
+    {"name": Nakshatra.JYESHTHA, "start": 226.666667, "end": 240, "ruler": Planet.MERCURY, "symbol": "Earring", "deity": "Indra"},
+    {"name": Nakshatra.MULA, "start": 240, "end": 253.333333, "ruler": Planet.KETU, "symbol": "Root", "deity": "Nirrti"},
+    {"name": Nakshatra.PURVA_ASHADHA, "start": 253.333333, "end": 266.666667, "ruler": Planet.VENUS, "symbol": "Fan", "deity": "Apas"},
+    {"name": Nakshatra.UTTARA_ASHADHA, "start": 266.666667, "end": 280, "ruler": Planet.SUN, "symbol": "Elephant Tusk", "deity": "Vishve Devas"},
+    {"name": Nakshatra.SHRAVANA, "start": 280, "end": 293.333333, "ruler": Planet.MOON, "symbol": "Ear", "deity": "Vishnu"},
+    {"name": Nakshatra.DHANISHTA, "start": 293.333333, "end": 306.666667, "ruler": Planet.MARS, "symbol": "Drum", "deity": "Vasu"},
+    {"name": Nakshatra.SHATABHISHA, "start": 306.666667, "end": 320, "ruler": Planet.RAHU, "symbol": "Circle", "deity": "Varuna"},
+    {"name": Nakshatra.PURVA_BHADRAPADA, "start": 320, "end": 333.333333, "ruler": Planet.JUPITER, "symbol": "Sword", "deity": "Aja Ekapada"},
+    {"name": Nakshatra.UTTARA_BHADRAPADA, "start": 333.333333, "end": 346.666667, "ruler": Planet.SATURN, "symbol": "Snake", "deity": "Ahir Budhnya"},
+    {"name": Nakshatra.REVATI, "start": 346.666667, "end": 360, "ruler": Planet.MERCURY, "symbol": "Fish", "deity": "Pushan"}
+]
+
+NAKSHATRA_BY_NAME = {nak_data["name"]: nak_data for nak_data in NAKSHATRAS}
+
+
+def longitude_to_zodiac_sign(longitude: float) -> Zodiac:
+    """Convert longitude to zodiac sign (pure: no swisseph call)"""
+    sign_number = int(longitude / 30) + 1
+    return Zodiac(sign_number)
+
+
+def longitude_to_nakshatra(longitude: float) -> Tuple[Nakshatra, int]:
+    """
+    Convert longitude to nakshatra and pada (pure: no swisseph call)
+
+    Args:
+        longitude: Longitude in degrees
+
+    Returns:
+        Tuple of (Nakshatra, pada)
+    """
+    for nak_data in NAKSHATRAS:
+        if nak_data["start"] <= longitude < nak_data["end"]:
+            # Calculate pada (1-4)
+            pada_size = (nak_data["end"] - nak_data["start"]) / 4
+            pada = int((longitude - nak_data["start"]) / pada_size) + 1
+            return (nak_data["name"], pada)
+
+    # Handle edge case for last nakshatra (Revati)
+    return (Nakshatra.REVATI, 4)
+
+# Selectable ayanamsas (swisseph sidereal modes) by request name
+AYANAMSAS = {
+    Ayanamsa.LAHIRI.value: swe.SIDM_LAHIRI,
+    Ayanamsa.LAHIRI_ICRC.value: swe.SIDM_LAHIRI_ICRC,
+    Ayanamsa.RAMAN.value: swe.SIDM_RAMAN,
+    Ayanamsa.KP.value: swe.SIDM_KRISHNAMURTI,
+    Ayanamsa.KP_NEW.value: swe.SIDM_KRISHNAMURTI_VP291,
+    Ayanamsa.TRUE_CHITRA.value: swe.SIDM_TRUE_CITRA,
+    Ayanamsa.TRUE_PUSHYA.value: swe.SIDM_TRUE_PUSHYA,
+    Ayanamsa.TRUE_REVATI.value: swe.SIDM_TRUE_REVATI,
+    Ayanamsa.YUKTESHWAR.value: swe.SIDM_YUKTESHWAR,
+    Ayanamsa.SURYASIDDHANTA.value: swe.SIDM_SURYASIDDHANTA,
+    Ayanamsa.FAGAN_BRADLEY.value: swe.SIDM_FAGAN_BRADLEY,
+}
+DEFAULT_AYANAMSA = Ayanamsa.LAHIRI.value
+
+# Selectable house systems (swisseph codes) by request name
+HOUSE_SYSTEMS = {
+    HouseSystem.WHOLE_SIGN.value: b'W',
+    HouseSystem.PLACIDUS.value: b'P',
+    HouseSystem.SRIPATI.value: b'S',
+    HouseSystem.EQUAL.value: b'A',
+    HouseSystem.PORPHYRY.value: b'O',
+    HouseSystem.KOCH.value: b'K',
+}
+DEFAULT_HOUSE_SYSTEM = HouseSystem.WHOLE_SIGN.value
+
+# Ephemeris sources by request name. Moshier is analytic (no file reads) and
+# stays within about 1" of the files for the planets and 3.5" for the Moon
+# over 1800-2100 (README, "Ephemeris Modes").
+EPHEMERIS_FLAGS = {
+    EphemerisMode.SWISS.value: swe.FLG_SWIEPH,
+    EphemerisMode.MOSHIER.value: swe.FLG_MOSEPH,
+}
+# Deployment default; requests may override it with "ephemeris"
+EPHEMERIS_MODE = os.environ.get("EPHEMERIS_MODE", EphemerisMode.SWISS.value)
+
+AYANAMSA_CACHE_SIZE = int(os.environ.get("AYANAMSA_CACHE_SIZE", "65536"))
+
+# swisseph's sidereal mode is process-global: it is only ever set and read
+# under this lock, and values are cached per (mode, Julian Day), so
+# concurrent requests with different ayanamsas never see each other's mode.
+_ayanamsa_lock = threading.Lock()
+_ayanamsa_cache = OrderedDict()
+_sid_mode = None
 
 
 class SwissEphemerisService:
     """Service class for Swiss Ephemeris calculations"""
     
-    def __init__(self, ephe_path: str = "./ephe"):
+    def __init__(self, ephe_path: str = "./ephe", ephemeris: str = EPHEMERIS_MODE):
         """
         Initialize Swiss Ephemeris with ephemeris files path
         
         Args:
             ephe_path: Path to Swiss Ephemeris data files
+            ephemeris: Default ephemeris mode (name in EPHEMERIS_FLAGS)
         """
+        if ephemeris not in EPHEMERIS_FLAGS:
+            raise ValueError(f"Unknown ephemeris mode: {ephemeris}")
         self.ephe_path = ephe_path
+        self.ephemeris = ephemeris
         swe.set_ephe_path(ephe_path)
         
         # Planet mapping for Swiss Ephemeris
@@ -42,136 +162,165 @@ class SwissEphemerisService:
         self.nakshatras = self._initialize_nakshatras()
     
     def _initialize_nakshatras(self) -> List[Dict]:
-        """Initialize nakshatra data with degrees and rulers"""
-        nakshatras = [
-            {"name": Nakshatra.ASHWINI, "start": 0, "end": 13.333333, "ruler": Planet.KETU, "symbol": "Horse Head", "deity": "Ashwin Kumaras"},
-            {"name": Nakshatra.BHARANI, "start": 13.333333, "end": 26.666667, "ruler": Planet.VENUS, "symbol": "Yoni", "deity": "Yama"},
-            {"name": Nakshatra.KRITTIKA, "start": 26.666667, "end": 40, "ruler": Planet.SUN, "symbol": "Knife", "deity": "Agni"},
-            {"name": Nakshatra.ROHINI, "start": 40, "end": 53.333333, "ruler": Planet.MOON, "symbol": "Cart", "deity": "Brahma"},
-            {"name": Nakshatra.MRIGASHIRA, "start": 53.333333, "end": 66.666667, "ruler": Planet.MARS, "symbol": "Deer Head", "deity": "Soma"},
-            {"name": Nakshatra.ARDRA, "start": 66.666667, "end": 80, "ruler": Planet.RAHU, "symbol": "Teardrop", "deity": "Rudra"},
-            {"name": Nakshatra.PUNARVASU, "start": 80, "end": 93.333333, "ruler": Planet.JUPITER, "symbol": "Bow and Quiver", "deity": "Aditi"},
-            {"name": Nakshatra.PUSHYA, "start": 93.333333, "end": 106.666667, "ruler": Planet.SATURN, "symbol": "Cow's Udder", "deity": "Brihaspati"},
-            {"name": Nakshatra.ASHLESHA, "start": 106.666667, "end": 120, "ruler": Planet.MERCURY, "symbol": "Serpent", "deity": "Sarpa"},
-            {"name": Nakshatra.MAGHA, "start": 120, "end": 133.333333, "ruler": Planet.KETU, "symbol": "Throne", "deity": "Pitru"},
-            {"name": Nakshatra.PURVA_PHALGUNI, "start": 133.333333, "end": 146.666667, "ruler": Planet.VENUS, "symbol": "Hammock", "deity": "Bhaga"},
-            {"name": Nakshatra.UTTARA_PHALGUNI, "start": 146.666667, "end": 160, "ruler": Planet.SUN, "symbol": "Bed", "deity": "Aryaman"},
-            {"name": Nakshatra.HASTA, "start": 160, "end": 173.333333, "ruler": Planet.MOON, "symbol": "Hand", "deity": "Savitar"},
-            {"name": Nakshatra.CHITRA, "start": 173.333333, "end": 186.666667, "ruler": Planet.MARS, "symbol": "Pearl", "deity": "Vishvakarma"},
-            {"name": Nakshatra.SWATI, "start": 186.666667, "end": 200, "ruler": Planet.RAHU, "symbol": "Blade of Grass", "deity": "Vayu"},
-            {"name": Nakshatra.VISHAKHA, "start": 200, "end": 213.333333, "ruler": Planet.JUPITER, "symbol": "Archway", "deity": "Indra-Agni"},
-            {"name": Nakshatra.ANURADHA, "start": 213.333333, "end": 226.666667, "ruler": Planet.SATURN, "symbol": "Lotus", "deity": "Mitra"},
-            {"name": Nakshatra.JYESHTHA, "start": 226.666667, "end": 240, "ruler": Planet.MERCURY, "symbol": "Earring", "deity": "Indra"},
-            {"name": Nakshatra.MULA, "start": 240, "end": 253.333333, "ruler": Planet.KETU, "symbol": "Root", "deity": "Nirrti"},
-            {"name": Nakshatra.PURVA_ASHADHA, "start": 253.333333, "end": 266.666667, "ruler": Planet.VENUS, "symbol": "Fan", "deity": "Apas"},
-            {"name": Nakshatra.UTTARA_ASHADHA, "start": 266.666667, "end": 280, "ruler": Planet.SUN, "symbol": "Elephant Tusk", "deity": "Vishve Devas"},
-            {"name": Nakshatra.SHRAVANA, "start": 280, "end": 293.333333, "ruler": Planet.MOON, "symbol": "Ear", "deity": "Vishnu"},
-            {"name": Nakshatra.DHANISHTA, "start": 293.333333, "end": 306.666667, "ruler": Planet.MARS, "symbol": "Drum", "deity": "Vasu"},
-            {"name": Nakshatra.SHATABHISHA, "start": 306.666667, "end": 320, "ruler": Planet.RAHU, "symbol": "Circle", "deity": "Varuna"},
-            {"name": Nakshatra.PURVA_BHADRAPADA, "start": 320, "end": 333.333333, "ruler": Planet.JUPITER, "symbol": "Sword", "deity": "Aja Ekapada"},
-            {"name": Nakshatra.UTTARA_BHADRAPADA, "start": 333.333333, "end": 346.666667, "ruler": Planet.SATURN, "symbol": "Snake", "deity": "Ahir Budhnya"},
-            {"name": Nakshatra.REVATI, "start": 346.666667, "end": 360, "ruler": Planet.MERCURY, "symbol": "Fish", "deity": "Pushan"}
-        ]
-        return nakshatras
+        """Return the shared nakshatra table (built once at import)"""
+        return NAKSHATRAS
     
-    def convert_to_julian_day(self, birth_datetime: str, timezone_offset: float) -> float:
+    def convert_to_julian_day(self, birth_datetime: str, timezone: Timezone) -> float:
         """
-        Convert birth datetime to Julian Day Number
+        Convert birth datetime to Julian Day Number (UT)
         
         Args:
             birth_datetime: Birth datetime in ISO format (YYYY-MM-DDTHH:MM:SS)
-            timezone_offset: Timezone offset in hours (e.g., 5.5 for IST, -5 for EST)
+            timezone: Timezone offset in hours (e.g., 5.5 for IST, -5 for EST) or IANA zone name
             
         Returns:
-            Julian Day Number
+            Julian Day Number (UT1, as swe.utc_to_jd; see utils.time_utils)
         """
-        # Parse datetime
-        dt = datetime.fromisoformat(birth_datetime)
-        
-        # Calculate UTC time by subtracting timezone offset
-        utc_hour = dt.hour - timezone_offset
-        utc_minute = dt.minute
-        utc_second = dt.second
-        
-        # Handle day overflow/underflow
-        utc_day = dt.day
-        utc_month = dt.month
-        utc_year = dt.year
-        
-        # Adjust for hour overflow
-        if utc_hour >= 24:
-            utc_hour -= 24
-            utc_day += 1
-        elif utc_hour < 0:
-            utc_hour += 24
-            utc_day -= 1
-        
-        # Simple day adjustment (Swiss Ephemeris handles complex cases)
-        # Calculate Julian Day
-        julian_day = swe.julday(
-            utc_year, utc_month, utc_day,
-            utc_hour + utc_minute/60.0 + utc_second/3600.0
-        )
-        
-        return julian_day
+        return civil_to_julian_day(birth_datetime, timezone)[1]
     
-    def calculate_ayanamsa(self, julian_day: float) -> float:
+    def calculate_ayanamsa(self, julian_day: float, ayanamsa: str = DEFAULT_AYANAMSA) -> float:
         """
         Calculate Ayanamsa (precession correction)
         
+        Sidereal positions are always the tropical ones minus this value, so
+        the sidereal mode only matters here; it is switched (and the value
+        read) under a process-wide lock, and only when it changes.
+        
         Args:
             julian_day: Julian Day Number
+            ayanamsa: Name in AYANAMSAS (default Lahiri, most commonly used in India)
             
         Returns:
             Ayanamsa value in degrees
         """
-        # Use Lahiri Ayanamsa (most commonly used in India)
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-        return swe.get_ayanamsa(julian_day)
+        global _sid_mode
+        mode = AYANAMSAS.get(ayanamsa)
+        if mode is None:
+            raise ValueError(f"Unknown ayanamsa: {ayanamsa}")
+        key = (mode, julian_day)
+        with _ayanamsa_lock:
+            value = _ayanamsa_cache.get(key)
+            if value is not None:
+                _ayanamsa_cache.move_to_end(key)
+                return value
+            if _sid_mode != mode:
+                swe.set_sid_mode(mode)
+                _sid_mode = mode
+            value = swe.get_ayanamsa(julian_day)
+            _ayanamsa_cache[key] = value
+            if len(_ayanamsa_cache) > AYANAMSA_CACHE_SIZE:
+                _ayanamsa_cache.popitem(last=False)
+        return value
+    
+    def ephemeris_flags(self, ephemeris: str = None) -> int:
+        """swisseph flags of an ephemeris mode (default: the service's), speeds included"""
+        flags = EPHEMERIS_FLAGS.get(ephemeris or self.ephemeris)
+        if flags is None:
+            raise ValueError(f"Unknown ephemeris mode: {ephemeris}")
+        return flags | swe.FLG_SPEED
     
-    def get_planet_position(self, planet: Planet, julian_day: float) -> Tuple[float, float, float, float]:
+    @staticmethod
+    def served_ephemeris(return_flags: int) -> str:
         """
-        Get planet position using Swiss Ephemeris
+        Ephemeris that actually served a swisseph result
+        
+        swisseph silently falls back to Moshier when a requested .se1 file is
+        missing, and says so only in the returned flags.
+        """
+        if return_flags & swe.FLG_MOSEPH:
+            return EphemerisMode.MOSHIER.value
+        return EphemerisMode.SWISS.value
+    
+    def calculate_planet(self, planet: Planet, julian_day: float,
+                         ephemeris: str = None) -> Tuple[Tuple[float, float, float, float], str]:
+        """
+        Tropical planet position and the ephemeris that served it
         
         Args:
             planet: Planet enum
             julian_day: Julian Day Number
+            ephemeris: Ephemeris mode (default: the service's)
             
         Returns:
-            Tuple of (longitude, latitude, distance, speed)
+            Tuple of ((longitude, latitude, distance, speed), served ephemeris mode)
         """
+        flags = self.ephemeris_flags(ephemeris)
         if planet == Planet.KETU:
             # Ketu is 180 degrees opposite to Rahu
-            rahu_pos = swe.calc_ut(julian_day, swe.MEAN_NODE)[0]
+            rahu_pos, return_flags = swe.calc_ut(julian_day, swe.MEAN_NODE, flags)
             longitude = (rahu_pos[0] + 180) % 360
-            return (longitude, 0, 0, rahu_pos[3])
+            return (longitude, 0, 0, rahu_pos[3]), self.served_ephemeris(return_flags)
         
         swe_planet = self.planet_map.get(planet)
         if swe_planet is None:
             raise ValueError(f"Unknown planet: {planet}")
         
-        result = swe.calc_ut(julian_day, swe_planet)
-        return result[0][:4]  # longitude, latitude, distance, speed
+        position, return_flags = swe.calc_ut(julian_day, swe_planet, flags)
+        served = self.served_ephemeris(return_flags)
+        if served == EphemerisMode.SWISS.value and planet != Planet.RAHU:
+            touched_files.observe(julian_day, moon=planet == Planet.MOON)
+        return position[:4], served  # longitude, latitude, distance, speed
+    
+    def get_planet_position(self, planet: Planet, julian_day: float,
+                            ephemeris: str = None) -> Tuple[float, float, float, float]:
+        """
+        Get planet position using Swiss Ephemeris
+        
+        Args:
+            planet: Planet enum
+            julian_day: Julian Day Number
+            ephemeris: Ephemeris mode (default: the service's)
+            
+        Returns:
+            Tuple of (longitude, latitude, distance, speed)
+        """
+        return self.calculate_planet(planet, julian_day, ephemeris)[0]
+    
+    def check_ephemeris(self, julian_day: float = 2451545.0) -> Dict[str, str]:
+        """
+        Configured ephemeris mode and the one that serves it in practice
+        
+        A "swiss" deployment whose .se1 files are missing is served by
+        Moshier; this probe (one Moon position) reports that.
+        """
+        return {
+            "configured": self.ephemeris,
+            "served": self.calculate_planet(Planet.MOON, julian_day)[1],
+            "path": self.ephe_path
+        }
     
-    def calculate_houses(self, julian_day: float, latitude: float, longitude: float) -> List[float]:
+    def calculate_houses(self, julian_day: float, latitude: float, longitude: float,
+                         house_system: str = HouseSystem.PLACIDUS.value) -> List[float]:
         """
-        Calculate house cusps using Placidus system
+        Calculate tropical house cusps
         
         Args:
             julian_day: Julian Day Number
             latitude: Birth latitude
             longitude: Birth longitude
+            house_system: Name in HOUSE_SYSTEMS (default Placidus)
             
         Returns:
             List of 12 house cusp longitudes
         """
-        houses_result = swe.houses(julian_day, latitude, longitude, b'P')  # Placidus system
+        code = HOUSE_SYSTEMS.get(house_system)
+        if code is None:
+            raise ValueError(f"Unknown house system: {house_system}")
+        try:
+            houses_result = swe.houses(julian_day, latitude, longitude, code)
+        except swe.Error:
+            # Placidus and Koch have no cusps inside the polar circles
+            raise ValueError(f"{house_system} houses are undefined at latitude {latitude:g}")
         return houses_result[0]  # House cusps
     
     def calculate_ascendant(self, julian_day: float, latitude: float, longitude: float) -> float:
         """
         Calculate ascendant (Lagna)
         
+        Only the ascendant is needed for whole-sign houses, so it comes straight
+        from the ARMC, obliquity and latitude (see utils.ascendant) rather than
+        a full house cusp calculation.
+        
         Args:
             julian_day: Julian Day Number
             latitude: Birth latitude
@@ -180,89 +329,45 @@ class SwissEphemerisService:
         Returns:
             Ascendant longitude in degrees
         """
-        houses_result = swe.houses(julian_day, latitude, longitude, b'P')
-        return houses_result[1][0]  # Ascendant is the first value in cusps
+        return ascendant(julian_day, latitude, longitude)[0]
     
-    def longitude_to_zodiac_sign(self, longitude: float) -> Zodiac:
-        """Convert longitude to zodiac sign"""
-        sign_number = int(longitude / 30) + 1
-        return Zodiac(sign_number)
-    
-    def longitude_to_nakshatra(self, longitude: float) -> Tuple[Nakshatra, int]:
+    def calculate_ascendants(self, julian_days, latitudes, longitudes) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Convert longitude to nakshatra and pada
+        Tropical ascendants and midheavens for broadcastable arrays
         
         Args:
-            longitude: Longitude in degrees
+            julian_days: Julian Day Numbers
+            latitudes: Latitudes
+            longitudes: Longitudes (east positive)
             
         Returns:
-            Tuple of (Nakshatra, pada)
+            Tuple of (ascendant, midheaven) arrays in degrees
         """
-        for nak_data in self.nakshatras:
-            if nak_data["start"] <= longitude < nak_data["end"]:
-                # Calculate pada (1-4)
-                pada_size = (nak_data["end"] - nak_data["start"]) / 4
-                pada = int((longitude - nak_data["start"]) / pada_size) + 1
-                return (nak_data["name"], pada)
-        
-        # Handle edge case for last nakshatra (Revati)
-        return (Nakshatra.REVATI, 4)
+        return ascendants(julian_days, latitudes, longitudes)
+    
+    def longitude_to_zodiac_sign(self, longitude: float) -> Zodiac:
+        """Convert longitude to zodiac sign"""
+        return longitude_to_zodiac_sign(longitude)
+    
+    def longitude_to_nakshatra(self, longitude: float) -> Tuple[Nakshatra, int]:
+        """Convert longitude to nakshatra and pada (see the module-level function)"""
+        return longitude_to_nakshatra(longitude)
     
     def is_planet_retrograde(self, speed: float) -> bool:
         """Check if planet is retrograde based on speed"""
         return speed < 0
     
-    def calculate_sunrise_sunset(self, julian_day: float, latitude: float, longitude: float) -> Dict[str, str]:
+    def reopen(self):
         """
-        Calculate sunrise and sunset times
-        
-        Args:
-            julian_day: Julian Day Number
-            latitude: Birth latitude  
-            longitude: Birth longitude
-            
-        Returns:
-            Dictionary with sunrise and sunset times
+        Close and reopen the Swiss Ephemeris files
+
+        swisseph keeps process-global file handles. A forked worker must not
+        share the read offsets of its parent, so it reopens them after fork.
+        Closing also resets the sidereal mode, so the next ayanamsa sets it again.
         """
-        try:
-            # Set geographic location
-            geopos = [longitude, latitude, 0]
-            
-            # Calculate sunrise
-            # rise_trans(jd_start, body, geopos, atpress, attemp, rsmi)
-            sunrise_result = swe.rise_trans(
-                julian_day - 1, swe.SUN, geopos, 1013.25, 15, 1 | swe.CALC_RISE
-            )
-            
-            # Calculate sunset
-            sunset_result = swe.rise_trans(
-                julian_day - 1, swe.SUN, geopos, 1013.25, 15, 1 | swe.CALC_SET
-            )
-            
-            # Convert Julian Day back to datetime if successful
-            if sunrise_result[0] >= 0:
-                sunrise_dt = swe.jdut1_to_utc(sunrise_result[1], 1)  # 1 for Gregorian calendar
-                sunrise_str = f"{sunrise_dt[0]:04d}-{sunrise_dt[1]:02d}-{sunrise_dt[2]:02d}T{sunrise_dt[3]:02d}:{sunrise_dt[4]:02d}:{int(sunrise_dt[5]):02d}"
-            else:
-                sunrise_str = "N/A"
-                
-            if sunset_result[0] >= 0:
-                sunset_dt = swe.jdut1_to_utc(sunset_result[1], 1)
-                sunset_str = f"{sunset_dt[0]:04d}-{sunset_dt[1]:02d}-{sunset_dt[2]:02d}T{sunset_dt[3]:02d}:{sunset_dt[4]:02d}:{int(sunset_dt[5]):02d}"
-            else:
-                sunset_str = "N/A"
-            
-            return {
-                "sunrise": sunrise_str,
-                "sunset": sunset_str
-            }
-        except Exception as e:
-            # If rise_trans fails, return estimated times
-            return {
-                "sunrise": "06:00:00",
-                "sunset": "18:00:00"
-            }
-    
-    def __del__(self):
-        """Cleanup Swiss Ephemeris resources"""
-        swe.close()
\ No newline at end of file
+        global _sid_mode
+        with _ayanamsa_lock:
+            swe.close()
+            swe.set_ephe_path(self.ephe_path)
+            _sid_mode = None
+        touched_files.reset()
\ No newline at end of file
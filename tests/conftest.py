@@ -0,0 +1,23 @@
+"""
+Shared fixtures for the test suite
+
+Tests run against the real Swiss Ephemeris files in ./ephe (the same engines
+the app serves), so the repository root is made the working directory and
+put on the import path.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+@pytest.fixture(scope="session")
+def ephemeris_service():
+    """The shared SwissEphemerisService behind the chart endpoints"""
+    from services import runtime
+
+    return runtime.get_d1_calculator().ephemeris_service
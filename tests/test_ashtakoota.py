@@ -0,0 +1,114 @@
+"""
+Ashtakoota pada-pair tables against the koota rules applied one couple at a time
+"""
+import numpy as np
+import pytest
+
+from calculators.ashtakoota_calculator import (
+    AshtakootaCalculator, KOOTAS, KOOTA_MAXIMA, MAX_POINTS, PADAS, DOSHAS,
+    SIGN_VARNA, SIGN_VASHYA, VASHYA_POINTS, NAKSHATRA_YONI, YONI_POINTS, NAKSHATRA_GANA,
+    GANA_POINTS, NADI_CYCLE, BHAKOOT_DOSHA_DISTANCES, MAITRI_POINTS,
+    longitude_to_pada, nakshatra_pada_to_pada
+)
+from models.astrology_models import Zodiac
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return AshtakootaCalculator()
+
+
+def _relationship(lord, other):
+    if lord == other or other in VedicAstrologyHelper.NATURAL_FRIENDS[lord]:
+        return 2
+    return 0 if other in VedicAstrologyHelper.NATURAL_ENEMIES[lord] else 1
+
+
+def _tara(start, end):
+    remainder = ((end - start) % 27 + 1) % 9 or 9
+    return 0.0 if remainder in (3, 5, 7) else 1.5
+
+
+def _kootas(groom_pada, bride_pada):
+    """Points of each koota for one couple, from nakshatra, pada position and sign"""
+    groom_nakshatra, bride_nakshatra = groom_pada // 4, bride_pada // 4
+    groom_sign, bride_sign = groom_pada // 9, bride_pada // 9
+    # A pada starting at 15 degrees or later lies in the second half of its sign
+    groom_half = int(groom_pada % 9 * 30 / 9 >= 15)
+    bride_half = int(bride_pada % 9 * 30 / 9 >= 15)
+    groom_lord = VedicAstrologyHelper.SIGN_LORDS[Zodiac(groom_sign + 1)]
+    bride_lord = VedicAstrologyHelper.SIGN_LORDS[Zodiac(bride_sign + 1)]
+    distance = (groom_sign - bride_sign) % 12 + 1
+    return [
+        1.0 if SIGN_VARNA[groom_sign] >= SIGN_VARNA[bride_sign] else 0.0,
+        VASHYA_POINTS[SIGN_VASHYA[groom_sign][groom_half], SIGN_VASHYA[bride_sign][bride_half]],
+        _tara(groom_nakshatra, bride_nakshatra) + _tara(bride_nakshatra, groom_nakshatra),
+        YONI_POINTS[NAKSHATRA_YONI[groom_nakshatra], NAKSHATRA_YONI[bride_nakshatra]],
+        MAITRI_POINTS[_relationship(groom_lord, bride_lord), _relationship(bride_lord, groom_lord)],
+        GANA_POINTS[NAKSHATRA_GANA[groom_nakshatra], NAKSHATRA_GANA[bride_nakshatra]],
+        0.0 if distance in BHAKOOT_DOSHA_DISTANCES else 7.0,
+        0.0 if NADI_CYCLE[groom_nakshatra % 6] == NADI_CYCLE[bride_nakshatra % 6] else 8.0,
+    ]
+
+
+def test_tables_match_koota_rules(calculator):
+    for groom in range(PADAS):
+        for bride in range(PADAS):
+            expected = _kootas(groom, bride)
+            assert calculator.points[groom, bride].tolist() == pytest.approx(expected)
+            assert calculator.total[groom, bride] == pytest.approx(sum(expected))
+            flags = ((DOSHAS["nadi"] if expected[KOOTAS.index("nadi")] == 0 else 0)
+                     | (DOSHAS["bhakoot"] if expected[KOOTAS.index("bhakoot")] == 0 else 0)
+                     | (DOSHAS["gana"] if expected[KOOTAS.index("gana")] == 0 else 0))
+            assert calculator.doshas[groom, bride] == flags
+
+
+def test_points_within_koota_maxima(calculator):
+    assert sum(KOOTA_MAXIMA) == MAX_POINTS
+    assert (calculator.points >= 0).all()
+    assert (calculator.points <= np.array(KOOTA_MAXIMA, dtype=np.float32)).all()
+    assert calculator.total.max() <= MAX_POINTS
+
+
+def test_symmetric_kootas(calculator):
+    for koota in ("tara", "yoni", "graha_maitri", "bhakoot", "nadi"):
+        points = calculator.points[..., KOOTAS.index(koota)]
+        np.testing.assert_array_equal(points, points.T, err_msg=koota)
+
+
+def test_same_pada_couple(calculator):
+    # Every koota at its maximum but nadi (same nadi): 36 - 8
+    for pada in range(PADAS):
+        assert calculator.total[pada, pada] == 28
+        assert calculator.doshas[pada, pada] == DOSHAS["nadi"]
+
+
+def test_pada_conversions():
+    assert longitude_to_pada([0.0, 3.3333, 3.3334, 359.999]).tolist() == [0, 0, 1, 107]
+    assert nakshatra_pada_to_pada([1, 1, 27], [1, 2, 4]).tolist() == [0, 1, 107]
+    longitudes = np.arange(PADAS) * 360.0 / PADAS + 1e-6
+    assert longitude_to_pada(longitudes).tolist() == list(range(PADAS))
+
+
+@pytest.mark.parametrize("role", ["groom", "bride"])
+def test_top_k_matches_sorted_scores(calculator, role):
+    rng = np.random.default_rng(11)
+    candidates = rng.integers(0, PADAS, 2000)
+    pada = 40
+    total = np.array([
+        calculator.total[pada, candidate] if role == "groom" else calculator.total[candidate, pada]
+        for candidate in candidates
+    ])
+    doshas = np.array([
+        calculator.doshas[pada, candidate] if role == "groom" else calculator.doshas[candidate, pada]
+        for candidate in candidates
+    ])
+
+    result = calculator.top_k(pada, role, candidates, k=25, min_score=18.0, exclude_doshas=DOSHAS["nadi"])
+    eligible = [i for i in range(len(candidates)) if total[i] >= 18.0 and not doshas[i] & DOSHAS["nadi"]]
+    expected = sorted(eligible, key=lambda i: (-total[i], i))[:25]
+    assert result.indices.tolist() == expected
+    assert result.total.tolist() == total[expected].tolist()
+    assert result.eligible == len(eligible)
+    assert result.considered == len(candidates)
@@ -0,0 +1,120 @@
+"""
+Vectorized dasha periods and the boundary index against the scalar dasha tree
+and brute-force scans
+"""
+import numpy as np
+import pytest
+
+from calculators.dasha_calculator import VimshottariDasha, NAKSHATRA_SPAN
+from models.astrology_models import DashaLevel, Planet
+from services.dasha_index import DashaIndex, expand_periods
+
+LEVELS = (DashaLevel.MAHA, DashaLevel.ANTAR)
+
+
+def _natal_data(count, seed):
+    rng = np.random.default_rng(seed)
+    birth_jd = rng.uniform(2415020.5, 2469807.5, count)      # 1900-2050
+    moon = rng.uniform(0.0, 360.0, count)
+    # Nakshatra boundaries and the ends of the zodiac
+    edges = np.array([0.0, NAKSHATRA_SPAN, 9 * NAKSHATRA_SPAN, 26 * NAKSHATRA_SPAN, np.nextafter(360.0, 0.0)])
+    moon[:len(edges)] = edges
+    return birth_jd, moon
+
+
+def _brute_force(user_ids, birth_jd, moon, level):
+    """(user id, start, end, lords) of every period of every user"""
+    columns = expand_periods(birth_jd, moon, (level,))[level]
+    return [
+        (int(user_ids[user]), float(start), float(end), tuple(lords.tolist()))
+        for user, start, end, lords in zip(columns["user"], columns["start"], columns["end"], columns["lords"])
+    ]
+
+
+def _rows(matches):
+    return sorted(
+        (int(user), float(start), float(end), tuple(lords.tolist()))
+        for user, start, end, lords in zip(matches.user_ids, matches.start_jd, matches.end_jd, matches.lords)
+    )
+
+
+def _check_queries(index, user_ids, birth_jd, moon, seed):
+    """Compare running_at and starting_between with scans over every period"""
+    rng = np.random.default_rng(seed)
+    for level in index.levels:
+        periods = _brute_force(user_ids, birth_jd, moon, level)
+        for julian_day in rng.uniform(2420000.5, 2480000.5, 5).tolist():
+            for lord in (None, Planet.SATURN, Planet.KETU):
+                expected = sorted(
+                    row for row in periods
+                    if row[1] <= julian_day < row[2] and (lord is None or row[3][-1] == lord.value)
+                )
+                assert _rows(index.running_at(level, julian_day, lord)) == expected
+
+            start_jd, end_jd = julian_day, julian_day + 365.0
+            for lord in (None, Planet.RAHU):
+                expected = sorted(
+                    row for row in periods
+                    if start_jd <= row[1] < end_jd and (lord is None or row[3][-1] == lord.value)
+                )
+                assert _rows(index.starting_between(level, start_jd, end_jd, lord)) == expected
+
+
+@pytest.mark.parametrize("level", [DashaLevel.MAHA, DashaLevel.ANTAR, DashaLevel.PRATYANTAR])
+def test_expand_periods_matches_vimshottari_dasha(level):
+    birth_jd, moon = _natal_data(60, seed=1)
+    columns = expand_periods(birth_jd, moon, (level,))[level]
+
+    for user in range(len(moon)):
+        rows = columns["user"] == user
+        expected = list(VimshottariDasha(float(birth_jd[user]), float(moon[user])).periods(level))
+        # Bit-for-bit: the same floating-point operations in the same order
+        assert columns["start"][rows].tolist() == [period.start_jd for period in expected]
+        assert columns["end"][rows].tolist() == [period.end_jd for period in expected]
+        assert columns["lords"][rows].tolist() == [[lord.value for lord in period.lords] for period in expected]
+
+
+def test_queries_match_brute_force():
+    birth_jd, moon = _natal_data(300, seed=2)
+    user_ids = np.arange(1000, 1300)
+    index = DashaIndex.build(user_ids, birth_jd, moon, LEVELS)
+    _check_queries(index, user_ids, birth_jd, moon, seed=3)
+
+
+def test_queries_after_update_remove_and_compact(tmp_path):
+    birth_jd, moon = _natal_data(300, seed=4)
+    user_ids = np.arange(300) * 7
+    index = DashaIndex.build(user_ids, birth_jd, moon, LEVELS)
+    users = {int(user): (float(jd), float(longitude)) for user, jd, longitude in zip(user_ids, birth_jd, moon)}
+
+    # Changed birth data for existing users, plus new users
+    rng = np.random.default_rng(5)
+    changed = np.concatenate([user_ids[::10], [5001, 5002, 5003]])
+    changed_jd = rng.uniform(2415020.5, 2469807.5, len(changed))
+    changed_moon = rng.uniform(0.0, 360.0, len(changed))
+    index.update(changed, changed_jd, changed_moon)
+    users.update({int(user): (float(jd), float(longitude))
+                  for user, jd, longitude in zip(changed, changed_jd, changed_moon)})
+
+    # Removed users: some only in the base, one changed (in the delta), one new
+    removed = [7, 14, 70, 5002]
+    index.remove(removed)
+    for user in removed:
+        del users[user]
+
+    def current():
+        ids = np.array(sorted(users))
+        return ids, np.array([users[user][0] for user in ids]), np.array([users[user][1] for user in ids])
+
+    _check_queries(index, *current(), seed=6)
+    compacted = index.compact()
+    assert compacted.user_ids.tolist() == sorted(users)
+    _check_queries(compacted, *current(), seed=6)
+
+    index.save(str(tmp_path / "index"))
+    _check_queries(DashaIndex.load(str(tmp_path / "index")), *current(), seed=7)
+
+
+def test_duplicate_user_ids_rejected():
+    with pytest.raises(ValueError):
+        DashaIndex.build([1, 1], [2451545.0, 2451545.0], [10.0, 20.0])
@@ -0,0 +1,76 @@
+"""
+Lagna table boundaries against the service's sidereal ascendant
+"""
+import pytest
+
+from calculators.lagna_table_calculator import LagnaTableCalculator, DIVISIONS, NAVAMSHA_SPAN
+
+# (local date, latitude, longitude, timezone offset)
+CASES = [
+    ("2024-03-20", 28.6139, 77.2090, 5.5),
+    ("1987-05-04", 26.1433, 91.7898, 5.5),
+    ("2001-12-21", -33.8688, 151.2093, 11.0),
+    ("2030-06-21", 59.9, 10.75, 2.0),
+    ("1950-01-01", 0.0, -78.5, -5.0),
+]
+
+# Half a second either side of a boundary; the lagna moves about 7 arcseconds
+# in that time, far above the table's root tolerance
+EPSILON_DAYS = 0.5 / 86400
+
+
+@pytest.fixture(scope="module")
+def calculator(ephemeris_service):
+    return LagnaTableCalculator(ephemeris_service=ephemeris_service, cache_size=16)
+
+
+def _sidereal_ascendant(service, julian_day, latitude, longitude):
+    tropical = service.calculate_ascendant(julian_day, latitude, longitude)
+    return (tropical - service.calculate_ayanamsa(julian_day)) % 360
+
+
+def _division_index(longitude, division):
+    return int(longitude // NAVAMSHA_SPAN) % 108 // DIVISIONS[division]
+
+
+@pytest.mark.parametrize("local_date, latitude, longitude, timezone", CASES)
+def test_segments_match_service_ascendant(calculator, ephemeris_service, local_date, latitude, longitude, timezone):
+    table = calculator.table(local_date, latitude, longitude, timezone)
+
+    for division in DIVISIONS:
+        segments = table.segments(division)
+        assert segments[0].start_jd == table.start_jd
+        assert segments[-1].end_jd == table.end_jd
+        for segment in segments:
+            middle = (segment.start_jd + segment.end_jd) / 2
+            lagna = _sidereal_ascendant(ephemeris_service, middle, latitude, longitude)
+            assert _division_index(lagna, division) == segment.index
+        for before, after in zip(segments, segments[1:]):
+            assert before.end_jd == after.start_jd
+            lagna = _sidereal_ascendant(ephemeris_service, after.start_jd - EPSILON_DAYS, latitude, longitude)
+            assert _division_index(lagna, division) == before.index
+            lagna = _sidereal_ascendant(ephemeris_service, after.start_jd + EPSILON_DAYS, latitude, longitude)
+            assert _division_index(lagna, division) == after.index
+
+
+def test_division_boundaries_are_navamsha_boundaries(calculator):
+    table = calculator.table(*CASES[0])
+    navamsha_starts = set(table.starts["navamsha"])
+    assert set(table.starts["nakshatra"]) <= navamsha_starts
+    assert set(table.starts["sign"]) <= navamsha_starts
+    assert len(table.starts["sign"]) in (12, 13)
+
+
+def test_point_queries_match_segments(calculator):
+    table = calculator.table(*CASES[1])
+    for division in DIVISIONS:
+        for segment in table.segments(division):
+            for julian_day in (segment.start_jd, (segment.start_jd + segment.end_jd) / 2):
+                assert table.at(julian_day)[division] == segment
+    with pytest.raises(ValueError):
+        table.at(table.end_jd)
+
+
+def test_latitude_limit(calculator):
+    with pytest.raises(ValueError):
+        calculator.table("2024-01-01", 70.0, 20.0, 1.0)
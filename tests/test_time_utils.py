@@ -0,0 +1,100 @@
+"""
+Civil time conversion against pytz and swe.utc_to_jd
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+import pytz
+import swisseph as swe
+
+from utils.time_utils import (
+    civil_to_julian_day, civil_to_julian_days, julian_day_to_local_datetime,
+    local_datetime_to_julian_day, timezone_offset_hours
+)
+
+ZONES = ["Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Sydney", "America/Sao_Paulo"]
+# Two ulps of a present-day Julian Day (about 90 microseconds): float rounding
+# of the different operation orders, not a time difference
+TOLERANCE_DAYS = 1e-9
+
+
+def _reference(value, zone, is_dst=None):
+    """(JD TT, JD UT1) from pytz's offset and swe.utc_to_jd"""
+    if isinstance(zone, str):
+        local = pytz.timezone(zone).localize(datetime.fromisoformat(value), is_dst=is_dst)
+        utc = local.astimezone(pytz.utc)
+    else:
+        utc = datetime.fromisoformat(value) - pytz.FixedOffset(round(zone * 60)).utcoffset(None)
+    return swe.utc_to_jd(utc.year, utc.month, utc.day, utc.hour, utc.minute,
+                         utc.second + utc.microsecond / 1e6, swe.GREG_CAL)
+
+
+def _random_datetimes(seed, count):
+    """Random ISO datetimes 1900-2037 (pytz's compiled range)"""
+    rng = np.random.default_rng(seed)
+    start = datetime(1900, 1, 1)
+    seconds = rng.integers(0, int((datetime(2037, 12, 31) - start).total_seconds()), count)
+    return [(start + timedelta(seconds=int(second))).isoformat() for second in seconds]
+
+
+@pytest.mark.parametrize("zone", ZONES)
+def test_zone_matches_pytz_and_utc_to_jd(zone):
+    values = []
+    for value in _random_datetimes(ZONES.index(zone), 200):
+        try:
+            expected = _reference(value, zone)
+        except (pytz.AmbiguousTimeError, pytz.NonExistentTimeError):
+            continue
+        values.append(value)
+        got = civil_to_julian_day(value, zone)
+        assert got[0] == pytest.approx(expected[0], abs=TOLERANCE_DAYS), value
+        assert got[1] == pytest.approx(expected[1], abs=TOLERANCE_DAYS), value
+
+    # The vectorized form agrees with the scalar one
+    terrestrial, universal = civil_to_julian_days(values, zone)
+    scalar = np.array([civil_to_julian_day(value, zone) for value in values])
+    np.testing.assert_allclose(terrestrial, scalar[:, 0], rtol=0, atol=TOLERANCE_DAYS)
+    np.testing.assert_allclose(universal, scalar[:, 1], rtol=0, atol=TOLERANCE_DAYS)
+
+
+@pytest.mark.parametrize("offset", [5.5, -3.0, 0.0, 5.75, -9.5])
+def test_fixed_offset_matches_utc_to_jd(offset):
+    for value in _random_datetimes(int(offset * 4) + 50, 50):
+        expected = _reference(value, offset)
+        got = civil_to_julian_day(value, offset)
+        assert got[0] == pytest.approx(expected[0], abs=TOLERANCE_DAYS), value
+        assert got[1] == pytest.approx(expected[1], abs=TOLERANCE_DAYS), value
+
+
+@pytest.mark.parametrize("value, fold, is_dst", [
+    ("2021-11-07T01:30:00", 0, True),       # Repeated hour: first (EDT) instant
+    ("2021-11-07T01:30:00", 1, False),      # Repeated hour: second (EST) instant
+])
+def test_repeated_wall_time(value, fold, is_dst):
+    expected = _reference(value, "America/New_York", is_dst=is_dst)
+    got = civil_to_julian_day(value, "America/New_York", fold)
+    assert got[0] == pytest.approx(expected[0], abs=TOLERANCE_DAYS)
+    assert got[1] == pytest.approx(expected[1], abs=TOLERANCE_DAYS)
+
+
+def test_leap_second_era_and_before():
+    # Before 1972 the civil time is taken as UT1, from 1972 on as leap-second UTC
+    for value in ("1960-06-15T12:00:00", "1985-06-30T23:59:59", "2016-12-31T23:59:59"):
+        expected = _reference(value, 0.0)
+        got = civil_to_julian_day(value, 0.0)
+        assert got[0] == pytest.approx(expected[0], abs=TOLERANCE_DAYS), value
+        assert got[1] == pytest.approx(expected[1], abs=TOLERANCE_DAYS), value
+
+
+def test_zone_offsets_per_instant():
+    assert timezone_offset_hours("2024-01-15T12:00:00", "America/New_York") == -5.0
+    assert timezone_offset_hours("2024-07-15T12:00:00", "America/New_York") == -4.0
+    assert timezone_offset_hours("2024-07-15T12:00:00", 5.5) == 5.5
+
+    winter = local_datetime_to_julian_day("2024-01-15T12:00:00", "America/New_York")
+    summer = local_datetime_to_julian_day("2024-07-15T12:00:00", "America/New_York")
+    assert winter == local_datetime_to_julian_day("2024-01-15T12:00:00", -5.0)
+    assert summer == local_datetime_to_julian_day("2024-07-15T12:00:00", -4.0)
+    assert julian_day_to_local_datetime(winter, "America/New_York") == "2024-01-15T12:00:00"
+    assert julian_day_to_local_datetime(summer, "America/New_York") == "2024-07-15T12:00:00"
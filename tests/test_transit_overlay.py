@@ -0,0 +1,98 @@
+"""
+Vectorized transit overlay against a per-chart, per-planet loop
+"""
+import math
+
+import numpy as np
+import pytest
+
+from calculators.transit_overlay import (
+    TransitOverlayCalculator, NatalColumns, TRANSIT_PLANETS, GRAHA_ASPECTS, DEFAULT_ASPECTS
+)
+
+ROWS = 500
+# Orbs are float32
+ORB_TOLERANCE = 1e-3
+
+
+def _natal_columns(seed):
+    rng = np.random.default_rng(seed)
+    moon = rng.uniform(0.0, 360.0, ROWS)
+    moon[::7] = np.nan                                  # Moon sign only
+    moon[:4] = [0.0, 29.999999, 30.0, 359.999999]       # Sign edges
+    lagna = rng.uniform(0.0, 360.0, ROWS)
+    return NatalColumns(
+        moon_longitude=moon,
+        moon_sign=rng.integers(1, 13, ROWS),
+        lagna_longitude=lagna
+    )
+
+
+def _transit_longitudes(seed):
+    rng = np.random.default_rng(seed)
+    longitudes = rng.uniform(0.0, 360.0, len(TRANSIT_PLANETS))
+    longitudes[-1] = (longitudes[-2] + 180.0) % 360       # Ketu opposite Rahu
+    return longitudes
+
+
+def _expected(transit_longitudes, longitude, sign):
+    """House, aspect and orb of one transit over one natal point"""
+    natal_sign = int(longitude // 30) if not math.isnan(longitude) else sign - 1
+    houses, aspects, orbs = [], [], []
+    for planet, transit in zip(TRANSIT_PLANETS, transit_longitudes):
+        transit_sign = int(transit // 30)
+        houses.append((transit_sign - natal_sign) % 12 + 1)
+        counted = (natal_sign - transit_sign) % 12 + 1
+        aspects.append(counted in GRAHA_ASPECTS.get(planet, DEFAULT_ASPECTS))
+        if math.isnan(longitude):
+            orbs.append(math.nan)
+        else:
+            orbs.append((longitude - transit - (counted - 1) * 30.0 + 180.0) % 360.0 - 180.0)
+    return houses, aspects, orbs
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_overlay_matches_loop(seed):
+    natal = _natal_columns(seed)
+    transit_longitudes = _transit_longitudes(seed + 100)
+    overlay = TransitOverlayCalculator().overlay(transit_longitudes, natal)
+
+    assert set(overlay.targets) == {"moon", "lagna"}
+    for target, signs in (("moon", natal.moon_sign), ("lagna", None)):
+        result = overlay.targets[target]
+        longitudes = getattr(natal, f"{target}_longitude")
+        for row in range(ROWS):
+            houses, aspects, orbs = _expected(
+                transit_longitudes, float(longitudes[row]), None if signs is None else int(signs[row])
+            )
+            assert result.house[row].tolist() == houses
+            assert result.aspect[row].tolist() == aspects
+            np.testing.assert_allclose(result.orb[row], orbs, atol=ORB_TOLERANCE)
+
+
+def test_sign_only_columns():
+    rng = np.random.default_rng(4)
+    signs = rng.integers(1, 13, ROWS)
+    transit_longitudes = _transit_longitudes(5)
+    overlay = TransitOverlayCalculator().overlay(transit_longitudes, NatalColumns(lagna_sign=signs))
+
+    assert list(overlay.targets) == ["lagna"]
+    result = overlay.targets["lagna"]
+    assert np.isnan(result.orb).all()
+    for row in range(ROWS):
+        houses, aspects, _ = _expected(transit_longitudes, math.nan, int(signs[row]))
+        assert result.house[row].tolist() == houses
+        assert result.aspect[row].tolist() == aspects
+
+
+def test_chunks_match_single_pass():
+    natal = _natal_columns(6)
+    transit_longitudes = _transit_longitudes(7)
+    calculator = TransitOverlayCalculator()
+    whole = calculator.overlay(transit_longitudes, natal)
+    for start, chunk in calculator.overlay_chunks(transit_longitudes, natal, chunk_rows=128):
+        for target, result in chunk.targets.items():
+            stop = start + len(result.house)
+            np.testing.assert_array_equal(result.house, whole.targets[target].house[start:stop])
+            np.testing.assert_array_equal(result.aspect, whole.targets[target].aspect[start:stop])
+            np.testing.assert_array_equal(result.orb, whole.targets[target].orb[start:stop])
@@ -0,0 +1,4 @@
+"""
+Tools Package
+Command line utilities for benchmarking, regression checks and data builds
+"""
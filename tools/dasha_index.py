@@ -0,0 +1,216 @@
+"""
+Dasha Index Tool
+Builds, updates and queries the dasha boundary index (services.dasha_index)
+
+Usage:
+    python -m tools.dasha_index build --users users.jsonl [--index ./data/dasha_index] [--levels maha,antar]
+    python -m tools.dasha_index update --users changed.jsonl [--compact]
+    python -m tools.dasha_index remove --ids 17,42
+    python -m tools.dasha_index starting --level maha --lord saturn --from 2025-01-01 --to 2025-01-31
+    python -m tools.dasha_index running --level antar --lord rahu --at 2025-01-01
+    python -m tools.dasha_index bench [--users 1000000]
+
+The users file holds one JSON object per line: an integer "id" plus the birth
+details accepted by the chart endpoints. Query dates are UTC.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models.astrology_models import UserDetails, Planet, DashaLevel
+from services.dasha_index import DashaIndex, DashaMatches, DEFAULT_LEVELS
+from utils.time_utils import local_datetime_to_julian_day, julian_day_to_local_datetime
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+DEFAULT_INDEX_PATH = os.environ.get("DASHA_INDEX_PATH", "./data/dasha_index")
+DEFAULT_LIMIT = 100
+DEFAULT_BENCH_USERS = 1_000_000
+
+
+def read_users(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute (user_ids, birth_jd, moon_longitude) for every user in a JSONL file
+
+    The natal Moon comes from the shared dasha calculator, so it is identical to
+    the one behind /api/v1/dasha.
+    """
+    from models.validation_schemas import UserDetailsSchema
+    from services import runtime
+
+    schema = UserDetailsSchema()
+    calculator = runtime.get_dasha_calculator()
+    user_ids, birth_jd, moon_longitude = [], [], []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                user_id = int(record.pop("id"))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"{path}:{line_number}: missing or non-integer 'id'")
+            dasha = calculator.calculate_dasha(UserDetails(**schema.load(record)))
+            user_ids.append(user_id)
+            birth_jd.append(dasha.birth_jd)
+            moon_longitude.append(dasha.moon_longitude)
+    return (np.array(user_ids, dtype=np.int64), np.array(birth_jd, dtype=np.float64),
+            np.array(moon_longitude, dtype=np.float64))
+
+
+def format_matches(matches: DashaMatches, limit: int) -> Dict:
+    """JSON summary of query matches (first `limit` rows)"""
+    return {
+        "count": int(len(matches.user_ids)),
+        "matches": [
+            {
+                "user_id": int(matches.user_ids[i]),
+                "lords": [Planet(int(value)).name.title() for value in matches.lords[i]],
+                "start": julian_day_to_local_datetime(float(matches.start_jd[i]), 0),
+                "end": julian_day_to_local_datetime(float(matches.end_jd[i]), 0)
+            }
+            for i in range(min(limit, len(matches.user_ids)))
+        ]
+    }
+
+
+def _parse_lord(name: Optional[str]) -> Optional[Planet]:
+    return Planet[name.upper()] if name else None
+
+
+def _timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_bench(users: int, seed: int = 7) -> Dict:
+    """Build an in-memory index over random natal data and time typical queries"""
+    rng = np.random.default_rng(seed)
+    birth_jd = rng.uniform(local_datetime_to_julian_day("1940-01-01", 0),
+                           local_datetime_to_julian_day("2020-01-01", 0), users)
+    moon_longitude = rng.uniform(0, 360, users)
+    index, build_ms = _timed(DashaIndex.build, np.arange(users), birth_jd, moon_longitude)
+
+    today = local_datetime_to_julian_day("2025-01-01", 0)
+    queries = {
+        "saturn_maha_starting_30d": lambda: index.starting_between(DashaLevel.MAHA, today, today + 30, Planet.SATURN),
+        "rahu_antar_starting_30d": lambda: index.starting_between(DashaLevel.ANTAR, today, today + 30, Planet.RAHU),
+        "any_antar_starting_1d": lambda: index.starting_between(DashaLevel.ANTAR, today, today + 1),
+        "rahu_antar_running": lambda: index.running_at(DashaLevel.ANTAR, today, Planet.RAHU),
+        "saturn_maha_running": lambda: index.running_at(DashaLevel.MAHA, today, Planet.SATURN),
+    }
+    timings = {}
+    for name, query in queries.items():
+        matches, elapsed = _timed(query)
+        timings[name] = {"matches": int(len(matches.user_ids)), "ms": round(elapsed, 2)}
+
+    changed = rng.choice(users, size=min(1000, users), replace=False)
+    _, update_ms = _timed(index.update, changed, birth_jd[changed] + 1.0, moon_longitude[changed])
+    _, query_ms = _timed(queries["rahu_antar_running"])
+    return {
+        "users": users,
+        "rows": {level.name.lower(): int(len(index.segments[level]["start"])) for level in index.levels},
+        "build_ms": round(build_ms, 1),
+        "queries": timings,
+        "update_1000_users_ms": round(update_ms, 2),
+        "query_after_update_ms": round(query_ms, 2)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Dasha boundary index across a user base")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build the index from a users file")
+    build_parser.add_argument("--users", required=True)
+    build_parser.add_argument("--levels", default=",".join(level.name.lower() for level in DEFAULT_LEVELS))
+    build_parser.add_argument("--horizon-from", help="Only keep periods ending after this UTC date")
+    build_parser.add_argument("--horizon-to", help="Only keep periods starting before this UTC date")
+
+    update_parser = subparsers.add_parser("update", help="Re-index users whose birth data changed")
+    update_parser.add_argument("--users", required=True)
+    update_parser.add_argument("--compact", action="store_true", help="Fold changes into the base segment")
+
+    remove_parser = subparsers.add_parser("remove", help="Drop users from the index")
+    remove_parser.add_argument("--ids", required=True, help="Comma-separated user ids")
+
+    starting_parser = subparsers.add_parser("starting", help="Periods starting in a UTC date range")
+    starting_parser.add_argument("--from", dest="start", required=True)
+    starting_parser.add_argument("--to", dest="end", required=True)
+
+    running_parser = subparsers.add_parser("running", help="Periods running at a UTC instant")
+    running_parser.add_argument("--at", required=True)
+
+    for query_parser in (starting_parser, running_parser):
+        query_parser.add_argument("--level", choices=[level.name.lower() for level in DashaLevel], default="maha")
+        query_parser.add_argument("--lord", choices=[planet.name.lower() for planet in VedicAstrologyHelper.VIMSHOTTARI_ORDER])
+        query_parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+
+    for index_parser in (build_parser, update_parser, remove_parser, starting_parser, running_parser):
+        index_parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+
+    bench_parser = subparsers.add_parser("bench", help="Time build, queries and updates on random users")
+    bench_parser.add_argument("--users", type=int, default=DEFAULT_BENCH_USERS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(json.dumps(run_bench(args.users), indent=2))
+        return 0
+
+    if args.command == "build":
+        horizon = None
+        if args.horizon_from or args.horizon_to:
+            horizon = (
+                local_datetime_to_julian_day(args.horizon_from, 0) if args.horizon_from else float("-inf"),
+                local_datetime_to_julian_day(args.horizon_to, 0) if args.horizon_to else float("inf")
+            )
+        levels = [DashaLevel[name.strip().upper()] for name in args.levels.split(",")]
+        index = DashaIndex.build(*read_users(args.users), levels=levels, horizon=horizon)
+        index.save(args.index)
+        print(json.dumps({"users": int(len(index.user_ids)), "index": args.index}))
+        return 0
+
+    index = DashaIndex.load(args.index)
+
+    if args.command in ("update", "remove"):
+        if args.command == "update":
+            user_ids, birth_jd, moon_longitude = read_users(args.users)
+            index.update(user_ids, birth_jd, moon_longitude)
+        else:
+            index.remove([int(user_id) for user_id in args.ids.split(",")])
+        if getattr(args, "compact", False):
+            index = index.compact()
+        index.save(args.index)
+        print(json.dumps({"users": int(len(index.user_ids)), "index": args.index}))
+        return 0
+
+    level = DashaLevel[args.level.upper()]
+    if level not in index.levels:
+        parser.error(f"Level {args.level} is not indexed (indexed: {', '.join(l.name.lower() for l in index.levels)})")
+    if args.command == "starting":
+        matches, elapsed = _timed(
+            index.starting_between, level,
+            local_datetime_to_julian_day(args.start, 0), local_datetime_to_julian_day(args.end, 0),
+            _parse_lord(args.lord)
+        )
+    else:
+        matches, elapsed = _timed(
+            index.running_at, level, local_datetime_to_julian_day(args.at, 0), _parse_lord(args.lord)
+        )
+    report = format_matches(matches, args.limit)
+    report["query_ms"] = round(elapsed, 3)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
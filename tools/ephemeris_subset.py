@@ -0,0 +1,156 @@
+"""
+Ephemeris Subset Tool
+Finds the Swiss Ephemeris files a date window needs and copies them into a smaller ./ephe
+
+Usage:
+    python -m tools.ephemeris_subset plan [--from 1800] [--to 2100] [--ephe-path ./ephe]
+    python -m tools.ephemeris_subset build --output ./ephe_subset [--from 1800] [--to 2100] [--no-verify]
+    python -m tools.ephemeris_subset preload [--from 1800] [--to 2100] [--method read|mmap]
+
+Years are astronomical (0 = 1 BC, negative before). The file choice follows
+services.ephemeris_files; build then verifies the subset by computing every
+body every VERIFY_STEP_DAYS across the window from both directories: no
+position may fall back to Moshier (a missing file) or move by more than
+VERIFY_TOLERANCE_ARCSEC.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import swisseph as swe
+
+from services.ephemeris_files import window_files, preload, PRELOAD_METHODS
+
+
+DEFAULT_EPHE_PATH = os.environ.get("EPHE_PATH", "./ephe")
+DEFAULT_FROM_YEAR = 1800
+DEFAULT_TO_YEAR = 2100
+VERIFY_STEP_DAYS = 7.0
+VERIFY_TOLERANCE_ARCSEC = 0.001
+
+# Every body the chart engines take from files (the mean node is analytic)
+VERIFY_BODIES = [
+    swe.SUN, swe.MOON, swe.MERCURY, swe.VENUS, swe.MARS,
+    swe.JUPITER, swe.SATURN, swe.URANUS, swe.NEPTUNE, swe.PLUTO
+]
+
+
+def window_julian_days(from_year: int, to_year: int) -> Tuple[float, float]:
+    """First and last instant of a year window (Gregorian calendar, UT)"""
+    return swe.julday(from_year, 1, 1, 0.0), swe.julday(to_year, 12, 31, 24.0) - 1e-6
+
+
+def plan(ephe_path: str, from_year: int, to_year: int) -> Dict:
+    """Files of a window with their sizes, against the whole ephemeris directory"""
+    paths = window_files(ephe_path, from_year, to_year)
+    sizes = {os.path.basename(path): os.path.getsize(path) for path in paths}
+    full = sum(entry.stat().st_size for entry in os.scandir(ephe_path) if entry.is_file())
+    return {
+        "window": f"{from_year}:{to_year}",
+        "files": sizes,
+        "bytes": sum(sizes.values()),
+        "full_bytes": full,
+        "full_files": sum(1 for name in os.listdir(ephe_path) if name.endswith(".se1"))
+    }
+
+
+def _positions(ephe_path: str, julian_days: np.ndarray) -> Tuple[np.ndarray, int]:
+    """(longitudes, Moshier fallback count) of VERIFY_BODIES with a fresh swisseph state"""
+    swe.close()
+    swe.set_ephe_path(ephe_path)
+    longitudes = np.empty((len(julian_days), len(VERIFY_BODIES)))
+    fallbacks = 0
+    for i, julian_day in enumerate(julian_days.tolist()):
+        for j, body in enumerate(VERIFY_BODIES):
+            position, flags = swe.calc_ut(julian_day, body, swe.FLG_SWIEPH)
+            longitudes[i, j] = position[0]
+            fallbacks += bool(flags & swe.FLG_MOSEPH)
+    return longitudes, fallbacks
+
+
+def verify(full_path: str, subset_path: str, from_year: int, to_year: int,
+           step_days: float = VERIFY_STEP_DAYS) -> Dict:
+    """Compare positions across the window between the full and the subset directory"""
+    start_jd, end_jd = window_julian_days(from_year, to_year)
+    julian_days = np.append(np.arange(start_jd, end_jd, step_days), end_jd)
+    started = time.perf_counter()
+    reference, _ = _positions(full_path, julian_days)
+    candidate, fallbacks = _positions(subset_path, julian_days)
+    swe.close()
+    swe.set_ephe_path(full_path)
+    deviation = float(np.max(np.abs((candidate - reference + 180.0) % 360 - 180.0))) * 3600
+    return {
+        "instants": int(len(julian_days)),
+        "positions": int(candidate.size),
+        "moshier_fallbacks": fallbacks,
+        "max_deviation_arcsec": round(deviation, 6),
+        "passed": fallbacks == 0 and deviation <= VERIFY_TOLERANCE_ARCSEC,
+        "ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+def build(ephe_path: str, output: str, from_year: int, to_year: int, check: bool = True) -> Dict:
+    """Copy the window's files into output (created if needed) and optionally verify them"""
+    report = plan(ephe_path, from_year, to_year)
+    os.makedirs(output, exist_ok=True)
+    for name in report["files"]:
+        shutil.copy2(os.path.join(ephe_path, name), os.path.join(output, name))
+    report["output"] = output
+    if check:
+        report["verification"] = verify(ephe_path, output, from_year, to_year)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Minimal Swiss Ephemeris file set for a date window")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    plan_parser = subparsers.add_parser("plan", help="List the files a window needs")
+
+    build_parser = subparsers.add_parser("build", help="Copy the window's files into a new directory")
+    build_parser.add_argument("--output", required=True)
+    build_parser.add_argument("--no-verify", action="store_true", help="Skip the position comparison")
+
+    preload_parser = subparsers.add_parser("preload", help="Pull the window's files into the page cache")
+    preload_parser.add_argument("--method", choices=PRELOAD_METHODS, default="read")
+
+    for window_parser in (plan_parser, build_parser, preload_parser):
+        window_parser.add_argument("--ephe-path", default=DEFAULT_EPHE_PATH)
+        window_parser.add_argument("--from", dest="from_year", type=int, default=DEFAULT_FROM_YEAR)
+        window_parser.add_argument("--to", dest="to_year", type=int, default=DEFAULT_TO_YEAR)
+
+    args = parser.parse_args(argv)
+    if args.to_year < args.from_year:
+        parser.error("--to must not precede --from")
+
+    if args.command == "plan":
+        print(json.dumps(plan(args.ephe_path, args.from_year, args.to_year), indent=2))
+        return 0
+
+    if args.command == "build":
+        if os.path.abspath(args.output) == os.path.abspath(args.ephe_path):
+            parser.error("--output must differ from --ephe-path")
+        report = build(args.ephe_path, args.output, args.from_year, args.to_year, not args.no_verify)
+        print(json.dumps(report, indent=2))
+        return 0 if report.get("verification", {"passed": True})["passed"] else 1
+
+    started = time.perf_counter()
+    paths = window_files(args.ephe_path, args.from_year, args.to_year)
+    loaded = preload(paths, args.method)
+    print(json.dumps({
+        "files": [os.path.basename(path) for path in paths],
+        "bytes": loaded,
+        "ms": round((time.perf_counter() - started) * 1000, 1)
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
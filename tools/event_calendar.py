@@ -0,0 +1,185 @@
+"""
+Event Calendar Tool
+Builds and queries the precomputed event calendar (services.event_calendar)
+
+Usage:
+    python -m tools.event_calendar build [--from 1900-01-01] [--to 2100-01-01] [--calendar ./data/event_calendar]
+    python -m tools.event_calendar query --from 2025-01-01 --to 2025-12-31 [--planets saturn] [--types sign_ingress]
+    python -m tools.event_calendar info
+    python -m tools.event_calendar check-paging --from 2024-01-01 --to 2024-03-01 [--limit 7]
+
+check-paging pages through a range with the API's cursors (using the calendar
+when one is built, the live search otherwise) and exits with status 1 unless
+the pages add up to the events of a single call.
+
+Dates are UTC. The calendar span must lie inside the range of the installed
+ephemeris files.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from models.astrology_models import Planet, TransitEventType
+from services.event_calendar import (
+    EventCalendar, RESUME_TOLERANCE, decode_event, encode_events, find_events, page_events
+)
+from utils.time_utils import local_datetime_to_julian_day, julian_day_to_local_datetime
+
+
+DEFAULT_CALENDAR_PATH = os.environ.get("EVENT_CALENDAR_PATH", "./data/event_calendar")
+DEFAULT_START = "1900-01-01"
+DEFAULT_END = "2100-01-01"
+DEFAULT_LIMIT = 100
+# Years searched between progress reports while building
+BUILD_BATCH_YEARS = 10
+
+
+def build_calendar(start_jd: float, end_jd: float) -> EventCalendar:
+    """Search the span in batches (reporting progress on stderr) and index the result"""
+    from services import runtime
+
+    search = runtime.get_event_search()
+    batches = []
+    batch_start = start_jd
+    started = time.perf_counter()
+    while batch_start < end_jd:
+        batch_end = min(batch_start + BUILD_BATCH_YEARS * 365.25, end_jd)
+        batches.append(encode_events(search.events(batch_start, batch_end)))
+        print(f"{julian_day_to_local_datetime(batch_end, 0)[:10]}: "
+              f"{sum(len(batch) for batch in batches)} events, {time.perf_counter() - started:.1f} s",
+              file=sys.stderr)
+        batch_start = batch_end
+    return EventCalendar(np.concatenate(batches), start_jd, end_jd)
+
+
+def check_paging(start_jd: float, end_jd: float, limit: int, calendar: Optional[EventCalendar]) -> dict:
+    """
+    Compare a range read page by page (find_events with the previous page's
+    cursor) with the same range read in one call
+
+    Events match when graha and type agree and their times differ by at most
+    RESUME_TOLERANCE (live searches started at different times).
+    """
+    from services import runtime
+
+    search = runtime.get_event_search()
+    single = [event for event, _ in find_events(start_jd, end_jd, calendar=calendar, search=search)]
+    paged = []
+    pages = 0
+    cursor = None
+    while True:
+        page, cursor = page_events(find_events(start_jd, end_jd, calendar=calendar, search=search, after=cursor), limit)
+        paged.extend(event for event, _ in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    mismatches = [
+        index for index, (expected, got) in enumerate(zip(single, paged))
+        if (expected.planet, expected.event_type) != (got.planet, got.event_type)
+        or abs(expected.julian_day - got.julian_day) > RESUME_TOLERANCE
+    ]
+    return {
+        "single": len(single),
+        "paged": len(paged),
+        "pages": pages,
+        "first_mismatch": mismatches[0] if mismatches else None,
+        "ok": len(single) == len(paged) and not mismatches
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precomputed transit and lunar event calendar")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Precompute every event in a UTC date span")
+    build_parser.add_argument("--from", dest="start", default=DEFAULT_START)
+    build_parser.add_argument("--to", dest="end", default=DEFAULT_END)
+
+    query_parser = subparsers.add_parser("query", help="Events in a UTC date range")
+    query_parser.add_argument("--from", dest="start", required=True)
+    query_parser.add_argument("--to", dest="end", required=True)
+    query_parser.add_argument("--planets", help="Comma-separated grahas")
+    query_parser.add_argument("--types", help="Comma-separated event types",
+                              metavar="{" + ",".join(event_type.value for event_type in TransitEventType) + "}")
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT)
+
+    info_parser = subparsers.add_parser("info", help="Span and size of a calendar")
+
+    paging_parser = subparsers.add_parser("check-paging", help="Check that cursor pages add up to a single call")
+    paging_parser.add_argument("--from", dest="start", required=True)
+    paging_parser.add_argument("--to", dest="end", required=True)
+    paging_parser.add_argument("--limit", type=int, default=7)
+
+    for calendar_parser in (build_parser, query_parser, info_parser, paging_parser):
+        calendar_parser.add_argument("--calendar", default=DEFAULT_CALENDAR_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "check-paging":
+        calendar = None
+        if os.path.exists(os.path.join(args.calendar, "manifest.json")):
+            calendar = EventCalendar.load(args.calendar)
+        report = check_paging(local_datetime_to_julian_day(args.start, 0),
+                              local_datetime_to_julian_day(args.end, 0), args.limit, calendar)
+        print(json.dumps(report))
+        return 0 if report["ok"] else 1
+
+    if args.command == "build":
+        started = time.perf_counter()
+        calendar = build_calendar(local_datetime_to_julian_day(args.start, 0),
+                                  local_datetime_to_julian_day(args.end, 0))
+        calendar.save(args.calendar)
+        print(json.dumps({
+            "events": len(calendar),
+            "bytes": int(calendar.records.nbytes),
+            "build_s": round(time.perf_counter() - started, 1),
+            "calendar": args.calendar
+        }))
+        return 0
+
+    calendar = EventCalendar.load(args.calendar)
+
+    if args.command == "info":
+        print(json.dumps({
+            "from": julian_day_to_local_datetime(calendar.start_jd, 0),
+            "to": julian_day_to_local_datetime(calendar.end_jd, 0),
+            "events": len(calendar),
+            "bytes": int(calendar.records.nbytes)
+        }, indent=2))
+        return 0
+
+    planets = [Planet[name.strip().upper()] for name in args.planets.split(",")] if args.planets else None
+    event_types = [TransitEventType(name.strip()) for name in args.types.split(",")] if args.types else None
+    start_jd = local_datetime_to_julian_day(args.start, 0)
+    end_jd = local_datetime_to_julian_day(args.end, 0)
+
+    started = time.perf_counter()
+    records = calendar.select(start_jd, end_jd, planets, event_types)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(json.dumps({
+        "count": int(len(records)),
+        "query_ms": round(elapsed, 3),
+        "events": [
+            {
+                "datetime": julian_day_to_local_datetime(event.julian_day, 0),
+                "planet": event.planet.name.title(),
+                "type": event.event_type.value,
+                "sign": event.sign.name,
+                "longitude": round(event.longitude, 6)
+            }
+            for event in map(decode_event, records[:args.limit])
+        ]
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+"""
+Golden Output Harness
+Records reference chart outputs for a fixed corpus and diffs any engine against them
+
+Usage:
+    python -m tools.golden_harness record [--size 300] [--seed 1987]
+    python -m tools.golden_harness compare [--engine reference] [--tolerance-arcsec 1.0]
+
+Longitudes are compared with an arcsecond tolerance; signs, nakshatras, padas,
+lords, houses and dignities must match exactly.  A categorical mismatch is only
+reported as a "boundary flip" (not a failure) when the reference longitude lies
+within the tolerance of the division boundary that produced it.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import swisseph as swe
+
+from models.astrology_models import UserDetails, Planet, Zodiac, D1Chart, EphemerisMode
+from services.swiss_ephemeris_service import SwissEphemerisService
+from calculators.d1_chart_calculator import D1ChartCalculator
+from calculators.d9_chart_calculator import D9ChartCalculator
+from utils.vedic_helper import VedicAstrologyHelper
+
+
+DEFAULT_EPHE_PATH = "./ephe"
+DEFAULT_GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "d1_d9_golden.json")
+DEFAULT_CORPUS_SIZE = 300
+DEFAULT_SEED = 1987
+DEFAULT_TOLERANCE_ARCSEC = 1.0
+DEFAULT_SPEED_TOLERANCE = 1e-4  # degrees per day
+
+# Inputs that sit on calendar edges; the UTC conversion has to roll the day,
+# month or year over for every one of them.
+EDGE_CASES = [
+    ("1999-12-31T23:30:00", -5.0),
+    ("2000-01-01T02:15:00", 5.5),
+    ("2000-02-29T23:59:59", -12.0),
+    ("2000-03-01T00:10:00", 14.0),
+    ("1987-05-04T19:43:00", 5.5),
+    ("1900-01-01T00:00:00", 1.0),
+    ("2099-12-31T23:59:59", -3.5),
+    ("2024-10-31T04:00:00", 9.5),
+    ("2024-11-30T22:45:00", -9.0),
+    ("1947-08-15T00:00:00", 5.5),
+]
+
+# Bodies in the order they are stored in a golden record
+GOLDEN_PLANETS = [
+    Planet.SUN, Planet.MOON, Planet.MARS, Planet.MERCURY,
+    Planet.JUPITER, Planet.VENUS, Planet.SATURN, Planet.RAHU, Planet.KETU
+]
+
+CATEGORICAL_FIELDS = ["sign", "nakshatra", "pada", "nakshatra_lord", "sub_lord", "d9_sign"]
+DERIVED_FIELDS = ["house", "dignity"]
+
+
+# ---------------------------------------------------------------------------
+# Engines
+# ---------------------------------------------------------------------------
+
+class ReferenceEngine:
+    """Reference swisseph path: D1ChartCalculator followed by D9ChartCalculator"""
+
+    name = "reference"
+
+    def __init__(self, ephe_path: str = DEFAULT_EPHE_PATH):
+        self.d1_calculator = D1ChartCalculator(ephe_path)
+        self.d9_calculator = D9ChartCalculator(ephe_path)
+
+    def calculate(self, user_details: UserDetails) -> Tuple[D1Chart, Dict]:
+        d1_chart = self.d1_calculator.calculate_d1_chart(user_details)
+        d9_data = self.d9_calculator.calculate_d9_chart(user_details, d1_chart)
+        return d1_chart, d9_data
+
+
+class MoshierEngine(ReferenceEngine):
+    """Reference path on the analytic Moshier ephemeris (no .se1 file reads)"""
+
+    name = "moshier"
+
+    def calculate(self, user_details: UserDetails) -> Tuple[D1Chart, Dict]:
+        return super().calculate(replace(user_details, ephemeris=EphemerisMode.MOSHIER.value))
+
+
+# Engine name -> factory(ephe_path).  Optimised code paths register here so the
+# harness can diff them against the stored reference output.
+ENGINES: Dict[str, Callable[[str], object]] = {
+    "reference": ReferenceEngine,
+    "moshier": MoshierEngine,
+}
+
+
+# ---------------------------------------------------------------------------
+# Corpus and snapshots
+# ---------------------------------------------------------------------------
+
+def build_corpus(size: int = DEFAULT_CORPUS_SIZE, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """
+    Build a deterministic corpus of birth records
+
+    Args:
+        size: Number of records (edge cases are included in this count)
+        seed: Random seed so the corpus is reproducible
+
+    Returns:
+        List of request-shaped dictionaries
+    """
+    rng = random.Random(seed)
+    corpus = []
+
+    for index, (birth_datetime, tz_offset) in enumerate(EDGE_CASES[:size]):
+        corpus.append({
+            "name": f"edge-{index}",
+            "datetime": birth_datetime,
+            "latitude": round(rng.uniform(-60, 60), 4),
+            "longitude": round(tz_offset * 15 if abs(tz_offset) <= 12 else 179.0, 4),
+            "timezone": tz_offset,
+            "place": "edge case"
+        })
+
+    start = datetime(1900, 1, 1)
+    span_seconds = int((datetime(2100, 1, 1) - start).total_seconds())
+    while len(corpus) < size:
+        longitude = round(rng.uniform(-180, 180), 4)
+        # Offsets follow the meridian, rounded to the half hour like most zones
+        tz_offset = max(-12.0, min(14.0, round(longitude / 15 * 2) / 2))
+        birth = start + timedelta(seconds=rng.randrange(span_seconds))
+        corpus.append({
+            "name": f"random-{len(corpus)}",
+            "datetime": birth.strftime("%Y-%m-%dT%H:%M:%S"),
+            "latitude": round(rng.uniform(-66, 66), 4),
+            "longitude": longitude,
+            "timezone": tz_offset,
+            "place": "random"
+        })
+
+    return corpus
+
+
+def snapshot_chart(d1_chart: D1Chart, d9_data: Dict) -> Dict:
+    """Reduce a D1/D9 calculation to the fields the harness compares"""
+    d9_signs = {p.planet.name: p.sign.name for p in d9_data["d9_planets"]}
+    planets = {}
+
+    for planet_enum in GOLDEN_PLANETS:
+        planet_pos = next((p for p in d1_chart.planets if p.planet == planet_enum), None)
+        if not planet_pos:
+            continue
+        planets[planet_enum.name] = {
+            "longitude": planet_pos.longitude,
+            "speed": planet_pos.speed,
+            "sign": planet_pos.sign.name,
+            "nakshatra": planet_pos.nakshatra.name,
+            "pada": planet_pos.nakshatra_pada,
+            "nakshatra_lord": planet_pos.nakshatra_lord.name if planet_pos.nakshatra_lord else None,
+            "sub_lord": planet_pos.sub_lord.name if planet_pos.sub_lord else None,
+            "retrograde": planet_pos.retrograde,
+            "house": planet_pos.is_in_house,
+            "dignity": planet_pos.dignity,
+            "d9_sign": d9_signs.get(planet_enum.name)
+        }
+
+    return {
+        "ayanamsa": d1_chart.ayanamsa,
+        "lagna": {
+            "longitude": d1_chart.lagna.longitude,
+            "sign": d1_chart.lagna.sign.name,
+            "nakshatra": d1_chart.lagna.nakshatra.name,
+            "pada": d1_chart.lagna.nakshatra_pada,
+            "d9_sign": d9_data["d9_lagna"].sign.name
+        },
+        "planets": planets
+    }
+
+
+def record_golden(output_path: str, size: int, seed: int, ephe_path: str = DEFAULT_EPHE_PATH) -> Dict:
+    """Compute the corpus with the reference engine and write the golden file"""
+    engine = ReferenceEngine(ephe_path)
+    corpus = build_corpus(size, seed)
+    records = []
+
+    started = time.perf_counter()
+    for item in corpus:
+        d1_chart, d9_data = engine.calculate(UserDetails(**item))
+        records.append({"input": item, "output": snapshot_chart(d1_chart, d9_data)})
+    elapsed = time.perf_counter() - started
+
+    golden = {
+        "meta": {
+            "engine": engine.name,
+            "swisseph_version": swe.version,
+            "corpus_size": size,
+            "seed": seed,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "reference_seconds": round(elapsed, 4)
+        },
+        "records": records
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as handle:
+        json.dump(golden, handle, separators=(",", ":"))
+        handle.write("\n")
+
+    return golden
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+def _arcsec_delta(reference: float, candidate: float) -> float:
+    """Smallest angular distance between two longitudes in arcseconds"""
+    delta = abs(reference - candidate) % 360
+    return min(delta, 360 - delta) * 3600
+
+
+def _categorical_at(longitude: float, ephe_service: SwissEphemerisService,
+                    helper: VedicAstrologyHelper) -> Dict:
+    """Derive the longitude-driven categorical fields for a sidereal longitude"""
+    longitude %= 360
+    nakshatra, pada = ephe_service.longitude_to_nakshatra(longitude)
+    nak_lord = next(n["ruler"] for n in ephe_service.nakshatras if n["name"] == nakshatra)
+    return {
+        "sign": ephe_service.longitude_to_zodiac_sign(longitude).name,
+        "nakshatra": nakshatra.name,
+        "pada": pada,
+        "nakshatra_lord": nak_lord.name,
+        "sub_lord": helper.get_sub_lord(longitude, nak_lord).name,
+        "d9_sign": Zodiac(int(longitude / (30 / 9)) % 12 + 1).name
+    }
+
+
+class ComparisonReport:
+    """Accumulates deviations between the golden file and a candidate engine"""
+
+    def __init__(self, tolerance_arcsec: float, speed_tolerance: float):
+        self.tolerance_arcsec = tolerance_arcsec
+        self.speed_tolerance = speed_tolerance
+        self.max_deviation = {"longitude": 0.0, "lagna": 0.0, "ayanamsa": 0.0, "speed": 0.0}
+        self.failures: List[Dict] = []
+        self.boundary_flips: List[Dict] = []
+        self.checked_fields = 0
+
+    def note_numeric(self, key: str, deviation: float, limit: float, context: Dict):
+        self.checked_fields += 1
+        self.max_deviation[key] = max(self.max_deviation[key], deviation)
+        if deviation > limit:
+            self.failures.append(dict(context, deviation=deviation, limit=limit))
+
+    def note_categorical(self, matched: bool, tolerated: bool, context: Dict):
+        self.checked_fields += 1
+        if matched:
+            return
+        if tolerated:
+            self.boundary_flips.append(context)
+        else:
+            self.failures.append(context)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+def compare_records(golden_output: Dict, candidate_output: Dict, record_name: str,
+                    report: ComparisonReport, ephe_service: SwissEphemerisService,
+                    helper: VedicAstrologyHelper):
+    """Diff one candidate snapshot against its golden snapshot"""
+    tolerance_deg = report.tolerance_arcsec / 3600
+
+    report.note_numeric(
+        "ayanamsa",
+        abs(golden_output["ayanamsa"] - candidate_output["ayanamsa"]) * 3600,
+        report.tolerance_arcsec,
+        {"record": record_name, "body": "AYANAMSA", "field": "ayanamsa"}
+    )
+
+    bodies = [("LAGNA", golden_output["lagna"], candidate_output["lagna"])]
+    bodies += [
+        (name, golden_output["planets"][name], candidate_output["planets"].get(name, {}))
+        for name in golden_output["planets"]
+    ]
+
+    flipped_signs = set()
+    for body_name, golden_body, candidate_body in bodies:
+        ref_lon = golden_body["longitude"]
+        deviation_key = "lagna" if body_name == "LAGNA" else "longitude"
+        report.note_numeric(
+            deviation_key,
+            _arcsec_delta(ref_lon, candidate_body.get("longitude", ref_lon + 180)),
+            report.tolerance_arcsec,
+            {"record": record_name, "body": body_name, "field": "longitude"}
+        )
+
+        # Values a longitude inside the tolerance band could legitimately produce
+        neighbours = [_categorical_at(ref_lon - tolerance_deg, ephe_service, helper),
+                      _categorical_at(ref_lon + tolerance_deg, ephe_service, helper)]
+
+        for field in CATEGORICAL_FIELDS:
+            if field not in golden_body:
+                continue
+            expected, actual = golden_body[field], candidate_body.get(field)
+            tolerated = any(n[field] == actual for n in neighbours)
+            if expected != actual and tolerated and field == "sign":
+                flipped_signs.add(body_name)
+            report.note_categorical(
+                expected == actual, tolerated,
+                {"record": record_name, "body": body_name, "field": field,
+                 "expected": expected, "actual": actual}
+            )
+
+        if "speed" in golden_body:
+            report.note_numeric(
+                "speed",
+                abs(golden_body["speed"] - candidate_body.get("speed", float("inf"))),
+                report.speed_tolerance,
+                {"record": record_name, "body": body_name, "field": "speed"}
+            )
+            report.note_categorical(
+                golden_body["retrograde"] == candidate_body.get("retrograde"),
+                abs(golden_body["speed"]) <= report.speed_tolerance,
+                {"record": record_name, "body": body_name, "field": "retrograde",
+                 "expected": golden_body["retrograde"], "actual": candidate_body.get("retrograde")}
+            )
+
+    # Houses and dignities follow from signs, so they may only differ where a
+    # sign flip was already tolerated for the body or for the lagna
+    for body_name, golden_body in golden_output["planets"].items():
+        candidate_body = candidate_output["planets"].get(body_name, {})
+        tolerated = body_name in flipped_signs or "LAGNA" in flipped_signs
+        for field in DERIVED_FIELDS:
+            report.note_categorical(
+                golden_body[field] == candidate_body.get(field), tolerated,
+                {"record": record_name, "body": body_name, "field": field,
+                 "expected": golden_body[field], "actual": candidate_body.get(field)}
+            )
+
+
+def run_comparison(golden_path: str, engine_name: str, tolerance_arcsec: float,
+                   speed_tolerance: float, ephe_path: str = DEFAULT_EPHE_PATH,
+                   limit: Optional[int] = None) -> Dict:
+    """
+    Diff an engine against the golden file and time it against the reference
+
+    Returns:
+        Summary dictionary with pass/fail, speedup and maximum deviations
+    """
+    with open(golden_path, encoding="utf-8") as handle:
+        golden = json.load(handle)
+
+    records = golden["records"][:limit] if limit else golden["records"]
+    inputs = [UserDetails(**record["input"]) for record in records]
+
+    reference = ReferenceEngine(ephe_path)
+    candidate = ENGINES[engine_name](ephe_path)
+    ephe_service = SwissEphemerisService(ephe_path)
+    helper = VedicAstrologyHelper()
+
+    started = time.perf_counter()
+    for user_details in inputs:
+        reference.calculate(user_details)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    candidate_outputs = [snapshot_chart(*candidate.calculate(u)) for u in inputs]
+    candidate_seconds = time.perf_counter() - started
+
+    report = ComparisonReport(tolerance_arcsec, speed_tolerance)
+    for record, candidate_output in zip(records, candidate_outputs):
+        compare_records(record["output"], candidate_output, record["input"]["name"],
+                        report, ephe_service, helper)
+
+    return {
+        "engine": engine_name,
+        "records": len(records),
+        "checked_fields": report.checked_fields,
+        "passed": report.passed,
+        "failures": len(report.failures),
+        "boundary_flips": len(report.boundary_flips),
+        "max_deviation_arcsec": {
+            "longitude": round(report.max_deviation["longitude"], 4),
+            "lagna": round(report.max_deviation["lagna"], 4),
+            "ayanamsa": round(report.max_deviation["ayanamsa"], 4)
+        },
+        "max_speed_deviation": report.max_deviation["speed"],
+        "reference_ms_per_chart": round(reference_seconds / len(records) * 1000, 4),
+        "candidate_ms_per_chart": round(candidate_seconds / len(records) * 1000, 4),
+        "speedup": round(reference_seconds / candidate_seconds, 3) if candidate_seconds else None,
+        "first_failures": report.failures[:10],
+        "first_boundary_flips": report.boundary_flips[:10]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Golden-output regression harness for chart engines")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record golden outputs with the reference engine")
+    record_parser.add_argument("--size", type=int, default=DEFAULT_CORPUS_SIZE)
+    record_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    record_parser.add_argument("--output", default=DEFAULT_GOLDEN_PATH)
+
+    compare_parser = subparsers.add_parser("compare", help="Diff an engine against the golden outputs")
+    compare_parser.add_argument("--engine", choices=sorted(ENGINES), default="reference")
+    compare_parser.add_argument("--golden", default=DEFAULT_GOLDEN_PATH)
+    compare_parser.add_argument("--tolerance-arcsec", type=float, default=DEFAULT_TOLERANCE_ARCSEC)
+    compare_parser.add_argument("--speed-tolerance", type=float, default=DEFAULT_SPEED_TOLERANCE)
+    compare_parser.add_argument("--limit", type=int, default=None)
+
+    parser.add_argument("--ephe-path", default=DEFAULT_EPHE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        golden = record_golden(args.output, args.size, args.seed, args.ephe_path)
+        print(json.dumps(golden["meta"], indent=2))
+        return 0
+
+    summary = run_comparison(
+        args.golden, args.engine, args.tolerance_arcsec,
+        args.speed_tolerance, args.ephe_path, args.limit
+    )
+    print(json.dumps(summary, indent=2))
+    return 0 if summary["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Startup Benchmark
+Measures import time and startup-to-first-response for each STARTUP_MODE
+
+Usage:
+    python -m tools.startup_benchmark [--runs 5] [--budget-ms 1500] [--top 15]
+
+Every measurement runs in a fresh interpreter so nothing is cached between
+runs. The import-time report is produced with ``python -X importtime``; the
+first-response time covers interpreter start, app import, engine
+initialisation and one refined D1 chart request through the Flask test
+client. Exits non-zero when the median first response of any mode exceeds
+the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_RUNS = 5
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_TOP = 15
+
+FIRST_REQUEST_SCRIPT = """
+import app
+client = app.app.test_client()
+response = client.post('/api/v1/d1-chart-refined', json={
+    'name': 'benchmark', 'datetime': '1987-05-04T19:43:00', 'latitude': 26.1433,
+    'longitude': 91.7898, 'timezone': 5.5, 'place': 'Dispur'
+})
+assert response.status_code == 200, response.status_code
+"""
+
+
+def import_time_report(top: int = DEFAULT_TOP) -> Dict:
+    """
+    Run ``python -X importtime -c "import app"`` and summarise it
+
+    Returns:
+        Dictionary with total import time, slowest modules and per-package totals
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+
+    total_ms = next((m["cumulative_ms"] for m in modules if m["module"] == "app"), 0.0)
+
+    packages: Dict[str, float] = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + module["self_ms"]
+
+    return {
+        "total_ms": round(total_ms, 1),
+        "slowest_modules": sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:top],
+        "packages_ms": {
+            name: round(ms, 1)
+            for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        }
+    }
+
+
+def first_response_ms(mode: str) -> float:
+    """Wall time from spawning a fresh interpreter to the first chart response"""
+    env = dict(os.environ, STARTUP_MODE=mode)
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST_SCRIPT],
+        cwd=PROJECT_ROOT, env=env, check=True, capture_output=True
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def run_benchmark(runs: int, budget_ms: float, top: int) -> Dict:
+    """Collect the import report and first-response timings for every mode"""
+    sys.path.insert(0, PROJECT_ROOT)
+    from services.runtime import STARTUP_MODES
+
+    first_response = {}
+    for mode in STARTUP_MODES:
+        samples: List[float] = [first_response_ms(mode) for _ in range(runs)]
+        first_response[mode] = {
+            "median_ms": round(statistics.median(samples), 1),
+            "min_ms": round(min(samples), 1),
+            "max_ms": round(max(samples), 1)
+        }
+
+    worst = max(result["median_ms"] for result in first_response.values())
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "budget_ms": budget_ms,
+        "within_budget": worst <= budget_ms,
+        "first_response": first_response,
+        "import_time": import_time_report(top)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the chart API")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.runs, args.budget_ms, args.top)
+    print(json.dumps(report, indent=2))
+    return 0 if report["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
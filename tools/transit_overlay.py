@@ -0,0 +1,132 @@
+"""
+Transit Overlay Tool
+Scores one transit sky state against a whole user base (calculators.transit_overlay)
+
+Usage:
+    python -m tools.transit_overlay score --natal natal.npz --out overlay.npz [--at 2025-01-01T00:00:00]
+    python -m tools.transit_overlay bench [--users 5000000]
+
+The natal file is an .npz with equal-length columns: optional user_id plus any
+of moon_longitude, lagna_longitude (sidereal degrees, NaN where unknown),
+moon_sign, lagna_sign (1-12). The output holds, per natal point, (users x
+planets) arrays <point>_house (int8), <point>_aspect (bool) and <point>_orb
+(float32), with planets and transit_longitudes. --at is UTC (default now).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calculators.transit_overlay import (
+    NatalColumns, TransitOverlayCalculator, DEFAULT_CHUNK_ROWS, TRANSIT_PLANETS, transit_longitudes_from_snapshot
+)
+from models.astrology_models import Planet
+from utils.time_utils import local_datetime_to_julian_day, julian_day_to_local_datetime
+
+
+DEFAULT_BENCH_USERS = 5_000_000
+NATAL_FIELDS = ("moon_longitude", "lagna_longitude", "moon_sign", "lagna_sign")
+
+
+def transit_state(at: Optional[str]):
+    """Sky state at a UTC instant, or the current one"""
+    from services import runtime
+
+    service = runtime.get_sky_snapshot_service()
+    return service.compute(local_datetime_to_julian_day(at, 0)) if at else service.refresh()
+
+
+def score(natal: NatalColumns, transit_longitudes: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Dict:
+    """Overlay every chart, chunk by chunk, into preallocated output arrays"""
+    calculator = TransitOverlayCalculator()
+    rows, planets = len(natal), len(calculator.planets)
+    output = {}
+    for target in natal.targets():
+        output[f"{target}_house"] = np.empty((rows, planets), dtype=np.int8)
+        output[f"{target}_aspect"] = np.empty((rows, planets), dtype=bool)
+        output[f"{target}_orb"] = np.empty((rows, planets), dtype=np.float32)
+
+    for start, overlay in calculator.overlay_chunks(transit_longitudes, natal, chunk_rows):
+        stop = start + chunk_rows
+        for target, values in overlay.targets.items():
+            output[f"{target}_house"][start:stop] = values.house
+            output[f"{target}_aspect"][start:stop] = values.aspect
+            output[f"{target}_orb"][start:stop] = values.orb
+    return output
+
+
+def run_bench(users: int, seed: int = 7) -> Dict:
+    """Score random natal Moons and lagnas against the current sky"""
+    rng = np.random.default_rng(seed)
+    natal = NatalColumns(moon_longitude=rng.uniform(0, 360, users), lagna_longitude=rng.uniform(0, 360, users))
+    sky = transit_state(None)
+
+    started = time.perf_counter()
+    output = score(natal, transit_longitudes_from_snapshot(sky))
+    elapsed = time.perf_counter() - started
+
+    saturn = TRANSIT_PLANETS.index(Planet.SATURN)
+    sade_sati = np.isin(output["moon_house"][:, saturn], (12, 1, 2))
+    return {
+        "users": users,
+        "score_s": round(elapsed, 3),
+        "users_per_s": int(users / elapsed),
+        "output_bytes": int(sum(array.nbytes for array in output.values())),
+        "saturn_sade_sati_share": round(float(sade_sati.mean()), 4)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk transit-over-natal overlay")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    score_parser = subparsers.add_parser("score", help="Overlay one sky state on a natal .npz")
+    score_parser.add_argument("--natal", required=True)
+    score_parser.add_argument("--out", required=True)
+    score_parser.add_argument("--at", help="UTC instant YYYY-MM-DDTHH:MM:SS (default now)")
+    score_parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+
+    bench_parser = subparsers.add_parser("bench", help="Time scoring of random natal data")
+    bench_parser.add_argument("--users", type=int, default=DEFAULT_BENCH_USERS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(json.dumps(run_bench(args.users), indent=2))
+        return 0
+
+    with np.load(args.natal) as stored:
+        columns = {name: stored[name] for name in NATAL_FIELDS if name in stored}
+        user_ids = stored["user_id"] if "user_id" in stored else None
+    natal = NatalColumns(**columns)
+    if not natal.targets():
+        print(f"{args.natal}: no natal columns (expected any of {', '.join(NATAL_FIELDS)})", file=sys.stderr)
+        return 1
+
+    sky = transit_state(args.at)
+    transit_longitudes = transit_longitudes_from_snapshot(sky)
+    started = time.perf_counter()
+    output = score(natal, transit_longitudes, args.chunk_rows)
+    elapsed = time.perf_counter() - started
+
+    if user_ids is not None:
+        output["user_id"] = user_ids
+    np.savez(args.out, planets=np.array([planet.name for planet in TRANSIT_PLANETS]),
+             transit_longitudes=transit_longitudes, **output)
+    print(json.dumps({
+        "users": len(natal),
+        "transit": julian_day_to_local_datetime(sky.julian_day, 0),
+        "score_s": round(elapsed, 3),
+        "out": args.out
+    }))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
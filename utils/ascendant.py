@@ -0,0 +1,128 @@
+"""
+Ascendant Utilities
+Vectorized ascendant and midheaven from sidereal time, obliquity and latitude
+
+The ascendant and MC depend only on the ARMC (right ascension of the
+meridian), the true obliquity and the geographic latitude:
+    MC  = atan2(sin ARMC, cos ARMC cos e)
+    Asc = atan2(cos ARMC, -(sin ARMC cos e + tan lat sin e))
+so no house system is needed to find them. Inside the polar circles the
+ascendant is taken as the eastern point within 180 degrees after the MC, as
+swisseph's houses functions do. Results match swe.houses / swe.houses_armc to
+about 1e-12 degrees. Only the per-instant inputs (apparent sidereal time and
+true obliquity) come from swisseph, once per distinct Julian Day.
+"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+
+def ascendant_midheaven(armc, obliquity, latitude) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tropical ascendant and midheaven of broadcastable arrays
+
+    Args:
+        armc: Right ascension of the meridian in degrees
+        obliquity: True obliquity of the ecliptic in degrees
+        latitude: Geographic latitude in degrees
+
+    Returns:
+        (ascendant, midheaven) longitudes in [0, 360)
+    """
+    armc, obliquity, latitude = np.broadcast_arrays(
+        np.asarray(armc, dtype=np.float64), np.asarray(obliquity, dtype=np.float64),
+        np.asarray(latitude, dtype=np.float64)
+    )
+    ramc = np.radians(armc)
+    eps = np.radians(obliquity)
+    sin_ramc, cos_ramc = np.sin(ramc), np.cos(ramc)
+
+    midheaven = np.degrees(np.arctan2(sin_ramc, cos_ramc * np.cos(eps))) % 360
+    ascendant = np.degrees(np.arctan2(
+        cos_ramc, -(sin_ramc * np.cos(eps) + np.tan(np.radians(latitude)) * np.sin(eps))
+    )) % 360
+
+    # Inside the polar circles the formula can give the western point
+    polar = np.abs(latitude) >= 90.0 - obliquity
+    behind = (ascendant - midheaven) % 360 >= 180.0
+    ascendant = np.where(polar & behind, (ascendant + 180.0) % 360, ascendant)
+    return ascendant, midheaven
+
+
+def sidereal_state(julian_days, with_obliquity: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Greenwich apparent sidereal time (hours) and true obliquity (degrees)
+
+    swisseph is called once per distinct Julian Day, so a grid of locations at
+    one instant costs a single pair of calls.
+
+    Args:
+        julian_days: Julian Days (UT), any shape
+        with_obliquity: False skips the obliquity (returned as None)
+
+    Returns:
+        (sidereal_time, obliquity) arrays shaped like julian_days
+    """
+    julian_days = np.asarray(julian_days, dtype=np.float64)
+    if julian_days.size and (julian_days == julian_days.flat[0]).all():
+        # One instant (e.g. a location grid): skip the sort
+        julian_day = float(julian_days.flat[0])
+        return (np.full(julian_days.shape, swe.sidtime(julian_day)),
+                np.full(julian_days.shape, swe.calc_ut(julian_day, swe.ECL_NUT)[0][0]) if with_obliquity else None)
+    distinct, inverse = np.unique(julian_days, return_inverse=True)
+    inverse = inverse.reshape(julian_days.shape)
+    sidereal_times = np.array([swe.sidtime(jd) for jd in distinct.tolist()])
+    if not with_obliquity:
+        return sidereal_times[inverse], None
+    obliquities = np.array([swe.calc_ut(jd, swe.ECL_NUT)[0][0] for jd in distinct.tolist()])
+    return sidereal_times[inverse], obliquities[inverse]
+
+
+def ascendants(julian_days, latitudes, longitudes, obliquity=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tropical ascendant and midheaven for broadcastable (JD, latitude, longitude)
+
+    One instant with a grid of locations, many instants at one location or
+    matching arrays all work.
+
+    Args:
+        julian_days: Julian Days (UT)
+        latitudes: Geographic latitudes
+        longitudes: Geographic longitudes (east positive)
+        obliquity: True obliquity if already known (e.g. interpolated over a day)
+
+    Returns:
+        (ascendant, midheaven) arrays of the broadcast shape
+    """
+    julian_days, latitudes, longitudes = np.broadcast_arrays(
+        np.asarray(julian_days, dtype=np.float64), np.asarray(latitudes, dtype=np.float64),
+        np.asarray(longitudes, dtype=np.float64)
+    )
+    sidereal_time, computed = sidereal_state(julian_days, with_obliquity=obliquity is None)
+    obliquity = computed if obliquity is None else obliquity
+    return ascendant_midheaven((sidereal_time * 15.0 + longitudes) % 360, obliquity, latitudes)
+
+
+def ascendant(julian_day: float, latitude: float, longitude: float,
+              obliquity: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Scalar ascendants() for a single chart, without numpy overhead
+
+    Returns:
+        (ascendant, midheaven) tropical longitudes in degrees
+    """
+    ramc = math.radians((swe.sidtime(julian_day) * 15.0 + longitude) % 360)
+    if obliquity is None:
+        obliquity = swe.calc_ut(julian_day, swe.ECL_NUT)[0][0]
+    eps = math.radians(obliquity)
+    sin_ramc, cos_ramc = math.sin(ramc), math.cos(ramc)
+
+    midheaven = math.degrees(math.atan2(sin_ramc, cos_ramc * math.cos(eps))) % 360
+    asc = math.degrees(math.atan2(
+        cos_ramc, -(sin_ramc * math.cos(eps) + math.tan(math.radians(latitude)) * math.sin(eps))
+    )) % 360
+    if abs(latitude) >= 90.0 - obliquity and (asc - midheaven) % 360 >= 180.0:
+        asc = (asc + 180.0) % 360
+    return asc, midheaven
@@ -0,0 +1,91 @@
+"""
+Root Finding Utilities
+Bracketed root refinement shared by the event, panchang and rise/set engines
+"""
+from typing import Callable, Optional
+
+
+def brent(func: Callable[[float], float], a: float, b: float, fa: Optional[float] = None,
+          fb: Optional[float] = None, tolerance: float = 1e-7, max_iterations: int = 60) -> float:
+    """
+    Brent's method: a root of func inside a sign-changing bracket [a, b]
+
+    Combines inverse quadratic interpolation and secant steps with bisection,
+    so it converges superlinearly on smooth functions and never leaves the
+    bracket.
+
+    Args:
+        func: Continuous function of one variable
+        a: Bracket start
+        b: Bracket end
+        fa: func(a) if already known
+        fb: func(b) if already known
+        tolerance: Absolute tolerance on the root
+        max_iterations: Iteration cap
+
+    Returns:
+        The root (to within tolerance)
+
+    Raises:
+        ValueError: If func(a) and func(b) have the same sign
+    """
+    fa = func(a) if fa is None else fa
+    fb = func(b) if fb is None else fb
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if (fa > 0) == (fb > 0):
+        raise ValueError("Root is not bracketed")
+
+    if abs(fa) < abs(fb):
+        a, b, fa, fb = b, a, fb, fa
+    c, fc = a, fa
+    d = e = b - a
+
+    for _ in range(max_iterations):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tol = 2e-16 * abs(b) + 0.5 * tolerance
+        m = 0.5 * (c - b)
+        if abs(m) <= tol or fb == 0:
+            return b
+
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2 * m * s
+                q = 1 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            else:
+                p = -p
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if m > 0 else -tol)
+        fb = func(b)
+
+    return b
+
+
+def wrap_degrees(angle: float) -> float:
+    """Wrap an angle difference into [-180, 180)"""
+    return (angle + 180.0) % 360.0 - 180.0
@@ -0,0 +1,306 @@
+"""
+Time Utilities
+Conversions between local ISO datetimes and Julian Days (UT)
+
+Civil (birth) times go through civil_to_julian_days, which takes a fixed
+offset or an IANA zone name and follows swe.utc_to_jd: UTC from 1972 on is
+converted to TT with the leap-second table and to UT1 through ΔT, earlier
+times are taken as UT1. Zone offsets come from pytz's compiled transition
+tables, held per zone as sorted arrays so a batch of datetimes resolves with
+one searchsorted.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import swisseph as swe
+
+JD_UNIX_EPOCH = 2440587.5
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+# An offset in hours (5.5) or an IANA zone name ("Asia/Kolkata")
+Timezone = Union[float, str]
+
+JD_1972 = 2441317.5                     # Start of leap-second UTC
+TT_MINUS_TAI = 32.184                   # Seconds
+MICROSECONDS_PER_DAY = 86400e6
+
+# pytz compiles transitions up to 2037. Zones still changing clocks then are
+# continued to 2099 by copying, for each later year, the transitions of the
+# latest compiled year with the same calendar (weekday of 1 January and leap)
+LAST_COMPILED_YEAR = 2037
+LAST_EXTENDED_YEAR = 2099
+
+
+def local_datetime_to_julian_day(value: str, timezone: Timezone) -> float:
+    """
+    Convert a local ISO date or datetime to a Julian Day (UT)
+
+    Args:
+        value: YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS in local time
+        timezone: Offset in hours, or an IANA zone name (its offset at value)
+
+    Returns:
+        Julian Day Number
+    """
+    if isinstance(timezone, str):
+        timezone = timezone_offset_hours(value, timezone)
+    utc = datetime.fromisoformat(value) - timedelta(hours=timezone)
+    return JD_UNIX_EPOCH + (utc - _UNIX_EPOCH).total_seconds() / 86400.0
+
+
+def julian_day_to_local_datetime(julian_day: float, timezone: Timezone) -> str:
+    """
+    Convert a Julian Day (UT) to a local ISO datetime rounded to the second
+
+    timezone is an offset in hours or an IANA zone name (its offset at that instant).
+    """
+    if isinstance(timezone, str):
+        seconds = (julian_day - JD_UNIX_EPOCH) * 86400.0
+        timezone = float(timezone_table(timezone).utc_offsets(seconds)) / 3600.0
+    local = _UNIX_EPOCH + timedelta(days=julian_day - JD_UNIX_EPOCH, hours=timezone)
+    return (local + timedelta(microseconds=500000)).replace(microsecond=0).isoformat()
+
+
+def julian_days_to_local_datetimes(julian_days, timezone_offset: float) -> List[Optional[str]]:
+    """
+    Vectorized julian_day_to_local_datetime for an array of Julian Days
+
+    NaN entries (events that do not happen) become None.
+    """
+    julian_days = np.asarray(julian_days, dtype=np.float64)
+    missing = np.isnan(julian_days)
+    seconds = np.floor((np.where(missing, JD_UNIX_EPOCH, julian_days) - JD_UNIX_EPOCH) * 86400.0
+                       + timezone_offset * 3600.0 + 0.5)
+    formatted = seconds.astype("datetime64[s]").astype(str).tolist()
+    return [None if gap else value for value, gap in zip(formatted, missing.tolist())]
+
+
+def current_julian_day() -> float:
+    """Julian Day (UT) of the current instant"""
+    return JD_UNIX_EPOCH + time.time() / 86400.0
+
+
+class TimezoneTable:
+    """UTC offsets of one IANA zone as transition arrays (seconds since the Unix epoch)"""
+
+    def __init__(self, name: str, transitions: np.ndarray, offsets: np.ndarray):
+        """
+        Initialize Timezone Table
+
+        Args:
+            name: IANA zone name
+            transitions: UTC instants where each offset starts, sorted, transitions[0] before any date
+            offsets: UTC offset in seconds from each transition on
+        """
+        self.name = name
+        self.transitions = transitions
+        self.offsets = offsets
+        # Local wall times at which both sides of a transition have passed,
+        # and at which its gap or repeated hour begins
+        before, after = offsets[:-1], offsets[1:]
+        self._local_passed = np.maximum.accumulate(transitions[1:] + np.maximum(before, after))
+        self._local_reached = transitions[1:] + np.minimum(before, after)
+
+    def utc_offsets(self, utc_seconds) -> np.ndarray:
+        """Offset in seconds in effect at UTC instants"""
+        index = np.searchsorted(self.transitions, utc_seconds, side="right") - 1
+        return self.offsets[np.maximum(index, 0)]
+
+    def local_offsets(self, local_seconds, fold: int = 0) -> np.ndarray:
+        """
+        Offset in seconds of local wall times
+
+        Wall times repeated when clocks go back take the earlier instant with
+        fold=0 and the later with fold=1; wall times skipped when clocks go
+        forward use the offset before the change with fold=0 and after it with
+        fold=1 (datetime's PEP 495 rules).
+        """
+        if not len(self._local_reached):
+            return np.full(np.shape(local_seconds), self.offsets[0])
+        passed = np.searchsorted(self._local_passed, local_seconds, side="right")
+        upcoming = np.minimum(passed, len(self._local_reached) - 1)
+        changing = (passed < len(self._local_reached)) & (local_seconds >= self._local_reached[upcoming])
+        return self.offsets[passed + (changing & bool(fold))]
+
+
+_timezone_tables: Dict[str, TimezoneTable] = {}
+_timezone_lock = threading.Lock()
+_leap_seconds: Optional[Tuple[List[float], List[float]]] = None
+
+
+def timezone_table(name: str) -> TimezoneTable:
+    """
+    Transition table of an IANA zone, built once per process and zone
+
+    Raises:
+        ValueError: If pytz does not know the zone
+    """
+    table = _timezone_tables.get(name)
+    if table is not None:
+        return table
+    import pytz
+
+    try:
+        zone = pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"Unknown timezone: {name}")
+    # Cached under the canonical name only (pytz also accepts other spellings)
+    table = _timezone_tables.get(zone.zone)
+    if table is not None:
+        return table
+    if hasattr(zone, "_utc_transition_times"):
+        transitions = np.array(zone._utc_transition_times, dtype="datetime64[s]").astype(np.int64)
+        offsets = np.array([info[0].total_seconds() for info in zone._transition_info])
+        if transitions[-1] >= _year_start(LAST_COMPILED_YEAR):
+            transitions, offsets = _extend_transitions(transitions, offsets)
+    else:
+        transitions = np.array([np.iinfo(np.int64).min // 2])
+        offsets = np.array([zone.utcoffset(None).total_seconds()])
+    table = TimezoneTable(zone.zone, transitions, offsets)
+    with _timezone_lock:
+        return _timezone_tables.setdefault(zone.zone, table)
+
+
+def _year_start(year: int) -> int:
+    """Seconds since the Unix epoch of 1 January of a year (UTC)"""
+    return int((datetime(year, 1, 1) - _UNIX_EPOCH).total_seconds())
+
+
+def _extend_transitions(transitions: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Continue a zone's compiled transitions to LAST_EXTENDED_YEAR (see LAST_COMPILED_YEAR)"""
+    def calendar(year):
+        return datetime(year, 1, 1).weekday(), year % 4 == 0
+
+    extended_transitions, extended_offsets = [transitions], [offsets]
+    for year in range(LAST_COMPILED_YEAR + 1, LAST_EXTENDED_YEAR + 1):
+        source = next(candidate for candidate in range(LAST_COMPILED_YEAR, LAST_COMPILED_YEAR - 28, -1)
+                      if calendar(candidate) == calendar(year))
+        in_source = (transitions >= _year_start(source)) & (transitions < _year_start(source + 1))
+        extended_transitions.append(transitions[in_source] + _year_start(year) - _year_start(source))
+        extended_offsets.append(offsets[in_source])
+    return np.concatenate(extended_transitions), np.concatenate(extended_offsets)
+
+
+def _leap_second_table() -> Tuple[List[float], List[float]]:
+    """
+    (UTC Julian Days, TAI - UTC seconds from each) as swisseph applies them
+
+    Read from swe.utc_to_jd on every 1 January and 1 July since 1972 (the only
+    days a leap second can precede), so a seleapsec.txt in the ephemeris path
+    is honoured as well.
+    """
+    global _leap_seconds
+    if _leap_seconds is None:
+        days, tai_utc = [], []
+        for year in range(1972, time.gmtime().tm_year + 2):
+            for month in (1, 7):
+                julian_day = swe.julday(year, month, 1, 0.0)
+                count = round((swe.utc_to_jd(year, month, 1, 0, 0, 0.0, swe.GREG_CAL)[0] - julian_day)
+                              * 86400.0 - TT_MINUS_TAI)
+                if not tai_utc or count != tai_utc[-1]:
+                    days.append(julian_day)
+                    tai_utc.append(count)
+        _leap_seconds = (days, [float(count) for count in tai_utc])
+    return _leap_seconds
+
+
+def _deltat(julian_days: np.ndarray) -> np.ndarray:
+    """swe.deltat (days) over an array"""
+    return np.fromiter((swe.deltat(julian_day) for julian_day in julian_days.tolist()),
+                       dtype=np.float64, count=len(julian_days))
+
+
+def _utc_microseconds(local: np.ndarray, timezone, fold: int) -> np.ndarray:
+    """UTC microseconds since the Unix epoch of local wall times in one or per-element zones"""
+    if isinstance(timezone, str):
+        offsets = timezone_table(timezone).local_offsets(local // 1000000, fold)
+        return local - (offsets * 1e6).astype(np.int64)
+    if np.ndim(timezone) == 0:
+        return local - int(round(float(timezone) * 3600e6))
+    zones = list(timezone)
+    if len(zones) != len(local):
+        raise ValueError("Give one timezone per datetime")
+    utc = np.empty_like(local)
+    names = np.array([isinstance(zone, str) for zone in zones])
+    hours = np.array([0.0 if name else zone for zone, name in zip(zones, names.tolist())], dtype=np.float64)
+    utc[~names] = local[~names] - np.round(hours[~names] * 3600e6).astype(np.int64)
+    for name in {zone for zone in zones if isinstance(zone, str)}:
+        selected = np.array([zone == name for zone in zones])
+        utc[selected] = _utc_microseconds(local[selected], name, fold)
+    return utc
+
+
+def civil_to_julian_days(values, timezone: Union[Timezone, Sequence[Timezone]],
+                         fold: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert local civil datetimes to Julian Days the way swe.utc_to_jd does
+
+    Args:
+        values: ISO dates or datetimes (YYYY-MM-DD[THH:MM:SS[.ffffff]]), proleptic Gregorian
+        timezone: Offset in hours or IANA zone name, or one of either per value
+        fold: 0 or 1, which instant a repeated or skipped wall time means (see TimezoneTable.local_offsets)
+
+    Returns:
+        Tuple of (Julian Days TT, Julian Days UT1) arrays
+
+    Raises:
+        ValueError: On a malformed or impossible datetime or an unknown zone
+    """
+    local = np.array(values, dtype="datetime64[us]").astype(np.int64).ravel()
+    utc = JD_UNIX_EPOCH + _utc_microseconds(local, timezone, fold) / MICROSECONDS_PER_DAY
+
+    leap_days, tai_utc = (np.array(column) for column in _leap_second_table())
+    deltat = _deltat(utc)
+    universal = utc.copy()
+    terrestrial = utc + deltat
+    # Leap-second UTC from 1972 until ΔT runs a second ahead of the table
+    # (future dates, where UT1 - UTC would exceed 0.9 s)
+    offset = tai_utc[np.maximum(np.searchsorted(leap_days, utc, side="right") - 1, 0)] + TT_MINUS_TAI
+    leap = (utc >= JD_1972) & (deltat * 86400.0 - offset < 1.0)
+    if leap.any():
+        terrestrial[leap] = utc[leap] + offset[leap] / 86400.0
+        universal[leap] = terrestrial[leap] - _deltat(terrestrial[leap] - _deltat(terrestrial[leap]))
+    return terrestrial, universal
+
+
+def civil_to_julian_day(value: str, timezone: Timezone, fold: int = 0) -> Tuple[float, float]:
+    """
+    Scalar civil_to_julian_days for years 1-9999 (one chart, without array overhead)
+
+    Returns:
+        Tuple of (Julian Day TT, Julian Day UT1)
+    """
+    local = (datetime.fromisoformat(value) - _UNIX_EPOCH).total_seconds()
+    if isinstance(timezone, str):
+        offset = float(timezone_table(timezone).local_offsets(local // 1, fold))
+    else:
+        offset = timezone * 3600.0
+    utc = JD_UNIX_EPOCH + (local - offset) / 86400.0
+
+    deltat = swe.deltat(utc)
+    if utc >= JD_1972:
+        leap_days, tai_utc = _leap_second_table()
+        leap_offset = tai_utc[max(bisect_right(leap_days, utc) - 1, 0)] + TT_MINUS_TAI
+        if deltat * 86400.0 - leap_offset < 1.0:
+            terrestrial = utc + leap_offset / 86400.0
+            return terrestrial, terrestrial - swe.deltat(terrestrial - swe.deltat(terrestrial))
+    return utc + deltat, utc
+
+
+def timezone_offset_hours(value: str, timezone: Timezone, fold: int = 0) -> float:
+    """
+    UTC offset in hours in effect at a local datetime
+
+    Args:
+        value: Local ISO date or datetime
+        timezone: Offset in hours (returned as is) or IANA zone name
+        fold: See TimezoneTable.local_offsets
+    """
+    if not isinstance(timezone, str):
+        return float(timezone)
+    local = np.array([value], dtype="datetime64[s]").astype(np.int64)
+    return float(timezone_table(timezone).local_offsets(local, fold)[0]) / 3600.0
@@ -2,9 +2,11 @@
 Vedic Astrology Helper Functions
 Contains helper methods for dignities, relationships, aspects, etc.
 """
+from bisect import bisect_left
 from enum import Enum
 from typing import List, Tuple
-from models.astrology_models import Planet, Zodiac
+from models.astrology_models import Planet, Zodiac, Nakshatra
+from services.swiss_ephemeris_service import NAKSHATRAS
 
 
 class Dignity(Enum):
@@ -128,10 +130,52 @@ class VedicAstrologyHelper:
         Planet.KETU: 7,
         Planet.VENUS: 20
     }
+
+    # Display labels
+    SIGN_SHORT_NAMES = {
+        Zodiac.ARIES: "Mesha", Zodiac.TAURUS: "Vrishabha", Zodiac.GEMINI: "Mithuna",
+        Zodiac.CANCER: "Karka", Zodiac.LEO: "Simha", Zodiac.VIRGO: "Kanya",
+        Zodiac.LIBRA: "Tula", Zodiac.SCORPIO: "Vrishchika", Zodiac.SAGITTARIUS: "Dhanu",
+        Zodiac.CAPRICORN: "Makara", Zodiac.AQUARIUS: "Kumbha", Zodiac.PISCES: "Meena"
+    }
+
+    SANSKRIT_PLANET_NAMES = {
+        Planet.SUN: "Surya",
+        Planet.MOON: "Chandra",
+        Planet.MARS: "Mangal",
+        Planet.MERCURY: "Budha",
+        Planet.JUPITER: "Guru",
+        Planet.VENUS: "Shukra",
+        Planet.SATURN: "Shani",
+        Planet.RAHU: "Rahu",
+        Planet.KETU: "Ketu"
+    }
+
+    PLANET_SYMBOLS = {
+        Planet.SUN: "☉", Planet.MOON: "☾", Planet.MARS: "♂",
+        Planet.MERCURY: "☿", Planet.JUPITER: "♃", Planet.VENUS: "♀",
+        Planet.SATURN: "♄", Planet.RAHU: "☊", Planet.KETU: "☋"
+    }
+
+    NAKSHATRA_LABELS = {nak: nak.name.replace("_", " ").title() for nak in Nakshatra}
+
+    # Filled in at import (see bottom of module): dignity and relationship
+    # matrices and the KP sub-lord boundaries of every nakshatra
+    DIGNITY_TABLE = {}
+    RELATIONSHIP_MATRIX = {}
+    KP_SUB_BOUNDARIES = []
     
     @staticmethod
     def get_planet_dignity(planet: Planet, sign: Zodiac, degree: float) -> str:
         """Calculate planet dignity"""
+        dignity = VedicAstrologyHelper.DIGNITY_TABLE.get((planet, sign))
+        if dignity is not None:
+            return dignity
+        return VedicAstrologyHelper._compute_planet_dignity(planet, sign)
+
+    @staticmethod
+    def _compute_planet_dignity(planet: Planet, sign: Zodiac) -> str:
+        """Dignity from exaltation, debilitation and own-sign tables"""
         if planet in [Planet.RAHU, Planet.KETU]:
             return "-"
             
@@ -157,6 +201,14 @@ class VedicAstrologyHelper:
     @staticmethod
     def get_planet_relationship(planet: Planet, sign_lord: Planet) -> str:
         """Get relationship between planet and sign lord"""
+        relationship = VedicAstrologyHelper.RELATIONSHIP_MATRIX.get((planet, sign_lord))
+        if relationship is not None:
+            return relationship
+        return VedicAstrologyHelper._compute_planet_relationship(planet, sign_lord)
+
+    @staticmethod
+    def _compute_planet_relationship(planet: Planet, sign_lord: Planet) -> str:
+        """Relationship from the natural friendship tables"""
         if planet == sign_lord:
             return "Own House"
         
@@ -218,13 +270,7 @@ class VedicAstrologyHelper:
     @staticmethod
     def get_sign_short_name(sign: Zodiac) -> str:
         """Get short Sanskrit name for sign"""
-        names = {
-            Zodiac.ARIES: "Mesha", Zodiac.TAURUS: "Vrishabha", Zodiac.GEMINI: "Mithuna",
-            Zodiac.CANCER: "Karka", Zodiac.LEO: "Simha", Zodiac.VIRGO: "Kanya",
-            Zodiac.LIBRA: "Tula", Zodiac.SCORPIO: "Vrishchika", Zodiac.SAGITTARIUS: "Dhanu",
-            Zodiac.CAPRICORN: "Makara", Zodiac.AQUARIUS: "Kumbha", Zodiac.PISCES: "Meena"
-        }
-        return names.get(sign, sign.name)
+        return VedicAstrologyHelper.SIGN_SHORT_NAMES.get(sign, sign.name)
 
     @staticmethod
     def get_sign_sanskrit_name(sign: Zodiac) -> str:
@@ -234,18 +280,12 @@ class VedicAstrologyHelper:
     @staticmethod
     def get_sanskrit_planet_name(planet: Planet) -> str:
         """Return common Sanskrit-style planet name (Shukra, Budha, etc.)"""
-        names = {
-            Planet.SUN: "Surya",
-            Planet.MOON: "Chandra",
-            Planet.MARS: "Mangal",
-            Planet.MERCURY: "Budha",
-            Planet.JUPITER: "Guru",
-            Planet.VENUS: "Shukra",
-            Planet.SATURN: "Shani",
-            Planet.RAHU: "Rahu",
-            Planet.KETU: "Ketu"
-        }
-        return names.get(planet, planet.name.title())
+        return VedicAstrologyHelper.SANSKRIT_PLANET_NAMES.get(planet, planet.name.title())
+
+    @staticmethod
+    def get_nakshatra_label(nakshatra: Nakshatra) -> str:
+        """Return display name for nakshatra (Purva Phalguni, etc.)"""
+        return VedicAstrologyHelper.NAKSHATRA_LABELS[nakshatra]
 
     def get_sub_lord(self, absolute_longitude: float, nakshatra_lord: Planet) -> Planet:
         """
@@ -254,50 +294,66 @@ class VedicAstrologyHelper:
         - Sub-lords are nine segments proportionate to dasha lengths
         - Order starts from the nakshatra lord and proceeds cyclically
         """
-        # Determine position inside nakshatra (0 to 13.333333)
         # Nakshatra boundaries start at 0 Aries and continue
-        segment_span = 13.333333
-        # Find the start degree of the current nakshatra
-        from services.swiss_ephemeris_service import SwissEphemerisService
-        svc = SwissEphemerisService()
-        nak = None
-        for n in svc.nakshatras:
+        nak_index = None
+        for index, n in enumerate(NAKSHATRAS):
             if n["start"] <= absolute_longitude < n["end"]:
-                nak = n
+                nak_index = index
                 break
-        if not nak:
+        if nak_index is None:
             return nakshatra_lord
+        nak = NAKSHATRAS[nak_index]
         pos_in_nak = absolute_longitude - nak["start"]
 
-        # Build order starting from nakshatra lord
-        order = []
-        # rotate VIMSHOTTARI_ORDER so that it starts with nakshatra_lord
-        base = self.VIMSHOTTARI_ORDER
-        start_idx = base.index(nakshatra_lord) if nakshatra_lord in base else 0
-        order = base[start_idx:] + base[:start_idx]
-
-        # Compute cumulative segment boundaries in degrees
-        total_years = sum(self.VIMSHOTTARI_LENGTHS[p] for p in order)
-        # Proportion per planet within nakshatra
-        boundaries = []
-        acc = 0.0
-        for p in order:
-            proportion = self.VIMSHOTTARI_LENGTHS[p] / total_years
-            acc += proportion * segment_span
-            boundaries.append((acc, p))
+        if nakshatra_lord == nak["ruler"]:
+            boundaries, lords = self.KP_SUB_BOUNDARIES[nak_index]
+        else:
+            boundaries, lords = _kp_sub_boundaries(nakshatra_lord)
 
         # Determine which boundary the position falls into
-        for boundary_deg, p in boundaries:
-            if pos_in_nak <= boundary_deg:
-                return p
-        return order[-1]
+        index = bisect_left(boundaries, pos_in_nak)
+        return lords[index] if index < len(lords) else lords[-1]
     
     @staticmethod
     def get_planet_symbol(planet: Planet) -> str:
         """Get planet symbol"""
-        symbols = {
-            Planet.SUN: "☉", Planet.MOON: "☾", Planet.MARS: "♂",
-            Planet.MERCURY: "☿", Planet.JUPITER: "♃", Planet.VENUS: "♀",
-            Planet.SATURN: "♄", Planet.RAHU: "☊", Planet.KETU: "☋"
-        }
-        return symbols.get(planet, "")
\ No newline at end of file
+        return VedicAstrologyHelper.PLANET_SYMBOLS.get(planet, "")
+
+
+def _kp_sub_boundaries(nakshatra_lord: Planet) -> Tuple[List[float], List[Planet]]:
+    """
+    Cumulative KP sub-lord boundaries (degrees from nakshatra start)
+
+    Returns:
+        Tuple of (upper boundaries, sub-lords) in Vimshottari order starting
+        with the nakshatra lord
+    """
+    segment_span = 13.333333
+    # rotate VIMSHOTTARI_ORDER so that it starts with nakshatra_lord
+    base = VedicAstrologyHelper.VIMSHOTTARI_ORDER
+    start_idx = base.index(nakshatra_lord) if nakshatra_lord in base else 0
+    order = base[start_idx:] + base[:start_idx]
+
+    # Proportion per planet within nakshatra
+    total_years = sum(VedicAstrologyHelper.VIMSHOTTARI_LENGTHS[p] for p in order)
+    boundaries = []
+    acc = 0.0
+    for p in order:
+        proportion = VedicAstrologyHelper.VIMSHOTTARI_LENGTHS[p] / total_years
+        acc += proportion * segment_span
+        boundaries.append(acc)
+    return boundaries, order
+
+
+# Immutable lookup tables. Built once at import so a preloaded gunicorn master
+# shares them copy-on-write with every worker instead of each request
+# rebuilding them.
+VedicAstrologyHelper.DIGNITY_TABLE = {
+    (planet, sign): VedicAstrologyHelper._compute_planet_dignity(planet, sign)
+    for planet in Planet for sign in Zodiac
+}
+VedicAstrologyHelper.RELATIONSHIP_MATRIX = {
+    (planet, sign_lord): VedicAstrologyHelper._compute_planet_relationship(planet, sign_lord)
+    for planet in Planet for sign_lord in Planet
+}
+VedicAstrologyHelper.KP_SUB_BOUNDARIES = [_kp_sub_boundaries(n["ruler"]) for n in NAKSHATRAS]